@@ -1,27 +1,41 @@
+from importlib import import_module
 from fastapi import APIRouter
-from app.api.v1 import financial_institutions, expenses, income_targets, early_retirement_initial_setting, isa_accounts, isa_account_details, isa_account_sales, isa_account_dividends, pension_fund_accounts, pension_fund_account_details, irp_accounts, irp_account_details, common_code_masters, common_code_details, domestic_etfs, usa_etfs, usa_indicators, domestic_etfs_daily_chart, domestic_etfs_dividend, usa_etfs_daily_chart, usa_etfs_dividend, usd_krw_exchange
 
-api_router = APIRouter()
-api_router.include_router(financial_institutions.router, prefix="/financial-institutions", tags=["financial-institutions"])
-api_router.include_router(expenses.router, prefix="/expenses", tags=["expenses"])
-api_router.include_router(income_targets.router, prefix="/income-targets", tags=["income-targets"])
-api_router.include_router(early_retirement_initial_setting.router, prefix="/early-retirement-initial-setting", tags=["early-retirement-initial-setting"])
-api_router.include_router(isa_accounts.router, prefix="/isa-accounts", tags=["isa-accounts"])
-api_router.include_router(isa_account_details.router, prefix="/isa-account-details", tags=["isa-account-details"])
-api_router.include_router(isa_account_sales.router, prefix="/isa-account-sales", tags=["isa-account-sales"])
-api_router.include_router(isa_account_dividends.router, prefix="/isa-account-dividends", tags=["isa-account-dividends"])
-api_router.include_router(pension_fund_accounts.router, prefix="/pension-fund-accounts", tags=["pension-fund-accounts"])
-api_router.include_router(pension_fund_account_details.router, prefix="/pension-fund-account-details", tags=["pension-fund-account-details"])
-api_router.include_router(irp_accounts.router, prefix="/irp-accounts", tags=["irp-accounts"])
-api_router.include_router(irp_account_details.router, prefix="/irp-account-details", tags=["irp-account-details"])
-api_router.include_router(common_code_masters.router, prefix="/common-code-masters", tags=["common-code-masters"])
-api_router.include_router(common_code_details.router, prefix="/common-code-details", tags=["common-code-details"])
-api_router.include_router(domestic_etfs.router, prefix="/domestic-etfs", tags=["domestic-etfs"])
-api_router.include_router(domestic_etfs_daily_chart.router, prefix="/domestic-etfs-daily-chart", tags=["domestic-etfs-daily-chart"])
-api_router.include_router(domestic_etfs_dividend.router, prefix="/domestic-etfs-dividend", tags=["domestic-etfs-dividend"])
-api_router.include_router(usa_etfs.router, prefix="/usa-etfs", tags=["usa-etfs"])
-api_router.include_router(usa_etfs_daily_chart.router, prefix="/usa-etfs-daily-chart", tags=["usa-etfs-daily-chart"])
-api_router.include_router(usa_etfs_dividend.router, prefix="/usa-etfs-dividend", tags=["usa-etfs-dividend"])
-api_router.include_router(usd_krw_exchange.router, prefix="/usd-krw-exchange", tags=["usd-krw-exchange"])
-api_router.include_router(usa_indicators.router, prefix="/usa-indicators", tags=["usa-indicators"])
+# (라우터 모듈, URL prefix) - 태그는 prefix에서 '/'를 뺀 값
+ROUTER_REGISTRY = [
+    ("financial_institutions", "/financial-institutions"),
+    ("expenses", "/expenses"),
+    ("income_targets", "/income-targets"),
+    ("early_retirement_initial_setting", "/early-retirement-initial-setting"),
+    ("isa_accounts", "/isa-accounts"),
+    ("isa_account_details", "/isa-account-details"),
+    ("isa_account_sales", "/isa-account-sales"),
+    ("isa_account_dividends", "/isa-account-dividends"),
+    ("pension_fund_accounts", "/pension-fund-accounts"),
+    ("pension_fund_account_details", "/pension-fund-account-details"),
+    ("irp_accounts", "/irp-accounts"),
+    ("irp_account_details", "/irp-account-details"),
+    ("portfolio_valuation", "/portfolio-valuation"),
+    ("dividend_projection", "/dividend-projection"),
+    ("simulations", "/simulations"),
+    ("import_jobs", "/import-jobs"),
+    ("common_code_masters", "/common-code-masters"),
+    ("common_code_details", "/common-code-details"),
+    ("domestic_etfs", "/domestic-etfs"),
+    ("domestic_etfs_daily_chart", "/domestic-etfs-daily-chart"),
+    ("domestic_etfs_dividend", "/domestic-etfs-dividend"),
+    ("usa_etfs", "/usa-etfs"),
+    ("usa_etfs_daily_chart", "/usa-etfs-daily-chart"),
+    ("usa_etfs_dividend", "/usa-etfs-dividend"),
+    ("usd_krw_exchange", "/usd-krw-exchange"),
+    ("usa_indicators", "/usa-indicators"),
+]
+
+# 라우터 모듈 import 시점에는 로딩하지 않고, 사용하는 엔드포인트 안에서 import하는 무거운 의존성
+# (benchmarks/bench_import_time.py에서 앱 import 후 로딩되지 않았는지 확인)
+DEFERRED_IMPORTS = ("openpyxl",)
 
+api_router = APIRouter()
+for module_name, prefix in ROUTER_REGISTRY:
+    module = import_module(f"{__name__}.{module_name}")
+    api_router.include_router(module.router, prefix=prefix, tags=[prefix.strip("/")])
@@ -0,0 +1,213 @@
+"""
+ISA / IRP / 연금저축펀드 계좌 상세(보유 종목) 라우터 공통 생성
+
+계좌 유형별 라우터 모듈(isa_account_details 등)은 build_holdings_router로 같은 엔드포인트를 만든다.
+"""
+from fastapi import APIRouter, Body, Depends, HTTPException, UploadFile, File, Form, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Dict, List, Literal, Optional
+import json
+from io import BytesIO
+from app.database import get_db
+from app.crud import account_holdings
+from app.crud.account_holdings import HoldingType
+from app.schemas.holdings_import import HoldingsIngestResult
+from app.services.holdings_import import import_holdings_excel, ingest_holdings, parse_mapping
+from app.services.ledger_export import EXPORT_MEDIA_TYPES, stream_export
+
+
+def build_holdings_router(holding_type: HoldingType, detail_schema, create_schema, update_schema) -> APIRouter:
+    """
+    계좌 상세 CRUD / 일괄 처리 / 엑셀 템플릿 / 업로드 / 파일 가져오기 / 내보내기 라우터
+
+    Args:
+        holding_type: 계좌 유형 (account_holdings.HOLDING_TYPES)
+        detail_schema, create_schema, update_schema: 계좌 유형별 응답 / 생성 / 수정 스키마
+    """
+    router = APIRouter()
+    label = holding_type.label
+    file_prefix = f"{holding_type.name}_account_detail"
+
+    @router.get("/account/{account_id}", response_model=List[detail_schema])
+    def read_account_details(
+        account_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        db: Session = Depends(get_db)
+    ):
+        try:
+            details = account_holdings.get_holdings(db, holding_type, account_id=account_id, skip=skip, limit=limit)
+            return details
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+
+    # /bulk는 /{detail_id}보다 먼저 등록해야 함
+    @router.post("/bulk", response_model=List[detail_schema], status_code=201)
+    def bulk_create_account_details(details: List[create_schema], db: Session = Depends(get_db)):
+        """여러 계좌 상세를 한 번에 생성"""
+        try:
+            return account_holdings.create_holdings(db, holding_type, details)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @router.put("/bulk", response_model=List[detail_schema])
+    def bulk_update_account_details(details: Dict[int, update_schema], db: Session = Depends(get_db)):
+        """여러 계좌 상세를 한 번에 수정 ({계좌 상세 id: 수정 값}, 없는 id가 있으면 아무것도 수정하지 않음)"""
+        try:
+            return account_holdings.update_holdings(db, holding_type, details)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @router.delete("/bulk")
+    def bulk_delete_account_details(detail_ids: List[int] = Body(...), db: Session = Depends(get_db)):
+        """여러 계좌 상세를 한 번에 삭제 (없는 id는 무시)"""
+        deleted_ids = account_holdings.delete_holdings(db, holding_type, detail_ids)
+        return {"deleted_count": len(deleted_ids), "deleted_ids": deleted_ids}
+
+    @router.get("/{detail_id}", response_model=detail_schema)
+    def read_account_detail(detail_id: int, db: Session = Depends(get_db)):
+        db_detail = account_holdings.get_holding(db, holding_type, detail_id=detail_id)
+        if db_detail is None:
+            raise HTTPException(status_code=404, detail=holding_type.not_found_message)
+        return db_detail
+
+    @router.post("/", response_model=detail_schema, status_code=201)
+    def create_account_detail(detail: create_schema, db: Session = Depends(get_db)):
+        try:
+            return account_holdings.create_holding(db, holding_type, detail)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @router.put("/{detail_id}", response_model=detail_schema)
+    def update_account_detail(
+        detail_id: int,
+        detail: update_schema,
+        db: Session = Depends(get_db)
+    ):
+        try:
+            return account_holdings.update_holding(db, holding_type, detail_id=detail_id, detail=detail)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @router.delete("/{detail_id}", status_code=204)
+    def delete_account_detail(detail_id: int, db: Session = Depends(get_db)):
+        try:
+            account_holdings.delete_holding(db, holding_type, detail_id=detail_id)
+            return None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @router.get("/template/download")
+    def download_template():
+        """종목 상세 엑셀 템플릿 다운로드"""
+        # openpyxl은 import 비용이 커서 엑셀 엔드포인트가 처음 호출될 때 로딩
+        from openpyxl import Workbook
+        from openpyxl.styles import Font, Alignment, PatternFill
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = f"{label} 종목 상세"
+
+        # 헤더 설정
+        headers = ["종목코드", "수량", "매입단가", "현재가", "매수수수료"]
+        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF")
+
+        for col_idx, header in enumerate(headers, start=1):
+            cell = ws.cell(row=1, column=col_idx)
+            cell.value = header
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+
+        # 컬럼 너비 설정
+        for column in ('A', 'B', 'C', 'D', 'E'):
+            ws.column_dimensions[column].width = 15
+
+        # 예시 데이터 행 추가
+        example_row = ["069500", "10", "50000", "52000", "0"]
+        for col_idx, value in enumerate(example_row, start=1):
+            cell = ws.cell(row=2, column=col_idx)
+            cell.value = value
+            cell.alignment = Alignment(horizontal="right", vertical="center")
+
+        # 파일을 메모리에 저장
+        output = BytesIO()
+        wb.save(output)
+        output.seek(0)
+
+        return StreamingResponse(
+            output,
+            media_type=EXPORT_MEDIA_TYPES['xlsx'],
+            headers={"Content-Disposition": f"attachment; filename={file_prefix}_template.xlsx"}
+        )
+
+    @router.post("/upload/{account_id}")
+    def upload_excel(
+        account_id: int,
+        file: UploadFile = File(...),
+        db: Session = Depends(get_db)
+    ):
+        """종목 상세 엑셀 파일 업로드"""
+        if not file.filename.endswith(('.xlsx', '.xls')):
+            raise HTTPException(status_code=400, detail="엑셀 파일(.xlsx, .xls)만 업로드 가능합니다.")
+
+        try:
+            result = import_holdings_excel(db, holding_type.model, account_id, file.file)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"파일 처리 중 오류 발생: {str(e)}")
+
+        if result["errors"]:
+            raise HTTPException(status_code=400, detail=result)
+
+        return result
+
+    @router.post("/ingest/{account_id}", response_model=HoldingsIngestResult)
+    def ingest_holdings_file(
+        account_id: int,
+        file: UploadFile = File(...),
+        layout: str = Form("auto"),
+        mapping: Optional[str] = Form(None),
+        dry_run: bool = Form(True),
+        delete_missing: bool = Form(False),
+        db: Session = Depends(get_db)
+    ):
+        """
+        보유 종목 파일(CSV, XLSX, 증권사 잔고 내보내기) 가져오기
+
+        - layout: auto(헤더로 판단), template, kiwoom, mirae_asset, samsung, korea_investment
+        - mapping: 직접 지정하는 컬럼 매핑 JSON (예: {"stock_code": "종목번호", "quantity": ["보유수량", "잔고수량"], ...})
+        - dry_run: true면 저장하지 않고 생성 / 업데이트 / 삭제 내역만 반환 (기본값)
+        - delete_missing: true면 파일에 없는 보유 종목을 삭제 (파일이 계좌 전체 잔고인 경우)
+        """
+        try:
+            column_mapping = parse_mapping(json.loads(mapping)) if mapping else None
+            result = ingest_holdings(
+                db, holding_type.model, account_id, file.file, file.filename,
+                layout=layout, mapping=column_mapping, dry_run=dry_run, delete_missing=delete_missing,
+            )
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="mapping은 JSON 객체여야 합니다.")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        if result.errors and not dry_run:
+            raise HTTPException(status_code=400, detail=result.model_dump(mode="json"))
+
+        return result
+
+    @router.get("/export/{account_id}")
+    def export_account_details(
+        account_id: int,
+        file_format: Literal["xlsx", "csv"] = Query("xlsx", alias="format"),
+    ):
+        """보유 종목 파일 내보내기 (format: xlsx 또는 csv, 서버 측 커서로 읽으면서 스트리밍)"""
+        stmt = account_holdings.holdings_export_query(holding_type, account_id)
+        return StreamingResponse(
+            stream_export(stmt, file_format, sheet_title=f"{label} 종목 상세"),
+            media_type=EXPORT_MEDIA_TYPES[file_format],
+            headers={"Content-Disposition": f"attachment; filename={file_prefix}_{account_id}.{file_format}"}
+        )
+
+    return router
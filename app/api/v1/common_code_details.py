@@ -1,28 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.database import get_db
 from app.schemas.common_code_detail import CommonCodeDetail, CommonCodeDetailCreate, CommonCodeDetailUpdate
 from app.crud.common_code_detail import (
     get_common_code_details as crud_get_all,
+    get_common_code_details_page as crud_get_page,
     get_common_code_detail as crud_get_one,
     create_common_code_detail as crud_create,
     update_common_code_detail as crud_update,
     delete_common_code_detail as crud_delete
 )
+from app.crud.keyset import NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
 @router.get("/", response_model=List[CommonCodeDetail])
 def read_common_code_details(
+    response: Response,
     master_id: Optional[int] = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
+    # 다음 페이지가 있으면 응답 헤더 X-Next-Cursor의 값을 cursor로 넘겨서 조회 (skip 대신 권장)
     try:
-        details = crud_get_all(db, master_id=master_id, skip=skip, limit=limit)
+        if skip:
+            return crud_get_all(db, master_id=master_id, skip=skip, limit=limit)
+        details, next_cursor = crud_get_page(db, master_id=master_id, limit=limit, cursor=cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         return details
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
 
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date
+from app.database import get_db
+from app.schemas.dividend_projection import DividendProjection
+from app.services.dividend_projection import dividend_projection_service
+
+router = APIRouter()
+
+# NumPy 계산이 포함되어 있어 이벤트 루프를 막지 않도록 동기 함수(스레드풀)로 처리
+@router.get("/", response_model=DividendProjection)
+def get_dividend_projection(as_of: Optional[date] = None, db: Session = Depends(get_db)):
+    """보유 종목 전체의 향후 12개월 종목별 / 월별 예상 배당금(원화)과 배당소득 목표 비교"""
+    return dividend_projection_service.project(db, as_of=as_of)
@@ -1,27 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import date, datetime, timedelta
-from app.database import get_db
+from app.database import get_async_db, AsyncSession
 from app.schemas.domestic_etfs_dividend import DomesticETFsDividend
 from app.crud import domestic_etfs_dividend
+from app.crud.keyset import NDJSON_MEDIA_TYPE, NEXT_CURSOR_HEADER, stream_ndjson
 
 router = APIRouter()
 
 @router.get("/etf/{etf_id}", response_model=List[DomesticETFsDividend])
-def get_dividends_by_etf(etf_id: int, db: Session = Depends(get_db)):
-    """ETF의 모든 배당 데이터 조회"""
-    dividends = domestic_etfs_dividend.get_domestic_etf_dividends_by_etf_id(db, etf_id=etf_id)
+async def get_dividends_by_etf(
+    etf_id: int,
+    response: Response,
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """ETF의 배당 데이터 조회 (기준일 내림차순, 다음 페이지가 있으면 응답 헤더 X-Next-Cursor의 값을 cursor로 넘겨서 조회)"""
+    try:
+        dividends, next_cursor = await domestic_etfs_dividend.get_domestic_etf_dividends_page_async(db, etf_id=etf_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return dividends
 
+@router.get("/export")
+def export_dividends(etf_id: Optional[int] = None, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """배당 데이터 NDJSON 스트리밍 내보내기 (한 줄에 한 행, etf_id / 기준일 오름차순, etf_id를 생략하면 전체)"""
+    stmt = domestic_etfs_dividend.domestic_etf_dividends_export_query(etf_id=etf_id, start_date=start_date, end_date=end_date)
+    return StreamingResponse(stream_ndjson(stmt), media_type=NDJSON_MEDIA_TYPE)
+
 @router.get("/etf/{etf_id}/period", response_model=List[DomesticETFsDividend])
-def get_dividends_by_period(etf_id: int, months_ago: int = 12, db: Session = Depends(get_db)):
+async def get_dividends_by_period(etf_id: int, months_ago: int = 12, db: AsyncSession = Depends(get_async_db)):
     """ETF의 N개월 전부터 현재까지의 배당 데이터 조회"""
     # 현재 날짜에서 N개월 전 날짜 계산
     target_date = datetime.now().date() - timedelta(days=months_ago * 30)
     
     # 모든 배당 데이터 조회
-    all_dividends = domestic_etfs_dividend.get_domestic_etf_dividends_by_etf_id(db, etf_id=etf_id, limit=1000)
+    all_dividends = await domestic_etfs_dividend.get_domestic_etf_dividends_by_etf_id_async(db, etf_id=etf_id, limit=1000)
     
     # 해당 기간 이후의 배당만 필터링
     filtered_dividends = [d for d in all_dividends if d.payment_date >= target_date]
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.database import get_db
+from app.crud import import_job as crud_import_job
+from app.schemas.import_job import ImportJob, ImportJobCreate, ImportJobStatus, ImportJobType
+from app.services.import_jobs import JOB_TYPES, import_jobs
+
+router = APIRouter()
+
+@router.get("/types", response_model=List[ImportJobType])
+def read_import_job_types():
+    """접수할 수 있는 가져오기 작업 유형과 파라미터 기본값"""
+    return [
+        ImportJobType(job_type=job_type, description=spec.description, concurrency=spec.concurrency,
+                      params=spec.params().model_dump())
+        for job_type, spec in JOB_TYPES.items()
+    ]
+
+@router.post("/", response_model=ImportJob, status_code=202)
+def submit_import_job(request: ImportJobCreate, db: Session = Depends(get_db)):
+    """가져오기 / 스크래핑 작업 접수 (바로 작업 ID 반환, 진행 상황과 결과는 GET /import-jobs/{job_id}로 조회)"""
+    try:
+        return import_jobs.submit(db, request.job_type, request.params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/", response_model=List[ImportJob])
+def read_import_jobs(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    job_type: Optional[str] = None,
+    status: Optional[ImportJobStatus] = None,
+    db: Session = Depends(get_db)
+):
+    """가져오기 작업 목록 (최근 접수 순)"""
+    return crud_import_job.get_import_jobs(db, skip=skip, limit=limit, job_type=job_type, status=status)
+
+@router.get("/{job_id}", response_model=ImportJob)
+def read_import_job(job_id: int, db: Session = Depends(get_db)):
+    """가져오기 작업 상태 / 진행 상황 / 결과 조회"""
+    job = crud_import_job.get_import_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Literal, Optional
 from app.database import get_db
 from app.schemas.isa_account_dividend import ISAAccountDividend, ISAAccountDividendCreate, ISAAccountDividendUpdate
 from app.crud.isa_account_dividend import (
@@ -8,8 +9,10 @@ from app.crud.isa_account_dividend import (
     get_isa_account_dividend as crud_get_one,
     create_isa_account_dividend as crud_create,
     update_isa_account_dividend as crud_update,
-    delete_isa_account_dividend as crud_delete
+    delete_isa_account_dividend as crud_delete,
+    isa_account_dividends_export_query
 )
+from app.services.ledger_export import EXPORT_MEDIA_TYPES, stream_export
 
 router = APIRouter()
 
@@ -58,3 +61,16 @@ def delete_isa_account_dividend(dividend_id: int, db: Session = Depends(get_db))
         raise HTTPException(status_code=404, detail="ISA 배당 내역을 찾을 수 없습니다")
     return None
 
+@router.get("/export/{account_id}")
+def export_isa_account_dividends(
+    account_id: int,
+    year_month: Optional[str] = None,
+    file_format: Literal["xlsx", "csv"] = Query("xlsx", alias="format"),
+):
+    """ISA 배당 내역 파일 내보내기 (format: xlsx 또는 csv, 서버 측 커서로 읽으면서 스트리밍)"""
+    stmt = isa_account_dividends_export_query(account_id, year_month=year_month)
+    return StreamingResponse(
+        stream_export(stmt, file_format, sheet_title="ISA 배당 내역"),
+        media_type=EXPORT_MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f"attachment; filename=isa_account_dividend_{account_id}.{file_format}"}
+    )
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+from app.database import get_async_db, AsyncSession
+from app.schemas.portfolio_valuation import PortfolioValuation
+from app.services.portfolio_valuation import portfolio_valuation_cache
+
+router = APIRouter()
+
+@router.get("/", response_model=PortfolioValuation)
+async def get_portfolio_valuation(db: AsyncSession = Depends(get_async_db)):
+    """ISA / IRP / 연금저축펀드 전체 계좌의 평가금액, 매입금액, 평가손익, 비중 (계좌별 / 계좌유형별 / 전체)"""
+    return await portfolio_valuation_cache.aget(db)
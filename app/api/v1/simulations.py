@@ -0,0 +1,18 @@
+from fastapi import APIRouter, HTTPException
+from app.schemas.simulation import SimulationRequest, SimulationJob
+from app.services.simulation import simulation_jobs
+
+router = APIRouter()
+
+@router.post("/", response_model=SimulationJob, status_code=202)
+def submit_simulation(request: SimulationRequest):
+    """조기은퇴 계획 몬테카를로 시뮬레이션 작업 접수 (결과는 GET /simulations/{job_id}로 조회)"""
+    return simulation_jobs.submit(request)
+
+@router.get("/{job_id}", response_model=SimulationJob)
+def get_simulation(job_id: str):
+    """시뮬레이션 작업 상태 및 결과 조회"""
+    job = simulation_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Simulation job not found")
+    return job
@@ -1,20 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Optional
+from app.database import get_db, get_async_db, AsyncSession
 from app.schemas.usa_etfs import USAETFs, USAETFsCreate, USAETFsUpdate
 from app.crud import usa_etfs
+from app.crud.keyset import NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
 @router.get("/", response_model=List[USAETFs])
-def read_usa_etfs(skip: int = 0, limit: int = 1000, etf_type: str = None, db: Session = Depends(get_db)):
-    etfs = usa_etfs.get_usa_etfs(db, skip=skip, limit=limit, etf_type=etf_type)
+async def read_usa_etfs(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(1000, ge=1),
+    etf_type: str = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """ETF 목록 (id 순, 다음 페이지가 있으면 응답 헤더 X-Next-Cursor의 값을 cursor로 넘겨서 조회, skip 대신 권장)"""
+    if skip:
+        return await usa_etfs.get_usa_etfs_async(db, skip=skip, limit=limit, etf_type=etf_type)
+    try:
+        etfs, next_cursor = await usa_etfs.get_usa_etfs_page_async(db, limit=limit, etf_type=etf_type, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return etfs
 
 @router.get("/{etf_id}", response_model=USAETFs)
-def read_usa_etf(etf_id: int, db: Session = Depends(get_db)):
-    db_etf = usa_etfs.get_usa_etf(db, etf_id=etf_id)
+async def read_usa_etf(etf_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_etf = await usa_etfs.get_usa_etf_async(db, etf_id=etf_id)
     if db_etf is None:
         raise HTTPException(status_code=404, detail="ETF not found")
     return db_etf
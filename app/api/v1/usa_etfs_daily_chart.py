@@ -1,50 +1,86 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List, Optional
 from datetime import date, datetime, timedelta
-from app.database import get_db
+from app.database import get_async_db, AsyncSession
 from app.schemas.usa_etfs_daily_chart import USAETFsDailyChart
-from app.crud import usa_etfs_daily_chart
+from app.schemas.asof_lookup import ChartAsOfRequest
+from app.crud.usa_etfs_daily_chart import usa_etf_daily_charts_export_query
+from app.crud.keyset import NDJSON_MEDIA_TYPE, NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, stream_ndjson
+from app.models.usa_etfs_daily_chart import USAETFsDailyChart as USAETFsDailyChartModel
+from app.services.chart_cache import usa_chart_cache
+from app.services.asof_lookup import nearest_index, chart_asof_batch
 
 router = APIRouter()
 
 @router.get("/etf/{etf_id}/latest", response_model=USAETFsDailyChart)
-def get_latest_chart(etf_id: int, db: Session = Depends(get_db)):
+async def get_latest_chart(etf_id: int, db: AsyncSession = Depends(get_async_db)):
     """ETF의 가장 최근 일봉 차트 데이터 조회"""
-    chart = usa_etfs_daily_chart.get_latest_usa_etf_daily_chart(db, etf_id=etf_id)
-    if chart is None:
+    series = await usa_chart_cache.aget(db, etf_id)
+    if len(series) == 0:
         raise HTTPException(status_code=404, detail="Chart data not found")
-    return chart
+    return JSONResponse(content=series.to_records(slice(-1, None))[0])
 
 @router.get("/etf/{etf_id}/date/{chart_date}", response_model=USAETFsDailyChart)
-def get_chart_by_date(etf_id: int, chart_date: date, db: Session = Depends(get_db)):
+async def get_chart_by_date(etf_id: int, chart_date: date, db: AsyncSession = Depends(get_async_db)):
     """ETF의 특정 날짜 일봉 차트 데이터 조회"""
-    chart = usa_etfs_daily_chart.get_usa_etf_daily_chart_by_etf_and_date(db, etf_id=etf_id, date=chart_date)
-    if chart is None:
+    series = await usa_chart_cache.aget(db, etf_id)
+    idx = series.index_of(chart_date)
+    if idx is None:
         raise HTTPException(status_code=404, detail="Chart data not found for the specified date")
-    return chart
+    return JSONResponse(content=series.to_records(slice(idx, idx + 1))[0])
 
 @router.get("/etf/{etf_id}/period", response_model=Optional[USAETFsDailyChart])
-def get_chart_by_period(etf_id: int, months_ago: int = 12, db: Session = Depends(get_db)):
+async def get_chart_by_period(etf_id: int, months_ago: int = 12, db: AsyncSession = Depends(get_async_db)):
     """ETF의 N개월 전 일봉 차트 데이터 조회 (해당 날짜에 가장 가까운 데이터)"""
     # 개월 단위로 계산 (1개월 = 30일로 근사)
     target_date = datetime.now().date() - timedelta(days=months_ago * 30)
     
-    # 해당 날짜 또는 그 이전의 가장 가까운 데이터 조회
-    charts = usa_etfs_daily_chart.get_usa_etf_daily_chart_by_date_range(
-        db, etf_id=etf_id, start_date=target_date - timedelta(days=30), end_date=target_date + timedelta(days=30)
-    )
-    
-    if not charts:
+    # target_date 전후 30일 이내에서 가장 가까운 데이터 찾기 (이진 탐색)
+    series = await usa_chart_cache.aget(db, etf_id)
+    idx = nearest_index(series.dates, target_date, max_distance_days=30)
+    if idx is None:
         return None
-    
-    # target_date에 가장 가까운 데이터 찾기
-    closest_chart = min(charts, key=lambda x: abs((x.date - target_date).days))
-    return closest_chart
+    return JSONResponse(content=series.to_records(slice(idx, idx + 1))[0])
+
+@router.post("/asof", response_model=List[Optional[USAETFsDailyChart]])
+async def get_charts_asof(request: ChartAsOfRequest, db: AsyncSession = Depends(get_async_db)):
+    """여러 (etf_id, date)에 대해 해당 날짜 또는 그 이전의 가장 최근 일봉 차트를 한 번에 조회 (요청 순서대로, 없으면 null)"""
+    queries = [(query.etf_id, query.date) for query in request.queries]
+    series_by_etf = await usa_chart_cache.aget_many(db, [etf_id for etf_id, _ in queries])
+    results = chart_asof_batch(series_by_etf, queries)
+    return JSONResponse(content=results)
 
 @router.get("/etf/{etf_id}", response_model=List[USAETFsDailyChart])
-def get_charts_by_etf(etf_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """ETF의 일봉 차트 데이터 목록 조회"""
-    charts = usa_etfs_daily_chart.get_usa_etf_daily_charts_by_etf_id(db, etf_id=etf_id, skip=skip, limit=limit)
-    return charts
+async def get_charts_by_etf(
+    etf_id: int,
+    skip: int = 0,
+    limit: int = Query(100, ge=1),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    ETF의 일봉 차트 데이터 목록 조회 (날짜 내림차순, start_date/end_date로 기간 지정 가능)
+
+    다음 페이지가 있으면 응답 헤더 X-Next-Cursor의 값을 cursor로 넘겨서 이어서 조회 (skip 대신 권장)
+    """
+    series = await usa_chart_cache.aget(db, etf_id)
+    if skip:
+        index = series.latest_first(start_date, end_date, skip=skip, limit=limit)
+        return JSONResponse(content=series.to_records(index))
+    try:
+        after = decode_cursor(cursor, [USAETFsDailyChartModel.date])[0] if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    index, last_date = series.latest_first_page(start_date, end_date, after=after, limit=limit)
+    headers = {NEXT_CURSOR_HEADER: encode_cursor([last_date])} if last_date else None
+    return JSONResponse(content=series.to_records(index), headers=headers)
+
+@router.get("/export")
+def export_charts(etf_id: Optional[int] = None, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """일봉 차트 NDJSON 스트리밍 내보내기 (한 줄에 한 행, etf_id / 날짜 오름차순, etf_id를 생략하면 전체)"""
+    stmt = usa_etf_daily_charts_export_query(etf_id=etf_id, start_date=start_date, end_date=end_date)
+    return StreamingResponse(stream_ndjson(stmt), media_type=NDJSON_MEDIA_TYPE)
 
@@ -0,0 +1,173 @@
+"""
+ISA / IRP / 연금저축펀드 계좌 보유 종목(계좌 상세) 공통 CRUD
+
+세 계좌 상세 테이블은 컬럼이 같으므로 계좌 유형(HOLDING_TYPES)의 모델로 같은 함수를 사용한다.
+- 쓰기는 INSERT / UPDATE / DELETE ... RETURNING 한 문장 + 커밋 (커밋 후 refresh / 조인 재조회 없음)
+- 조회 / 쓰기 응답의 종목명(stock_name)은 종목 정보 캐시(ticker_cache)에서 채움 (ETF 테이블 조인 없음)
+- 일괄 생성 / 삭제는 한 문장, 일괄 수정은 세 문장 (행 수와 관계없음, executemany)
+- 쓰기 후 계좌 평가 캐시 무효화
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+from pydantic import BaseModel
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+from app.models.domestic_etfs import DomesticETFs
+from app.models.irp_account_detail import IRPAccountDetail
+from app.models.isa_account_detail import ISAAccountDetail
+from app.models.pension_fund_account_detail import PensionFundAccountDetail
+from app.services.portfolio_valuation import portfolio_valuation_cache
+from app.services.ticker_cache import ticker_cache
+
+
+@dataclass(frozen=True)
+class HoldingType:
+    """계좌 유형별 보유 종목 테이블"""
+    name: str  # 계좌 유형 (isa, irp, pension_fund)
+    model: type  # 계좌 상세 모델
+    label: str  # 화면 / 오류 메시지에 쓰는 계좌 유형 이름
+
+    @property
+    def not_found_message(self) -> str:
+        return f"{self.label} 계좌 상세를 찾을 수 없습니다"
+
+
+HOLDING_TYPES: Dict[str, HoldingType] = {
+    'isa': HoldingType('isa', ISAAccountDetail, 'ISA'),
+    'irp': HoldingType('irp', IRPAccountDetail, 'IRP'),
+    'pension_fund': HoldingType('pension_fund', PensionFundAccountDetail, '연금저축펀드'),
+}
+
+
+def _columns(holding_type: HoldingType):
+    return list(holding_type.model.__table__.c)
+
+
+def _values(detail) -> dict:
+    # stock_name은 응답용 필드이므로 저장하지 않음
+    values = detail.model_dump() if isinstance(detail, BaseModel) else dict(detail)
+    values.pop('stock_name', None)
+    return values
+
+
+def _to_detached(db: Session, holding_type: HoldingType, rows: Sequence) -> list:
+    """RETURNING 행 -> 세션에 속하지 않는 모델 객체 (종목명은 캐시에서)"""
+    return ticker_cache.attach_names(db, (holding_type.model(**row._mapping) for row in rows))
+
+
+def _commit(db: Session):
+    db.commit()
+    portfolio_valuation_cache.invalidate()
+
+
+def get_holdings(db: Session, holding_type: HoldingType, account_id: int, skip: int = 0, limit: int = 100):
+    model = holding_type.model
+    details = db.query(model).filter(
+        model.account_id == account_id
+    ).offset(skip).limit(limit).all()
+    return ticker_cache.attach_names(db, details)
+
+
+def get_holding(db: Session, holding_type: HoldingType, detail_id: int):
+    model = holding_type.model
+    detail = db.query(model).filter(model.id == detail_id).first()
+    if detail:
+        ticker_cache.attach_names(db, [detail])
+    return detail
+
+
+def get_holding_by_stock_code(db: Session, holding_type: HoldingType, account_id: int, stock_code: str):
+    """account_id와 stock_code로 기존 레코드 찾기"""
+    model = holding_type.model
+    return db.query(model).filter(
+        model.account_id == account_id,
+        model.stock_code == stock_code
+    ).first()
+
+
+def create_holding(db: Session, holding_type: HoldingType, detail):
+    row = db.execute(insert(holding_type.model).values(**_values(detail)).returning(*_columns(holding_type))).one()
+    _commit(db)
+    return _to_detached(db, holding_type, [row])[0]
+
+
+def update_holding(db: Session, holding_type: HoldingType, detail_id: int, detail):
+    model = holding_type.model
+    row = db.execute(
+        update(model).where(model.id == detail_id).values(**_values(detail)).returning(*_columns(holding_type))
+    ).one_or_none()
+    if row is None:
+        db.rollback()
+        raise ValueError(f"{holding_type.not_found_message}: {detail_id}")
+    _commit(db)
+    return _to_detached(db, holding_type, [row])[0]
+
+
+def delete_holding(db: Session, holding_type: HoldingType, detail_id: int):
+    model = holding_type.model
+    row = db.execute(delete(model).where(model.id == detail_id).returning(*_columns(holding_type))).one_or_none()
+    if row is None:
+        db.rollback()
+        raise ValueError(f"{holding_type.not_found_message}: {detail_id}")
+    _commit(db)
+    return _to_detached(db, holding_type, [row])[0]
+
+
+def create_holdings(db: Session, holding_type: HoldingType, details: list) -> list:
+    """여러 보유 종목을 한 번에 생성 (INSERT ... RETURNING executemany)"""
+    if not details:
+        return []
+    rows = db.execute(
+        insert(holding_type.model).returning(*_columns(holding_type), sort_by_parameter_order=True),
+        [_values(detail) for detail in details],
+    ).all()
+    _commit(db)
+    return _to_detached(db, holding_type, rows)
+
+
+def update_holdings(db: Session, holding_type: HoldingType, details: Dict[int, object]) -> list:
+    """
+    여러 보유 종목을 한 번에 수정 ({id: 수정 값}, 기본키 기준 UPDATE executemany + 결과 조회 1회)
+
+    없는 id가 있으면 아무것도 수정하지 않고 ValueError.
+    """
+    if not details:
+        return []
+    model = holding_type.model
+    ids = list(details)
+    existing = set(db.scalars(select(model.id).where(model.id.in_(ids))))
+    missing = [detail_id for detail_id in ids if detail_id not in existing]
+    if missing:
+        raise ValueError(f"{holding_type.not_found_message}: {', '.join(map(str, missing))}")
+    db.execute(update(model), [{**_values(detail), 'id': detail_id} for detail_id, detail in details.items()])
+    rows = db.execute(select(*_columns(holding_type)).where(model.id.in_(ids)).order_by(model.id)).all()
+    _commit(db)
+    return _to_detached(db, holding_type, rows)
+
+
+def delete_holdings(db: Session, holding_type: HoldingType, detail_ids: List[int]) -> List[int]:
+    """여러 보유 종목을 한 번에 삭제 (삭제된 id 목록, 없는 id는 무시)"""
+    if not detail_ids:
+        return []
+    model = holding_type.model
+    deleted = list(db.scalars(delete(model).where(model.id.in_(detail_ids)).returning(model.id)))
+    _commit(db)
+    return deleted
+
+
+def holdings_export_query(holding_type: HoldingType, account_id: int):
+    """내보내기(ledger_export)용 조회문 (헤더는 업로드 템플릿과 같은 이름, 종목코드 순)"""
+    model = holding_type.model
+    return select(
+        model.stock_code.label('종목코드'),
+        DomesticETFs.name.label('종목명'),
+        model.quantity.label('수량'),
+        model.purchase_avg_price.label('매입단가'),
+        model.current_price.label('현재가'),
+        model.purchase_fee.label('매수수수료'),
+        model.sale_fee.label('매도수수료'),
+    ).outerjoin(
+        DomesticETFs, model.stock_code == DomesticETFs.ticker
+    ).where(
+        model.account_id == account_id
+    ).order_by(model.stock_code, model.id)
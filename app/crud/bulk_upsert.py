@@ -0,0 +1,168 @@
+"""
+자연키(예: etf_id + date) 기준 일괄 upsert 공통 모듈
+
+- PostgreSQL: 배치 단위 INSERT ... ON CONFLICT (키) DO UPDATE 한 문장으로 처리
+- 그 외 DB(SQLite 등) 또는 유니크 제약이 없는 경우: 배치당 SELECT 1회로 기존 키를 찾고
+  나머지는 executemany INSERT / UPDATE로 처리
+- skip_unchanged=True면 기존 값과 같은 행은 UPDATE하지 않음 (증분 수집의 겹치는 구간 등)
+"""
+from decimal import Decimal
+from typing import Dict, List, Sequence, Tuple
+from sqlalchemy import inspect, insert, update, tuple_, literal_column, or_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+DEFAULT_BATCH_SIZE = 1000
+
+# (DB URL, 스키마.테이블, 키 컬럼) -> 유니크 제약 존재 여부
+_unique_key_cache: Dict[Tuple[str, str, Tuple[str, ...]], bool] = {}
+
+
+def _dedupe_rows(rows: list, key_columns: Sequence[str]) -> Dict[tuple, dict]:
+    """키가 비어있는 행은 제외하고, 같은 키가 여러 번 나오면 마지막 값만 남김"""
+    deduped = {}
+    for row in rows:
+        key = tuple(row.get(col) for col in key_columns)
+        if not all(key):
+            continue
+        deduped[key] = row
+    return deduped
+
+
+def _has_unique_key(db: Session, model, key_columns: Sequence[str]) -> bool:
+    """실제 DB 테이블에 키 컬럼과 정확히 일치하는 유니크 제약(또는 유니크 인덱스)이 있는지 확인"""
+    table = model.__table__
+    bind = db.get_bind()
+    cache_key = (str(bind.url), table.fullname, tuple(key_columns))
+    if cache_key not in _unique_key_cache:
+        inspector = inspect(bind)
+        wanted = set(key_columns)
+        found = False
+        try:
+            for constraint in inspector.get_unique_constraints(table.name, schema=table.schema):
+                if set(constraint['column_names']) == wanted:
+                    found = True
+                    break
+            if not found:
+                for index in inspector.get_indexes(table.name, schema=table.schema):
+                    if index.get('unique') and set(index['column_names']) == wanted:
+                        found = True
+                        break
+        except Exception:
+            found = False
+        _unique_key_cache[cache_key] = found
+    return _unique_key_cache[cache_key]
+
+
+def _same_value(stored, new) -> bool:
+    """DB 값과 새 값 비교 (Numeric 컬럼의 Decimal과 float은 숫자로 비교)"""
+    if isinstance(stored, Decimal) and isinstance(new, float):
+        return float(stored) == new
+    return stored == new
+
+
+def _upsert_batch_on_conflict(db: Session, model, batch: List[dict], key_columns: Sequence[str],
+                              skip_unchanged: bool = False) -> Tuple[int, int]:
+    """
+    PostgreSQL INSERT ... ON CONFLICT DO UPDATE (xmax = 0 이면 새로 생성된 행)
+
+    skip_unchanged면 값이 하나라도 다른 행만 UPDATE (변경 없는 행은 RETURNING에 나오지 않음)
+    """
+    update_columns = [col for col in batch[0].keys() if col not in key_columns]
+    table = model.__table__
+    stmt = postgresql.insert(table).values(batch)
+    if update_columns:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={col: stmt.excluded[col] for col in update_columns},
+            where=or_(*(table.c[col].is_distinct_from(stmt.excluded[col]) for col in update_columns))
+            if skip_unchanged else None,
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=list(key_columns))
+    stmt = stmt.returning(literal_column('(xmax = 0)').label('inserted'))
+
+    created = 0
+    updated = 0
+    for (inserted,) in db.execute(stmt):
+        if inserted:
+            created += 1
+        else:
+            updated += 1
+    return created, updated
+
+
+def _upsert_batch_portable(db: Session, model, batch: Dict[tuple, dict], key_columns: Sequence[str],
+                           skip_unchanged: bool = False) -> Tuple[int, int]:
+    """기존 키를 한 번에 조회한 뒤 INSERT / UPDATE를 각각 executemany로 실행"""
+    pk_column = inspect(model).primary_key[0]
+    key_attrs = [getattr(model, col) for col in key_columns]
+    update_columns = [col for col in next(iter(batch.values())).keys() if col not in key_columns]
+    # skip_unchanged면 기존 값도 함께 조회해서 비교
+    value_attrs = [getattr(model, col) for col in update_columns] if skip_unchanged else []
+
+    existing = {
+        tuple(row[1:1 + len(key_attrs)]): (row[0], row[1 + len(key_attrs):])
+        for row in db.query(pk_column, *key_attrs, *value_attrs).filter(tuple_(*key_attrs).in_(list(batch.keys()))).all()
+    }
+
+    inserts = []
+    updates = []
+    for key, row in batch.items():
+        if key in existing:
+            pk, stored_values = existing[key]
+            if skip_unchanged and all(
+                _same_value(stored, row[col]) for col, stored in zip(update_columns, stored_values)
+            ):
+                continue
+            update_row = {k: v for k, v in row.items() if k not in key_columns}
+            update_row[pk_column.key] = pk
+            updates.append(update_row)
+        else:
+            inserts.append(row)
+
+    if inserts:
+        db.execute(insert(model), inserts)
+    if updates:
+        db.execute(update(model), updates)
+    return len(inserts), len(updates)
+
+
+def bulk_upsert(db: Session, model, rows: list, key_columns: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE,
+                skip_unchanged: bool = False) -> dict:
+    """
+    rows(dict 리스트)를 key_columns 기준으로 일괄 upsert (커밋은 호출하는 쪽에서 처리)
+
+    Args:
+        db: 데이터베이스 세션
+        model: SQLAlchemy 모델 클래스
+        rows: 저장할 데이터 dict 리스트 (모든 dict는 같은 키를 가져야 함)
+        key_columns: 자연키 컬럼명 (예: ('etf_id', 'date'))
+        batch_size: 한 문장으로 처리할 행 수
+        skip_unchanged: True면 기존 값과 모두 같은 행은 UPDATE하지 않음
+
+    Returns:
+        {'created': 생성 건수, 'updated': 업데이트 건수, 'unchanged': 변경 없어서 건너뛴 건수}
+    """
+    deduped = _dedupe_rows(rows, key_columns)
+    if not deduped:
+        return {'created': 0, 'updated': 0, 'unchanged': 0}
+
+    use_on_conflict = (
+        db.get_bind().dialect.name == 'postgresql'
+        and _has_unique_key(db, model, key_columns)
+    )
+
+    created_count = 0
+    updated_count = 0
+    items = list(deduped.items())
+    for start in range(0, len(items), batch_size):
+        batch = dict(items[start:start + batch_size])
+        if use_on_conflict:
+            created, updated = _upsert_batch_on_conflict(db, model, list(batch.values()), key_columns, skip_unchanged)
+        else:
+            created, updated = _upsert_batch_portable(db, model, batch, key_columns, skip_unchanged)
+        created_count += created
+        updated_count += updated
+
+    return {'created': created_count, 'updated': updated_count, 'unchanged': len(deduped) - created_count - updated_count}
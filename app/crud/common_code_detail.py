@@ -1,4 +1,7 @@
+from typing import Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from app.crud.keyset import paginate
 from app.models.common_code_detail import CommonCodeDetail
 from app.schemas.common_code_detail import CommonCodeDetailCreate, CommonCodeDetailUpdate
 
@@ -9,6 +12,13 @@ def get_common_code_details(db: Session, master_id: int = None, skip: int = 0, l
     # order_by를 offset/limit 전에 적용하고, order_no가 없을 경우를 대비해 id로도 정렬
     return query.order_by(CommonCodeDetail.order_no.asc(), CommonCodeDetail.id.asc()).offset(skip).limit(limit).all()
 
+def get_common_code_details_page(db: Session, master_id: int = None, limit: int = 100, cursor: Optional[str] = None):
+    """(order_no, id) 순 키셋 페이지 (상세 목록, 다음 페이지 커서)"""
+    stmt = select(CommonCodeDetail)
+    if master_id:
+        stmt = stmt.where(CommonCodeDetail.master_id == master_id)
+    return paginate(db, stmt, [CommonCodeDetail.order_no, CommonCodeDetail.id], cursor=cursor, limit=limit)
+
 def get_common_code_detail(db: Session, detail_id: int):
     return db.query(CommonCodeDetail).filter(CommonCodeDetail.id == detail_id).first()
 
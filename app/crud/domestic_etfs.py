@@ -1,7 +1,14 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import TYPE_CHECKING, Optional
+from app.crud.keyset import paginate_async
+from app.services.ticker_cache import ticker_cache
 from app.models.domestic_etfs import DomesticETFs
 from app.schemas.domestic_etfs import DomesticETFsCreate, DomesticETFsUpdate
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 def get_domestic_etf(db: Session, etf_id: int):
     return db.query(DomesticETFs).filter(DomesticETFs.id == etf_id).first()
 
@@ -14,10 +21,29 @@ def get_domestic_etfs(db: Session, skip: int = 0, limit: int = 100, etf_type: st
         query = query.filter(DomesticETFs.etf_type == etf_type)
     return query.offset(skip).limit(limit).all()
 
+async def get_domestic_etf_async(db: "AsyncSession", etf_id: int):
+    result = await db.execute(select(DomesticETFs).where(DomesticETFs.id == etf_id))
+    return result.scalars().first()
+
+async def get_domestic_etfs_async(db: "AsyncSession", skip: int = 0, limit: int = 100, etf_type: str = None):
+    stmt = select(DomesticETFs)
+    if etf_type:
+        stmt = stmt.where(DomesticETFs.etf_type == etf_type)
+    result = await db.execute(stmt.order_by(DomesticETFs.id).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def get_domestic_etfs_page_async(db: "AsyncSession", limit: int = 100, etf_type: str = None, cursor: Optional[str] = None):
+    """id 순 키셋 페이지 (ETF 목록, 다음 페이지 커서)"""
+    stmt = select(DomesticETFs)
+    if etf_type:
+        stmt = stmt.where(DomesticETFs.etf_type == etf_type)
+    return await paginate_async(db, stmt, [DomesticETFs.id], cursor=cursor, limit=limit)
+
 def create_domestic_etf(db: Session, etf: DomesticETFsCreate):
     db_etf = DomesticETFs(**etf.model_dump())
     db.add(db_etf)
     db.commit()
+    ticker_cache.invalidate()
     db.refresh(db_etf)
     return db_etf
 
@@ -28,6 +54,7 @@ def update_domestic_etf(db: Session, etf_id: int, etf: DomesticETFsUpdate):
         for field, value in update_data.items():
             setattr(db_etf, field, value)
         db.commit()
+        ticker_cache.invalidate()
         db.refresh(db_etf)
     return db_etf
 
@@ -36,6 +63,7 @@ def delete_domestic_etf(db: Session, etf_id: int):
     if db_etf:
         db.delete(db_etf)
         db.commit()
+        ticker_cache.invalidate()
     return db_etf
 
 def bulk_create_domestic_etfs(db: Session, etfs: list):
@@ -48,6 +76,7 @@ def bulk_create_domestic_etfs(db: Session, etfs: list):
             db.add(db_etf)
             created_count += 1
     db.commit()
+    ticker_cache.invalidate()
     return created_count
 
 
@@ -1,4 +1,7 @@
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
+from app.crud.bulk_upsert import bulk_upsert
+from app.services.chart_cache import domestic_chart_cache
 from app.models.domestic_etfs_daily_chart import DomesticETFsDailyChart
 from app.schemas.domestic_etfs_daily_chart import DomesticETFsDailyChartCreate, DomesticETFsDailyChartUpdate
 
@@ -16,6 +19,7 @@ def create_domestic_etf_daily_chart(db: Session, chart: DomesticETFsDailyChartCr
     db.add(db_chart)
     db.commit()
     db.refresh(db_chart)
+    domestic_chart_cache.invalidate([db_chart.etf_id])
     return db_chart
 
 def bulk_create_domestic_etf_daily_charts(db: Session, charts: list):
@@ -26,6 +30,7 @@ def bulk_create_domestic_etf_daily_charts(db: Session, charts: list):
         db.add(db_chart)
         created_count += 1
     db.commit()
+    domestic_chart_cache.invalidate({chart_data.get('etf_id') for chart_data in charts})
     return created_count
 
 def get_domestic_etf_daily_chart_by_etf_and_date(db: Session, etf_id: int, date):
@@ -41,6 +46,13 @@ def get_latest_domestic_etf_daily_chart(db: Session, etf_id: int):
         DomesticETFsDailyChart.etf_id == etf_id
     ).order_by(DomesticETFsDailyChart.date.desc()).first()
 
+def get_latest_domestic_etf_daily_chart_dates(db: Session, etf_ids: list = None) -> dict:
+    """ETF별 가장 최근 일봉 날짜 (etf_id -> date). GROUP BY 한 번으로 조회 (증분 수집 기준점)"""
+    stmt = select(DomesticETFsDailyChart.etf_id, func.max(DomesticETFsDailyChart.date)).group_by(DomesticETFsDailyChart.etf_id)
+    if etf_ids is not None:
+        stmt = stmt.where(DomesticETFsDailyChart.etf_id.in_(etf_ids))
+    return {etf_id: latest_date for etf_id, latest_date in db.execute(stmt)}
+
 def get_domestic_etf_daily_chart_by_date_range(db: Session, etf_id: int, start_date, end_date):
     """etf_id와 날짜 범위로 일봉 차트 데이터 조회"""
     return db.query(DomesticETFsDailyChart).filter(
@@ -49,50 +61,50 @@ def get_domestic_etf_daily_chart_by_date_range(db: Session, etf_id: int, start_d
         DomesticETFsDailyChart.date <= end_date
     ).order_by(DomesticETFsDailyChart.date.asc()).all()
 
-def bulk_upsert_domestic_etf_daily_charts(db: Session, charts: list):
-    """여러 일봉 차트 데이터를 한 번에 upsert (etf_id와 date가 같으면 업데이트, 없으면 생성)"""
-    created_count = 0
-    updated_count = 0
-    
-    for chart_data in charts:
-        etf_id = chart_data.get('etf_id')
-        date = chart_data.get('date')
-        
-        if not etf_id or not date:
-            continue
-        
-        # 기존 데이터 조회
-        existing = get_domestic_etf_daily_chart_by_etf_and_date(db, etf_id, date)
-        
-        if existing:
-            # 업데이트
-            update_data = {k: v for k, v in chart_data.items() if k not in ['etf_id', 'date']}
-            for field, value in update_data.items():
-                setattr(existing, field, value)
-            updated_count += 1
-        else:
-            # 생성
-            db_chart = DomesticETFsDailyChart(**chart_data)
-            db.add(db_chart)
-            created_count += 1
-    
+def domestic_etf_daily_charts_export_query(etf_id: int = None, start_date=None, end_date=None):
+    """내보내기(stream_ndjson)용 컬럼 조회문 (etf_id, 날짜 오름차순, 캐시를 거치지 않음)"""
+    stmt = select(
+        DomesticETFsDailyChart.id, DomesticETFsDailyChart.etf_id, DomesticETFsDailyChart.date,
+        DomesticETFsDailyChart.open, DomesticETFsDailyChart.high, DomesticETFsDailyChart.low, DomesticETFsDailyChart.close, DomesticETFsDailyChart.volume,
+    )
+    if etf_id is not None:
+        stmt = stmt.where(DomesticETFsDailyChart.etf_id == etf_id)
+    if start_date is not None:
+        stmt = stmt.where(DomesticETFsDailyChart.date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(DomesticETFsDailyChart.date <= end_date)
+    return stmt.order_by(DomesticETFsDailyChart.etf_id, DomesticETFsDailyChart.date)
+
+def bulk_upsert_domestic_etf_daily_charts(db: Session, charts: list, skip_unchanged: bool = False):
+    """
+    여러 일봉 차트 데이터를 한 번에 upsert (etf_id와 date가 같으면 업데이트, 없으면 생성)
+
+    skip_unchanged=True면 기존 값과 같은 행은 UPDATE하지 않음 (증분 수집의 겹치는 구간)
+    """
+    result = bulk_upsert(db, DomesticETFsDailyChart, charts, key_columns=('etf_id', 'date'), skip_unchanged=skip_unchanged)
     db.commit()
-    return {'created': created_count, 'updated': updated_count}
+    if result['created'] or result['updated']:
+        domestic_chart_cache.invalidate({chart_data.get('etf_id') for chart_data in charts})
+    return result
 
 def update_domestic_etf_daily_chart(db: Session, chart_id: int, chart: DomesticETFsDailyChartUpdate):
     db_chart = db.query(DomesticETFsDailyChart).filter(DomesticETFsDailyChart.id == chart_id).first()
     if db_chart:
+        previous_etf_id = db_chart.etf_id
         update_data = chart.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_chart, field, value)
         db.commit()
         db.refresh(db_chart)
+        domestic_chart_cache.invalidate([previous_etf_id, db_chart.etf_id])
     return db_chart
 
 def delete_domestic_etf_daily_chart(db: Session, chart_id: int):
     db_chart = db.query(DomesticETFsDailyChart).filter(DomesticETFsDailyChart.id == chart_id).first()
     if db_chart:
+        etf_id = db_chart.etf_id
         db.delete(db_chart)
         db.commit()
+        domestic_chart_cache.invalidate([etf_id])
     return db_chart
 
@@ -1,14 +1,45 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import TYPE_CHECKING, Optional
+from app.crud.keyset import paginate_async
 from app.models.domestic_etfs_dividend import DomesticETFsDividend
 from app.schemas.domestic_etfs_dividend import DomesticETFsDividendCreate, DomesticETFsDividendUpdate
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 def get_domestic_etf_dividend(db: Session, dividend_id: int):
     return db.query(DomesticETFsDividend).filter(DomesticETFsDividend.id == dividend_id).first()
 
 def get_domestic_etf_dividends_by_etf_id(db: Session, etf_id: int, skip: int = 0, limit: int = 100):
     return db.query(DomesticETFsDividend).filter(DomesticETFsDividend.etf_id == etf_id).offset(skip).limit(limit).all()
 
+async def get_domestic_etf_dividends_by_etf_id_async(db: "AsyncSession", etf_id: int, skip: int = 0, limit: int = 100):
+    result = await db.execute(
+        select(DomesticETFsDividend).where(DomesticETFsDividend.etf_id == etf_id).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+async def get_domestic_etf_dividends_page_async(db: "AsyncSession", etf_id: int, limit: int = 100, cursor: Optional[str] = None):
+    """기준일 내림차순 키셋 페이지 (배당 목록, 다음 페이지 커서)"""
+    stmt = select(DomesticETFsDividend).where(DomesticETFsDividend.etf_id == etf_id)
+    return await paginate_async(db, stmt, [DomesticETFsDividend.record_date, DomesticETFsDividend.id], cursor=cursor, limit=limit, descending=True)
+
+def domestic_etf_dividends_export_query(etf_id: int = None, start_date=None, end_date=None):
+    """내보내기(stream_ndjson)용 컬럼 조회문 (etf_id, 기준일 오름차순)"""
+    stmt = select(
+        DomesticETFsDividend.id, DomesticETFsDividend.etf_id, DomesticETFsDividend.record_date,
+        DomesticETFsDividend.payment_date, DomesticETFsDividend.dividend_amt, DomesticETFsDividend.taxable_amt,
+    )
+    if etf_id is not None:
+        stmt = stmt.where(DomesticETFsDividend.etf_id == etf_id)
+    if start_date is not None:
+        stmt = stmt.where(DomesticETFsDividend.record_date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(DomesticETFsDividend.record_date <= end_date)
+    return stmt.order_by(DomesticETFsDividend.etf_id, DomesticETFsDividend.record_date, DomesticETFsDividend.id)
+
 def get_domestic_etf_dividends(db: Session, skip: int = 0, limit: int = 100):
     return db.query(DomesticETFsDividend).offset(skip).limit(limit).all()
 
@@ -0,0 +1,98 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import desc, func, update
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+from app.models.import_job import ImportJob
+
+def get_import_job(db: Session, job_id: int) -> Optional[ImportJob]:
+    """ID로 가져오기 작업 조회"""
+    return db.query(ImportJob).filter(ImportJob.id == job_id).first()
+
+def get_import_jobs(
+    db: Session,
+    skip: int = 0,
+    limit: int = 50,
+    job_type: Optional[str] = None,
+    status: Optional[str] = None
+) -> List[ImportJob]:
+    """가져오기 작업 목록 조회 (최근 접수 순)"""
+    query = db.query(ImportJob)
+    if job_type:
+        query = query.filter(ImportJob.job_type == job_type)
+    if status:
+        query = query.filter(ImportJob.status == status)
+    return query.order_by(desc(ImportJob.id)).offset(skip).limit(limit).all()
+
+def get_queued_import_jobs(db: Session, limit: int = 100) -> List[ImportJob]:
+    """대기 중인 작업 (접수 순)"""
+    return db.query(ImportJob).filter(ImportJob.status == 'queued').order_by(ImportJob.id).limit(limit).all()
+
+def count_running_import_jobs(db: Session) -> Dict[str, int]:
+    """작업 유형별 실행 중인 작업 수 (다른 프로세스에서 실행 중인 작업 포함)"""
+    rows = db.query(ImportJob.job_type, func.count(ImportJob.id)).filter(ImportJob.status == 'running').group_by(ImportJob.job_type).all()
+    return {job_type: count for job_type, count in rows}
+
+def create_import_job(db: Session, job_type: str, params: dict) -> ImportJob:
+    """가져오기 작업 접수 (queued 상태)"""
+    db_job = ImportJob(job_type=job_type, params=params, status='queued', created_at=datetime.now())
+    db.add(db_job)
+    db.commit()
+    db.refresh(db_job)
+    return db_job
+
+def claim_import_job(db: Session, job_id: int, worker: str) -> bool:
+    """
+    대기 중인 작업을 running으로 변경 (조건부 UPDATE라서 여러 프로세스가 같은 작업을 동시에 가져가도 하나만 성공)
+    """
+    now = datetime.now()
+    result = db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.status == 'queued')
+        .values(status='running', worker=worker, started_at=now, heartbeat_at=now, error=None)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+def update_import_job_progress(db: Session, job_id: int, done: int, total: Optional[int], message: Optional[str] = None):
+    """진행 상황 기록 (생존 신호 갱신 포함)"""
+    db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id)
+        .values(progress_done=done, progress_total=total, message=message[:200] if message else None,
+                heartbeat_at=datetime.now())
+    )
+    db.commit()
+
+def touch_import_jobs(db: Session, job_ids: List[int]):
+    """실행 중인 작업들의 생존 신호 갱신"""
+    if not job_ids:
+        return
+    db.execute(
+        update(ImportJob)
+        .where(ImportJob.id.in_(job_ids), ImportJob.status == 'running')
+        .values(heartbeat_at=datetime.now())
+    )
+    db.commit()
+
+def finish_import_job(db: Session, job_id: int, status: str, result: Optional[dict] = None, error: Optional[str] = None):
+    """작업 종료 기록 (completed / failed)"""
+    db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id)
+        .values(status=status, result=result, error=error, finished_at=datetime.now(), heartbeat_at=None)
+    )
+    db.commit()
+
+def requeue_stale_import_jobs(db: Session, stale_seconds: float) -> int:
+    """
+    생존 신호가 stale_seconds 넘게 없는 running 작업을 다시 대기열로 (워커가 죽은 경우)
+
+    작업 스크립트는 체크포인트에서 이어서 실행하므로 다시 실행해도 완료된 항목은 건너뛴다.
+    """
+    result = db.execute(
+        update(ImportJob)
+        .where(ImportJob.status == 'running', ImportJob.heartbeat_at < datetime.now() - timedelta(seconds=stale_seconds))
+        .values(status='queued', worker=None, heartbeat_at=None)
+    )
+    db.commit()
+    return result.rowcount
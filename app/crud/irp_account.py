@@ -3,6 +3,7 @@ from sqlalchemy import select
 from app.models.irp_account import IRPAccount
 from app.models.financial_institution import FinancialInstitution
 from app.schemas.irp_account import IRPAccountCreate, IRPAccountUpdate
+from app.services.portfolio_valuation import portfolio_valuation_cache
 
 def get_irp_accounts(db: Session, skip: int = 0, limit: int = 100):
     # 금융기관과 LEFT JOIN하여 금융기관명 포함 (금융기관이 없어도 오류 없음)
@@ -58,6 +59,7 @@ def create_irp_account(db: Session, account: IRPAccountCreate):
     db_account = IRPAccount(**account.model_dump())
     db.add(db_account)
     db.commit()
+    portfolio_valuation_cache.invalidate()
     db.refresh(db_account)
     
     # 금융기관명 조회 (금융기관이 없어도 오류 없음)
@@ -103,6 +105,7 @@ def update_irp_account(db: Session, account_id: int, account: IRPAccountUpdate):
         db_account.financial_institution_name = None
     
     db.commit()
+    portfolio_valuation_cache.invalidate()
     db.refresh(db_account)
     return db_account
 
@@ -113,5 +116,6 @@ def delete_irp_account(db: Session, account_id: int):
     
     db.delete(db_account)
     db.commit()
+    portfolio_valuation_cache.invalidate()
     return db_account
 
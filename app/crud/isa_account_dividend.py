@@ -1,51 +1,42 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import join
+from sqlalchemy import select
 from app.models.isa_account_dividend import ISAAccountDividend
 from app.models.domestic_etfs import DomesticETFs
+from app.services.ticker_cache import ticker_cache
 from app.schemas.isa_account_dividend import ISAAccountDividendCreate, ISAAccountDividendUpdate
 
 def get_isa_account_dividends(db: Session, account_id: int, year_month: str = None, skip: int = 0, limit: int = 100):
-    query = db.query(
-        ISAAccountDividend,
-        DomesticETFs.name.label('etf_name')
-    ).join(
-        DomesticETFs,
-        ISAAccountDividend.stock_code == DomesticETFs.ticker,
-        isouter=False  # INNER JOIN
-    ).filter(
+    query = db.query(ISAAccountDividend).filter(
         ISAAccountDividend.account_id == account_id
     )
     
     if year_month:
         query = query.filter(ISAAccountDividend.year_month == year_month)
     
-    results = query.offset(skip).limit(limit).all()
-    
-    # 조인된 결과를 ISAAccountDividend 객체에 etf_name을 추가
-    dividends = []
-    for dividend, etf_name in results:
-        dividend.stock_name = etf_name
-        dividends.append(dividend)
-    
-    return dividends
+    # 종목명은 ETF 테이블 조인 대신 종목 정보 캐시에서 채움 (캐시에 없는 종목도 행은 유지)
+    return ticker_cache.attach_names(db, query.offset(skip).limit(limit).all())
 
 def get_isa_account_dividend(db: Session, dividend_id: int):
-    result = db.query(
-        ISAAccountDividend,
-        DomesticETFs.name.label('etf_name')
-    ).join(
-        DomesticETFs,
-        ISAAccountDividend.stock_code == DomesticETFs.ticker,
-        isouter=False  # INNER JOIN
-    ).filter(
-        ISAAccountDividend.id == dividend_id
-    ).first()
-    
-    if result:
-        dividend, etf_name = result
-        dividend.stock_name = etf_name
-        return dividend
-    return None
+    dividend = db.query(ISAAccountDividend).filter(ISAAccountDividend.id == dividend_id).first()
+    if dividend:
+        ticker_cache.attach_names(db, [dividend])
+    return dividend
+
+def isa_account_dividends_export_query(account_id: int, year_month: str = None):
+    """내보내기(ledger_export)용 조회문 (연월 순)"""
+    stmt = select(
+        ISAAccountDividend.year_month.label('연월'),
+        ISAAccountDividend.stock_code.label('종목코드'),
+        DomesticETFs.name.label('종목명'),
+        ISAAccountDividend.dividend_amount.label('배당금'),
+    ).outerjoin(
+        DomesticETFs, ISAAccountDividend.stock_code == DomesticETFs.ticker
+    ).where(
+        ISAAccountDividend.account_id == account_id
+    )
+    if year_month:
+        stmt = stmt.where(ISAAccountDividend.year_month == year_month)
+    return stmt.order_by(ISAAccountDividend.year_month, ISAAccountDividend.id)
 
 def create_isa_account_dividend(db: Session, dividend: ISAAccountDividendCreate):
     db_dividend = ISAAccountDividend(
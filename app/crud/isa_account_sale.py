@@ -1,52 +1,48 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import join
+from sqlalchemy import select
 from app.models.isa_account_sale import ISAAccountSale
 from app.models.domestic_etfs import DomesticETFs
+from app.services.ticker_cache import ticker_cache
 from app.schemas.isa_account_sale import ISAAccountSaleCreate, ISAAccountSaleUpdate
 from decimal import Decimal
 
 def get_isa_account_sales(db: Session, account_id: int, year_month: str = None, skip: int = 0, limit: int = 100):
-    query = db.query(
-        ISAAccountSale,
-        DomesticETFs.name.label('etf_name')
-    ).join(
-        DomesticETFs,
-        ISAAccountSale.stock_code == DomesticETFs.ticker,
-        isouter=False  # INNER JOIN
-    ).filter(
+    query = db.query(ISAAccountSale).filter(
         ISAAccountSale.account_id == account_id
     )
     
     if year_month:
         query = query.filter(ISAAccountSale.year_month == year_month)
     
-    results = query.offset(skip).limit(limit).all()
-    
-    # 조인된 결과를 ISAAccountSale 객체에 etf_name을 추가
-    sales = []
-    for sale, etf_name in results:
-        sale.stock_name = etf_name
-        sales.append(sale)
-    
-    return sales
+    # 종목명은 ETF 테이블 조인 대신 종목 정보 캐시에서 채움 (캐시에 없는 종목도 행은 유지)
+    return ticker_cache.attach_names(db, query.offset(skip).limit(limit).all())
 
 def get_isa_account_sale(db: Session, sale_id: int):
-    result = db.query(
-        ISAAccountSale,
-        DomesticETFs.name.label('etf_name')
-    ).join(
-        DomesticETFs,
-        ISAAccountSale.stock_code == DomesticETFs.ticker,
-        isouter=False  # INNER JOIN
-    ).filter(
-        ISAAccountSale.id == sale_id
-    ).first()
-    
-    if result:
-        sale, etf_name = result
-        sale.stock_name = etf_name
-        return sale
-    return None
+    sale = db.query(ISAAccountSale).filter(ISAAccountSale.id == sale_id).first()
+    if sale:
+        ticker_cache.attach_names(db, [sale])
+    return sale
+
+def isa_account_sales_export_query(account_id: int, year_month: str = None):
+    """내보내기(ledger_export)용 조회문 (연월 순)"""
+    stmt = select(
+        ISAAccountSale.year_month.label('연월'),
+        ISAAccountSale.stock_code.label('종목코드'),
+        DomesticETFs.name.label('종목명'),
+        ISAAccountSale.sale_quantity.label('매도수량'),
+        ISAAccountSale.purchase_price.label('매입단가'),
+        ISAAccountSale.sale_price.label('매도단가'),
+        ISAAccountSale.transaction_fee.label('거래비용'),
+        ISAAccountSale.profit_loss.label('손익금액'),
+        ISAAccountSale.return_rate.label('수익률'),
+    ).outerjoin(
+        DomesticETFs, ISAAccountSale.stock_code == DomesticETFs.ticker
+    ).where(
+        ISAAccountSale.account_id == account_id
+    )
+    if year_month:
+        stmt = stmt.where(ISAAccountSale.year_month == year_month)
+    return stmt.order_by(ISAAccountSale.year_month, ISAAccountSale.id)
 
 def create_isa_account_sale(db: Session, sale: ISAAccountSaleCreate):
     # 손익금액 계산: (매도단가 - 매입단가) * 매도수량 - 거래비용
@@ -0,0 +1,132 @@
+"""
+키셋(커서) 페이지네이션 / 서버 측 커서 스트리밍 공용 함수
+
+- OFFSET은 앞 페이지의 행을 모두 읽고 버리므로 뒤 페이지일수록 느려진다.
+  키셋은 마지막으로 받은 행의 정렬 키(예: (date, id)) 다음부터 인덱스로 바로 찾아가므로 페이지 위치와 관계없이 일정하다.
+- 커서는 정렬 키 값을 JSON -> URL-safe base64로 인코딩한 문자열 (응답 헤더 X-Next-Cursor로 전달, 마지막 페이지면 없음)
+- NDJSON 스트리밍: 서버 측 커서(yield_per)로 batch_size행씩 읽어서 한 줄에 한 행씩 전송 (전체 결과를 메모리에 올리지 않음)
+
+정렬 키의 마지막 컬럼은 유일해야 한다 (보통 id).
+"""
+import base64
+import binascii
+import json
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, Iterator, Optional, Sequence, Tuple
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+STREAM_BATCH_SIZE = 1000
+
+
+def encode_cursor(values: Sequence) -> str:
+    """정렬 키 값 -> 커서 문자열"""
+    data = json.dumps([value.isoformat() if isinstance(value, (date, datetime)) else value for value in values],
+                      default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _parse_value(column, value):
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is Decimal:
+        return Decimal(str(value))
+    return python_type(value)
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> tuple:
+    """커서 문자열 -> 정렬 키 값 (columns의 타입으로 변환, 형식이 맞지 않으면 ValueError)"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        return tuple(_parse_value(column, value) for column, value in zip(columns, values))
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        raise ValueError("잘못된 커서입니다")
+
+
+def keyset_statement(stmt, columns: Sequence, cursor: Optional[str] = None, limit: Optional[int] = None,
+                     descending: bool = False):
+    """
+    정렬 키 순서로 정렬하고 커서 다음 행부터 조회하도록 stmt에 조건 추가
+
+    limit을 지정하면 다음 페이지 존재 여부 확인을 위해 limit + 1행을 조회한다 (split_page로 잘라냄).
+    """
+    if cursor:
+        key, values = tuple_(*columns), tuple_(*decode_cursor(cursor, columns))
+        stmt = stmt.where(key < values if descending else key > values)
+    stmt = stmt.order_by(*(column.desc() if descending else column.asc() for column in columns))
+    if limit is not None:
+        stmt = stmt.limit(max(limit, 0) + 1)
+    return stmt
+
+
+def split_page(rows: list, columns: Sequence, limit: int) -> Tuple[list, Optional[str]]:
+    """limit + 1행 조회 결과 -> (limit행, 다음 페이지 커서 또는 None)"""
+    if limit <= 0:
+        return [], None
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, column.key) for column in columns])
+
+
+def paginate(db: Session, stmt, columns: Sequence, cursor: Optional[str] = None, limit: int = 100,
+             descending: bool = False) -> Tuple[list, Optional[str]]:
+    """ORM 엔티티 조회 stmt의 한 페이지 (엔티티 목록, 다음 페이지 커서)"""
+    rows = db.scalars(keyset_statement(stmt, columns, cursor, limit, descending)).all()
+    return split_page(list(rows), columns, limit)
+
+
+async def paginate_async(db, stmt, columns: Sequence, cursor: Optional[str] = None, limit: int = 100,
+                         descending: bool = False) -> Tuple[list, Optional[str]]:
+    """paginate의 비동기 버전 (AsyncSession / ThreadpoolSession)"""
+    result = await db.scalars(keyset_statement(stmt, columns, cursor, limit, descending))
+    return split_page(list(result.all()), columns, limit)
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)  # Decimal은 기존 응답과 같이 문자열
+
+
+@contextmanager
+def server_side_result(stmt, batch_size: int = STREAM_BATCH_SIZE):
+    """
+    stmt를 batch_size행씩 읽는 결과 (result.partitions()로 반복)
+
+    요청 세션과 별개의 세션을 열어서 블록이 끝날 때 닫는다 (StreamingResponse가 응답 중에 반복).
+    PostgreSQL에서는 yield_per가 서버 측 커서를 사용하므로 메모리 사용량이 batch_size행 수준으로 일정하다.
+    """
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        yield db.execute(stmt.execution_options(yield_per=batch_size))
+    finally:
+        db.close()
+
+
+def stream_ndjson(stmt, batch_size: int = STREAM_BATCH_SIZE, serialize: Callable = None) -> Iterator[bytes]:
+    """
+    컬럼 조회 stmt(select(Model.a, Model.b, ...))의 결과를 NDJSON 줄로 스트리밍
+
+    Args:
+        serialize: 행(dict) -> JSON 직렬화할 값 (기본값: 행 dict 그대로)
+    """
+    with server_side_result(stmt, batch_size) as result:
+        for partition in result.mappings().partitions():
+            lines = [
+                json.dumps(serialize(row) if serialize else dict(row), default=_json_default, ensure_ascii=False)
+                for row in partition
+            ]
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
@@ -1,7 +1,14 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import TYPE_CHECKING, Optional
+from app.crud.keyset import paginate_async
+from app.services.ticker_cache import ticker_cache
 from app.models.usa_etfs import USAETFs
 from app.schemas.usa_etfs import USAETFsCreate, USAETFsUpdate
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 def get_usa_etf(db: Session, etf_id: int):
     return db.query(USAETFs).filter(USAETFs.id == etf_id).first()
 
@@ -14,10 +21,29 @@ def get_usa_etfs(db: Session, skip: int = 0, limit: int = 100, etf_type: str = N
         query = query.filter(USAETFs.etf_type == etf_type)
     return query.offset(skip).limit(limit).all()
 
+async def get_usa_etf_async(db: "AsyncSession", etf_id: int):
+    result = await db.execute(select(USAETFs).where(USAETFs.id == etf_id))
+    return result.scalars().first()
+
+async def get_usa_etfs_async(db: "AsyncSession", skip: int = 0, limit: int = 100, etf_type: str = None):
+    stmt = select(USAETFs)
+    if etf_type:
+        stmt = stmt.where(USAETFs.etf_type == etf_type)
+    result = await db.execute(stmt.order_by(USAETFs.id).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def get_usa_etfs_page_async(db: "AsyncSession", limit: int = 100, etf_type: str = None, cursor: Optional[str] = None):
+    """id 순 키셋 페이지 (ETF 목록, 다음 페이지 커서)"""
+    stmt = select(USAETFs)
+    if etf_type:
+        stmt = stmt.where(USAETFs.etf_type == etf_type)
+    return await paginate_async(db, stmt, [USAETFs.id], cursor=cursor, limit=limit)
+
 def create_usa_etf(db: Session, etf: USAETFsCreate):
     db_etf = USAETFs(**etf.model_dump())
     db.add(db_etf)
     db.commit()
+    ticker_cache.invalidate()
     db.refresh(db_etf)
     return db_etf
 
@@ -28,6 +54,7 @@ def update_usa_etf(db: Session, etf_id: int, etf: USAETFsUpdate):
         for field, value in update_data.items():
             setattr(db_etf, field, value)
         db.commit()
+        ticker_cache.invalidate()
         db.refresh(db_etf)
     return db_etf
 
@@ -36,6 +63,7 @@ def delete_usa_etf(db: Session, etf_id: int):
     if db_etf:
         db.delete(db_etf)
         db.commit()
+        ticker_cache.invalidate()
     return db_etf
 
 def bulk_create_usa_etfs(db: Session, etfs: list):
@@ -48,5 +76,6 @@ def bulk_create_usa_etfs(db: Session, etfs: list):
             db.add(db_etf)
             created_count += 1
     db.commit()
+    ticker_cache.invalidate()
     return created_count
 
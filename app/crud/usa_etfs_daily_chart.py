@@ -1,4 +1,7 @@
+from sqlalchemy import Float, and_, cast, func, select
 from sqlalchemy.orm import Session
+from app.crud.bulk_upsert import bulk_upsert
+from app.services.chart_cache import usa_chart_cache
 from app.models.usa_etfs_daily_chart import USAETFsDailyChart
 from app.schemas.usa_etfs_daily_chart import USAETFsDailyChartCreate, USAETFsDailyChartUpdate
 
@@ -16,6 +19,7 @@ def create_usa_etf_daily_chart(db: Session, chart: USAETFsDailyChartCreate):
     db.add(db_chart)
     db.commit()
     db.refresh(db_chart)
+    usa_chart_cache.invalidate([db_chart.etf_id])
     return db_chart
 
 def bulk_create_usa_etf_daily_charts(db: Session, charts: list):
@@ -26,6 +30,7 @@ def bulk_create_usa_etf_daily_charts(db: Session, charts: list):
         db.add(db_chart)
         created_count += 1
     db.commit()
+    usa_chart_cache.invalidate({chart_data.get('etf_id') for chart_data in charts})
     return created_count
 
 def get_usa_etf_daily_chart_by_etf_and_date(db: Session, etf_id: int, date):
@@ -41,6 +46,32 @@ def get_latest_usa_etf_daily_chart(db: Session, etf_id: int):
         USAETFsDailyChart.etf_id == etf_id
     ).order_by(USAETFsDailyChart.date.desc()).first()
 
+def get_latest_usa_etf_daily_chart_dates(db: Session, etf_ids: list = None) -> dict:
+    """ETF별 가장 최근 일봉 날짜 (etf_id -> date). GROUP BY 한 번으로 조회 (증분 수집 기준점)"""
+    stmt = select(USAETFsDailyChart.etf_id, func.max(USAETFsDailyChart.date)).group_by(USAETFsDailyChart.etf_id)
+    if etf_ids is not None:
+        stmt = stmt.where(USAETFsDailyChart.etf_id.in_(etf_ids))
+    return {etf_id: latest_date for etf_id, latest_date in db.execute(stmt)}
+
+def get_latest_usa_etf_daily_bars(db: Session, etf_ids: list) -> dict:
+    """ETF별 가장 최근 일봉의 날짜와 종가 (etf_id -> (date, close)). 최근 날짜 서브쿼리와 조인해서 한 번에 조회"""
+    latest = select(
+        USAETFsDailyChart.etf_id, func.max(USAETFsDailyChart.date).label('date')
+    ).where(USAETFsDailyChart.etf_id.in_(etf_ids)).group_by(USAETFsDailyChart.etf_id).subquery()
+    stmt = select(USAETFsDailyChart.etf_id, USAETFsDailyChart.date, USAETFsDailyChart.close).join(
+        latest, and_(USAETFsDailyChart.etf_id == latest.c.etf_id, USAETFsDailyChart.date == latest.c.date)
+    )
+    return {etf_id: (latest_date, close) for etf_id, latest_date, close in db.execute(stmt)}
+
+def get_usa_etf_daily_closes(db: Session, etf_ids: list, start_date=None) -> list:
+    """ETF들의 (etf_id, date, 종가 float) 목록 (etf_id, date 오름차순, ORM 객체 / Decimal 변환 없이 컬럼 값만 조회)"""
+    stmt = select(USAETFsDailyChart.etf_id, USAETFsDailyChart.date, cast(USAETFsDailyChart.close, Float)).where(
+        USAETFsDailyChart.etf_id.in_(etf_ids)
+    )
+    if start_date is not None:
+        stmt = stmt.where(USAETFsDailyChart.date >= start_date)
+    return db.execute(stmt.order_by(USAETFsDailyChart.etf_id, USAETFsDailyChart.date)).all()
+
 def get_usa_etf_daily_chart_by_date_range(db: Session, etf_id: int, start_date, end_date):
     """etf_id와 날짜 범위로 일봉 차트 데이터 조회"""
     return db.query(USAETFsDailyChart).filter(
@@ -49,50 +80,50 @@ def get_usa_etf_daily_chart_by_date_range(db: Session, etf_id: int, start_date,
         USAETFsDailyChart.date <= end_date
     ).order_by(USAETFsDailyChart.date.asc()).all()
 
-def bulk_upsert_usa_etf_daily_charts(db: Session, charts: list):
-    """여러 일봉 차트 데이터를 한 번에 upsert (etf_id와 date가 같으면 업데이트, 없으면 생성)"""
-    created_count = 0
-    updated_count = 0
-    
-    for chart_data in charts:
-        etf_id = chart_data.get('etf_id')
-        date = chart_data.get('date')
-        
-        if not etf_id or not date:
-            continue
-        
-        # 기존 데이터 조회
-        existing = get_usa_etf_daily_chart_by_etf_and_date(db, etf_id, date)
-        
-        if existing:
-            # 업데이트
-            update_data = {k: v for k, v in chart_data.items() if k not in ['etf_id', 'date']}
-            for field, value in update_data.items():
-                setattr(existing, field, value)
-            updated_count += 1
-        else:
-            # 생성
-            db_chart = USAETFsDailyChart(**chart_data)
-            db.add(db_chart)
-            created_count += 1
-    
+def usa_etf_daily_charts_export_query(etf_id: int = None, start_date=None, end_date=None):
+    """내보내기(stream_ndjson)용 컬럼 조회문 (etf_id, 날짜 오름차순, 캐시를 거치지 않음)"""
+    stmt = select(
+        USAETFsDailyChart.id, USAETFsDailyChart.etf_id, USAETFsDailyChart.date,
+        USAETFsDailyChart.open, USAETFsDailyChart.high, USAETFsDailyChart.low, USAETFsDailyChart.close, USAETFsDailyChart.volume,
+    )
+    if etf_id is not None:
+        stmt = stmt.where(USAETFsDailyChart.etf_id == etf_id)
+    if start_date is not None:
+        stmt = stmt.where(USAETFsDailyChart.date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(USAETFsDailyChart.date <= end_date)
+    return stmt.order_by(USAETFsDailyChart.etf_id, USAETFsDailyChart.date)
+
+def bulk_upsert_usa_etf_daily_charts(db: Session, charts: list, skip_unchanged: bool = False):
+    """
+    여러 일봉 차트 데이터를 한 번에 upsert (etf_id와 date가 같으면 업데이트, 없으면 생성)
+
+    skip_unchanged=True면 기존 값과 같은 행은 UPDATE하지 않음 (증분 수집의 겹치는 구간)
+    """
+    result = bulk_upsert(db, USAETFsDailyChart, charts, key_columns=('etf_id', 'date'), skip_unchanged=skip_unchanged)
     db.commit()
-    return {'created': created_count, 'updated': updated_count}
+    if result['created'] or result['updated']:
+        usa_chart_cache.invalidate({chart_data.get('etf_id') for chart_data in charts})
+    return result
 
 def update_usa_etf_daily_chart(db: Session, chart_id: int, chart: USAETFsDailyChartUpdate):
     db_chart = db.query(USAETFsDailyChart).filter(USAETFsDailyChart.id == chart_id).first()
     if db_chart:
+        previous_etf_id = db_chart.etf_id
         update_data = chart.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_chart, field, value)
         db.commit()
         db.refresh(db_chart)
+        usa_chart_cache.invalidate([previous_etf_id, db_chart.etf_id])
     return db_chart
 
 def delete_usa_etf_daily_chart(db: Session, chart_id: int):
     db_chart = db.query(USAETFsDailyChart).filter(USAETFsDailyChart.id == chart_id).first()
     if db_chart:
+        etf_id = db_chart.etf_id
         db.delete(db_chart)
         db.commit()
+        usa_chart_cache.invalidate([etf_id])
     return db_chart
 
@@ -1,13 +1,41 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import TYPE_CHECKING, Optional
+from app.crud.keyset import paginate_async
 from app.models.usa_etfs_dividend import USAETFsDividend
 from app.schemas.usa_etfs_dividend import USAETFsDividendCreate, USAETFsDividendUpdate
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 def get_usa_etf_dividend(db: Session, dividend_id: int):
     return db.query(USAETFsDividend).filter(USAETFsDividend.id == dividend_id).first()
 
 def get_usa_etf_dividends_by_etf_id(db: Session, etf_id: int, skip: int = 0, limit: int = 100):
     return db.query(USAETFsDividend).filter(USAETFsDividend.etf_id == etf_id).order_by(USAETFsDividend.record_date.desc()).offset(skip).limit(limit).all()
 
+async def get_usa_etf_dividends_by_etf_id_async(db: "AsyncSession", etf_id: int, skip: int = 0, limit: int = 100):
+    result = await db.execute(
+        select(USAETFsDividend).where(USAETFsDividend.etf_id == etf_id).order_by(USAETFsDividend.record_date.desc(), USAETFsDividend.id.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+async def get_usa_etf_dividends_page_async(db: "AsyncSession", etf_id: int, limit: int = 100, cursor: Optional[str] = None):
+    """기준일 내림차순 키셋 페이지 (배당 목록, 다음 페이지 커서)"""
+    stmt = select(USAETFsDividend).where(USAETFsDividend.etf_id == etf_id)
+    return await paginate_async(db, stmt, [USAETFsDividend.record_date, USAETFsDividend.id], cursor=cursor, limit=limit, descending=True)
+
+def usa_etf_dividends_export_query(etf_id: int = None, start_date=None, end_date=None):
+    """내보내기(stream_ndjson)용 컬럼 조회문 (etf_id, 기준일 오름차순)"""
+    stmt = select(USAETFsDividend.id, USAETFsDividend.etf_id, USAETFsDividend.record_date, USAETFsDividend.dividend_amt)
+    if etf_id is not None:
+        stmt = stmt.where(USAETFsDividend.etf_id == etf_id)
+    if start_date is not None:
+        stmt = stmt.where(USAETFsDividend.record_date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(USAETFsDividend.record_date <= end_date)
+    return stmt.order_by(USAETFsDividend.etf_id, USAETFsDividend.record_date, USAETFsDividend.id)
+
 def get_usa_etf_dividends(db: Session, skip: int = 0, limit: int = 100):
     return db.query(USAETFsDividend).offset(skip).limit(limit).all()
 
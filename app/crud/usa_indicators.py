@@ -1,3 +1,4 @@
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from app.models.usa_indicators import USAIndicators
 from app.schemas.usa_indicators import USAIndicatorsCreate, USAIndicatorsUpdate
@@ -32,3 +33,11 @@ def delete_usa_indicator(db: Session, indicator_id: int):
         db.commit()
     return db_indicator
 
+
+def bulk_update_usa_indicator_values(db: Session, values: list) -> int:
+    """계산된 지표 값 일괄 업데이트 (values: [{'id': ..., 컬럼: 값}, ...], 기본키 기준 executemany 한 번)"""
+    if not values:
+        return 0
+    db.execute(update(USAIndicators), values)
+    db.commit()
+    return len(values)
@@ -1,10 +1,15 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
-from typing import List, Optional
+from sqlalchemy import and_, desc, func, select
+from typing import TYPE_CHECKING, List, Optional
 from datetime import date
 from app.models.usd_krw_exchange import USDKRWExchange
 from app.schemas.usd_krw_exchange import USDKRWExchangeCreate, USDKRWExchangeUpdate
 from decimal import Decimal
+from app.services.exchange_rate_cache import usd_krw_cache
+from app.crud.bulk_upsert import bulk_upsert
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 def get_usd_krw_exchange(db: Session, exchange_id: int) -> Optional[USDKRWExchange]:
     """ID로 환율 조회"""
@@ -14,6 +19,11 @@ def get_usd_krw_exchange_by_date(db: Session, exchange_date: date) -> Optional[U
     """날짜로 환율 조회"""
     return db.query(USDKRWExchange).filter(USDKRWExchange.date == exchange_date).first()
 
+async def get_usd_krw_exchange_by_date_async(db: "AsyncSession", exchange_date: date) -> Optional[USDKRWExchange]:
+    """날짜로 환율 조회 (비동기)"""
+    result = await db.execute(select(USDKRWExchange).where(USDKRWExchange.date == exchange_date))
+    return result.scalars().first()
+
 def get_usd_krw_exchanges(
     db: Session, 
     skip: int = 0, 
@@ -40,6 +50,7 @@ def create_usd_krw_exchange(db: Session, exchange: USDKRWExchangeCreate) -> USDK
     db.add(db_exchange)
     db.commit()
     db.refresh(db_exchange)
+    usd_krw_cache.invalidate()
     return db_exchange
 
 def update_usd_krw_exchange(
@@ -58,6 +69,7 @@ def update_usd_krw_exchange(
     
     db.commit()
     db.refresh(db_exchange)
+    usd_krw_cache.invalidate()
     return db_exchange
 
 def delete_usd_krw_exchange(db: Session, exchange_id: int) -> bool:
@@ -68,8 +80,13 @@ def delete_usd_krw_exchange(db: Session, exchange_id: int) -> bool:
     
     db.delete(db_exchange)
     db.commit()
+    usd_krw_cache.invalidate()
     return True
 
+def get_latest_usd_krw_exchange_date(db: Session) -> Optional[date]:
+    """가장 최근 환율 날짜 (증분 스크래핑 기준점)"""
+    return db.execute(select(func.max(USDKRWExchange.date))).scalar()
+
 def bulk_upsert_usd_krw_exchanges(
     db: Session, 
     exchanges: List[USDKRWExchangeCreate]
@@ -77,28 +94,14 @@ def bulk_upsert_usd_krw_exchanges(
     """
     환율 일괄 upsert (날짜 기준으로 존재하면 업데이트, 없으면 생성)
     
+    기존 값과 같은 날짜는 UPDATE하지 않음 (집합 기반 bulk_upsert 사용)
+    
     Returns:
         생성/업데이트된 레코드 수
     """
-    created_count = 0
-    updated_count = 0
-    
-    for exchange_data in exchanges:
-        existing = get_usd_krw_exchange_by_date(db, exchange_data.date)
-        
-        if existing:
-            # 업데이트
-            existing.exchange_rate = exchange_data.exchange_rate
-            updated_count += 1
-        else:
-            # 생성
-            db_exchange = USDKRWExchange(
-                date=exchange_data.date,
-                exchange_rate=exchange_data.exchange_rate
-            )
-            db.add(db_exchange)
-            created_count += 1
-    
+    rows = [{'date': exchange.date, 'exchange_rate': exchange.exchange_rate} for exchange in exchanges]
+    result = bulk_upsert(db, USDKRWExchange, rows, key_columns=('date',), skip_unchanged=True)
     db.commit()
-    return created_count + updated_count
-
+    if result['created'] or result['updated']:
+        usd_krw_cache.invalidate()
+    return result['created'] + result['updated']
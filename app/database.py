@@ -1,11 +1,37 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from pydantic_settings import BaseSettings
+from app.services import cold_start
+import logging
+import time
 
 class Settings(BaseSettings):
     database_url: str = ""
-    
+    async_database_url: str = ""  # 비어있으면 database_url에서 유도 (postgresql -> asyncpg, sqlite -> aiosqlite)
+    async_db_enabled: bool = True  # False이거나 async 드라이버가 없으면 동기 세션을 스레드풀에서 사용
+    serverless_mode: bool = False  # 서버리스(Vercel 등): 시작 시 테이블 생성 생략, 커넥션 풀 미사용, 엔진 지연 생성
+    db_pool_size: int = 5  # 커넥션 풀 크기
+    db_max_overflow: int = 10  # 풀 크기를 초과해서 추가로 열 수 있는 커넥션 수
+    db_pool_pre_ping: bool = True  # 커넥션 사용 전 살아있는지 확인
+    db_pool_recycle: int = 1800  # 커넥션 재생성 주기 (초)
+    chart_cache_ttl_seconds: int = 300  # 일봉 차트 캐시 유효시간 (다른 프로세스의 쓰기 반영 주기)
+    exchange_rate_cache_ttl_seconds: int = 300  # 환율 캐시 유효시간
+    portfolio_valuation_cache_ttl_seconds: int = 300  # 계좌 평가 캐시 유효시간
+    dividend_projection_cache_ttl_seconds: int = 300  # 배당 추정 결과 캐시 유효시간
+    ticker_cache_ttl_seconds: int = 300  # 종목코드 -> 종목 정보 캐시 유효시간
+    simulation_workers: int = 0  # 시뮬레이션 프로세스 수 (0이면 CPU 수, 최대 4)
+    simulation_cache_ttl_seconds: int = 3600  # 시뮬레이션 결과 캐시 유효시간
+    scrape_cache_dir: str = ".cache/scrapes"  # 스크래퍼 응답 디스크 캐시 디렉터리
+    scrape_cache_max_mb: int = 200  # 스크래퍼 캐시 최대 크기 (초과 시 오래 사용하지 않은 항목부터 삭제)
+    scrape_cache_ttl_seconds: int = 3600  # 스크래퍼 캐시를 재검증 없이 사용하는 시간
+    batch_checkpoint_dir: str = ".cache/batch_jobs"  # 배치 작업 체크포인트 디렉터리
+    batch_checkpoint_max_age_hours: float = 24  # 이보다 오래된 체크포인트는 이어받지 않음
+    import_job_workers: int = 2  # API 작업 큐에서 동시에 실행할 가져오기 / 스크래핑 작업 수 (유형별 제한과 별도)
+    import_job_stale_seconds: int = 600  # 생존 신호가 이 시간 넘게 없는 실행 중 작업은 다시 대기열로
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -18,8 +44,70 @@ if not settings.database_url:
         "Please create a .env file with DATABASE_URL=postgresql://..."
     )
 
-engine = create_engine(settings.database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def engine_options(url: str) -> dict:
+    """URL과 실행 모드에 맞는 커넥션 풀 옵션"""
+    parsed = make_url(url)
+    if settings.serverless_mode:
+        # 함수 인스턴스가 언제 멈출지 모르므로 커넥션을 보관하지 않고 외부 풀러(PgBouncer, Neon pooler 등)에 맡김
+        options = {"poolclass": NullPool}
+        if parsed.get_driver_name() == "asyncpg":
+            # 트랜잭션 모드 풀러에서는 커넥션별 prepared statement 캐시를 사용할 수 없음
+            options["connect_args"] = {"statement_cache_size": 0}
+        return options
+
+    # SQLite는 풀 크기/재생성 옵션을 사용하지 않음
+    options = {"pool_pre_ping": settings.db_pool_pre_ping}
+    if parsed.get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    return options
+
+def _record_first_connect(engine, phase_name: str):
+    """엔진의 첫 DB 연결 소요시간을 콜드 스타트 단계로 기록"""
+    state = {}
+
+    @event.listens_for(engine, "do_connect")
+    def _before_connect(dialect, conn_rec, cargs, cparams):
+        state.setdefault("started", time.perf_counter())
+
+    @event.listens_for(engine, "connect")
+    def _after_connect(dbapi_connection, connection_record):
+        if "started" in state and not state.get("done"):
+            state["done"] = True
+            cold_start.record(phase_name, time.perf_counter() - state["started"])
+
+_engine = None
+
+def get_engine():
+    """동기 엔진 반환 (서버리스 모드에서는 첫 요청 시 생성)"""
+    global _engine
+    if _engine is None:
+        with cold_start.phase("create_engine"):
+            _engine = create_engine(settings.database_url, **engine_options(settings.database_url))
+        _record_first_connect(_engine, "first_connect")
+    return _engine
+
+class LazySessionmaker(sessionmaker):
+    """바인딩된 엔진이 없으면 세션 생성 시점에 엔진을 만들어 바인딩하는 sessionmaker"""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+SessionLocal = LazySessionmaker(autocommit=False, autoflush=False)
+
+if not settings.serverless_mode:
+    SessionLocal.configure(bind=get_engine())
+
+def __getattr__(name):
+    # `from app.database import engine` 호환: 처음 접근할 때 엔진 생성
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 Base = declarative_base()
 
@@ -30,3 +118,85 @@ def get_db():
     finally:
         db.close()
 
+
+# 비동기 DB (읽기 위주 라우터용)
+
+def to_async_url(url: str) -> str:
+    """동기 DB URL을 async 드라이버 URL로 변환"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        # asyncpg는 libpq 전용 파라미터(sslmode 등)를 모르므로 ssl로 변환
+        query = dict(parsed.query)
+        sslmode = query.pop("sslmode", None)
+        query.pop("channel_binding", None)
+        if sslmode:
+            query["ssl"] = sslmode
+        parsed = parsed.set(drivername="postgresql+asyncpg", query=query)
+    elif backend == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+_async_engine = None
+AsyncSessionLocal = None
+
+def get_async_engine():
+    """async 엔진을 최초 사용 시 생성 (비활성화되었거나 드라이버가 없으면 None)"""
+    global _async_engine, AsyncSessionLocal
+    if _async_engine is None and settings.async_db_enabled:
+        try:
+            import greenlet  # noqa: F401  (없으면 async 세션이 실행 시점에 실패하므로 미리 확인)
+            from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+            url = settings.async_database_url or to_async_url(settings.database_url)
+            with cold_start.phase("create_async_engine"):
+                _async_engine = create_async_engine(url, **engine_options(url))
+            _record_first_connect(_async_engine.sync_engine, "first_async_connect")
+            AsyncSessionLocal = async_sessionmaker(bind=_async_engine, autoflush=False, expire_on_commit=False)
+        except ImportError as e:
+            logging.warning(f"async DB 드라이버를 찾을 수 없어 동기 세션을 스레드풀에서 사용합니다: {e}")
+            settings.async_db_enabled = False
+    return _async_engine
+
+class ThreadpoolSession:
+    """
+    async 드라이버가 없을 때 사용하는 AsyncSession 호환 래퍼
+    동기 세션의 쿼리를 스레드풀에서 실행한다 (execute / scalar / scalars / get만 지원)
+    """
+
+    def __init__(self, session):
+        self._session = session
+
+    async def _run(self, func, *args, **kwargs):
+        from starlette.concurrency import run_in_threadpool
+        return await run_in_threadpool(func, *args, **kwargs)
+
+    async def execute(self, statement, *args, **kwargs):
+        return await self._run(self._session.execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await self._run(self._session.scalar, statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        return await self._run(self._session.scalars, statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await self._run(self._session.get, entity, ident, **kwargs)
+
+try:
+    from sqlalchemy.ext.asyncio import AsyncSession
+except ImportError:
+    # greenlet 미설치 환경에서는 get_async_db가 ThreadpoolSession을 주입함 (라우터 타입 힌트용)
+    AsyncSession = ThreadpoolSession
+
+async def get_async_db():
+    """읽기 위주 라우터용 비동기 세션 의존성"""
+    get_async_engine()
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield session
+    else:
+        db = SessionLocal()
+        try:
+            yield ThreadpoolSession(db)
+        finally:
+            db.close()
@@ -0,0 +1,68 @@
+"""
+저장된 미국 ETF 일봉으로 usa_indicators의 주봉 지표(MACD 오실레이터, RSI, 20주 이동평균, 이격도)를 계산해서 저장하는 스크립트
+"""
+import os
+import sys
+import argparse
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+# 프로젝트 루트를 Python 경로에 추가
+# 현재 파일: backend-fastapi/app/import/compute_usa_indicators.py
+# app 모듈을 import하려면 backend-fastapi/ 디렉토리가 경로에 있어야 함
+current_dir = os.path.dirname(os.path.abspath(__file__))  # backend-fastapi/app/import
+app_dir = os.path.dirname(current_dir)  # backend-fastapi/app
+backend_dir = os.path.dirname(app_dir)  # backend-fastapi
+
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.services.indicators import DEFAULT_LOOKBACK_WEEKS, update_usa_indicators
+
+def compute_usa_indicators(incremental: bool = True, lookback_weeks: int = DEFAULT_LOOKBACK_WEEKS, ticker: str = None):
+    """
+    usa_indicators 지표 계산 후 일괄 업데이트
+    
+    Args:
+        incremental: True면 지난 계산 이후 새 일봉이 있거나 최신 일봉 종가가 바뀐 티커만 최근 lookback_weeks주 일봉으로 계산
+        lookback_weeks: 증분 모드에서 읽는 주 수
+        ticker: 특정 티커만 처리 (기본값: None이면 모든 지표)
+    """
+    db: Session = SessionLocal()
+    try:
+        stats = update_usa_indicators(db, incremental=incremental, lookback_weeks=lookback_weeks,
+                                      tickers=[ticker] if ticker else None)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    
+    print(f"\n{'='*60}")
+    print("[결과 요약]")
+    print(f"{'='*60}")
+    print(f"지표 {stats.indicators}개 / 일봉이 있는 티커 {stats.tickers}개")
+    print(f"계산: {stats.computed}개 (새 일봉 없음 {stats.unchanged}개 건너뜀)")
+    if stats.missing_chart:
+        print(f"일봉 없음 (기존 값 유지): {', '.join(stats.missing_chart)}")
+    print(f"일봉 {stats.daily_rows}행 -> 주봉 {stats.weeks}주, 업데이트 {stats.updated}행")
+    print(f"소요 시간: {stats.elapsed_seconds:.2f}초")
+    print(f"{'='*60}\n")
+    return stats
+
+if __name__ == "__main__":
+    # 예: python compute_usa_indicators.py                 # 새 일봉이 있는 티커만 (일봉 가져오기 후 실행)
+    # 예: python compute_usa_indicators.py --full          # 모든 티커를 전체 기간으로 다시 계산
+    # 예: python compute_usa_indicators.py --ticker QQQ    # 특정 티커만
+    parser = argparse.ArgumentParser(description="미국 지표 주봉 MACD 오실레이터 / RSI / 이동평균 계산")
+    parser.add_argument("--full", action="store_true", help="모든 티커를 전체 기간 일봉으로 다시 계산")
+    parser.add_argument("--lookback-weeks", type=int, default=DEFAULT_LOOKBACK_WEEKS,
+                        help=f"증분 모드에서 읽는 주 수 (기본값: {DEFAULT_LOOKBACK_WEEKS})")
+    parser.add_argument("--ticker", "-t", help="특정 티커만 처리")
+    args = parser.parse_args()
+    
+    compute_usa_indicators(incremental=not args.full, lookback_weeks=args.lookback_weeks, ticker=args.ticker)
@@ -3,6 +3,7 @@ FinanceDataReader를 사용하여 국내 ETF 일봉 차트 데이터를 가져
 """
 import os
 import sys
+import argparse
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
@@ -22,9 +23,11 @@ if backend_dir not in sys.path:
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.crud import domestic_etfs, domestic_etfs_daily_chart
+from app.services.batch_jobs import run_batch_job
+from app.services.daily_chart_pipeline import INCREMENTAL_OVERLAP_DAYS, incremental_start
 import pandas as pd
 
-def import_single_etf_chart(db: Session, etf, weeks: int, fdr):
+def import_single_etf_chart(db: Session, etf, weeks: int, fdr, start=None):
     """
     단일 ETF의 차트 데이터를 가져와서 저장하는 내부 함수
     
@@ -33,13 +36,20 @@ def import_single_etf_chart(db: Session, etf, weeks: int, fdr):
         etf: ETF 모델 객체
         weeks: 가져올 주 수
         fdr: FinanceDataReader 모듈
+        start: 증분 수집 시작일 (지정하면 weeks 대신 start부터 조회하고 변경 없는 행은 건너뜀)
+    
+    Returns:
+        upsert 결과 {'created', 'updated', 'unchanged'} (저장할 데이터가 없으면 None). 조회 / 저장 실패 시 예외
     """
     ticker = etf.ticker
-    print(f"\n[INFO] {ticker} ({etf.name}) 티커의 {weeks}주 일봉 데이터를 가져옵니다...")
+    if start is not None:
+        print(f"\n[INFO] {ticker} ({etf.name}) 티커의 {start} 이후 일봉 데이터를 가져옵니다...")
+    else:
+        print(f"\n[INFO] {ticker} ({etf.name}) 티커의 {weeks}주 일봉 데이터를 가져옵니다...")
     
-    # 날짜 계산 (현재로부터 weeks주 전)
+    # 날짜 계산 (현재로부터 weeks주 전, 증분 모드면 start부터)
     end_date = datetime.now().date()
-    start_date = end_date - timedelta(weeks=weeks)
+    start_date = start if start is not None else end_date - timedelta(weeks=weeks)
     
     print(f"[INFO] 기간: {start_date} ~ {end_date}")
     
@@ -53,7 +63,7 @@ def import_single_etf_chart(db: Session, etf, weeks: int, fdr):
         
         if df is None or df.empty:
             print(f"[WARN] {ticker} 티커의 데이터를 가져올 수 없습니다.")
-            return
+            return None
         
         print(f"[OK] {len(df)}개의 일봉 데이터를 가져왔습니다.")
         
@@ -121,18 +131,24 @@ def import_single_etf_chart(db: Session, etf, weeks: int, fdr):
         # 일괄 upsert
         if charts_to_save:
             print(f"[INFO] {len(charts_to_save)}개의 일봉 데이터를 데이터베이스에 저장합니다...")
-            result = domestic_etfs_daily_chart.bulk_upsert_domestic_etf_daily_charts(db, charts_to_save)
-            print(f"[OK] {result['created']}개의 새로운 데이터를 생성하고 {result['updated']}개의 데이터를 업데이트했습니다.")
-        else:
-            print("[WARN] 저장할 데이터가 없습니다.")
+            result = domestic_etfs_daily_chart.bulk_upsert_domestic_etf_daily_charts(
+                db, charts_to_save, skip_unchanged=start is not None
+            )
+            print(f"[OK] {result['created']}개의 새로운 데이터를 생성하고 {result['updated']}개의 데이터를 업데이트했습니다. "
+                  f"(변경 없음 {result['unchanged']}개)")
+            return result
+        print("[WARN] 저장할 데이터가 없습니다.")
+        return None
             
     except Exception as e:
         print(f"[ERROR] {ticker} 티커 처리 중 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
+        db.rollback()
+        raise
 
 
-def import_domestic_etf_daily_chart(etf_type: str = "high_dividend", weeks: int = 52, ticker: str = None):
+def import_domestic_etf_daily_chart(etf_type: str = "high_dividend", weeks: int = 52, ticker: str = None,
+                                    incremental: bool = False, workers: int = 1, retries: int = 2,
+                                    resume: bool = True):
     """
     FinanceDataReader를 사용하여 국내 ETF 일봉 차트 데이터를 가져와서 저장
     
@@ -140,6 +156,11 @@ def import_domestic_etf_daily_chart(etf_type: str = "high_dividend", weeks: int
         etf_type: ETF 유형 (기본값: "high_dividend"). None이면 ticker 파라미터 사용
         weeks: 가져올 주 수 (기본값: 52주)
         ticker: 특정 티커만 처리하고 싶을 때 사용 (기본값: None)
+        incremental: True면 ETF별 마지막 저장일(INCREMENTAL_OVERLAP_DAYS일 겹침) 이후만 조회
+                     (저장된 데이터가 없는 ETF는 weeks 전체)
+        workers: 동시에 처리할 ETF 수 (ETF마다 별도 DB 세션 사용)
+        retries: ETF별 실패 시 재시도 횟수 (지수 백오프)
+        resume: True면 중단된 이전 실행의 체크포인트에서 이어서 처리 (완료된 ETF는 건너뜀)
     """
     try:
         import FinanceDataReader as fdr
@@ -169,32 +190,52 @@ def import_domestic_etf_daily_chart(etf_type: str = "high_dividend", weeks: int
                 
                 print(f"[OK] 총 {len(etf_list)}개의 ETF를 찾았습니다.")
             
-            # 각 ETF에 대해 차트 데이터 가져오기
-            total_created = 0
-            total_updated = 0
-            success_count = 0
-            fail_count = 0
+            # 증분 모드: ETF별 마지막 저장일을 GROUP BY 한 번으로 조회
+            start_dates = {}
+            if incremental:
+                latest_dates = domestic_etfs_daily_chart.get_latest_domestic_etf_daily_chart_dates(
+                    db, [etf.id for etf in etf_list]
+                )
+                start_dates = {etf_id: incremental_start(latest_date) for etf_id, latest_date in latest_dates.items()}
+                print(f"[INFO] 증분 모드: {len(start_dates)}/{len(etf_list)}개 ETF는 마지막 저장일 "
+                      f"{INCREMENTAL_OVERLAP_DAYS}일 전부터 조회합니다.")
             
-            for idx, etf in enumerate(etf_list, 1):
+            # 각 ETF에 대해 차트 데이터 가져오기 (ETF별 완료 여부를 체크포인트에 기록)
+            progress = {'count': 0}
+            
+            def job(etf):
                 print(f"\n{'='*60}")
-                print(f"[{idx}/{len(etf_list)}] 처리 중: {etf.ticker} - {etf.name}")
+                print(f"처리 중: {etf.ticker} - {etf.name}")
                 print(f"{'='*60}")
-                
+                etf_db: Session = SessionLocal()
                 try:
-                    import_single_etf_chart(db, etf, weeks, fdr)
-                    success_count += 1
-                except Exception as e:
-                    print(f"[ERROR] {etf.ticker} 처리 실패: {e}")
-                    fail_count += 1
-                    continue
+                    return import_single_etf_chart(etf_db, etf, weeks, fdr, start=start_dates.get(etf.id))
+                finally:
+                    etf_db.close()
+            
+            def on_done(etf, result, error):
+                progress['count'] += 1
+                if error is not None:
+                    print(f"[ERROR] [{progress['count']}] {etf.ticker} 처리 실패: {error}")
+            
+            report = run_batch_job(
+                "import_domestic_etf_daily_chart",
+                etf_list,
+                job,
+                key=lambda etf: etf.ticker,
+                run_key=f"{etf_type}:{ticker}:{weeks}:{incremental}",
+                workers=workers,
+                max_retries=retries,
+                resume=resume,
+                on_done=on_done,
+            )
             
             # 결과 요약
             print(f"\n{'='*60}")
             print("[결과 요약]")
             print(f"{'='*60}")
-            print(f"총 처리 대상: {len(etf_list)}개")
-            print(f"성공: {success_count}개")
-            print(f"실패: {fail_count}개")
+            for line in report.summary_lines():
+                print(line)
             print(f"{'='*60}\n")
             
         except Exception as e:
@@ -207,6 +248,7 @@ def import_domestic_etf_daily_chart(etf_type: str = "high_dividend", weeks: int
             db.close()
         
         print("\n[OK] 모든 작업이 완료되었습니다!")
+        return report
         
     except ImportError:
         print("[ERROR] FinanceDataReader가 설치되지 않았습니다.")
@@ -219,47 +261,39 @@ def import_domestic_etf_daily_chart(etf_type: str = "high_dividend", weeks: int
         sys.exit(1)
 
 if __name__ == "__main__":
-    # 명령줄 인자 처리
     # 예: python import_domestic_etf_daily_chart.py                    # high_dividend 모든 종목, 52주
     # 예: python import_domestic_etf_daily_chart.py high_dividend 52   # high_dividend 모든 종목, 52주
     # 예: python import_domestic_etf_daily_chart.py --ticker 494300    # 특정 티커만, 52주
     # 예: python import_domestic_etf_daily_chart.py --ticker 494300 26 # 특정 티커만, 26주
+    # 예: python import_domestic_etf_daily_chart.py --incremental      # 마지막 저장일 이후만 (야간 배치)
+    # 예: python import_domestic_etf_daily_chart.py --workers 4        # 4개 ETF 동시 처리
+    # 예: python import_domestic_etf_daily_chart.py --restart          # 중단된 이전 실행을 이어받지 않고 처음부터
+    parser = argparse.ArgumentParser(description="국내 ETF 일봉 차트 데이터 가져오기")
+    parser.add_argument("etf_type_or_weeks", nargs="?", help="ETF 유형 (기본값: high_dividend) 또는 주 수")
+    parser.add_argument("weeks", nargs="?", type=int, help="가져올 주 수 (기본값: 52)")
+    parser.add_argument("--ticker", "-t", help="특정 티커만 처리")
+    parser.add_argument("--incremental", action="store_true", help="ETF별 마지막 저장일 이후만 조회 (변경 없는 행은 건너뜀)")
+    parser.add_argument("--workers", type=int, default=1, help="동시에 처리할 ETF 수 (기본값: 1)")
+    parser.add_argument("--retries", type=int, default=2, help="ETF별 실패 시 재시도 횟수 (기본값: 2)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 실행")
+    args = parser.parse_args()
     
     etf_type = "high_dividend"
     weeks = 52
-    ticker = None
-    
-    # 간단한 인자 파싱
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--ticker" or sys.argv[1] == "-t":
-            # 티커 모드
-            if len(sys.argv) > 2:
-                ticker = sys.argv[2]
-                if len(sys.argv) > 3:
-                    weeks = int(sys.argv[3])
-            else:
-                print("[ERROR] --ticker 옵션 사용 시 티커를 지정해주세요.")
-                sys.exit(1)
-        else:
-            # 첫 번째 인자는 etf_type 또는 weeks
-            try:
-                # 숫자면 weeks로 간주
-                weeks = int(sys.argv[1])
-            except ValueError:
-                # 문자열이면 etf_type으로 간주
-                etf_type = sys.argv[1]
-            
-            # 두 번째 인자는 weeks
-            if len(sys.argv) > 2:
-                try:
-                    weeks = int(sys.argv[2])
-                except ValueError:
-                    pass
+    # 첫 번째 인자는 etf_type 또는 weeks (숫자면 weeks로 간주)
+    if args.etf_type_or_weeks is not None:
+        try:
+            weeks = int(args.etf_type_or_weeks)
+        except ValueError:
+            etf_type = args.etf_type_or_weeks
+    if args.weeks is not None:
+        weeks = args.weeks
     
-    if ticker:
-        print(f"[INFO] 특정 티커 모드: {ticker}, {weeks}주")
-        import_domestic_etf_daily_chart(etf_type=None, weeks=weeks, ticker=ticker)
+    options = dict(weeks=weeks, incremental=args.incremental, workers=args.workers, retries=args.retries,
+                   resume=not args.restart)
+    if args.ticker:
+        print(f"[INFO] 특정 티커 모드: {args.ticker}, {weeks}주" + (" (증분)" if args.incremental else ""))
+        import_domestic_etf_daily_chart(etf_type=None, ticker=args.ticker, **options)
     else:
-        print(f"[INFO] etf_type='{etf_type}'인 모든 종목 처리, {weeks}주")
-        import_domestic_etf_daily_chart(etf_type=etf_type, weeks=weeks)
-
+        print(f"[INFO] etf_type='{etf_type}'인 모든 종목 처리, {weeks}주" + (" (증분)" if args.incremental else ""))
+        import_domestic_etf_daily_chart(etf_type=etf_type, **options)
@@ -3,7 +3,7 @@ yfinance를 사용하여 미국 ETF 일봉 차트 데이터를 가져와서 데
 """
 import os
 import sys
-from datetime import datetime, timedelta
+import argparse
 from dotenv import load_dotenv
 
 # 환경 변수 로드
@@ -22,10 +22,15 @@ if backend_dir not in sys.path:
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.crud import usa_etfs, usa_etfs_daily_chart
-import pandas as pd
-from decimal import Decimal
+from app.services.batch_jobs import (
+    STATUS_DONE, STATUS_FAILED, BatchJobReport, open_checkpoint, report_progress, run_batch_job,
+)
+from app.services.daily_chart_pipeline import (
+    INCREMENTAL_OVERLAP_DAYS, FakeChartSource, PipelineStats, YFinanceSource, frame_to_rows, incremental_start,
+    run_chart_pipeline,
+)
 
-def import_single_etf_chart(db: Session, etf, period: str = '2y', interval: str = '1d'):
+def import_single_etf_chart(db: Session, etf, period: str = '2y', interval: str = '1d', start=None):
     """
     단일 ETF의 차트 데이터를 가져와서 저장하는 내부 함수
     
@@ -34,9 +39,16 @@ def import_single_etf_chart(db: Session, etf, period: str = '2y', interval: str
         etf: ETF 모델 객체
         period: 가져올 기간 (기본값: '2y' - 2년)
         interval: 데이터 간격 (기본값: '1d' - 일봉)
+        start: 증분 수집 시작일 (지정하면 period 대신 start부터 조회하고 변경 없는 행은 건너뜀)
+    
+    Returns:
+        upsert 결과 {'created', 'updated', 'unchanged'} (저장할 데이터가 없으면 None). 조회 / 저장 실패 시 예외
     """
     ticker = etf.ticker
-    print(f"\n[INFO] {ticker} ({etf.name}) 티커의 {period} 일봉 데이터를 가져옵니다...")
+    if start is not None:
+        print(f"\n[INFO] {ticker} ({etf.name}) 티커의 {start} 이후 일봉 데이터를 가져옵니다...")
+    else:
+        print(f"\n[INFO] {ticker} ({etf.name}) 티커의 {period} 일봉 데이터를 가져옵니다...")
     
     try:
         import yfinance as yf
@@ -45,66 +57,33 @@ def import_single_etf_chart(db: Session, etf, period: str = '2y', interval: str
         print(f"[INFO] 데이터 조회 중: {ticker}")
         
         t = yf.Ticker(ticker)
-        df = t.history(period=period, interval=interval)
+        if start is not None:
+            df = t.history(start=start, interval=interval)
+        else:
+            df = t.history(period=period, interval=interval)
         
         if df is None or df.empty:
             print(f"[WARN] {ticker} 티커의 데이터를 가져올 수 없습니다.")
-            return
+            return None
         
         print(f"[OK] {len(df)}개의 일봉 데이터를 가져왔습니다.")
         
-        # DataFrame을 데이터베이스 형식으로 변환
-        charts_to_save = []
-        
-        for date_idx, row in df.iterrows():
-            # date_idx가 DatetimeIndex인 경우
-            if isinstance(date_idx, pd.Timestamp):
-                date = date_idx.date()
-            elif isinstance(date_idx, datetime):
-                date = date_idx.date()
-            else:
-                try:
-                    date = pd.to_datetime(date_idx).date()
-                except:
-                    print(f"[WARN] 날짜 변환 실패: {date_idx}")
-                    continue
-            
-            # yfinance는 Open, High, Low, Close, Volume 컬럼을 반환
-            try:
-                open_price = Decimal(str(row.get('Open', 0))) if pd.notna(row.get('Open')) else None
-                high_price = Decimal(str(row.get('High', 0))) if pd.notna(row.get('High')) else None
-                low_price = Decimal(str(row.get('Low', 0))) if pd.notna(row.get('Low')) else None
-                close_price = Decimal(str(row.get('Close', 0))) if pd.notna(row.get('Close')) else None
-                volume = int(row.get('Volume', 0)) if pd.notna(row.get('Volume')) else None
-            except Exception as e:
-                print(f"[WARN] {date} 데이터 파싱 실패: {e}")
-                continue
-            
-            # 필수 필드 확인
-            if not all([open_price is not None, high_price is not None, 
-                       low_price is not None, close_price is not None, volume is not None]):
-                print(f"[WARN] {date} 데이터에 필수 필드가 없습니다. 스킵합니다.")
-                continue
-            
-            chart_data = {
-                'etf_id': etf.id,
-                'date': date,
-                'open': open_price,
-                'high': high_price,
-                'low': low_price,
-                'close': close_price,
-                'volume': volume
-            }
-            
-            charts_to_save.append(chart_data)
+        # DataFrame을 데이터베이스 형식으로 변환 (컬럼 단위 벡터 연산, 결측 행 제외)
+        charts_to_save = frame_to_rows(df, etf.id)
+        if len(charts_to_save) < len(df):
+            print(f"[WARN] 필수 필드가 없는 {len(df) - len(charts_to_save)}개의 데이터를 스킵합니다.")
         
         # 일괄 upsert
         if charts_to_save:
             print(f"[INFO] {len(charts_to_save)}개의 일봉 데이터를 데이터베이스에 저장합니다...")
-            result = usa_etfs_daily_chart.bulk_upsert_usa_etf_daily_charts(db, charts_to_save)
-            print(f"[OK] {result['created']}개의 새로운 데이터를 생성하고 {result['updated']}개의 데이터를 업데이트했습니다.")
-        else:
-            print("[WARN] 저장할 데이터가 없습니다.")
+            result = usa_etfs_daily_chart.bulk_upsert_usa_etf_daily_charts(
+                db, charts_to_save, skip_unchanged=start is not None
+            )
+            print(f"[OK] {result['created']}개의 새로운 데이터를 생성하고 {result['updated']}개의 데이터를 업데이트했습니다. "
+                  f"(변경 없음 {result['unchanged']}개)")
+            return result
+        print("[WARN] 저장할 데이터가 없습니다.")
+        return None
             
     except ImportError:
         print("[ERROR] yfinance가 설치되지 않았습니다.")
@@ -112,18 +91,56 @@ def import_single_etf_chart(db: Session, etf, period: str = '2y', interval: str
         raise
     except Exception as e:
         print(f"[ERROR] {ticker} 티커 처리 중 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
+        db.rollback()
+        raise
+
+
+def latest_chart_starts(db: Session, etf_list: list, overlap_days: int = INCREMENTAL_OVERLAP_DAYS) -> dict:
+    """증분 수집용 ETF별 조회 시작일 (etf_id -> 마지막 저장일 - overlap_days, 저장된 데이터가 없으면 제외)"""
+    latest_dates = usa_etfs_daily_chart.get_latest_usa_etf_daily_chart_dates(db, [etf.id for etf in etf_list])
+    print(f"[INFO] 증분 모드: {len(latest_dates)}/{len(etf_list)}개 ETF는 마지막 저장일 {overlap_days}일 전부터 조회합니다.")
+    return {etf_id: incremental_start(latest_date, overlap_days) for etf_id, latest_date in latest_dates.items()}
 
 
-def import_usa_etf_daily_chart(period: str = '2y', ticker: str = None):
+def select_usa_etfs(db: Session, ticker: str = None) -> list:
+    """처리할 ETF 목록 (ticker가 있으면 해당 ETF만, 없으면 등록된 모든 ETF). 등록되지 않은 ticker는 ValueError"""
+    if ticker:
+        etf = usa_etfs.get_usa_etf_by_ticker(db, ticker)
+        if not etf:
+            raise ValueError(f"티커 {ticker}에 해당하는 ETF를 찾을 수 없습니다.")
+        return [etf]
+    return usa_etfs.get_usa_etfs(db, skip=0, limit=1000)
+
+
+def import_usa_etf_daily_chart(period: str = '2y', ticker: str = None, incremental: bool = False,
+                               overlap_days: int = INCREMENTAL_OVERLAP_DAYS, retries: int = 2, resume: bool = True):
     """
     yfinance를 사용하여 미국 ETF 일봉 차트 데이터를 가져와서 저장
     
     Args:
         period: 가져올 기간 (기본값: '2y' - 2년). yfinance period 옵션 사용 (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
         ticker: 특정 티커만 처리하고 싶을 때 사용 (기본값: None이면 모든 ETF 처리)
+        incremental: True면 ETF별 마지막 저장일 이후만 조회 (저장된 데이터가 없는 ETF는 period 전체)
+        overlap_days: 증분 모드에서 마지막 저장일 이전으로 다시 가져오는 일수
+        retries: ETF별 실패 시 재시도 횟수 (지수 백오프)
+        resume: True면 중단된 이전 실행의 체크포인트에서 이어서 처리 (완료된 ETF는 건너뜀)
+
+    Returns:
+        BatchJobReport: 실행 결과 (등록된 ETF가 없으면 빈 리포트)
+
+    Raises:
+        ValueError: ticker에 해당하는 ETF가 없을 때 (파이프라인 모드와 같음)
     """
+    # 처리 대상 ETF 확인 (등록되지 않은 티커의 ValueError는 아래 sys.exit 처리를 거치지 않고 그대로 전달)
+    print(f"[INFO] 특정 티커 {ticker}만 처리합니다." if ticker else "[INFO] 모든 미국 ETF를 조회합니다...")
+    with SessionLocal() as db:
+        etf_list = select_usa_etfs(db, ticker)
+    if not etf_list:
+        print("[WARN] 등록된 ETF를 찾을 수 없습니다.")
+        return BatchJobReport("import_usa_etf_daily_chart")
+    if not ticker:
+        print(f"[OK] 총 {len(etf_list)}개의 ETF를 찾았습니다.")
+
     try:
         import yfinance as yf
         
@@ -131,51 +148,36 @@ def import_usa_etf_daily_chart(period: str = '2y', ticker: str = None):
         db: Session = SessionLocal()
         
         try:
-            etf_list = []
-            
-            # 특정 티커가 지정된 경우
-            if ticker:
-                print(f"[INFO] 특정 티커 {ticker}만 처리합니다.")
-                etf = usa_etfs.get_usa_etf_by_ticker(db, ticker)
-                if not etf:
-                    print(f"[ERROR] 티커 {ticker}에 해당하는 ETF를 찾을 수 없습니다.")
-                    return
-                etf_list = [etf]
-            else:
-                # 모든 ETF 조회
-                print(f"[INFO] 모든 미국 ETF를 조회합니다...")
-                etf_list = usa_etfs.get_usa_etfs(db, skip=0, limit=1000)
-                
-                if not etf_list:
-                    print(f"[WARN] 등록된 ETF를 찾을 수 없습니다.")
-                    return
-                
-                print(f"[OK] 총 {len(etf_list)}개의 ETF를 찾았습니다.")
-            
-            # 각 ETF에 대해 차트 데이터 가져오기
-            success_count = 0
-            fail_count = 0
+            start_dates = latest_chart_starts(db, etf_list, overlap_days) if incremental else {}
             
-            for idx, etf in enumerate(etf_list, 1):
+            # 각 ETF에 대해 차트 데이터 가져오기 (ETF별 완료 여부를 체크포인트에 기록)
+            def job(etf):
                 print(f"\n{'='*60}")
-                print(f"[{idx}/{len(etf_list)}] 처리 중: {etf.ticker} - {etf.name}")
+                print(f"처리 중: {etf.ticker} - {etf.name}")
                 print(f"{'='*60}")
-                
-                try:
-                    import_single_etf_chart(db, etf, period=period)
-                    success_count += 1
-                except Exception as e:
-                    print(f"[ERROR] {etf.ticker} 처리 실패: {e}")
-                    fail_count += 1
-                    continue
+                return import_single_etf_chart(db, etf, period=period, start=start_dates.get(etf.id))
+            
+            def on_done(etf, result, error):
+                if error is not None:
+                    print(f"[ERROR] {etf.ticker} 처리 실패: {error}")
+            
+            report = run_batch_job(
+                "import_usa_etf_daily_chart",
+                etf_list,
+                job,
+                key=lambda etf: etf.ticker,
+                run_key=f"{ticker}:{period}:{incremental}",
+                max_retries=retries,
+                resume=resume,
+                on_done=on_done,
+            )
             
             # 결과 요약
             print(f"\n{'='*60}")
             print("[결과 요약]")
             print(f"{'='*60}")
-            print(f"총 처리 대상: {len(etf_list)}개")
-            print(f"성공: {success_count}개")
-            print(f"실패: {fail_count}개")
+            for line in report.summary_lines():
+                print(line)
             print(f"{'='*60}\n")
             
         except Exception as e:
@@ -188,6 +190,7 @@ def import_usa_etf_daily_chart(period: str = '2y', ticker: str = None):
             db.close()
         
         print("\n[OK] 모든 작업이 완료되었습니다!")
+        return report
         
     except ImportError:
         print("[ERROR] yfinance가 설치되지 않았습니다.")
@@ -199,35 +202,150 @@ def import_usa_etf_daily_chart(period: str = '2y', ticker: str = None):
         traceback.print_exc()
         sys.exit(1)
 
+def import_usa_etf_daily_chart_pipeline(period: str = '2y', ticker: str = None, workers: int = 8,
+                                        rate: float = 5.0, batch_rows: int = 5000, fake: bool = False,
+                                        incremental: bool = False, overlap_days: int = INCREMENTAL_OVERLAP_DAYS,
+                                        retries: int = 2, resume: bool = True):
+    """
+    파이프라인 모드: 여러 ETF를 동시에 조회하고 배치 단위로 일괄 upsert
+    
+    Args:
+        period: 가져올 기간 (기본값: '2y' - 2년)
+        ticker: 특정 티커만 처리하고 싶을 때 사용 (기본값: None이면 모든 ETF 처리)
+        workers: 동시 조회 스레드 수
+        rate: 초당 최대 조회 요청 수 (yfinance 요청 제한 회피)
+        batch_rows: 이 행 수 이상 모이면 DB에 저장
+        fake: True면 yfinance 대신 가짜 데이터 소스 사용 (네트워크 없이 테스트)
+        incremental: True면 ETF별 마지막 저장일 이후만 조회하고 변경 없는 행은 건너뜀
+        overlap_days: 증분 모드에서 마지막 저장일 이전으로 다시 가져오는 일수
+        retries: ETF별 조회 실패 시 재시도 횟수 (지수 백오프)
+        resume: True면 중단된 이전 실행의 체크포인트에서 이어서 처리
+                (배치로 저장까지 끝난 ETF만 완료로 기록되므로 저장 전에 죽어도 누락되지 않음)
+
+    Returns:
+        PipelineStats: 실행 통계 (등록된 ETF가 없으면 빈 통계)
+
+    Raises:
+        ValueError: ticker에 해당하는 ETF가 없을 때
+    """
+    try:
+        source = FakeChartSource() if fake else YFinanceSource()
+    except ImportError:
+        print("[ERROR] yfinance가 설치되지 않았습니다.")
+        print("[INFO] 'pip install yfinance' 명령으로 설치해주세요.")
+        sys.exit(1)
+    
+    db: Session = SessionLocal()
+    try:
+        etf_list = select_usa_etfs(db, ticker)
+        if not etf_list:
+            print("[WARN] 등록된 ETF를 찾을 수 없습니다.")
+            return PipelineStats()
+        
+        checkpoint = open_checkpoint(
+            "import_usa_etf_daily_chart_pipeline", run_key=f"{ticker}:{period}:{incremental}:{fake}", resume=resume,
+        )
+        done_tickers = checkpoint.done_keys()
+        if done_tickers:
+            etf_list = [etf for etf in etf_list if etf.ticker not in done_tickers]
+            print(f"[INFO] 체크포인트에서 이어서 실행합니다: 완료 {len(done_tickers)}개 건너뜀, 남은 ETF {len(etf_list)}개")
+        
+        print(f"[INFO] {len(etf_list)}개의 ETF를 파이프라인 모드로 처리합니다. (워커 {workers}개, 초당 {rate}건)")
+        start_dates = latest_chart_starts(db, etf_list, overlap_days) if incremental else {}
+        tickers_by_id = {etf.id: etf.ticker for etf in etf_list}
+        progress = {'done': len(done_tickers), 'total': len(done_tickers) + len(etf_list)}
+        report_progress(progress['done'], progress['total'])
+        
+        def on_ticker_done(done_ticker: str, rows: int, error: str):
+            progress['done'] += 1
+            report_progress(progress['done'], progress['total'], done_ticker)
+            if error:
+                print(f"[ERROR] {done_ticker} 처리 실패: {error}")
+                checkpoint.record(done_ticker, STATUS_FAILED, error=error)
+            elif rows:
+                print(f"[OK] {done_ticker}: {rows}개의 일봉 데이터")
+            else:
+                print(f"[WARN] {done_ticker} 티커의 데이터를 가져올 수 없습니다.")
+                checkpoint.record(done_ticker, STATUS_DONE)
+        
+        def writer(rows: list) -> dict:
+            # 배치 저장이 커밋된 뒤에 배치에 포함된 ETF를 완료로 기록 (ETF 하나의 행은 항상 같은 배치에 들어감)
+            result = usa_etfs_daily_chart.bulk_upsert_usa_etf_daily_charts(db, rows, skip_unchanged=incremental)
+            for etf_id in {row['etf_id'] for row in rows}:
+                checkpoint.record(tickers_by_id[etf_id], STATUS_DONE)
+            return result
+        
+        stats = run_chart_pipeline(
+            [(etf.id, etf.ticker) for etf in etf_list],
+            source,
+            writer,
+            start_dates=start_dates,
+            period=period,
+            workers=workers,
+            rate_per_second=rate,
+            batch_rows=batch_rows,
+            max_retries=retries,
+            on_ticker_done=on_ticker_done,
+        )
+        
+        # 결과 요약
+        print(f"\n{'='*60}")
+        print("[결과 요약]")
+        print(f"{'='*60}")
+        print(f"총 처리 대상: {stats.tickers}개")
+        print(f"성공: {stats.succeeded}개 / 데이터 없음: {stats.empty}개 / 실패: {len(stats.failed)}개")
+        print(f"저장: {stats.rows}행 (생성 {stats.created}, 업데이트 {stats.updated}, 변경 없음 {stats.unchanged}, 배치 {stats.batches}회)")
+        print(f"소요 시간: {stats.elapsed_seconds:.2f}초 (조회+변환 합계 {stats.fetch_seconds:.2f}초, 저장 {stats.write_seconds:.2f}초)")
+        if stats.failed:
+            print(f"체크포인트: {checkpoint.path} (다시 실행하면 실패한 ETF만 처리)")
+        else:
+            checkpoint.finish()
+        print(f"{'='*60}\n")
+        return stats
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 if __name__ == "__main__":
-    # 명령줄 인자 처리
     # 예: python import_usa_etf_daily_chart.py                    # 모든 종목, 2년
     # 예: python import_usa_etf_daily_chart.py 1y                 # 모든 종목, 1년
     # 예: python import_usa_etf_daily_chart.py --ticker QYLD      # 특정 티커만, 2년
     # 예: python import_usa_etf_daily_chart.py --ticker QYLD 1y   # 특정 티커만, 1년
+    # 예: python import_usa_etf_daily_chart.py --pipeline --workers 8 --rate 5   # 동시 조회 + 배치 저장
+    # 예: python import_usa_etf_daily_chart.py --pipeline --fake                 # 가짜 데이터 소스 (네트워크 없이)
+    # 예: python import_usa_etf_daily_chart.py --incremental --pipeline          # 마지막 저장일 이후만 (야간 배치)
+    # 예: python import_usa_etf_daily_chart.py --restart                         # 중단된 이전 실행을 이어받지 않고 처음부터
+    parser = argparse.ArgumentParser(description="미국 ETF 일봉 차트 데이터 가져오기")
+    parser.add_argument("period", nargs="?", default="2y", help="yfinance period (기본값: 2y)")
+    parser.add_argument("--ticker", "-t", help="특정 티커만 처리")
+    parser.add_argument("--pipeline", action="store_true", help="동시 조회 + 배치 저장 파이프라인 모드")
+    parser.add_argument("--workers", type=int, default=8, help="파이프라인 동시 조회 스레드 수 (기본값: 8)")
+    parser.add_argument("--rate", type=float, default=5.0, help="파이프라인 초당 최대 조회 요청 수 (기본값: 5)")
+    parser.add_argument("--batch-rows", type=int, default=5000, help="파이프라인 배치 저장 행 수 (기본값: 5000)")
+    parser.add_argument("--fake", action="store_true", help="파이프라인에서 가짜 데이터 소스 사용")
+    parser.add_argument("--incremental", action="store_true", help="ETF별 마지막 저장일 이후만 조회 (변경 없는 행은 건너뜀)")
+    parser.add_argument("--overlap-days", type=int, default=INCREMENTAL_OVERLAP_DAYS,
+                        help=f"증분 모드에서 마지막 저장일 이전으로 다시 가져오는 일수 (기본값: {INCREMENTAL_OVERLAP_DAYS})")
+    parser.add_argument("--retries", type=int, default=2, help="ETF별 실패 시 재시도 횟수 (기본값: 2)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 실행")
+    args = parser.parse_args()
     
-    period = "2y"
-    ticker = None
-    
-    # 간단한 인자 파싱
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--ticker" or sys.argv[1] == "-t":
-            # 티커 모드
-            if len(sys.argv) > 2:
-                ticker = sys.argv[2]
-                if len(sys.argv) > 3:
-                    period = sys.argv[3]
-            else:
-                print("[ERROR] --ticker 옵션 사용 시 티커를 지정해주세요.")
-                sys.exit(1)
-        else:
-            # 첫 번째 인자는 period
-            period = sys.argv[1]
+    if args.ticker:
+        print(f"[INFO] 특정 티커 모드: {args.ticker}, 기간: {args.period}")
+    else:
+        print(f"[INFO] 모든 종목 처리, 기간: {args.period}")
     
-    if ticker:
-        print(f"[INFO] 특정 티커 모드: {ticker}, 기간: {period}")
-        import_usa_etf_daily_chart(period=period, ticker=ticker)
+    if args.pipeline or args.fake:
+        import_usa_etf_daily_chart_pipeline(
+            period=args.period, ticker=args.ticker, workers=args.workers,
+            rate=args.rate, batch_rows=args.batch_rows, fake=args.fake,
+            incremental=args.incremental, overlap_days=args.overlap_days, retries=args.retries, resume=not args.restart,
+        )
     else:
-        print(f"[INFO] 모든 종목 처리, 기간: {period}")
-        import_usa_etf_daily_chart(period=period)
-
+        import_usa_etf_daily_chart(
+            period=args.period, ticker=args.ticker, incremental=args.incremental, overlap_days=args.overlap_days,
+            retries=args.retries, resume=not args.restart,
+        )
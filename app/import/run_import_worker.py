@@ -0,0 +1,77 @@
+"""
+API로 접수된 가져오기 작업(import_job 테이블)을 실행하는 워커
+
+서버리스 배포(SERVERLESS_MODE)에서는 API가 작업을 접수만 하므로 이 워커를 별도 서버 / 크론에서 실행한다.
+일반 배포에서는 API 프로세스가 직접 실행하므로 필요 없다 (함께 실행해도 같은 작업을 두 번 실행하지 않음).
+"""
+import os
+import sys
+import time
+import argparse
+import logging
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+# 프로젝트 루트를 Python 경로에 추가
+# 현재 파일: backend-fastapi/app/import/run_import_worker.py
+# app 모듈을 import하려면 backend-fastapi/ 디렉토리가 경로에 있어야 함
+current_dir = os.path.dirname(os.path.abspath(__file__))  # backend-fastapi/app/import
+app_dir = os.path.dirname(current_dir)  # backend-fastapi/app
+backend_dir = os.path.dirname(app_dir)  # backend-fastapi
+
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from app.crud import import_job as crud_import_job
+from app.database import SessionLocal
+from app.services.import_jobs import ImportJobQueue
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def has_queued_jobs() -> bool:
+    db = SessionLocal()
+    try:
+        return bool(crud_import_job.get_queued_import_jobs(db, limit=1))
+    finally:
+        db.close()
+
+
+def run_import_worker(workers: int = None, poll_seconds: float = 5.0, once: bool = False):
+    """
+    대기 중인 작업을 poll_seconds마다 확인해서 실행
+
+    Args:
+        workers: 동시에 실행할 작업 수 (None이면 설정의 import_job_workers)
+        poll_seconds: 대기열 확인 주기 (초)
+        once: True면 대기 중인 작업이 모두 끝나면 종료 (크론 실행용)
+    """
+    queue = ImportJobQueue(max_workers=workers)
+    logger.info(f"가져오기 작업 워커 시작: {queue.worker_id} (동시 실행 {queue.max_workers}개)")
+    while True:
+        started = queue.dispatch()
+        if started:
+            logger.info(f"작업 {started}개를 시작했습니다.")
+        if once and not queue.running_count() and not has_queued_jobs():
+            logger.info("대기 중인 작업이 없습니다. 워커를 종료합니다.")
+            return
+        time.sleep(poll_seconds)
+
+
+if __name__ == "__main__":
+    # 예: python run_import_worker.py                # 계속 실행하면서 대기열 확인
+    # 예: python run_import_worker.py --once         # 대기 중인 작업을 모두 처리하고 종료 (크론)
+    # 예: python run_import_worker.py --workers 1    # 한 번에 하나씩만 실행
+    parser = argparse.ArgumentParser(description="API로 접수된 가져오기 작업 실행 워커")
+    parser.add_argument("--workers", type=int, default=None, help="동시에 실행할 작업 수 (기본값: 설정의 import_job_workers)")
+    parser.add_argument("--poll-seconds", type=float, default=5.0, help="대기열 확인 주기 (기본값: 5초)")
+    parser.add_argument("--once", action="store_true", help="대기 중인 작업을 모두 처리하고 종료")
+    args = parser.parse_args()
+
+    run_import_worker(workers=args.workers, poll_seconds=args.poll_seconds, once=args.once)
@@ -1,11 +1,15 @@
+from app.services import cold_start
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1 import api_router
-from app.database import engine, Base
+from app.crud.keyset import NEXT_CURSOR_HEADER
+from app.database import get_engine, settings, Base
 import os
 
-# 데이터베이스 테이블 생성
-Base.metadata.create_all(bind=engine)
+# 데이터베이스 테이블 생성 (서버리스 모드에서는 콜드 스타트마다 반복하지 않도록 생략 - 스키마는 배포 전에 미리 생성)
+if not settings.serverless_mode:
+    with cold_start.phase("create_all"):
+        Base.metadata.create_all(bind=get_engine())
 
 app = FastAPI(
     title="Early Retire Lab API",
@@ -35,8 +39,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],  # 키셋 페이지네이션 다음 페이지 커서
 )
 
+app.add_middleware(cold_start.ColdStartMiddleware)
+
 # API 라우터 등록
 app.include_router(api_router, prefix="/api/v1")
 
@@ -48,3 +55,9 @@ def read_root():
 def health_check():
     return {"status": "ok"}
 
+@app.get("/debug/cold-start")
+def cold_start_timings():
+    """콜드 스타트 단계별 소요시간 (ms)"""
+    return {"serverless_mode": settings.serverless_mode, **cold_start.report()}
+
+cold_start.record_since_start("import_app")
@@ -21,5 +21,6 @@ from app.models.usa_indicators import USAIndicators
 from app.models.usa_etfs_daily_chart import USAETFsDailyChart
 from app.models.usa_etfs_dividend import USAETFsDividend
 from app.models.usd_krw_exchange import USDKRWExchange
+from app.models.import_job import ImportJob
 
-__all__ = ["Base", "FinancialInstitution", "Expense", "ExpenseType", "IncomeTarget", "IncomeType", "EarlyRetirementInitialSetting", "DividendOption", "ISAAccount", "ISAAccountDetail", "ISAAccountSale", "ISAAccountDividend", "PensionFundAccount", "PensionFundAccountDetail", "IRPAccount", "IRPAccountDetail", "CommonCodeMaster", "CommonCodeDetail", "DomesticETFs", "DomesticETFsDividend", "DomesticETFsDailyChart", "USAETFs", "USAIndicators", "USAETFsDailyChart", "USAETFsDividend", "USDKRWExchange"]
+__all__ = ["Base", "FinancialInstitution", "Expense", "ExpenseType", "IncomeTarget", "IncomeType", "EarlyRetirementInitialSetting", "DividendOption", "ISAAccount", "ISAAccountDetail", "ISAAccountSale", "ISAAccountDividend", "PensionFundAccount", "PensionFundAccountDetail", "IRPAccount", "IRPAccountDetail", "CommonCodeMaster", "CommonCodeDetail", "DomesticETFs", "DomesticETFsDividend", "DomesticETFsDailyChart", "USAETFs", "USAIndicators", "USAETFsDailyChart", "USAETFsDividend", "USDKRWExchange", "ImportJob"]
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, BigInteger, Date, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, Date, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class DomesticETFsDailyChart(Base):
     __tablename__ = "domestic_etfs_daily_chart"
-    __table_args__ = {'schema': 'stock'}
+    __table_args__ = (
+        UniqueConstraint('etf_id', 'date', name='uq_domestic_etfs_daily_chart_etf_id_date'),  # 일괄 upsert(ON CONFLICT) 키
+        {'schema': 'stock'},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     etf_id = Column(Integer, ForeignKey('stock.domestic_etfs.id'), nullable=False, index=True)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from app.database import Base
+
+class ImportJob(Base):
+    __tablename__ = "import_job"
+    __table_args__ = {'schema': 'basic'}
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(50), nullable=False, index=True)  # 작업 유형 (services.import_jobs.JOB_TYPES 키)
+    params = Column(JSON, nullable=False, default=dict)  # 작업 파라미터
+    status = Column(String(20), nullable=False, default='queued', index=True)  # queued / running / completed / failed
+    progress_done = Column(Integer, nullable=False, default=0)  # 처리한 항목 수
+    progress_total = Column(Integer, nullable=True)  # 전체 항목 수 (알 수 없으면 NULL)
+    message = Column(String(200), nullable=True)  # 마지막 진행 메시지 (예: 처리 중인 티커)
+    result = Column(JSON, nullable=True)  # 완료 시 결과 요약
+    error = Column(Text, nullable=True)  # 실패 사유
+    worker = Column(String(100), nullable=True)  # 실행 중인 워커 (호스트:PID)
+    created_at = Column(DateTime, nullable=False)  # 접수 시각
+    started_at = Column(DateTime, nullable=True)  # 실행 시작 시각
+    finished_at = Column(DateTime, nullable=True)  # 종료 시각
+    heartbeat_at = Column(DateTime, nullable=True)  # 실행 중 마지막 생존 신호 (오래되면 다시 대기열로)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric
+from sqlalchemy import Column, Integer, String, Numeric, Date
 from app.database import Base
 
 class USAIndicators(Base):
@@ -10,4 +10,8 @@ class USAIndicators(Base):
     indicator_nm = Column(String(200), nullable=False)  # 지표명
     order_no = Column(Integer, nullable=False, default=0)  # 정렬순서
     weekly_macd_oscillator = Column(Numeric(10, 4), nullable=True)  # 주봉MACD오실레이터
-
+    weekly_rsi = Column(Numeric(10, 4), nullable=True)  # 주봉RSI(14)
+    weekly_ma20 = Column(Numeric(12, 4), nullable=True)  # 주봉20주이동평균
+    weekly_ma20_gap = Column(Numeric(10, 4), nullable=True)  # 종가의20주이동평균이격도(%)
+    calculated_date = Column(Date, nullable=True)  # 지표계산기준일(마지막일봉날짜)
+    calculated_close = Column(Numeric(10, 6), nullable=True)  # 지표계산기준종가(마지막일봉종가, 같은 날짜 일봉 보정 감지용)
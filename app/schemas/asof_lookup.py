@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+from datetime import date
+from typing import List
+
+class ChartAsOfQuery(BaseModel):
+    etf_id: int
+    date: date  # 이 날짜 또는 그 이전의 가장 최근 일봉
+
+class ChartAsOfRequest(BaseModel):
+    queries: List[ChartAsOfQuery] = Field(..., max_length=5000)
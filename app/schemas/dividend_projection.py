@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List, Optional
+from app.models.early_retirement_initial_setting import DividendOption
+
+class HoldingDividendProjection(BaseModel):
+    account_type: str  # 계좌유형 (isa / irp / pension_fund)
+    account_id: int  # 계좌 ID
+    stock_code: str  # 종목코드
+    stock_name: Optional[str] = None  # 종목명
+    market: Optional[str] = None  # domestic / usa (ETF 목록에 없는 종목이면 None)
+    quantity: float  # 수량
+    annual_amount: int  # 향후 12개월 예상 배당금 합계 (원화)
+    monthly_amounts: List[int]  # 월별 예상 배당금 (months 순서, 원화)
+
+class MonthlyDividendProjection(BaseModel):
+    month: str  # YYYY-MM
+    amount: int  # 예상 배당금 (원화)
+    target_amount: int  # 월 배당소득 목표
+    shortfall: int  # 목표 대비 부족금액 (초과 시 0)
+
+class DividendProjection(BaseModel):
+    as_of: date  # 기준일
+    months: List[str]  # 추정 대상 월 (YYYY-MM, 기준월 다음 달부터 12개월)
+    usd_krw_rate: Optional[float] = None  # 미국 ETF 배당 환산 환율 (기준일 as-of)
+    holdings: List[HoldingDividendProjection]  # 보유 종목별 추정
+    monthly: List[MonthlyDividendProjection]  # 월별 합계와 목표 비교
+    annual_total: int  # 향후 12개월 예상 배당금 합계
+    monthly_target: int  # 월 배당소득 목표 (income_target 배당소득 합계)
+    annual_target: int  # 연 배당소득 목표
+    achievement_rate: Optional[float] = None  # 목표 달성률 (예상 배당금 / 연 목표)
+    dividend_option: Optional[DividendOption] = None  # 조기은퇴 초기설정의 배당옵션
+    option_yield: Optional[float] = None  # 배당옵션 수익률
+    required_assets: Optional[int] = None  # 배당옵션 수익률로 연 목표를 달성하는 데 필요한 투자자산
@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from decimal import Decimal
+from typing import List, Literal, Optional
+
+HoldingChangeAction = Literal['create', 'update', 'delete']
+
+class HoldingValues(BaseModel):
+    quantity: Decimal  # 수량
+    purchase_avg_price: Decimal  # 매입단가
+    current_price: Decimal  # 현재가
+    purchase_fee: Decimal  # 매수수수료
+
+class HoldingChange(BaseModel):
+    action: HoldingChangeAction
+    stock_code: str
+    before: Optional[HoldingValues] = None  # 현재 저장된 값 (create면 없음)
+    after: Optional[HoldingValues] = None  # 파일의 값 (delete면 없음)
+    changed_fields: List[str] = []  # update에서 값이 바뀌는 필드
+
+class HoldingsIngestResult(BaseModel):
+    dry_run: bool  # True면 저장하지 않고 변경 내역만 계산
+    applied: bool  # 실제로 저장했는지
+    file_format: Literal['csv', 'xlsx']
+    layout: str  # 사용한 컬럼 매핑 (auto면 헤더로 찾은 증권사 레이아웃, custom이면 요청한 매핑)
+    row_count: int  # 빈 행을 제외한 데이터 행 수
+    create_count: int
+    update_count: int
+    unchanged_count: int
+    delete_count: int
+    error_count: int
+    errors: List[str]
+    changes: List[HoldingChange]
@@ -0,0 +1,93 @@
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+
+ImportJobStatus = Literal['queued', 'running', 'completed', 'failed']
+
+# 작업 유형별 파라미터 (필드 이름은 실행하는 스크립트 함수의 인자와 같음)
+
+class JobParams(BaseModel):
+    # 알 수 없는 파라미터(오타 등)를 무시하고 기본값으로 실행하지 않도록 거부
+    model_config = ConfigDict(extra='forbid')
+
+class USAETFDailyChartParams(JobParams):
+    period: str = '2y'  # yfinance 조회 기간 (1mo, 1y, 2y, 5y, max 등)
+    ticker: Optional[str] = None  # 특정 티커만 (없으면 모든 ETF)
+    incremental: bool = True  # ETF별 마지막 저장일 이후만 조회
+    workers: int = Field(8, ge=1, le=32)  # 동시 조회 스레드 수
+    rate: float = Field(5.0, gt=0, le=50)  # 초당 최대 조회 요청 수
+    retries: int = Field(2, ge=0, le=5)  # ETF별 재시도 횟수
+    resume: bool = True  # 중단된 이전 실행의 체크포인트에서 이어서 처리
+
+class DomesticETFDailyChartParams(JobParams):
+    etf_type: str = 'high_dividend'  # ETF 유형
+    weeks: int = Field(52, ge=1, le=520)  # 가져올 주 수
+    ticker: Optional[str] = None  # 특정 티커만 (없으면 etf_type의 모든 ETF)
+    incremental: bool = True  # ETF별 마지막 저장일 이후만 조회
+    workers: int = Field(1, ge=1, le=16)  # 동시에 처리할 ETF 수
+    retries: int = Field(2, ge=0, le=5)  # ETF별 재시도 횟수
+    resume: bool = True  # 중단된 이전 실행의 체크포인트에서 이어서 처리
+
+class USDKRWExchangeParams(JobParams):
+    years: int = Field(2, ge=1, le=20)  # 가져올 년수
+    incremental: bool = True  # 마지막 저장일 이후만 수집
+    workers: int = Field(4, ge=1, le=16)  # 동시 요청 수
+    rate: float = Field(4.0, gt=0, le=20)  # 초당 최대 요청 수
+    use_cache: bool = True  # 응답 디스크 캐시 사용
+
+class USAETFDividendParams(JobParams):
+    ticker: Optional[str] = None  # 특정 티커만 (없으면 모든 ETF)
+    years: List[int] = Field(default_factory=lambda: [2024, 2025], min_length=1)  # 가져올 연도
+    workers: Optional[int] = Field(None, ge=1, le=8)  # 동시에 띄울 브라우저 수 (없으면 CPU 코어 수의 절반)
+    strategy: Literal['auto', 'http', 'browser'] = 'auto'  # 수집 경로
+    http_workers: int = Field(8, ge=1, le=32)  # HTTP 경로 동시 요청 수
+    use_cache: bool = True  # 스크래핑 캐시 사용
+    retries: int = Field(1, ge=0, le=5)  # 티커별 재시도 횟수
+    resume: bool = True  # 중단된 이전 실행의 체크포인트에서 이어서 처리
+
+class USAETFDividendYahooParams(JobParams):
+    ticker: Optional[str] = None  # 특정 티커만 (없으면 모든 ETF)
+    years: List[int] = Field(default_factory=lambda: [2024, 2025], min_length=1)  # 가져올 연도
+    workers: int = Field(1, ge=1, le=8)  # 동시 요청 수
+    rate: float = Field(1.0, gt=0, le=10)  # 초당 최대 요청 수
+    retries: int = Field(2, ge=0, le=5)  # 티커별 재시도 횟수
+    resume: bool = True  # 중단된 이전 실행의 체크포인트에서 이어서 처리
+
+class DomesticETFDividendParams(JobParams):
+    etf_type: str = 'high_dividend'  # ETF 유형
+    ticker: Optional[str] = None  # 특정 티커만 (없으면 etf_type의 모든 ETF)
+    workers: Optional[int] = Field(None, ge=1, le=8)  # 동시에 띄울 브라우저 수 (없으면 CPU 코어 수의 절반)
+    retries: int = Field(1, ge=0, le=5)  # ETF별 재시도 횟수
+    resume: bool = True  # 중단된 이전 실행의 체크포인트에서 이어서 처리
+
+class USAIndicatorsParams(JobParams):
+    incremental: bool = True  # 지난 계산 이후 새 일봉이 있거나 최신 일봉 종가가 바뀐 티커만 계산
+    lookback_weeks: int = Field(312, ge=40, le=1040)  # 증분 모드에서 읽는 주 수
+    ticker: Optional[str] = None  # 특정 티커만 (없으면 모든 지표)
+
+class ImportJobCreate(BaseModel):
+    job_type: str  # 작업 유형 (GET /import-jobs/types 참고)
+    params: Dict[str, Any] = Field(default_factory=dict)  # 작업 파라미터 (생략한 값은 유형별 기본값)
+
+class ImportJobType(BaseModel):
+    job_type: str  # 작업 유형
+    description: str  # 설명
+    concurrency: int  # 동시에 실행할 수 있는 같은 유형 작업 수
+    params: Dict[str, Any]  # 파라미터 기본값
+
+class ImportJob(BaseModel):
+    id: int  # 작업 ID
+    job_type: str  # 작업 유형
+    params: Dict[str, Any]  # 작업 파라미터 (기본값 포함)
+    status: ImportJobStatus  # 작업 상태
+    progress_done: int = 0  # 처리한 항목 수
+    progress_total: Optional[int] = None  # 전체 항목 수
+    message: Optional[str] = None  # 마지막 진행 메시지
+    result: Optional[Dict[str, Any]] = None  # 완료 시 결과 요약
+    error: Optional[str] = None  # 실패 사유
+    created_at: datetime  # 접수 시각
+    started_at: Optional[datetime] = None  # 실행 시작 시각
+    finished_at: Optional[datetime] = None  # 종료 시각
+    
+    class Config:
+        from_attributes = True
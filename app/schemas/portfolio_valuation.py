@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+class ValuationSummary(BaseModel):
+    holding_count: int  # 보유 종목 수
+    market_value: Decimal  # 평가금액 (수량 x 현재가)
+    cost_basis: Decimal  # 매입금액 (수량 x 매입단가 + 매수수수료)
+    sale_fee: Decimal  # 매도수수료
+    unrealized_pnl: Decimal  # 평가손익 (평가금액 - 매도수수료 - 매입금액)
+    return_rate: Optional[float] = None  # 수익률 (평가손익 / 매입금액, 매입금액이 0이면 None)
+    cash_balance: Decimal  # 현금잔고
+    total_value: Decimal  # 총자산 (평가금액 + 현금잔고)
+    weight: Optional[float] = None  # 전체 총자산 대비 비중
+
+class AccountValuation(ValuationSummary):
+    account_type: str  # 계좌유형 (isa / irp / pension_fund)
+    account_id: int  # 계좌 ID
+    account_number: str  # 계좌번호
+    financial_institution_code: str  # 금융기관코드
+
+class PortfolioValuation(BaseModel):
+    accounts: List[AccountValuation]  # 계좌별 평가
+    by_account_type: Dict[str, ValuationSummary]  # 계좌유형별 합계
+    total: ValuationSummary  # 전체 합계
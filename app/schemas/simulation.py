@@ -0,0 +1,42 @@
+from pydantic import BaseModel, Field
+from decimal import Decimal
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
+
+class SimulationAsset(BaseModel):
+    market: Literal['domestic', 'usa']  # 국내 / 미국 ETF
+    etf_id: int  # ETF ID
+    weight: float = Field(gt=0)  # 비중 (합계가 1이 아니면 자동 정규화)
+
+class SimulationRequest(BaseModel):
+    assets: List[SimulationAsset] = Field(min_length=1, max_length=20)  # 투자 자산 구성
+    years: int = Field(40, ge=1, le=60)  # 시뮬레이션 기간 (년)
+    paths: int = Field(10000, ge=100, le=20000)  # 경로 수
+    seed: Optional[int] = Field(None, ge=0)  # 난수 시드 (같은 시드면 같은 결과, 지정 시 결과 캐시 사용)
+    inflation_rate: float = Field(0.025, ge=-0.05, le=0.2)  # 연 물가상승률 (생활비 증가율)
+    investable_assets: Optional[Decimal] = None  # 투자가능자산 (없으면 조기은퇴 초기설정 값)
+    standby_fund: Optional[Decimal] = None  # 대기자금 (없으면 조기은퇴 초기설정 값)
+    monthly_expense: Optional[Decimal] = None  # 월 생활비 (없으면 고정비 + 변동비 합계)
+
+class SimulationResult(BaseModel):
+    seed: int  # 사용된 난수 시드
+    paths: int  # 경로 수
+    years: int  # 시뮬레이션 기간 (년)
+    initial_value: float  # 초기 총자산
+    monthly_expense: float  # 초기 월 생활비
+    sample_start: str  # 부트스트랩 표본 시작월 (YYYY-MM)
+    sample_end: str  # 부트스트랩 표본 종료월 (YYYY-MM)
+    sample_months: int  # 부트스트랩 표본 월 수
+    percentiles: Dict[str, List[float]]  # 연도별(0~years년) 총자산 백분위 밴드 (p5, p25, p50, p75, p95)
+    failure_probability: float  # 기간 내 자산 고갈 확률
+    failure_probability_by_year: List[float]  # 1~years년 시점까지의 누적 고갈 확률
+    median_depletion_year: Optional[float] = None  # 고갈된 경로의 고갈 시점 중앙값 (년)
+
+class SimulationJob(BaseModel):
+    job_id: str  # 작업 ID
+    status: Literal['pending', 'running', 'completed', 'failed']  # 작업 상태
+    submitted_at: datetime  # 접수 시각
+    finished_at: Optional[datetime] = None  # 종료 시각
+    cached: bool = False  # 캐시된 결과 여부
+    error: Optional[str] = None  # 실패 사유
+    result: Optional[SimulationResult] = None  # 완료 시 결과
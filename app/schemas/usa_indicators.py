@@ -1,12 +1,18 @@
 from pydantic import BaseModel
 from typing import Optional
 from decimal import Decimal
+from datetime import date
 
 class USAIndicatorsBase(BaseModel):
     ticker: str
     indicator_nm: str
     order_no: int = 0
     weekly_macd_oscillator: Optional[Decimal] = None
+    weekly_rsi: Optional[Decimal] = None
+    weekly_ma20: Optional[Decimal] = None
+    weekly_ma20_gap: Optional[Decimal] = None
+    calculated_date: Optional[date] = None
+    calculated_close: Optional[Decimal] = None
 
 class USAIndicatorsCreate(USAIndicatorsBase):
     pass
@@ -16,6 +22,11 @@ class USAIndicatorsUpdate(BaseModel):
     indicator_nm: Optional[str] = None
     order_no: Optional[int] = None
     weekly_macd_oscillator: Optional[Decimal] = None
+    weekly_rsi: Optional[Decimal] = None
+    weekly_ma20: Optional[Decimal] = None
+    weekly_ma20_gap: Optional[Decimal] = None
+    calculated_date: Optional[date] = None
+    calculated_close: Optional[Decimal] = None
 
 class USAIndicators(USAIndicatorsBase):
     id: int
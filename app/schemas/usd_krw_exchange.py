@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
 
 class USDKRWExchangeBase(BaseModel):
@@ -20,3 +20,33 @@ class USDKRWExchange(USDKRWExchangeBase):
     class Config:
         from_attributes = True
 
+
+MAX_CONVERT_ITEMS = 10000  # 환산 요청 최대 건수 (dates 길이, 일별 환율 시계열 일수)
+
+class USDKRWConvertRequest(BaseModel):
+    dates: List[date] = Field(..., max_length=MAX_CONVERT_ITEMS)  # 환산 기준일 (해당 날짜 또는 그 이전의 가장 최근 환율 적용)
+    usd_amounts: List[float] = Field(..., max_length=MAX_CONVERT_ITEMS)  # 달러 금액 (dates와 같은 순서/길이)
+    rate_start_date: Optional[date] = None  # 일별 환율 시계열 시작일 (선택)
+    rate_end_date: Optional[date] = None  # 일별 환율 시계열 종료일 (선택, 시작일부터 최대 MAX_CONVERT_ITEMS일)
+
+    @model_validator(mode='after')
+    def validate_lengths(self):
+        if len(self.dates) != len(self.usd_amounts):
+            raise ValueError("dates와 usd_amounts의 길이가 같아야 합니다")
+        if (self.rate_start_date is None) != (self.rate_end_date is None):
+            raise ValueError("rate_start_date와 rate_end_date는 함께 지정해야 합니다")
+        if self.rate_start_date and self.rate_start_date > self.rate_end_date:
+            raise ValueError("rate_start_date는 rate_end_date보다 이후일 수 없습니다")
+        if self.rate_start_date and (self.rate_end_date - self.rate_start_date).days + 1 > MAX_CONVERT_ITEMS:
+            raise ValueError(f"일별 환율 시계열 기간은 최대 {MAX_CONVERT_ITEMS}일입니다")
+        return self
+
+class USDKRWDailyRate(BaseModel):
+    date: date
+    exchange_rate: Optional[float] = None  # 해당 날짜 또는 그 이전의 가장 최근 환율
+
+class USDKRWConvertResponse(BaseModel):
+    krw_amounts: List[Optional[float]]  # 원화 환산 금액 (적용 가능한 환율이 없으면 null)
+    exchange_rates: List[Optional[float]]  # 적용된 환율
+    rate_dates: List[Optional[date]]  # 적용된 환율의 날짜
+    daily_rates: Optional[List[USDKRWDailyRate]] = None  # rate_start_date ~ rate_end_date 일별 환율
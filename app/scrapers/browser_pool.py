@@ -0,0 +1,303 @@
+"""
+Selenium 스크래퍼 공용 브라우저 풀
+
+- ChromeDriverManager().install()은 프로세스당 한 번만 실행하고, 생성한 드라이버는 재사용
+- 최대 size개의 드라이버를 미리 띄워두고(필요할 때 생성) 티커별 작업에 빌려줌
+- 반납 시 드라이버 상태를 확인해서 죽은 드라이버는 버리고, 대기 중인 작업이 빈자리에 새로 생성
+- 고정 time.sleep 대신 사용할 명시적 대기 함수 (문서 로딩, 요소 등장, 임의 조건)
+- 단계별 소요 시간 집계 (StageTimer)
+"""
+import os
+import threading
+import time
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Callable, Iterable, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+_driver_path: Optional[str] = None
+_driver_path_lock = threading.Lock()
+
+
+def default_pool_size() -> int:
+    """기본 브라우저 수 (CPU 코어 수의 절반, 최소 1개 - Chrome 한 개가 코어 하나 이상을 사용)"""
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def chromedriver_path() -> str:
+    """webdriver-manager로 chromedriver 경로 확인 (프로세스당 한 번만 설치 / 확인)"""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+def headless_chrome_options(user_agent: str = DEFAULT_USER_AGENT) -> Options:
+    """헤드리스 Chrome 옵션"""
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')  # 헤드리스 모드 (브라우저 창 숨김)
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument(f'user-agent={user_agent}')
+    return chrome_options
+
+
+def wait_document_ready(driver, timeout: float = 30):
+    """document.readyState가 complete가 될 때까지 대기"""
+    WebDriverWait(driver, timeout).until(lambda d: d.execute_script("return document.readyState") == "complete")
+
+
+def wait_for_element(driver, locator: tuple, timeout: float = 10, clickable: bool = False):
+    """locator 요소가 나타날 때까지(clickable이면 클릭 가능할 때까지) 대기 후 반환"""
+    condition = EC.element_to_be_clickable(locator) if clickable else EC.presence_of_element_located(locator)
+    return WebDriverWait(driver, timeout).until(condition)
+
+
+def wait_until(driver, predicate: Callable, timeout: float = 10, poll_frequency: float = 0.2, default=None):
+    """predicate(driver)가 참이 될 때까지 대기 (시간 초과 시 default 반환)"""
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(predicate)
+    except TimeoutException:
+        return default
+
+
+class StageTimer:
+    """작업 단계별 소요 시간 집계 (여러 스레드에서 같이 사용, 스레드 안전)"""
+
+    def __init__(self):
+        self._totals = defaultdict(float)
+        self._counts = defaultdict(int)
+        self._max = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            self._totals[name] += seconds
+            self._counts[name] += 1
+            self._max[name] = max(self._max[name], seconds)
+
+    @contextmanager
+    def stage(self, name: str):
+        """with 블록 실행 시간을 name 단계로 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def report(self) -> dict:
+        """{단계: {'count', 'total_seconds', 'avg_seconds', 'max_seconds'}} (기록 순서)"""
+        with self._lock:
+            return {
+                name: {
+                    'count': self._counts[name],
+                    'total_seconds': round(total, 3),
+                    'avg_seconds': round(total / self._counts[name], 3),
+                    'max_seconds': round(self._max[name], 3),
+                }
+                for name, total in self._totals.items()
+            }
+
+    def log_report(self, title: str = "단계별 소요 시간"):
+        logger.info(f"[{title}]")
+        for name, stats in self.report().items():
+            logger.info(
+                f"  {name:<10} {stats['count']:>4}회  합계 {stats['total_seconds']:>8.2f}초  "
+                f"평균 {stats['avg_seconds']:>6.2f}초  최대 {stats['max_seconds']:>6.2f}초"
+            )
+
+
+@contextmanager
+def _optional_stage(timer: Optional[StageTimer], name: str):
+    if timer is None:
+        yield
+    else:
+        with timer.stage(name):
+            yield
+
+
+class BrowserPool:
+    """
+    Chrome 드라이버 풀
+
+    Args:
+        size: 최대 드라이버 수
+        options_factory: 드라이버마다 새 Options를 만드는 함수 (기본: 헤드리스)
+        on_create: 드라이버 생성 직후 호출 (예: CDP 스크립트 등록)
+        driver_factory: 드라이버 생성 함수 (기본: chromedriver_path()로 webdriver.Chrome 생성)
+        timer: 드라이버 생성 / 대기 시간을 기록할 StageTimer
+    """
+
+    def __init__(self, size: int = None, options_factory: Callable[[], Options] = headless_chrome_options,
+                 on_create: Callable = None, driver_factory: Callable = None, timer: StageTimer = None):
+        self.size = size or default_pool_size()
+        self.options_factory = options_factory
+        self.on_create = on_create
+        self.driver_factory = driver_factory or self._create_chrome
+        self.timer = timer
+        self._idle = []  # 최근에 쓴 드라이버부터 재사용 (뒤에서 꺼냄)
+        self._all = []
+        self._created = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)  # 반납 / 폐기 / 종료 시 대기 중인 작업을 깨움
+        self._closed = False
+
+    def _create_chrome(self):
+        return webdriver.Chrome(service=Service(chromedriver_path()), options=self.options_factory())
+
+    def _create(self):
+        with _optional_stage(self.timer, 'driver'):
+            driver = self.driver_factory()
+            if self.on_create:
+                self.on_create(driver)
+        with self._lock:
+            self._all.append(driver)
+        logger.info(f"Chrome 드라이버를 생성했습니다. ({len(self._all)}/{self.size})")
+        return driver
+
+    def _is_alive(self, driver) -> bool:
+        # chromedriver가 죽으면 WebDriverException 외에 urllib3 / ConnectionError 등이 발생할 수 있음
+        try:
+            driver.switch_to.default_content()
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _release(self, driver):
+        """드라이버를 유휴 목록에 반납하고 대기 중인 작업 하나를 깨움"""
+        with self._available:
+            self._idle.append(driver)
+            self._available.notify()
+
+    def _discard(self, driver):
+        """드라이버를 폐기하고 빈자리가 생겼음을 대기 중인 작업에 알림"""
+        with self._available:
+            if driver in self._all:
+                self._all.remove(driver)
+            self._created -= 1
+            self._available.notify()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _checkout(self):
+        """유휴 드라이버를 꺼내거나, 여유가 있으면 새로 생성하거나, 반납 / 폐기될 때까지 대기"""
+        waited_since = None
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("BrowserPool is closed")
+                if self._idle:
+                    driver = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    self._created += 1
+                    driver = None
+                    break
+                if waited_since is None:
+                    waited_since = time.perf_counter()
+                self._available.wait()
+        if waited_since is not None and self.timer is not None:
+            self.timer.record('queue', time.perf_counter() - waited_since)
+        if driver is not None:
+            return driver
+        try:
+            return self._create()
+        except Exception:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+
+    @contextmanager
+    def acquire(self):
+        """드라이버를 빌려서 사용 후 반납 (비정상 드라이버는 폐기)"""
+        driver = self._checkout()
+        try:
+            yield driver
+        finally:
+            if not self._closed and self._is_alive(driver):
+                self._release(driver)
+            else:
+                logger.warning("비정상 종료된 드라이버를 폐기합니다.")
+                self._discard(driver)
+
+    def warm_up(self, count: int = None):
+        """count개(기본: size)의 드라이버를 미리 생성"""
+        drivers = []
+        for _ in range(min(count or self.size, self.size)):
+            drivers.append(self._checkout())
+        for driver in drivers:
+            self._release(driver)
+
+    def close(self):
+        with self._available:
+            self._closed = True
+            drivers = list(self._all)
+            self._all.clear()
+            self._idle.clear()
+            self._available.notify_all()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        logger.info(f"브라우저 {len(drivers)}개를 종료했습니다.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_with_pool(pool: BrowserPool, items: Iterable, job: Callable, workers: int = None,
+                  on_done: Callable = None) -> list:
+    """
+    items 각각에 대해 job(driver, item)을 풀의 드라이버로 병렬 실행
+
+    Args:
+        pool: 브라우저 풀
+        items: 작업 대상 목록 (예: ETF 목록)
+        job: (driver, item) -> 결과
+        workers: 동시 작업 수 (기본: 풀 크기)
+        on_done: 작업 하나가 끝날 때마다 (item, 결과, 예외) 로 호출
+
+    Returns:
+        [(item, 결과, 예외), ...] (완료 순서)
+    """
+    def run_one(item):
+        with pool.acquire() as driver:
+            return job(driver, item)
+
+    results = []
+    with ThreadPoolExecutor(max_workers=workers or pool.size, thread_name_prefix='browser-job') as executor:
+        futures = {executor.submit(run_one, item): item for item in items}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                result, error = future.result(), None
+            except Exception as e:
+                result, error = None, e
+            results.append((item, result, error))
+            if on_done:
+                on_done(item, result, error)
+    return results
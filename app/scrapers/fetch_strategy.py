@@ -0,0 +1,195 @@
+"""
+스크래퍼 수집 전략 (가벼운 HTTP 우선, 필요할 때만 브라우저)
+
+- 소스를 (이름, fetch 함수) 순서대로 시도해서 처음으로 결과가 있는 소스를 사용
+  (예: [('http', 정적 HTML 파싱), ('browser', Selenium)] - HTTP로 테이블을 찾지 못하면 브라우저로 폴백)
+- 소스별 시도 / 성공 / 빈 결과 / 오류 횟수와 응답 시간을 집계 (SourceStats)
+- HTTP 경로: keep-alive 연결 풀을 쓰는 requests 세션 + 표준 라이브러리 HTMLParser로 table 파싱
+  (Selenium / Chrome을 띄우지 않으므로 작은 컨테이너에서도 CPU / 메모리 부담이 적음)
+
+이 모듈은 selenium에 의존하지 않는다.
+"""
+import threading
+import time
+import logging
+from collections import OrderedDict
+from html.parser import HTMLParser
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9,ko;q=0.8',
+}
+
+
+def create_http_session(pool_size: int = 8, headers: dict = None, retries: int = 2) -> requests.Session:
+    """keep-alive 연결을 재사용하는 HTTP 세션 (pool_size개까지 동시 연결 유지, 5xx / 연결 오류 재시도)"""
+    session = requests.Session()
+    session.headers.update(headers or DEFAULT_HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=retries, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504)),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class _TableParser(HTMLParser):
+    """HTML 문서의 모든 table을 {'attrs', 'headers', 'rows'}로 추출 (중첩 table은 각각 별도 table)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables = []
+        self._stack = []  # 열려 있는 table (중첩 대응)
+        self._cell = None  # 현재 셀 텍스트 조각
+        self._row = None
+        self._row_has_td = False
+        self._in_thead = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            self._stack.append({'attrs': dict(attrs), 'headers': [], 'rows': []})
+        elif not self._stack:
+            return
+        elif tag == 'thead':
+            self._in_thead = True
+        elif tag == 'tr':
+            self._row = []
+            self._row_has_td = False
+        elif tag in ('td', 'th') and self._row is not None:
+            self._cell = []
+            self._row_has_td = self._row_has_td or tag == 'td'
+        elif tag == 'br' and self._cell is not None:
+            self._cell.append(' ')
+
+    def handle_endtag(self, tag):
+        if not self._stack:
+            return
+        table = self._stack[-1]
+        if tag in ('td', 'th') and self._cell is not None:
+            self._row.append(' '.join(''.join(self._cell).split()))
+            self._cell = None
+        elif tag == 'tr' and self._row is not None:
+            # thead 안의 행, 또는 thead 없이 첫 행이 th로만 구성된 경우 헤더로 간주
+            is_header = self._in_thead or (not self._row_has_td and not table['headers'] and not table['rows'])
+            if is_header and self._row:
+                table['headers'] = self._row
+            elif any(self._row):
+                table['rows'].append(self._row)
+            self._row = None
+        elif tag == 'thead':
+            self._in_thead = False
+        elif tag == 'table':
+            self.tables.append(self._stack.pop())
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def parse_html_tables(html: str) -> List[dict]:
+    """
+    HTML의 table 목록 추출
+
+    Returns:
+        [{'attrs': {속성}, 'headers': [헤더 텍스트], 'rows': [[셀 텍스트]]}, ...]
+    """
+    parser = _TableParser()
+    parser.feed(html)
+    parser.close()
+    return parser.tables
+
+
+def table_to_records(table: dict) -> List[dict]:
+    """table 행을 {헤더: 값} dict 리스트로 변환 (헤더가 모자라면 Column_i)"""
+    headers = table['headers']
+    return [
+        {(headers[i] if i < len(headers) else f"Column_{i}"): value for i, value in enumerate(row)}
+        for row in table['rows']
+    ]
+
+
+class SourceStats:
+    """소스별 수집 통계 (스레드 안전)"""
+
+    def __init__(self):
+        self._stats = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, source: str, outcome: str, seconds: float):
+        """outcome: 'success' / 'empty' / 'error'"""
+        with self._lock:
+            stats = self._stats.setdefault(
+                source, {'attempts': 0, 'success': 0, 'empty': 0, 'error': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
+            )
+            stats['attempts'] += 1
+            stats[outcome] += 1
+            stats['total_seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+
+    def report(self) -> dict:
+        """{소스: {'attempts', 'success', 'empty', 'error', 'success_rate', 'avg_seconds', 'max_seconds'}}"""
+        with self._lock:
+            return {
+                source: {
+                    'attempts': stats['attempts'],
+                    'success': stats['success'],
+                    'empty': stats['empty'],
+                    'error': stats['error'],
+                    'success_rate': round(stats['success'] / stats['attempts'], 3),
+                    'avg_seconds': round(stats['total_seconds'] / stats['attempts'], 3),
+                    'max_seconds': round(stats['max_seconds'], 3),
+                }
+                for source, stats in self._stats.items()
+            }
+
+    def log_report(self, title: str = "소스별 수집 통계"):
+        logger.info(f"[{title}]")
+        for source, stats in self.report().items():
+            logger.info(
+                f"  {source:<8} 시도 {stats['attempts']:>4}회  성공 {stats['success']:>4}  빈 결과 {stats['empty']:>4}  "
+                f"오류 {stats['error']:>4}  성공률 {stats['success_rate']:.0%}  "
+                f"평균 {stats['avg_seconds']:.2f}초  최대 {stats['max_seconds']:.2f}초"
+            )
+
+
+class FetchStrategy:
+    """
+    소스를 순서대로 시도하는 수집 전략
+
+    Args:
+        sources: [(소스 이름, fetch(key) -> 결과), ...] 시도 순서대로.
+                 결과가 비어 있거나(None, 빈 리스트) 예외가 발생하면 다음 소스로 넘어감
+        stats: 통계를 기록할 SourceStats (여러 전략이 공유 가능)
+    """
+
+    def __init__(self, sources: Sequence[Tuple[str, Callable]], stats: SourceStats = None):
+        self.sources = list(sources)
+        self.stats = stats or SourceStats()
+
+    def fetch(self, key) -> Tuple[Optional[object], Optional[str]]:
+        """(결과, 결과를 얻은 소스 이름) - 모든 소스가 실패하면 (None, None)"""
+        for name, fetch in self.sources:
+            started = time.perf_counter()
+            try:
+                result = fetch(key)
+            except Exception as e:
+                self.stats.record(name, 'error', time.perf_counter() - started)
+                logger.warning(f"[{key}] {name} 소스 수집 실패: {e}")
+                continue
+            if result:
+                self.stats.record(name, 'success', time.perf_counter() - started)
+                return result, name
+            self.stats.record(name, 'empty', time.perf_counter() - started)
+            logger.info(f"[{key}] {name} 소스에서 데이터를 찾지 못했습니다.")
+        return None, None
+
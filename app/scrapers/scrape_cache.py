@@ -0,0 +1,293 @@
+"""
+스크래퍼 응답 디스크 캐시
+
+- URL + 파라미터를 키로 응답 본문을 디스크에 저장
+- 유효시간(TTL) 안이면 요청 없이 캐시 사용, 지나면 ETag / Last-Modified 조건부 요청으로 재검증 (304면 본문 재사용)
+- 본문 SHA-256 해시 보관: 처리(파싱 + DB 저장)를 마친 내용의 해시를 키별로 기록해두고,
+  다음 실행에서 같은 해시면 파싱 / DB 저장을 건너뜀 (부분 실패 후 재실행 시 성공한 대상은 거의 비용 없음)
+- 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- 적중 / 재검증 / 미스 / 처리 생략 / 삭제 통계
+
+디렉터리 구조: <directory>/<키 해시>.json (메타데이터), <키 해시>.body (본문), processed.json (처리 완료 해시)
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 3600
+
+_PROCESSED_FILE = 'processed.json'
+
+
+def cache_key(url: str, params: dict = None) -> str:
+    """URL + 정렬된 쿼리 파라미터"""
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted((str(k), str(v)) for k, v in params.items()))}"
+
+
+def content_hash(data) -> str:
+    """bytes / str / JSON 직렬화 가능한 값의 SHA-256 (date, Decimal 등은 문자열로 직렬화)"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    elif not isinstance(data, (bytes, bytearray)):
+        data = json.dumps(data, sort_keys=True, default=str, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass
+class CachedPage:
+    """캐시를 거친 응답"""
+    url: str
+    key: str
+    status_code: int
+    content: bytes
+    content_hash: str
+    source: str  # 'cache' (TTL 안, 요청 없음) / 'revalidated' (304) / 'network'
+    encoding: str = 'utf-8'
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+
+    @property
+    def from_cache(self) -> bool:
+        return self.source != 'network'
+
+
+class ScrapeCache:
+    """
+    스크래핑 응답 디스크 캐시 (스레드 안전)
+
+    Args:
+        directory: 캐시 디렉터리 (없으면 생성)
+        max_bytes: 본문 전체 최대 크기 (초과 시 LRU 삭제)
+        ttl_seconds: 재검증 없이 캐시를 그대로 쓰는 시간 (0이면 항상 조건부 요청)
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'same_content': 0, 'skipped': 0, 'evictions': 0}
+        os.makedirs(directory, exist_ok=True)
+        self._index = self._scan()  # 키 해시 -> 본문 크기 (오래 사용하지 않은 순)
+        self._processed = self._load_json(os.path.join(directory, _PROCESSED_FILE)) or {}
+
+    # ------------------------------------------------------------------ 파일
+
+    def _path(self, digest: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{digest}{suffix}")
+
+    def _scan(self) -> OrderedDict:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.body'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name[:-len('.body')], stat.st_size))
+        entries.sort()
+        return OrderedDict((digest, size) for _, digest, size in entries)
+
+    @staticmethod
+    def _load_json(path: str) -> Optional[dict]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _read_entry(self, digest: str) -> tuple:
+        """(메타데이터, 본문) - 없거나 손상되었으면 (None, None)"""
+        meta = self._load_json(self._path(digest, '.json'))
+        if meta is None:
+            return None, None
+        try:
+            with open(self._path(digest, '.body'), 'rb') as f:
+                return meta, f.read()
+        except OSError:
+            return None, None
+
+    def _write_meta(self, digest: str, meta: dict):
+        self._write_atomic(self._path(digest, '.json'), json.dumps(meta).encode('utf-8'))
+
+    def _touch(self, digest: str):
+        """LRU 순서 갱신 (본문 파일 mtime이 재시작 후의 사용 순서)"""
+        with self._lock:
+            if digest in self._index:
+                self._index.move_to_end(digest)
+        try:
+            os.utime(self._path(digest, '.body'))
+        except OSError:
+            pass
+
+    def _store(self, digest: str, meta: dict, content: bytes):
+        self._write_atomic(self._path(digest, '.body'), content)
+        self._write_meta(digest, meta)
+        with self._lock:
+            self._index[digest] = len(content)
+            self._index.move_to_end(digest)
+            evicted = self._evict_locked()
+        for old in evicted:
+            for suffix in ('.body', '.json'):
+                try:
+                    os.remove(self._path(old, suffix))
+                except OSError:
+                    pass
+
+    def _evict_locked(self) -> list:
+        evicted = []
+        total = sum(self._index.values())
+        while total > self.max_bytes and len(self._index) > 1:
+            digest, size = self._index.popitem(last=False)
+            total -= size
+            evicted.append(digest)
+        self._stats['evictions'] += len(evicted)
+        return evicted
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    # ------------------------------------------------------------------ 조회
+
+    def fetch(self, session, url: str, params: dict = None, timeout: float = 10, ttl_seconds: float = None,
+              encoding: str = None) -> CachedPage:
+        """
+        캐시를 거쳐 GET 요청
+
+        Args:
+            session: requests 세션 (연결 풀 재사용)
+            ttl_seconds: 이 요청에만 적용할 유효시간 (None이면 캐시 기본값)
+            encoding: 본문 디코딩 인코딩 (None이면 응답 헤더 기준, 없으면 utf-8)
+
+        200이 아닌 응답은 캐시에 저장하지 않고 그대로 반환한다.
+        """
+        key = cache_key(url, params)
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        meta, body = self._read_entry(digest)
+
+        if meta is not None and time.time() - meta['fetched_at'] < ttl_seconds:
+            self._count('hits')
+            self._touch(digest)
+            return CachedPage(url, key, 200, body, meta['content_hash'], 'cache', encoding or meta.get('encoding') or 'utf-8')
+
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        response = session.get(url, params=params, headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and meta is not None:
+            self._count('revalidated')
+            meta['fetched_at'] = time.time()
+            self._write_meta(digest, meta)
+            self._touch(digest)
+            return CachedPage(url, key, 200, body, meta['content_hash'], 'revalidated', encoding or meta.get('encoding') or 'utf-8')
+
+        self._count('misses')
+        content = response.content
+        page = CachedPage(url, key, response.status_code, content, content_hash(content), 'network',
+                          encoding or response.encoding or 'utf-8')
+        if response.status_code != 200:
+            return page
+        if meta is not None and meta['content_hash'] == page.content_hash:
+            self._count('same_content')
+        self._store(digest, {
+            'key': key,
+            'fetched_at': time.time(),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_hash': page.content_hash,
+            'encoding': page.encoding,
+        }, content)
+        return page
+
+    # ------------------------------------------------------------------ 처리 완료 기록
+
+    def is_processed(self, key: str, fingerprint: str) -> bool:
+        """key의 마지막 처리(파싱 + 저장) 내용이 fingerprint와 같으면 True (처리 생략 통계 집계)"""
+        with self._lock:
+            processed = self._processed.get(key) == fingerprint
+            if processed:
+                self._stats['skipped'] += 1
+            return processed
+
+    def mark_processed(self, key: str, fingerprint: str):
+        """key의 내용을 fingerprint 상태로 처리 완료 (DB 저장 성공 후 호출)"""
+        with self._lock:
+            self._processed[key] = fingerprint
+            data = json.dumps(self._processed, sort_keys=True).encode('utf-8')
+            self._write_atomic(os.path.join(self.directory, _PROCESSED_FILE), data)
+
+    def clear(self):
+        """캐시 항목과 처리 완료 기록 모두 삭제"""
+        with self._lock:
+            digests = list(self._index)
+            self._index.clear()
+            self._processed = {}
+        for digest in digests:
+            for suffix in ('.body', '.json'):
+                try:
+                    os.remove(self._path(digest, suffix))
+                except OSError:
+                    pass
+        try:
+            os.remove(os.path.join(self.directory, _PROCESSED_FILE))
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------ 통계
+
+    def stats(self) -> dict:
+        """{'hits', 'revalidated', 'misses', 'same_content', 'skipped', 'evictions', 'entries', 'bytes', 'hit_rate'}"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._index)
+            stats['bytes'] = sum(self._index.values())
+        requests_total = stats['hits'] + stats['revalidated'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['revalidated']) / requests_total, 3) if requests_total else 0.0
+        return stats
+
+    def log_stats(self, title: str = "스크래핑 캐시"):
+        stats = self.stats()
+        logger.info(
+            f"[{title}] 적중 {stats['hits']}  재검증(304) {stats['revalidated']}  미스 {stats['misses']} "
+            f"(내용 동일 {stats['same_content']})  적중률 {stats['hit_rate']:.0%}  처리 생략 {stats['skipped']}  "
+            f"삭제 {stats['evictions']}  항목 {stats['entries']}개 / {stats['bytes'] / 1024 / 1024:.1f}MB"
+        )
+
+
+def open_scrape_cache(ttl_seconds: float = None) -> ScrapeCache:
+    """설정(scrape_cache_dir, scrape_cache_max_mb, scrape_cache_ttl_seconds)으로 캐시 생성"""
+    from app.database import settings
+
+    return ScrapeCache(
+        settings.scrape_cache_dir,
+        max_bytes=settings.scrape_cache_max_mb * 1024 * 1024,
+        ttl_seconds=settings.scrape_cache_ttl_seconds if ttl_seconds is None else ttl_seconds,
+    )
@@ -1,5 +1,7 @@
 """
 Seeking Alpha에서 미국 ETF 배당 정보를 스크래핑하는 스크립트
+
+HTTP 요청 + HTML 파싱으로 먼저 시도하고, 테이블을 찾지 못한 티커만 Selenium 브라우저로 수집한다.
 """
 import os
 import sys
@@ -12,13 +14,12 @@ backend_dir = os.path.dirname(app_dir)  # backend-fastapi
 if backend_dir not in sys.path:
     sys.path.insert(0, backend_dir)
 
-from selenium import webdriver
+import argparse
+import threading
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 import pandas as pd
 import time
 import logging
@@ -27,6 +28,14 @@ from decimal import Decimal
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.crud import usa_etfs, usa_etfs_dividend
+from app.scrapers.browser_pool import (
+    DEFAULT_USER_AGENT, BrowserPool, StageTimer, default_pool_size, wait_document_ready, wait_until,
+)
+from app.scrapers.fetch_strategy import (
+    FetchStrategy, SourceStats, create_http_session, parse_html_tables, table_to_records,
+)
+from app.scrapers.scrape_cache import ScrapeCache, content_hash, open_scrape_cache
+from app.services.batch_jobs import run_batch_job
 
 # 로깅 설정
 logging.basicConfig(
@@ -86,21 +95,18 @@ def parse_dividend_amount(amount_str: str) -> Decimal:
         return None
 
 
-def scrape_usa_etf_dividend(ticker: str = "QYLD", save_to_db: bool = True, years: list = [2024, 2025]):
-    """
-    Seeking Alpha에서 미국 ETF 배당 정보를 스크래핑
-    
-    Args:
-        ticker: ETF 티커 (기본값: QYLD)
-        save_to_db: 데이터베이스에 저장할지 여부 (기본값: True)
-        years: 가져올 연도 리스트 (기본값: [2024, 2025])
-    
-    Returns:
-        list: 스크래핑한 배당 데이터 리스트
-    """
-    url = f"https://seekingalpha.com/symbol/{ticker}/dividends/history"
-    
-    # Chrome 옵션 설정 (사람처럼 보이도록)
+CAPTCHA_INDICATORS = [
+    "계속하기 전에",
+    "길게 누르기",
+    "로봇이 아니라 사람인지 확인",
+    "verify",
+    "captcha",
+    "challenge"
+]
+
+
+def seeking_alpha_chrome_options() -> Options:
+    """Seeking Alpha용 Chrome 옵션 (사람처럼 보이도록)"""
     chrome_options = Options()
     # 헤드리스 모드 비활성화 (사람처럼 보이기 위해)
     # chrome_options.add_argument('--headless')
@@ -112,374 +118,394 @@ def scrape_usa_etf_dividend(ticker: str = "QYLD", save_to_db: bool = True, years
     chrome_options.add_argument('--window-size=1920,1080')
     chrome_options.add_argument('--start-maximized')
     # 더 현실적인 User-Agent
-    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-    
-    driver = None
-    db: Session = None
+    chrome_options.add_argument(f'user-agent={DEFAULT_USER_AGENT}')
+    return chrome_options
+
+
+def hide_webdriver_flag(driver):
+    """자동화 감지 방지를 위한 JavaScript 등록 (드라이버 생성 시 한 번)"""
+    driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+        'source': '''
+            Object.defineProperty(navigator, 'webdriver', {
+                get: () => undefined
+            });
+        '''
+    })
+
+
+def create_browser_pool(size: int = None, timer: StageTimer = None) -> BrowserPool:
+    """Seeking Alpha 스크래핑용 브라우저 풀"""
+    return BrowserPool(size=size, options_factory=seeking_alpha_chrome_options, on_create=hide_webdriver_flag, timer=timer)
+
+
+def _captcha_present(driver) -> bool:
+    page_text = driver.page_source.lower()
+    page_title = driver.title.lower()
+    return any(indicator.lower() in page_text or indicator.lower() in page_title for indicator in CAPTCHA_INDICATORS)
+
+
+def _is_dividend_headers(headers: list) -> bool:
+    """헤더에 "Record Date", "Adj. Amount"가 모두 있는지"""
+    headers_lower = [header.strip().lower() for header in headers]
+    return any('record' in h and 'date' in h for h in headers_lower) and \
+        any('adj' in h and 'amount' in h for h in headers_lower)
+
+
+def _find_dividend_table(driver):
+    """헤더에 "Record Date", "Adj. Amount"가 있는 배당 히스토리 테이블 (없으면 False)"""
+    for tbl in driver.find_elements(By.TAG_NAME, "table"):
+        try:
+            header_cells = tbl.find_elements(By.CSS_SELECTOR, "thead tr th")
+            if _is_dividend_headers([cell.text for cell in header_cells]):
+                return tbl
+        except Exception:
+            continue
+    return False
+
+
+def dividend_history_url(ticker: str) -> str:
+    return f"https://seekingalpha.com/symbol/{ticker}/dividends/history"
+
+
+def fetch_dividend_rows_http(ticker: str, session, timeout: float = 15, cache: ScrapeCache = None) -> list:
+    """
+    브라우저 없이 HTTP 요청 + HTML 파싱으로 배당 히스토리 테이블 행 추출
+
+    서버에서 렌더링된 HTML에 Selenium 경로와 같은 테이블(헤더에 "Record Date", "Adj. Amount")이 있을 때만 성공.
+    JavaScript로 그려지는 페이지이거나 CAPTCHA / 차단 응답이면 빈 리스트 (브라우저 경로로 폴백)
+
+    Args:
+        cache: 응답 디스크 캐시 (유효시간 안이면 요청하지 않고, 지나면 ETag / Last-Modified로 재검증)
+
+    Returns:
+        list: {헤더: 셀 텍스트} dict 리스트
+    """
+    if cache is not None:
+        response = cache.fetch(session, dividend_history_url(ticker), timeout=timeout)
+    else:
+        response = session.get(dividend_history_url(ticker), timeout=timeout)
+    if response.status_code != 200:
+        logger.info(f"[{ticker}] HTTP 응답 코드 {response.status_code} - 테이블을 가져오지 못했습니다.")
+        return []
+
+    for table in parse_html_tables(response.text):
+        if _is_dividend_headers(table['headers']):
+            rows = table_to_records(table)
+            logger.info(f"[{ticker}] HTTP 응답에서 배당 테이블을 찾았습니다. ({len(rows)}행)")
+            return rows
+    return []
+
+
+def fetch_dividend_rows_browser(ticker: str, driver, timer: StageTimer = None) -> list:
+    """
+    Selenium으로 배당 히스토리 테이블 행 추출 (CAPTCHA 대기, 지연 로딩 대응)
+
+    Returns:
+        list: {헤더: 셀 텍스트} dict 리스트 (테이블을 찾지 못하면 빈 리스트)
+    """
+    timer = timer or StageTimer()
+    url = dividend_history_url(ticker)
+
+    # 페이지 접속 (문서 로딩 완료까지 대기)
+    with timer.stage('load'):
+        logger.info(f"[{ticker}] 페이지 접속 중: {url}")
+        driver.get(url)
+        wait_document_ready(driver)
     
+    # CAPTCHA 확인 및 대기
     try:
-        # 데이터베이스 세션 생성
-        if save_to_db:
-            db = SessionLocal()
-            etf = usa_etfs.get_usa_etf_by_ticker(db, ticker)
-            if not etf:
-                logger.error(f"티커 {ticker}에 해당하는 ETF를 데이터베이스에서 찾을 수 없습니다.")
-                return []
-        
-        # Chrome 드라이버 초기화
-        logger.info("Chrome 드라이버를 초기화합니다...")
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        # 자동화 감지 방지를 위한 JavaScript 실행
-        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-            'source': '''
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-            '''
-        })
-        
-        # 페이지 접속
-        logger.info(f"페이지 접속 중: {url}")
-        driver.get(url)
-        
-        # 페이지 로딩 대기 (더 긴 대기 시간)
-        wait = WebDriverWait(driver, 30)
-        time.sleep(5)  # 초기 로딩 대기
-        
-        # CAPTCHA 확인 및 대기
-        try:
-            captcha_indicators = [
-                "계속하기 전에",
-                "길게 누르기",
-                "로봇이 아니라 사람인지 확인",
-                "verify",
-                "captcha",
-                "challenge"
-            ]
+        if _captcha_present(driver):
+            logger.warning("="*60)
+            logger.warning(f"[{ticker}] CAPTCHA가 감지되었습니다!")
+            logger.warning("브라우저 창에서 CAPTCHA를 수동으로 해결해주세요.")
+            logger.warning("CAPTCHA 해결 후 60초 이내에 페이지가 로드되면 자동으로 계속됩니다.")
+            logger.warning("="*60)
             
-            page_text = driver.page_source.lower()
-            page_title = driver.title.lower()
-            
-            captcha_found = False
-            for indicator in captcha_indicators:
-                if indicator.lower() in page_text or indicator.lower() in page_title:
-                    captcha_found = True
-                    break
-            
-            if captcha_found:
-                logger.warning("="*60)
-                logger.warning("CAPTCHA가 감지되었습니다!")
-                logger.warning("브라우저 창에서 CAPTCHA를 수동으로 해결해주세요.")
-                logger.warning("CAPTCHA 해결 후 60초 이내에 페이지가 로드되면 자동으로 계속됩니다.")
-                logger.warning("="*60)
-                
-                # CAPTCHA 해결 대기 (최대 60초)
-                max_wait_time = 60
-                check_interval = 2
-                waited_time = 0
-                
-                while waited_time < max_wait_time:
-                    time.sleep(check_interval)
-                    waited_time += check_interval
-                    
-                    # CAPTCHA가 해결되었는지 확인
-                    current_text = driver.page_source.lower()
-                    current_title = driver.title.lower()
-                    captcha_still_present = False
-                    
-                    for indicator in captcha_indicators:
-                        if indicator.lower() in current_text or indicator.lower() in current_title:
-                            captcha_still_present = True
-                            break
-                    
-                    if not captcha_still_present:
-                        logger.info(f"CAPTCHA가 해결된 것으로 보입니다. 계속 진행합니다. (대기 시간: {waited_time}초)")
-                        break
-                    
-                    if waited_time % 10 == 0:
-                        logger.info(f"CAPTCHA 해결 대기 중... ({waited_time}/{max_wait_time}초)")
-                
-                if waited_time >= max_wait_time:
-                    logger.error("CAPTCHA 해결 시간 초과. 스크래핑을 중단합니다.")
-                    return []
-        except Exception as e:
-            logger.warning(f"CAPTCHA 확인 중 오류 (계속 진행): {e}")
-        
-        time.sleep(3)  # 추가 로딩 대기
-        
-        # 사람처럼 스크롤 (페이지가 완전히 로드되도록)
-        logger.info("페이지 스크롤 중...")
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight/3);")
-        time.sleep(2)
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-        time.sleep(2)
+            # CAPTCHA 해결 대기 (최대 60초, 2초 간격 확인)
+            with timer.stage('captcha'):
+                solved = wait_until(driver, lambda d: not _captcha_present(d), timeout=60, poll_frequency=2, default=False)
+            if not solved:
+                logger.error(f"[{ticker}] CAPTCHA 해결 시간 초과. 스크래핑을 중단합니다.")
+                return []
+            logger.info(f"[{ticker}] CAPTCHA가 해결된 것으로 보입니다. 계속 진행합니다.")
+            wait_document_ready(driver)
+    except Exception as e:
+        logger.warning(f"CAPTCHA 확인 중 오류 (계속 진행): {e}")
+    
+    # 배당 테이블 찾기 (지연 로딩되는 콘텐츠를 불러오도록 스크롤한 뒤 테이블이 렌더링될 때까지 대기)
+    with timer.stage('table'):
+        logger.info(f"[{ticker}] 배당 테이블 찾는 중...")
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(3)
-        driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(2)
-        
-        # 배당 테이블 찾기
-        logger.info("배당 테이블 찾는 중...")
-        
-        # 동적 콘텐츠 로딩을 위한 추가 대기
-        time.sleep(5)
+        history_section = wait_until(
+            driver,
+            lambda d: (d.find_elements(By.XPATH, "//*[contains(text(), 'Dividend History')]")
+                       or d.find_elements(By.XPATH, "//h2[contains(text(), 'Dividend')]")
+                       or d.find_elements(By.XPATH, "//h3[contains(text(), 'Dividend')]")),
+            timeout=15,
+            default=[],
+        )
+        if history_section:
+            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", history_section[0])
+        else:
+            logger.warning(f"[{ticker}] Dividend History 섹션을 찾지 못했습니다. 계속 진행합니다.")
         
-        # 페이지가 완전히 로드될 때까지 대기
+        # 방법 1: 배당 히스토리 테이블 (헤더에 "Record Date", "Adj. Amount"가 있는 테이블)
+        table = wait_until(driver, _find_dividend_table, timeout=20, poll_frequency=0.5, default=None)
+        if table:
+            logger.info(f"[{ticker}] 배당 히스토리 테이블을 찾았습니다.")
+    
+    # 방법 2: 제공된 XPath로 시도
+    if not table:
         try:
-            WebDriverWait(driver, 30).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
-        except:
-            pass
-        
-        # 배당 히스토리 섹션으로 스크롤
+            xpath = "/html/body/div[3]/div/div[1]/div/main/div[2]/div[2]/div/div/div[1]/div/div[2]/section[4]/div/div[2]/div/div[3]"
+            table = WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.XPATH, xpath)))
+            logger.info("XPath로 테이블을 찾았습니다.")
+        except Exception as e:
+            logger.warning(f"XPath로 테이블을 찾지 못했습니다: {e}")
+    
+    # 방법 3: div 기반 테이블 구조 확인
+    if not table:
+        logger.info("div 기반 테이블 구조를 확인합니다...")
         try:
-            # 여러 가능한 텍스트 패턴으로 섹션 찾기
-            history_xpaths = [
-                "//*[contains(text(), 'Dividend History')]",
-                "//*[contains(text(), 'dividend history')]",
-                "//*[contains(text(), 'Dividend') and contains(text(), 'History')]",
-                "//h2[contains(text(), 'Dividend')]",
-                "//h3[contains(text(), 'Dividend')]",
-            ]
-            for xpath in history_xpaths:
+            # "Record Date" 텍스트가 있는 요소 주변 찾기
+            record_date_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Record Date') or contains(text(), 'record date')]")
+            logger.info(f"'Record Date' 텍스트를 포함한 요소 {len(record_date_elements)}개를 찾았습니다.")
+            
+            for elem in record_date_elements:
                 try:
-                    history_section = driver.find_element(By.XPATH, xpath)
-                    driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", history_section)
-                    time.sleep(3)
-                    logger.info(f"Dividend History 섹션을 찾았습니다: {xpath}")
+                    # 부모 요소들을 거슬러 올라가서 테이블 구조 찾기
+                    parent = elem.find_element(By.XPATH, "./ancestor::table[1]")
+                    table = parent
+                    logger.info("Record Date 텍스트 근처에서 테이블을 찾았습니다.")
                     break
                 except:
-                    continue
-        except:
-            logger.warning("Dividend History 섹션을 찾지 못했습니다. 계속 진행합니다.")
-        
-        # 추가 대기 (JavaScript 실행 대기)
-        time.sleep(5)
-        
-        # 여러 방법으로 테이블 찾기 시도
-        table = None
-        
-        # 방법 1: 모든 테이블 찾기
-        tables = driver.find_elements(By.TAG_NAME, "table")
-        logger.info(f"페이지에서 {len(tables)}개의 table 태그를 찾았습니다.")
-        
-        # 배당 히스토리 테이블 찾기 (헤더에 "Record Date", "Pay Date", "Adj. Amount"가 있는 테이블)
-        for tbl in tables:
-            try:
-                # thead 확인
-                thead = tbl.find_element(By.TAG_NAME, "thead")
-                header_row = thead.find_element(By.TAG_NAME, "tr")
-                header_cells = header_row.find_elements(By.TAG_NAME, "th")
-                headers = [cell.text.strip() for cell in header_cells]
-                logger.info(f"테이블 헤더 발견: {headers}")
-                
-                # 배당 히스토리 테이블의 특징적인 헤더 확인
-                headers_lower = [h.lower() for h in headers]
-                if any('record' in h and 'date' in h for h in headers_lower) and \
-                   any('adj' in h and 'amount' in h for h in headers_lower):
-                    table = tbl
-                    logger.info(f"배당 히스토리 테이블을 찾았습니다! 헤더: {headers}")
-                    break
-            except Exception as e:
-                logger.debug(f"테이블 헤더 확인 중 오류: {e}")
-                continue
-        
-        # 방법 2: 제공된 XPath로 시도
-        if not table:
-            try:
-                xpath = "/html/body/div[3]/div/div[1]/div/main/div[2]/div[2]/div/div/div[1]/div/div[2]/section[4]/div/div[2]/div/div[3]"
-                table = wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
-                logger.info("XPath로 테이블을 찾았습니다.")
-            except Exception as e:
-                logger.warning(f"XPath로 테이블을 찾지 못했습니다: {e}")
-        
-        # 방법 3: div 기반 테이블 구조 확인
-        if not table:
-            logger.info("div 기반 테이블 구조를 확인합니다...")
-            try:
-                # "Record Date" 텍스트가 있는 요소 주변 찾기
-                record_date_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Record Date') or contains(text(), 'record date')]")
-                logger.info(f"'Record Date' 텍스트를 포함한 요소 {len(record_date_elements)}개를 찾았습니다.")
-                
-                for elem in record_date_elements:
                     try:
-                        # 부모 요소들을 거슬러 올라가서 테이블 구조 찾기
-                        parent = elem.find_element(By.XPATH, "./ancestor::table[1]")
+                        # div 구조인 경우
+                        parent = elem.find_element(By.XPATH, "./ancestor::div[contains(@class, 'table') or contains(@class, 'grid')][1]")
                         table = parent
-                        logger.info("Record Date 텍스트 근처에서 테이블을 찾았습니다.")
+                        logger.info("Record Date 텍스트 근처에서 div 테이블을 찾았습니다.")
                         break
                     except:
-                        try:
-                            # div 구조인 경우
-                            parent = elem.find_element(By.XPATH, "./ancestor::div[contains(@class, 'table') or contains(@class, 'grid')][1]")
-                            table = parent
-                            logger.info("Record Date 텍스트 근처에서 div 테이블을 찾았습니다.")
-                            break
-                        except:
-                            continue
-            except Exception as e:
-                logger.warning(f"div 기반 테이블 찾기 중 오류: {e}")
+                        continue
+        except Exception as e:
+            logger.warning(f"div 기반 테이블 찾기 중 오류: {e}")
+    
+    if not table:
+        logger.error(f"배당 히스토리 테이블을 찾을 수 없습니다.")
+        logger.error(f"페이지 URL: {driver.current_url}")
+        logger.error(f"페이지 제목: {driver.title}")
         
-        if not table:
-            logger.error(f"배당 히스토리 테이블을 찾을 수 없습니다.")
-            logger.error(f"페이지 URL: {driver.current_url}")
-            logger.error(f"페이지 제목: {driver.title}")
-            
-            # 디버깅: 페이지 소스 일부 확인
-            try:
-                page_source = driver.page_source
-                if 'Record Date' in page_source or 'record date' in page_source.lower():
-                    logger.info("페이지 소스에 'Record Date' 텍스트가 있습니다.")
-                else:
-                    logger.warning("페이지 소스에 'Record Date' 텍스트가 없습니다.")
-                
-                # 페이지 소스 일부 저장 (디버깅용)
-                with open(f"debug_page_source_{ticker}.html", "w", encoding="utf-8") as f:
-                    f.write(page_source[:50000])  # 처음 50KB만 저장
-                logger.info(f"페이지 소스를 debug_page_source_{ticker}.html 파일에 저장했습니다.")
-            except Exception as e:
-                logger.error(f"페이지 소스 확인 중 오류: {e}")
+        # 디버깅: 페이지 소스 일부 확인
+        try:
+            page_source = driver.page_source
+            if 'Record Date' in page_source or 'record date' in page_source.lower():
+                logger.info("페이지 소스에 'Record Date' 텍스트가 있습니다.")
+            else:
+                logger.warning("페이지 소스에 'Record Date' 텍스트가 없습니다.")
             
-            return []
+            # 페이지 소스 일부 저장 (디버깅용)
+            with open(f"debug_page_source_{ticker}.html", "w", encoding="utf-8") as f:
+                f.write(page_source[:50000])  # 처음 50KB만 저장
+            logger.info(f"페이지 소스를 debug_page_source_{ticker}.html 파일에 저장했습니다.")
+        except Exception as e:
+            logger.error(f"페이지 소스 확인 중 오류: {e}")
         
-        # 테이블 헤더 찾기
-        headers = []
+        return []
+    
+    # 테이블 헤더 찾기
+    headers = []
+    try:
+        thead = table.find_element(By.TAG_NAME, "thead")
+        header_row = thead.find_element(By.TAG_NAME, "tr")
+        header_cells = header_row.find_elements(By.TAG_NAME, "th")
+        headers = [cell.text.strip() for cell in header_cells]
+        logger.info(f"테이블 헤더: {headers}")
+    except:
+        logger.warning("테이블 헤더를 찾을 수 없습니다. 기본 헤더를 사용합니다.")
+    
+    # 테이블 행 찾기
+    rows = []
+    try:
+        # tbody 내의 행들 찾기
+        tbody = table.find_element(By.TAG_NAME, "tbody")
+        rows = tbody.find_elements(By.TAG_NAME, "tr")
+    except:
         try:
-            thead = table.find_element(By.TAG_NAME, "thead")
-            header_row = thead.find_element(By.TAG_NAME, "tr")
-            header_cells = header_row.find_elements(By.TAG_NAME, "th")
-            headers = [cell.text.strip() for cell in header_cells]
-            logger.info(f"테이블 헤더: {headers}")
+            # tbody가 없으면 직접 tr 찾기 (헤더 행 제외)
+            all_rows = table.find_elements(By.TAG_NAME, "tr")
+            rows = all_rows[1:] if len(all_rows) > 1 else all_rows
         except:
-            logger.warning("테이블 헤더를 찾을 수 없습니다. 기본 헤더를 사용합니다.")
-        
-        # 테이블 행 찾기
-        rows = []
+            logger.error("테이블 행을 찾을 수 없습니다.")
+            return []
+    
+    logger.info(f"총 {len(rows)}개의 데이터 행을 찾았습니다.")
+    
+    # 데이터프레임을 위한 데이터 리스트
+    df_data = []
+    
+    for idx, row in enumerate(rows, 1):
         try:
-            # tbody 내의 행들 찾기
-            tbody = table.find_element(By.TAG_NAME, "tbody")
-            rows = tbody.find_elements(By.TAG_NAME, "tr")
-        except:
-            try:
-                # tbody가 없으면 직접 tr 찾기 (헤더 행 제외)
-                all_rows = table.find_elements(By.TAG_NAME, "tr")
-                rows = all_rows[1:] if len(all_rows) > 1 else all_rows
-            except:
-                logger.error("테이블 행을 찾을 수 없습니다.")
-                return []
-        
-        logger.info(f"총 {len(rows)}개의 데이터 행을 찾았습니다.")
-        
-        # 데이터프레임을 위한 데이터 리스트
-        df_data = []
-        
-        for idx, row in enumerate(rows, 1):
-            try:
-                cells = row.find_elements(By.TAG_NAME, "td")
-                if len(cells) == 0:
-                    continue
-                
-                # 각 셀의 텍스트 추출
-                row_data = {}
-                for i, cell in enumerate(cells):
-                    header_name = headers[i] if i < len(headers) else f"Column_{i}"
-                    row_data[header_name] = cell.text.strip()
-                
-                df_data.append(row_data)
-                logger.debug(f"행 {idx} 데이터: {row_data}")
-                
-            except Exception as e:
-                logger.error(f"행 {idx} 처리 중 오류: {e}")
+            cells = row.find_elements(By.TAG_NAME, "td")
+            if len(cells) == 0:
                 continue
+            
+            # 각 셀의 텍스트 추출
+            row_data = {}
+            for i, cell in enumerate(cells):
+                header_name = headers[i] if i < len(headers) else f"Column_{i}"
+                row_data[header_name] = cell.text.strip()
+            
+            df_data.append(row_data)
+            logger.debug(f"행 {idx} 데이터: {row_data}")
+            
+        except Exception as e:
+            logger.error(f"행 {idx} 처리 중 오류: {e}")
+            continue
+    
+    return df_data
+
+
+def parse_dividend_rows(df_data: list, years: list) -> list:
+    """
+    배당 히스토리 테이블 행({헤더: 셀 텍스트})을 배당 데이터로 변환 (HTTP / 브라우저 경로 공통)
+
+    Returns:
+        list: {'record_date', 'payment_date', 'dividend_amt'} 리스트 (years에 해당하는 Record Date만)
+    """
+    df = pd.DataFrame(df_data)
+    logger.info(f"데이터프레임 생성 완료: {len(df)}행, {len(df.columns)}열")
+    logger.info(f"컬럼명: {list(df.columns)}")
+    
+    # 컬럼명 매핑 및 데이터 변환
+    dividends_data = []
+    
+    # 컬럼명 매핑 (대소문자 무시, 공백 무시)
+    record_date_col = None
+    payment_date_col = None
+    dividend_amt_col = None
+    
+    for col in df.columns:
+        col_lower = col.lower().strip()
+        if 'record' in col_lower and 'date' in col_lower:
+            record_date_col = col
+        elif ('pay' in col_lower or 'payment' in col_lower) and 'date' in col_lower:
+            payment_date_col = col
+        elif 'adj' in col_lower and 'amount' in col_lower:
+            dividend_amt_col = col
+        elif 'amount' in col_lower and not dividend_amt_col:
+            dividend_amt_col = col
+    
+    logger.info(f"컬럼 매핑: Record Date={record_date_col}, Pay Date={payment_date_col}, Adj. Amount={dividend_amt_col}")
+    
+    if not record_date_col or not dividend_amt_col:
+        logger.error(f"필수 컬럼을 찾을 수 없습니다. Record Date: {record_date_col}, Adj. Amount: {dividend_amt_col}")
+        logger.info(f"사용 가능한 컬럼: {list(df.columns)}")
+        return []
+    
+    # 데이터프레임 처리
+    for idx, row in df.iterrows():
+        try:
+            # Record Date 파싱
+            record_date_str = str(row[record_date_col]).strip()
+            record_date = parse_date(record_date_str)
+            
+            if not record_date:
+                logger.warning(f"행 {idx}: Record Date 파싱 실패 - {record_date_str}")
+                continue
+            
+            # 연도 필터링
+            if record_date.year not in years:
+                continue
+            
+            # Pay Date 파싱
+            payment_date = None
+            if payment_date_col and payment_date_col in row:
+                payment_date_str = str(row[payment_date_col]).strip()
+                payment_date = parse_date(payment_date_str)
+            
+            # payment_date가 없으면 record_date와 동일하게 설정
+            if not payment_date:
+                payment_date = record_date
+            
+            # Adj. Amount 파싱
+            dividend_amt_str = str(row[dividend_amt_col]).strip()
+            dividend_amt = parse_dividend_amount(dividend_amt_str)
+            
+            if not dividend_amt:
+                logger.warning(f"행 {idx}: Adj. Amount 파싱 실패 - {dividend_amt_str}")
+                continue
+            
+            dividend_info = {
+                'record_date': record_date,
+                'payment_date': payment_date,
+                'dividend_amt': dividend_amt
+            }
+            
+            dividends_data.append(dividend_info)
+            logger.info(f"배당 데이터 추출: {record_date} - ${dividend_amt}")
+            
+        except Exception as e:
+            logger.error(f"행 {idx} 처리 중 오류: {e}")
+            continue
+    
+    return dividends_data
+
+
+def scrape_usa_etf_dividend(ticker: str = "QYLD", save_to_db: bool = True, years: list = [2024, 2025],
+                            driver=None, timer: StageTimer = None, fetch_rows=None, cache: ScrapeCache = None):
+    """
+    Seeking Alpha에서 미국 ETF 배당 정보를 스크래핑
+    
+    Args:
+        ticker: ETF 티커 (기본값: QYLD)
+        save_to_db: 데이터베이스에 저장할지 여부 (기본값: True)
+        years: 가져올 연도 리스트 (기본값: [2024, 2025])
+        driver: 사용할 Chrome 드라이버 (브라우저 풀에서 빌린 드라이버, None이면 새로 띄우고 종료)
+        timer: 단계별 소요 시간을 기록할 StageTimer
+        fetch_rows: ticker -> 테이블 행 리스트 함수 (HTTP 우선 수집 전략 등, 지정하면 driver는 사용하지 않음)
+        cache: 스크래핑 캐시 (지난번에 저장한 것과 같은 테이블이면 파싱 / DB 저장을 건너뜀)
+    
+    Returns:
+        list: 스크래핑한 배당 데이터 리스트 (테이블이 지난번 저장 때와 같아서 건너뛰면 None)
+    """
+    if fetch_rows is None and driver is None:
+        # 단독 실행: 드라이버 하나짜리 풀을 만들어서 사용 후 종료
+        with create_browser_pool(size=1, timer=timer) as pool, pool.acquire() as pooled_driver:
+            return scrape_usa_etf_dividend(ticker, save_to_db=save_to_db, years=years, driver=pooled_driver, timer=timer)
+    
+    timer = timer or StageTimer()
+    if fetch_rows is None:
+        fetch_rows = lambda symbol: fetch_dividend_rows_browser(symbol, driver, timer)
+    db: Session = None
+    
+    try:
+        # 데이터베이스 세션 생성
+        if save_to_db:
+            db = SessionLocal()
+            etf = usa_etfs.get_usa_etf_by_ticker(db, ticker)
+            if not etf:
+                logger.error(f"티커 {ticker}에 해당하는 ETF를 데이터베이스에서 찾을 수 없습니다.")
+                return []
         
-        # 데이터프레임 생성
+        df_data = fetch_rows(ticker)
         if not df_data:
             logger.warning("추출된 데이터가 없습니다.")
             return []
         
-        df = pd.DataFrame(df_data)
-        logger.info(f"데이터프레임 생성 완료: {len(df)}행, {len(df.columns)}열")
-        logger.info(f"컬럼명: {list(df.columns)}")
-        
-        # 컬럼명 매핑 및 데이터 변환
-        dividends_data = []
-        
-        # 컬럼명 매핑 (대소문자 무시, 공백 무시)
-        record_date_col = None
-        payment_date_col = None
-        dividend_amt_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'record' in col_lower and 'date' in col_lower:
-                record_date_col = col
-            elif ('pay' in col_lower or 'payment' in col_lower) and 'date' in col_lower:
-                payment_date_col = col
-            elif 'adj' in col_lower and 'amount' in col_lower:
-                dividend_amt_col = col
-            elif 'amount' in col_lower and not dividend_amt_col:
-                dividend_amt_col = col
-        
-        logger.info(f"컬럼 매핑: Record Date={record_date_col}, Pay Date={payment_date_col}, Adj. Amount={dividend_amt_col}")
-        
-        if not record_date_col or not dividend_amt_col:
-            logger.error(f"필수 컬럼을 찾을 수 없습니다. Record Date: {record_date_col}, Adj. Amount: {dividend_amt_col}")
-            logger.info(f"사용 가능한 컬럼: {list(df.columns)}")
-            return []
-        
-        # 데이터프레임 처리
-        for idx, row in df.iterrows():
-            try:
-                # Record Date 파싱
-                record_date_str = str(row[record_date_col]).strip()
-                record_date = parse_date(record_date_str)
-                
-                if not record_date:
-                    logger.warning(f"행 {idx}: Record Date 파싱 실패 - {record_date_str}")
-                    continue
-                
-                # 연도 필터링
-                if record_date.year not in years:
-                    continue
-                
-                # Pay Date 파싱
-                payment_date = None
-                if payment_date_col and payment_date_col in row:
-                    payment_date_str = str(row[payment_date_col]).strip()
-                    payment_date = parse_date(payment_date_str)
-                
-                # payment_date가 없으면 record_date와 동일하게 설정
-                if not payment_date:
-                    payment_date = record_date
-                
-                # Adj. Amount 파싱
-                dividend_amt_str = str(row[dividend_amt_col]).strip()
-                dividend_amt = parse_dividend_amount(dividend_amt_str)
-                
-                if not dividend_amt:
-                    logger.warning(f"행 {idx}: Adj. Amount 파싱 실패 - {dividend_amt_str}")
-                    continue
-                
-                dividend_info = {
-                    'record_date': record_date,
-                    'payment_date': payment_date,
-                    'dividend_amt': dividend_amt
-                }
-                
-                dividends_data.append(dividend_info)
-                logger.info(f"배당 데이터 추출: {record_date} - ${dividend_amt}")
-                
-            except Exception as e:
-                logger.error(f"행 {idx} 처리 중 오류: {e}")
-                continue
+        # 테이블 내용 해시가 지난번 저장 때와 같으면 파싱 / 저장 생략 (HTTP / 브라우저 어느 경로로 가져와도 같은 해시)
+        processed_key = f"usa-etf-dividends:{ticker}:{','.join(map(str, years))}"
+        fingerprint = content_hash(df_data)
+        if cache is not None and save_to_db and cache.is_processed(processed_key, fingerprint):
+            logger.info(f"[{ticker}] 배당 테이블이 지난번 저장 때와 같습니다. 파싱 / 저장을 건너뜁니다.")
+            return None
         
-        logger.info(f"총 {len(dividends_data)}개의 배당 데이터를 추출했습니다.")
+        with timer.stage('parse'):
+            dividends_data = parse_dividend_rows(df_data, years)
+        logger.info(f"[{ticker}] 총 {len(dividends_data)}개의 배당 데이터를 추출했습니다.")
         
         # 데이터베이스에 저장
         if save_to_db and db and etf and dividends_data:
+            save_started = time.perf_counter()
             try:
                 dividends_to_save = []
                 for div_data in dividends_data:
@@ -494,12 +520,15 @@ def scrape_usa_etf_dividend(ticker: str = "QYLD", save_to_db: bool = True, years
                 if dividends_to_save:
                     result = usa_etfs_dividend.bulk_upsert_usa_etf_dividends(db, dividends_to_save)
                     logger.info(f"{result['created']}개의 배당 정보를 생성하고 {result['updated']}개의 배당 정보를 업데이트했습니다.")
+                    if cache is not None:
+                        cache.mark_processed(processed_key, fingerprint)
             except Exception as e:
                 logger.error(f"데이터베이스 저장 중 오류 발생: {e}")
                 import traceback
                 traceback.print_exc()
                 if db:
                     db.rollback()
+            timer.record('save', time.perf_counter() - save_started)
         
         return dividends_data
         
@@ -511,19 +540,62 @@ def scrape_usa_etf_dividend(ticker: str = "QYLD", save_to_db: bool = True, years
             db.rollback()
         return []
     finally:
-        if driver:
-            driver.quit()
         if db:
             db.close()
 
 
-def scrape_all_usa_etf_dividends(ticker: str = None, years: list = [2024, 2025]):
+FETCH_STRATEGIES = ('auto', 'http', 'browser')
+
+
+def create_fetch_strategy(strategy: str, pool: BrowserPool = None, session=None, timer: StageTimer = None,
+                          stats: SourceStats = None, cache: ScrapeCache = None) -> FetchStrategy:
+    """
+    배당 테이블 수집 전략
+
+    Args:
+        strategy: 'auto' (HTTP 먼저, 실패 시 브라우저) / 'http' (HTTP만) / 'browser' (브라우저만)
+        pool: 브라우저 경로에서 사용할 풀 (드라이버는 처음 폴백할 때 생성, 동시 폴백은 풀 크기까지만)
+        session: HTTP 경로에서 사용할 세션 (연결 풀 재사용)
+        cache: HTTP 경로의 응답 디스크 캐시
+    """
+    if strategy not in FETCH_STRATEGIES:
+        raise ValueError(f"strategy must be one of {FETCH_STRATEGIES}: {strategy}")
+    timer = timer or StageTimer()
+
+    def http_source(ticker):
+        with timer.stage('http'):
+            return fetch_dividend_rows_http(ticker, session, cache=cache)
+
+    # 'auto'는 HTTP 동시 요청 수만큼 스레드를 쓰므로 브라우저 폴백은 드라이버 수만큼만 동시에 진입
+    browser_slots = threading.BoundedSemaphore(pool.size) if pool is not None else None
+
+    def browser_source(ticker):
+        with browser_slots, pool.acquire() as driver:
+            return fetch_dividend_rows_browser(ticker, driver, timer)
+
+    sources = []
+    if strategy in ('auto', 'http'):
+        sources.append(('http', http_source))
+    if strategy in ('auto', 'browser'):
+        sources.append(('browser', browser_source))
+    return FetchStrategy(sources, stats=stats)
+
+
+def scrape_all_usa_etf_dividends(ticker: str = None, years: list = [2024, 2025], workers: int = None,
+                                 strategy: str = 'auto', http_workers: int = 8, use_cache: bool = True,
+                                 retries: int = 1, resume: bool = True):
     """
     모든 미국 ETF 또는 특정 티커의 배당 정보를 스크래핑
     
     Args:
         ticker: 특정 티커만 처리 (None이면 모든 ETF 처리)
         years: 가져올 연도 리스트 (기본값: [2024, 2025])
+        workers: 동시에 띄울 브라우저 수 (기본값: CPU 코어 수의 절반)
+        strategy: 'auto' (HTTP 먼저, 테이블을 못 찾으면 브라우저) / 'http' / 'browser'
+        http_workers: HTTP 경로 동시 요청 수 ('browser' 전략에서는 브라우저 수만큼만 동시 실행)
+        use_cache: 스크래핑 캐시 사용 (HTTP 응답 재사용, 지난번 저장과 같은 테이블은 파싱 / 저장 생략)
+        retries: 티커별 실패(배당 정보를 찾지 못한 경우 포함) 시 재시도 횟수
+        resume: True면 중단된 이전 실행의 체크포인트에서 이어서 처리 (완료된 티커는 건너뜀)
     """
     db_session_for_etf_list: Session = SessionLocal()
     try:
@@ -543,42 +615,85 @@ def scrape_all_usa_etf_dividends(ticker: str = None, years: list = [2024, 2025])
     finally:
         db_session_for_etf_list.close()
     
-    success_count = 0
-    fail_count = 0
+    workers = min(workers or default_pool_size(), len(etf_list))
+    threads = workers if strategy == 'browser' else max(workers, min(http_workers, len(etf_list)))
+    etfs = [(etf.ticker, etf.name) for etf in etf_list]
+    timer = StageTimer()
+    cache = open_scrape_cache() if use_cache else None
+    unchanged_count = 0
     
-    for idx, etf in enumerate(etf_list, 1):
-        logger.info(f"\n{'='*60}")
-        logger.info(f"[{idx}/{len(etf_list)}] 처리 중: {etf.ticker} - {etf.name}")
-        logger.info(f"{'='*60}")
-        try:
-            dividends = scrape_usa_etf_dividend(etf.ticker, save_to_db=True, years=years)
-            if dividends:
-                logger.info(f"[OK] {etf.ticker} 배당 정보 스크래핑 완료: {len(dividends)}개")
-                success_count += 1
-            else:
-                logger.warning(f"[WARN] {etf.ticker} 배당 정보를 찾을 수 없습니다.")
-                fail_count += 1
-        except Exception as e:
-            logger.error(f"[ERROR] {etf.ticker} 처리 실패: {e}")
-            fail_count += 1
-            continue
+    def on_done(etf, dividends, error):
+        nonlocal unchanged_count
+        if error is not None:
+            logger.error(f"[ERROR] {etf[0]} 처리 실패: {error}")
+        elif dividends is None:
+            logger.info(f"[SKIP] {etf[0]} 배당 정보 변경 없음")
+            unchanged_count += 1
+        else:
+            logger.info(f"[OK] {etf[0]} - {etf[1]} 배당 정보 스크래핑 완료: {len(dividends)}개")
+    
+    logger.info(f"[INFO] 수집 전략 {strategy}: 동시 작업 {threads}개 (브라우저 최대 {workers}개)로 {len(etfs)}개 ETF를 처리합니다.")
+    # 브라우저 풀은 드라이버를 처음 빌릴 때 생성하므로 HTTP로 모두 성공하면 Chrome을 띄우지 않음
+    with create_browser_pool(size=workers, timer=timer) as pool, create_http_session(pool_size=threads) as session:
+        fetch_strategy = create_fetch_strategy(strategy, pool=pool, session=session, timer=timer, cache=cache)
+        
+        def fetch_rows(symbol):
+            rows, source = fetch_strategy.fetch(symbol)
+            if source:
+                logger.info(f"[{symbol}] {source} 경로로 배당 테이블을 가져왔습니다.")
+            return rows
+        
+        def job(etf):
+            dividends = scrape_usa_etf_dividend(etf[0], save_to_db=True, years=years, timer=timer, fetch_rows=fetch_rows,
+                                                cache=cache)
+            if dividends == []:
+                raise RuntimeError("배당 정보를 찾을 수 없습니다.")
+            return dividends
+        
+        report = run_batch_job(
+            "scrape_usa_etf_dividends",
+            etfs,
+            job,
+            key=lambda etf: etf[0],
+            run_key=f"{ticker}:{','.join(map(str, years))}:{strategy}",
+            workers=threads,
+            max_retries=retries,
+            resume=resume,
+            on_done=on_done,
+        )
     
     logger.info(f"\n{'='*60}")
     logger.info("[결과 요약]")
     logger.info(f"{'='*60}")
-    logger.info(f"총 처리 대상: {len(etf_list)}개")
-    logger.info(f"성공: {success_count}개")
-    logger.info(f"실패: {fail_count}개")
+    for line in report.summary_lines():
+        logger.info(line)
+    logger.info(f"(변경 없음 {unchanged_count}개, 동시 작업 {threads}개, 브라우저 최대 {workers}개)")
+    fetch_strategy.stats.log_report()
+    if cache is not None:
+        cache.log_stats()
+    timer.log_report()
     logger.info(f"{'='*60}\n")
+    return report
 
 
 if __name__ == "__main__":
-    # 기본값: QYLD 티커의 2024, 2025 데이터
-    import sys
-    
-    ticker = None
-    if len(sys.argv) > 1:
-        ticker = sys.argv[1]
+    # 기본값: 모든 ETF의 2024, 2025 데이터 (HTTP로 먼저 시도하고 테이블을 못 찾은 티커만 브라우저로 수집)
+    # 예: python usa_etfs_dividend.py QYLD                  # 특정 티커만
+    # 예: python usa_etfs_dividend.py --workers 2           # 브라우저 최대 2개
+    # 예: python usa_etfs_dividend.py --strategy browser    # 기존처럼 브라우저로만 수집
+    # 예: python usa_etfs_dividend.py --no-cache            # 캐시 없이 모두 다시 수집 / 저장
+    # 예: python usa_etfs_dividend.py --restart             # 중단된 이전 실행을 이어받지 않고 처음부터
+    parser = argparse.ArgumentParser(description="Seeking Alpha 미국 ETF 배당 정보 스크래핑")
+    parser.add_argument("ticker", nargs="?", default=None, help="특정 티커만 처리")
+    parser.add_argument("--workers", type=int, default=None, help="동시에 띄울 브라우저 수 (기본값: CPU 코어 수의 절반)")
+    parser.add_argument("--strategy", choices=FETCH_STRATEGIES, default='auto',
+                        help="수집 경로: auto (HTTP 우선, 실패 시 브라우저) / http / browser (기본값: auto)")
+    parser.add_argument("--http-workers", type=int, default=8, help="HTTP 경로 동시 요청 수 (기본값: 8)")
+    parser.add_argument("--no-cache", action="store_true", help="스크래핑 캐시를 사용하지 않음")
+    parser.add_argument("--retries", type=int, default=1, help="티커별 실패 시 재시도 횟수 (기본값: 1)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 실행")
+    args = parser.parse_args()
     
-    scrape_all_usa_etf_dividends(ticker=ticker, years=[2024, 2025])
-
+    scrape_all_usa_etf_dividends(ticker=args.ticker, years=[2024, 2025], workers=args.workers,
+                                 strategy=args.strategy, http_workers=args.http_workers, use_cache=not args.no_cache,
+                                 retries=args.retries, resume=not args.restart)
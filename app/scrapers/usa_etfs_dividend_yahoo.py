@@ -12,13 +12,14 @@ backend_dir = os.path.dirname(app_dir)  # backend-fastapi
 if backend_dir not in sys.path:
     sys.path.insert(0, backend_dir)
 
-import time
+import argparse
 import logging
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.crud import usa_etfs, usa_etfs_dividend
+from app.services.batch_jobs import run_batch_job
 import pandas as pd
 
 # 로깅 설정
@@ -139,13 +140,18 @@ def scrape_usa_etf_dividend_yahoo(ticker: str = "QYLD", save_to_db: bool = True,
             db.close()
 
 
-def scrape_all_usa_etf_dividends_yahoo(ticker: str = None, years: list = [2024, 2025]):
+def scrape_all_usa_etf_dividends_yahoo(ticker: str = None, years: list = [2024, 2025], workers: int = 1,
+                                       rate: float = 1.0, retries: int = 2, resume: bool = True):
     """
     모든 미국 ETF 또는 특정 티커의 배당 정보를 Yahoo Finance에서 가져오기
     
     Args:
         ticker: 특정 티커만 처리 (None이면 모든 ETF 처리)
         years: 가져올 연도 리스트 (기본값: [2024, 2025])
+        workers: 동시 요청 수
+        rate: 초당 최대 요청 수 (API 요청 제한 회피)
+        retries: 티커별 실패 시 재시도 횟수 (지수 백오프)
+        resume: True면 중단된 이전 실행의 체크포인트에서 이어서 처리 (완료된 티커는 건너뜀)
     """
     db_session_for_etf_list: Session = SessionLocal()
     try:
@@ -165,46 +171,54 @@ def scrape_all_usa_etf_dividends_yahoo(ticker: str = None, years: list = [2024,
     finally:
         db_session_for_etf_list.close()
     
-    success_count = 0
-    fail_count = 0
+    etfs = [(etf.ticker, etf.name) for etf in etf_list]
     
-    for idx, etf in enumerate(etf_list, 1):
-        logger.info(f"\n{'='*60}")
-        logger.info(f"[{idx}/{len(etf_list)}] 처리 중: {etf.ticker} - {etf.name}")
-        logger.info(f"{'='*60}")
-        try:
-            dividends = scrape_usa_etf_dividend_yahoo(etf.ticker, save_to_db=True, years=years)
-            if dividends:
-                logger.info(f"[OK] {etf.ticker} 배당 정보 스크래핑 완료: {len(dividends)}개")
-                success_count += 1
-            else:
-                logger.warning(f"[WARN] {etf.ticker} 배당 정보를 찾을 수 없습니다.")
-                fail_count += 1
-            
-            # API 요청 제한을 피하기 위한 대기 시간
-            time.sleep(1)
-            
-        except Exception as e:
-            logger.error(f"[ERROR] {etf.ticker} 처리 실패: {e}")
-            fail_count += 1
-            continue
+    def job(etf):
+        dividends = scrape_usa_etf_dividend_yahoo(etf[0], save_to_db=True, years=years)
+        if not dividends:
+            raise RuntimeError("배당 정보를 찾을 수 없습니다.")
+        return dividends
+    
+    def on_done(etf, dividends, error):
+        if error is not None:
+            logger.error(f"[ERROR] {etf[0]} 처리 실패: {error}")
+        else:
+            logger.info(f"[OK] {etf[0]} 배당 정보 스크래핑 완료: {len(dividends)}개")
+    
+    # API 요청 제한을 피하기 위해 초당 rate건까지만 요청
+    report = run_batch_job(
+        "scrape_usa_etf_dividends_yahoo",
+        etfs,
+        job,
+        key=lambda etf: etf[0],
+        run_key=f"{ticker}:{','.join(map(str, years))}",
+        workers=workers,
+        max_retries=retries,
+        rate_per_second=rate,
+        resume=resume,
+        on_done=on_done,
+    )
     
     logger.info(f"\n{'='*60}")
     logger.info("[결과 요약]")
     logger.info(f"{'='*60}")
-    logger.info(f"총 처리 대상: {len(etf_list)}개")
-    logger.info(f"성공: {success_count}개")
-    logger.info(f"실패: {fail_count}개")
+    for line in report.summary_lines():
+        logger.info(line)
     logger.info(f"{'='*60}\n")
+    return report
 
 
 if __name__ == "__main__":
-    # 기본값: QYLD 티커의 2024, 2025 데이터
-    import sys
-    
-    ticker = None
-    if len(sys.argv) > 1:
-        ticker = sys.argv[1]
+    # 기본값: 모든 ETF의 2024, 2025 데이터
+    # 예: python usa_etfs_dividend_yahoo.py QYLD          # 특정 티커만
+    # 예: python usa_etfs_dividend_yahoo.py --restart     # 중단된 이전 실행을 이어받지 않고 처음부터
+    parser = argparse.ArgumentParser(description="Yahoo Finance 미국 ETF 배당 정보 가져오기")
+    parser.add_argument("ticker", nargs="?", default=None, help="특정 티커만 처리")
+    parser.add_argument("--workers", type=int, default=1, help="동시 요청 수 (기본값: 1)")
+    parser.add_argument("--rate", type=float, default=1.0, help="초당 최대 요청 수 (기본값: 1)")
+    parser.add_argument("--retries", type=int, default=2, help="티커별 실패 시 재시도 횟수 (기본값: 2)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 실행")
+    args = parser.parse_args()
     
-    scrape_all_usa_etf_dividends_yahoo(ticker=ticker, years=[2024, 2025])
-
+    scrape_all_usa_etf_dividends_yahoo(ticker=args.ticker, years=[2024, 2025], workers=args.workers, rate=args.rate,
+                                       retries=args.retries, resume=not args.restart)
@@ -20,12 +20,20 @@ from dotenv import load_dotenv
 # 환경 변수 로드
 load_dotenv()
 
+import argparse
+import re
 import requests
-from bs4 import BeautifulSoup
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.crud import usd_krw_exchange
+from app.scrapers import fetch_strategy
+from app.scrapers.scrape_cache import ScrapeCache, content_hash, open_scrape_cache
 from app.schemas.usd_krw_exchange import USDKRWExchangeCreate
+from app.services.batch_jobs import backoff_delay
+from app.services.daily_chart_pipeline import TokenBucket
 from decimal import Decimal
 import time
 import logging
@@ -37,6 +45,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+EXCHANGE_URL = "https://finance.naver.com/marketindex/exchangeDailyQuote.naver"
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+ROWS_PER_PAGE = 10  # 일별 시세 페이지당 행 수
+MAX_PAGES = 100  # 안전장치: 최대 100페이지까지만
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 4.0  # 초당 최대 요청 수
+DEFAULT_PAGE_RETRIES = 2  # 페이지별 재시도 횟수
+DEFAULT_BACKOFF_SECONDS = 1.0  # 재시도 대기 시간 (지수 백오프)
+MAX_BACKOFF_SECONDS = 30.0
+PROCESSED_KEY = 'usd-krw-exchange'  # 스크래핑 캐시에 처리 완료 해시를 기록하는 키
+
+_TABLE_PATTERN = re.compile(r'<table[^>]*class="[^"]*tbl_exchange[^"]*"[^>]*>.*?<tbody>(.*?)</tbody>', re.S)
+# 행의 첫 번째 열(날짜), 두 번째 열(매매기준율)
+_ROW_PATTERN = re.compile(r'<tr[^>]*>\s*<td[^>]*>\s*([\d.]+)\s*</td>\s*<td[^>]*>\s*([\d,.]+)\s*</td>', re.S)
+
+class ExchangePageError(Exception):
+    """페이지 요청 / 파싱 실패 (데이터가 없는 페이지와 구분)"""
+
 def parse_korean_date(date_str: str) -> date:
     """
     한국어 날짜 문자열을 date 객체로 변환
@@ -67,142 +95,228 @@ def parse_exchange_rate(rate_str: str) -> Decimal:
         logger.error(f"환율 파싱 실패: {rate_str}, 오류: {e}")
     return None
 
-def scrape_naver_exchange_rate(page: int = 1, target_date: date = None) -> list:
+def parse_exchange_page(html: str) -> list:
+    """
+    일별 시세 페이지 HTML에서 (날짜, 매매기준율) 목록 추출
+    
+    BeautifulSoup으로 전체 DOM을 만들지 않고 tbl_exchange 테이블의 행만 정규식으로 파싱
+    
+    Returns:
+        [(date, exchange_rate), ...] 리스트 (페이지 순서 = 최신순)
+    """
+    table = _TABLE_PATTERN.search(html)
+    if not table:
+        return []
+    exchange_data = []
+    for date_cell, rate_cell in _ROW_PATTERN.findall(table.group(1)):
+        exchange_date = parse_korean_date(date_cell)
+        exchange_rate = parse_exchange_rate(rate_cell)
+        if exchange_date and exchange_rate:
+            exchange_data.append((exchange_date, exchange_rate))
+    return exchange_data
+
+def create_http_session(pool_size: int = DEFAULT_WORKERS) -> requests.Session:
+    """keep-alive 연결을 재사용하는 HTTP 세션 (워커 수만큼 연결 풀 유지)"""
+    return fetch_strategy.create_http_session(pool_size=pool_size, headers=HEADERS)
+
+def scrape_naver_exchange_rate(page: int = 1, target_date: date = None, session: requests.Session = None,
+                               cache: ScrapeCache = None) -> list:
     """
     네이버 금융에서 USD/KRW 환율 데이터를 스크래핑
     
     Args:
         page: 페이지 번호 (기본값: 1)
         target_date: 이 날짜 이전 데이터를 가져올지 결정 (None이면 제한 없음)
+        session: 재사용할 HTTP 세션 (None이면 요청마다 새 연결)
+        cache: 응답 디스크 캐시 (session과 함께 지정, 유효시간 안의 페이지는 다시 요청하지 않음)
     
     Returns:
-        [(date, exchange_rate), ...] 리스트
+        [(date, exchange_rate), ...] 리스트 (빈 리스트는 정상 응답에 데이터 행이 없는 페이지 = 마지막 페이지 이후)
+    
+    Raises:
+        ExchangePageError: HTTP 오류, 네트워크 오류, 환율 테이블이 없는 응답
+    """
+    params = {'marketindexCd': 'FX_USDKRW', 'page': page}
+    try:
+        if cache is not None and session is not None:
+            # 네이버는 euc-kr 인코딩 사용
+            response = cache.fetch(session, EXCHANGE_URL, params=params, timeout=10, encoding='euc-kr')
+        elif session is not None:
+            response = session.get(EXCHANGE_URL, params=params, timeout=10)
+            response.encoding = 'euc-kr'
+        else:
+            response = requests.get(EXCHANGE_URL, params=params, headers=HEADERS, timeout=10)
+            response.encoding = 'euc-kr'
+        
+    except requests.RequestException as e:
+        raise ExchangePageError(f"페이지 {page} 요청 중 오류: {e}") from e
+    
+    if response.status_code != 200:
+        raise ExchangePageError(f"페이지 {page} 요청 실패: HTTP {response.status_code}")
+    
+    if not _TABLE_PATTERN.search(response.text):
+        raise ExchangePageError(f"페이지 {page}에서 환율 테이블을 찾을 수 없습니다.")
+    exchange_data = parse_exchange_page(response.text)
+    
+    # target_date 이전 데이터는 제외 (최신순이므로 앞부분만 남음)
+    if target_date:
+        exchange_data = [item for item in exchange_data if item[0] >= target_date]
+    return exchange_data
+
+def estimate_page_count(target_date: date, today: date = None) -> int:
+    """target_date까지 필요한 페이지 수 추정 (영업일 수 / 페이지당 행 수, 공휴일만큼 여유 있게 잡힘)"""
+    today = today or date.today()
+    business_days = int(np.busday_count(target_date, today + timedelta(days=1)))
+    return max(1, -(-business_days // ROWS_PER_PAGE))
+
+def fetch_exchange_rates(target_date: date, workers: int = DEFAULT_WORKERS, rate: float = DEFAULT_RATE,
+                         fetch_page: Callable[[int], list] = None, max_pages: int = MAX_PAGES,
+                         cache: ScrapeCache = None, max_retries: int = DEFAULT_PAGE_RETRIES,
+                         backoff_seconds: float = DEFAULT_BACKOFF_SECONDS) -> list:
     """
-    url = f"https://finance.naver.com/marketindex/exchangeDailyQuote.naver?marketindexCd=FX_USDKRW&page={page}"
+    target_date 이후 환율을 여러 페이지에서 동시에 수집
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    필요한 페이지 수를 먼저 추정해서 한 번에 요청하고, 마지막 페이지까지도 target_date에 도달하지 못하면
+    (추정보다 휴장일이 적은 경우 등) 다음 페이지 묶음을 이어서 요청한다.
+    
+    실패한 페이지는 지수 백오프로 재시도하고, 끝까지 실패하면 예외를 발생시켜 아무것도 저장하지 않는다.
+    (중간 페이지만 빠진 채 저장하면 증분 모드가 최신 저장일부터 다시 시작하므로 빠진 구간이 영영 채워지지 않음)
+    정상 응답에 데이터 행이 없는 페이지만 마지막 페이지로 본다.
+    
+    Args:
+        target_date: 이 날짜 이후 데이터만 수집
+        workers: 동시 요청 수
+        rate: 초당 최대 요청 수 (서버 부하 제한)
+        fetch_page: page -> [(date, exchange_rate), ...] 함수, 실패 시 예외 (기본: keep-alive 세션으로 네이버 조회,
+                    테스트에서는 저장해 둔 HTML을 파싱하는 함수로 대체 가능)
+        max_pages: 안전장치 - 최대 페이지 수
+        cache: 응답 디스크 캐시 (기본 fetch_page에만 적용)
+        max_retries: 페이지별 재시도 횟수
+        backoff_seconds: 첫 재시도 대기 시간 (이후 지수 백오프, 최대 MAX_BACKOFF_SECONDS)
+    
+    Returns:
+        [(date, exchange_rate), ...] 리스트 (날짜 최신순, 중복 제거)
+    
+    Raises:
+        ExchangePageError: 재시도 후에도 실패한 페이지가 있는 경우
+    """
+    session = None
+    if fetch_page is None:
+        session = create_http_session(workers)
+        fetch_page = lambda page: scrape_naver_exchange_rate(page, session=session, cache=cache)
     
+    bucket = TokenBucket(rate)
+    
+    def rate_limited_fetch(page: int) -> list:
+        for attempt in range(max_retries + 1):
+            bucket.acquire()
+            try:
+                return fetch_page(page)
+            except Exception as e:
+                if attempt == max_retries:
+                    raise ExchangePageError(f"페이지 {page} 수집 실패 ({attempt + 1}회 시도): {e}") from e
+                delay = backoff_delay(attempt, backoff_seconds, MAX_BACKOFF_SECONDS)
+                logger.warning(f"페이지 {page} 실패 ({attempt + 1}/{max_retries + 1}회): {e} - {delay:.1f}초 후 재시도")
+                time.sleep(delay)
+    
+    by_date = {}
+    next_page = 1
+    batch_size = min(estimate_page_count(target_date), max_pages)
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.encoding = 'euc-kr'  # 네이버는 euc-kr 인코딩 사용
-        
-        if response.status_code != 200:
-            logger.error(f"페이지 {page} 요청 실패: HTTP {response.status_code}")
-            return []
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 테이블 찾기
-        table = soup.find('table', class_='tbl_exchange')
-        if not table:
-            logger.error(f"페이지 {page}에서 테이블을 찾을 수 없습니다.")
-            return []
-        
-        # tbody에서 행들 찾기
-        tbody = table.find('tbody')
-        if not tbody:
-            logger.error(f"페이지 {page}에서 tbody를 찾을 수 없습니다.")
-            return []
-        
-        rows = tbody.find_all('tr')
-        exchange_data = []
-        
-        for row in rows:
-            cols = row.find_all('td')
-            if len(cols) < 2:
-                continue
-            
-            # 첫 번째 열: 날짜
-            date_cell = cols[0].get_text(strip=True)
-            exchange_date = parse_korean_date(date_cell)
-            
-            if not exchange_date:
-                continue
-            
-            # target_date가 설정되어 있고 현재 날짜가 target_date 이전이면 중지
-            if target_date and exchange_date < target_date:
-                return exchange_data  # 더 이상 진행하지 않음
-            
-            # 두 번째 열: 매매기준율 (종가)
-            rate_cell = cols[1].get_text(strip=True)
-            exchange_rate = parse_exchange_rate(rate_cell)
-            
-            if exchange_rate:
-                exchange_data.append((exchange_date, exchange_rate))
-        
-        return exchange_data
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='usd-krw-fetch') as executor:
+            while next_page <= max_pages:
+                pages = list(range(next_page, min(next_page + batch_size, max_pages + 1)))
+                logger.info(f"페이지 {pages[0]}~{pages[-1]} 동시 요청 중... (워커 {workers}개)")
+                results = list(executor.map(rate_limited_fetch, pages))
+                
+                reached = False
+                for page, page_data in zip(pages, results):
+                    if not page_data:
+                        logger.info(f"페이지 {page}에 데이터가 없습니다.")
+                        reached = True
+                        continue
+                    for exchange_date, exchange_rate in page_data:
+                        if exchange_date >= target_date:
+                            by_date[exchange_date] = exchange_rate
+                    if page_data[-1][0] <= target_date:
+                        reached = True
+                
+                if reached:
+                    break
+                next_page = pages[-1] + 1
+                # 추정이 모자랐던 경우 남은 구간은 작은 묶음으로 이어서 요청
+                batch_size = max(1, workers)
+    finally:
+        if session is not None:
+            session.close()
     
-    except Exception as e:
-        logger.error(f"페이지 {page} 스크래핑 중 오류: {e}")
-        return []
+    return sorted(by_date.items(), key=lambda item: item[0], reverse=True)
 
-def scrape_all_exchange_rates(years: int = 2) -> list:
+def scrape_all_exchange_rates(years: int = 2, target_date: date = None, workers: int = DEFAULT_WORKERS,
+                              rate: float = DEFAULT_RATE, cache: ScrapeCache = None) -> list:
     """
     2년치 환율 데이터를 모든 페이지에서 스크래핑
     
     Args:
         years: 가져올 년수 (기본값: 2)
+        target_date: 이 날짜 이후만 수집 (지정하면 years 무시, 증분 모드)
+        workers: 동시 요청 수
+        rate: 초당 최대 요청 수
+        cache: 응답 디스크 캐시
     
     Returns:
         [(date, exchange_rate), ...] 리스트
     """
     # 목표 날짜 계산 (현재로부터 years년 전)
-    target_date = (datetime.now() - timedelta(days=years * 365)).date()
-    
-    logger.info(f"{years}년치 USD/KRW 환율 데이터를 스크래핑합니다...")
+    if target_date is None:
+        target_date = (datetime.now() - timedelta(days=years * 365)).date()
+        logger.info(f"{years}년치 USD/KRW 환율 데이터를 스크래핑합니다...")
     logger.info(f"목표 날짜: {target_date} 이후 데이터를 수집합니다.")
     
-    all_data = []
-    page = 1
-    max_pages = 100  # 안전장치: 최대 100페이지까지만
+    started = time.perf_counter()
+    all_data = fetch_exchange_rates(target_date, workers=workers, rate=rate, cache=cache)
     
-    while page <= max_pages:
-        logger.info(f"페이지 {page} 스크래핑 중...")
-        
-        page_data = scrape_naver_exchange_rate(page, target_date)
-        
-        if not page_data:
-            logger.info(f"페이지 {page}에 데이터가 없습니다. 스크래핑 종료.")
-            break
-        
-        all_data.extend(page_data)
-        
-        # 마지막 날짜가 target_date 이전이면 더 이상 진행하지 않음
-        if page_data:
-            last_date = page_data[-1][0]
-            if last_date < target_date:
-                logger.info(f"목표 날짜({target_date})에 도달했습니다. 스크래핑 종료.")
-                break
-        
-        logger.info(f"페이지 {page} 완료: {len(page_data)}개 레코드 (총 {len(all_data)}개)")
-        
-        page += 1
-        time.sleep(0.5)  # 서버 부하를 줄이기 위한 대기
-    
-    # 날짜 기준으로 정렬 (최신순)
-    all_data.sort(key=lambda x: x[0], reverse=True)
-    
-    logger.info(f"총 {len(all_data)}개의 환율 데이터를 수집했습니다.")
+    logger.info(f"총 {len(all_data)}개의 환율 데이터를 수집했습니다. ({time.perf_counter() - started:.2f}초)")
     return all_data
 
-def scrape_and_save_usd_krw_exchange(years: int = 2):
+def scrape_and_save_usd_krw_exchange(years: int = 2, incremental: bool = False, workers: int = DEFAULT_WORKERS,
+                                     rate: float = DEFAULT_RATE, use_cache: bool = True):
     """
     네이버 금융에서 USD/KRW 환율 데이터를 스크래핑하여 데이터베이스에 저장
     
     Args:
         years: 가져올 년수 (기본값: 2)
+        incremental: True면 이미 저장된 가장 최근 날짜까지만 수집 (저장된 데이터가 없으면 years 전체)
+        workers: 동시 요청 수
+        rate: 초당 최대 요청 수
+        use_cache: 응답 디스크 캐시 사용 (유효시간 안의 페이지는 다시 요청하지 않고,
+                   지난 실행에서 저장한 것과 같은 데이터면 DB 저장을 건너뜀)
+    
+    Returns:
+        {'records': 수집한 레코드 수, 'changed': 저장(생성 / 변경)한 레코드 수, 'skipped': 저장 생략 여부}
     """
     db: Session = SessionLocal()
+    cache = open_scrape_cache() if use_cache else None
     
     try:
+        target_date = None
+        if incremental:
+            # 가장 최근 저장일도 다시 가져와서 장중에 저장된 값을 갱신
+            target_date = usd_krw_exchange.get_latest_usd_krw_exchange_date(db)
+            if target_date:
+                logger.info(f"증분 모드: 마지막 저장일 {target_date}까지 수집합니다.")
+        
         # 스크래핑
-        exchange_data = scrape_all_exchange_rates(years)
+        exchange_data = scrape_all_exchange_rates(years, target_date=target_date, workers=workers, rate=rate, cache=cache)
         
         if not exchange_data:
             logger.warning("수집된 데이터가 없습니다.")
-            return
+            return {'records': 0, 'changed': 0, 'skipped': False}
+        
+        fingerprint = content_hash(exchange_data)
+        if cache is not None and cache.is_processed(PROCESSED_KEY, fingerprint):
+            logger.info("지난 실행에서 저장한 데이터와 같습니다. DB 저장을 건너뜁니다.")
+            return {'records': len(exchange_data), 'changed': 0, 'skipped': True}
         
         # 스키마로 변환
         exchanges = []
@@ -217,18 +331,36 @@ def scrape_and_save_usd_krw_exchange(years: int = 2):
         
         # 일괄 upsert
         result_count = usd_krw_exchange.bulk_upsert_usd_krw_exchanges(db, exchanges)
+        if cache is not None:
+            cache.mark_processed(PROCESSED_KEY, fingerprint)
         
         logger.info("작업 완료!")
-        logger.info(f"처리된 레코드: {result_count}개")
+        logger.info(f"처리된 레코드: {result_count}개 (변경 없음 {len(exchanges) - result_count}개)")
+        return {'records': len(exchanges), 'changed': result_count, 'skipped': False}
         
     except Exception as e:
         logger.error(f"오류 발생: {e}")
         import traceback
         traceback.print_exc()
         db.rollback()
+        raise
     finally:
         db.close()
+        if cache is not None:
+            cache.log_stats()
 
 if __name__ == "__main__":
-    scrape_and_save_usd_krw_exchange(years=2)
-
+    # 예: python usd_krw_exchange.py                  # 2년치
+    # 예: python usd_krw_exchange.py --years 5        # 5년치
+    # 예: python usd_krw_exchange.py --incremental    # 마지막 저장일 이후만 (야간 배치)
+    # 예: python usd_krw_exchange.py --no-cache       # 응답 캐시 없이 모든 페이지 다시 요청
+    parser = argparse.ArgumentParser(description="네이버 금융 USD/KRW 환율 스크래핑")
+    parser.add_argument("--years", type=int, default=2, help="가져올 년수 (기본값: 2)")
+    parser.add_argument("--incremental", action="store_true", help="마지막 저장일 이후만 수집")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"동시 요청 수 (기본값: {DEFAULT_WORKERS})")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help=f"초당 최대 요청 수 (기본값: {DEFAULT_RATE})")
+    parser.add_argument("--no-cache", action="store_true", help="응답 디스크 캐시를 사용하지 않음")
+    args = parser.parse_args()
+    
+    scrape_and_save_usd_krw_exchange(years=args.years, incremental=args.incremental, workers=args.workers, rate=args.rate,
+                                     use_cache=not args.no_cache)
@@ -0,0 +1,2 @@
+# 인메모리 캐시, 계산 엔진 등 API에서 공통으로 사용하는 서비스 모듈들
+# 필요시 각 모듈을 직접 import하여 사용하세요
@@ -0,0 +1,78 @@
+"""
+정렬된 날짜 배열 기반 as-of 조회 ("D일 또는 그 이전의 가장 최근 값")
+
+모든 함수는 오름차순 정렬된 datetime64[D] 배열을 받아 이진 탐색(O(log n))으로 인덱스를 찾는다.
+일봉 차트 캐시(chart_cache), 환율 캐시(exchange_rate_cache) 등 날짜 시계열이면 어디서든 사용할 수 있다.
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+
+
+def to_datetime64(dates) -> np.ndarray:
+    """date 또는 date 리스트를 datetime64[D] 배열로 변환"""
+    return np.asarray(dates, dtype='datetime64[D]')
+
+
+def asof_indices(sorted_dates: np.ndarray, targets) -> np.ndarray:
+    """각 target에 대해 date <= target 인 마지막 인덱스 배열 (해당 값이 없으면 -1)"""
+    return np.searchsorted(sorted_dates, to_datetime64(targets), side='right') - 1
+
+
+def asof_index(sorted_dates: np.ndarray, target: date) -> Optional[int]:
+    """date <= target 인 마지막 인덱스 (없으면 None)"""
+    idx = int(np.searchsorted(sorted_dates, np.datetime64(target, 'D'), side='right')) - 1
+    return idx if idx >= 0 else None
+
+
+def nearest_index(sorted_dates: np.ndarray, target: date, max_distance_days: Optional[int] = None) -> Optional[int]:
+    """
+    target에 가장 가까운 날짜의 인덱스 (거리가 같으면 이전 날짜 우선)
+
+    Args:
+        sorted_dates: 오름차순 정렬된 datetime64[D] 배열
+        target: 기준 날짜
+        max_distance_days: 허용 최대 거리(일). 이보다 멀면 None
+    """
+    if len(sorted_dates) == 0:
+        return None
+    target64 = np.datetime64(target, 'D')
+    after = int(np.searchsorted(sorted_dates, target64, side='left'))
+    candidates = [idx for idx in (after - 1, after) if 0 <= idx < len(sorted_dates)]
+    best = min(candidates, key=lambda idx: abs(int((sorted_dates[idx] - target64).astype(int))))
+    if max_distance_days is not None and abs(int((sorted_dates[best] - target64).astype(int))) > max_distance_days:
+        return None
+    return best
+
+
+def chart_asof_batch(series_by_etf: dict, queries: Iterable[Tuple[int, date]]) -> List[Optional[dict]]:
+    """
+    여러 (etf_id, date) 쌍의 as-of 일봉 차트를 한 번에 조회
+
+    Args:
+        series_by_etf: etf_id -> chart_cache.ChartSeries (ChartCache.get_many / aget_many 결과)
+        queries: (etf_id, date) 리스트
+
+    Returns:
+        요청 순서대로 일봉 차트 dict (해당 날짜 이전 데이터가 없으면 None)
+    """
+    queries = list(queries)
+    results: List[Optional[dict]] = [None] * len(queries)
+
+    # etf_id별로 묶어서 ETF당 한 번의 벡터화된 이진 탐색으로 처리
+    positions_by_etf = defaultdict(list)
+    for position, (etf_id, _) in enumerate(queries):
+        positions_by_etf[etf_id].append(position)
+
+    for etf_id, positions in positions_by_etf.items():
+        series = series_by_etf.get(etf_id)
+        if series is None or len(series) == 0:
+            continue
+        indices = asof_indices(series.dates, [queries[position][1] for position in positions])
+        found = indices >= 0
+        records = series.to_records(indices[found])
+        for position, record in zip(np.asarray(positions)[found].tolist(), records):
+            results[position] = record
+
+    return results
@@ -0,0 +1,291 @@
+"""
+재시작 가능한 배치 작업 실행기 (임포터 / 스크래퍼 공용)
+
+- 항목(ETF 등)별 처리 상태를 체크포인트 파일(JSON Lines)에 기록하고, 중간에 죽은 배치를 다시 실행하면
+  이미 완료한 항목은 건너뛰고 나머지부터 이어서 처리
+- 동시 처리 수(workers), 초당 최대 시작 수(rate_per_second) 설정
+- 실패한 항목은 지수 백오프(+지터)로 재시도, 끝까지 실패하면 failed로 기록해서 다음 실행에서 다시 시도
+- 모든 항목이 완료되면 체크포인트를 삭제 (다음 실행은 처음부터)
+
+- 진행 상황(완료 항목 수 / 전체)을 progress_reporter로 등록한 콜백에 전달 (API 작업 큐에서 진행률 표시)
+
+체크포인트는 실행 키(run_key, 예: 옵션 조합)가 같고 max_age_hours 이내에 시작된 배치만 이어받는다.
+job(item)은 실패 시 예외를 발생시켜야 한다 (정상 반환은 완료로 기록).
+"""
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.database import settings
+from app.services.daily_chart_pipeline import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+# 현재 스레드(컨텍스트)에서 실행 중인 배치의 진행 상황을 받을 콜백 (done, total, message)
+_progress_callback: ContextVar[Optional[Callable]] = ContextVar('batch_job_progress', default=None)
+
+
+@contextmanager
+def progress_reporter(callback: Callable[[int, Optional[int], Optional[str]], None]):
+    """with 블록 안에서 실행되는 배치의 report_progress 호출을 callback(done, total, message)으로 전달"""
+    token = _progress_callback.set(callback)
+    try:
+        yield
+    finally:
+        _progress_callback.reset(token)
+
+
+def report_progress(done: int, total: Optional[int] = None, message: str = None):
+    """진행 상황 알림 (등록된 콜백이 없으면 아무것도 하지 않음, 콜백 오류는 배치를 중단시키지 않음)"""
+    callback = _progress_callback.get()
+    if callback is None:
+        return
+    try:
+        callback(done, total, message)
+    except Exception as e:
+        logger.warning(f"진행 상황 기록 실패: {e}")
+
+
+class CheckpointStore:
+    """
+    항목별 처리 상태 체크포인트 (JSON Lines, 스레드 안전)
+
+    첫 줄은 헤더 {'run_key', 'started_at'}, 이후 상태가 바뀔 때마다 {'key', 'status', 'attempts', 'error', 'at'} 한 줄 추가.
+    같은 key는 마지막 줄이 현재 상태이고, 비정상 종료로 잘린 마지막 줄은 무시한다.
+
+    Args:
+        path: 체크포인트 파일 경로
+        run_key: 실행 키 (헤더와 다르면 이전 체크포인트를 버리고 새로 시작)
+        resume: False면 기존 체크포인트를 무시하고 새로 시작
+        max_age_hours: 이보다 오래전에 시작된 체크포인트는 이어받지 않음
+    """
+
+    def __init__(self, path: str, run_key: str = '', resume: bool = True, max_age_hours: float = 24):
+        self.path = path
+        self.run_key = run_key
+        self._lock = threading.Lock()
+        self.statuses: Dict[str, dict] = {}
+        self.resumed = False
+        if resume:
+            self._load(max_age_hours)
+        if not self.resumed:
+            self._start()
+
+    def _load(self, max_age_hours: float):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+        if not lines:
+            return
+        try:
+            header = json.loads(lines[0])
+            started_at = datetime.fromisoformat(header['started_at'])
+        except (ValueError, KeyError, TypeError):
+            return
+        if header.get('run_key') != self.run_key:
+            logger.info(f"실행 옵션이 달라서 이전 체크포인트를 사용하지 않습니다. ({self.path})")
+            return
+        if (datetime.now() - started_at).total_seconds() > max_age_hours * 3600:
+            logger.info(f"{max_age_hours}시간보다 오래된 체크포인트는 사용하지 않습니다. ({self.path})")
+            return
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # 기록 중에 종료되어 잘린 줄
+            self.statuses[entry['key']] = entry
+        self.resumed = True
+
+    def _start(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'run_key': self.run_key, 'started_at': datetime.now().isoformat()}) + '\n')
+
+    def done_keys(self) -> set:
+        with self._lock:
+            return {key for key, entry in self.statuses.items() if entry['status'] == STATUS_DONE}
+
+    def record(self, key: str, status: str, attempts: int = 1, error: str = None):
+        entry = {'key': key, 'status': status, 'attempts': attempts, 'error': error, 'at': datetime.now().isoformat()}
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            self.statuses[key] = entry
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+    def finish(self):
+        """배치 완료 - 체크포인트 삭제"""
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+def checkpoint_path(job_name: str, checkpoint_dir: str = None) -> str:
+    return os.path.join(checkpoint_dir or settings.batch_checkpoint_dir, f"{job_name}.jsonl")
+
+
+def open_checkpoint(job_name: str, run_key: str = '', resume: bool = True, checkpoint_dir: str = None,
+                    max_age_hours: float = None) -> CheckpointStore:
+    """job_name 배치의 체크포인트 (설정의 batch_checkpoint_dir 아래 <job_name>.jsonl)"""
+    return CheckpointStore(
+        checkpoint_path(job_name, checkpoint_dir),
+        run_key=run_key,
+        resume=resume,
+        max_age_hours=settings.batch_checkpoint_max_age_hours if max_age_hours is None else max_age_hours,
+    )
+
+
+@dataclass
+class BatchJobReport:
+    """배치 실행 결과"""
+    job_name: str
+    total: int = 0
+    skipped: int = 0  # 이전 실행에서 이미 완료되어 건너뛴 항목
+    succeeded: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)  # (항목 키, 마지막 오류)
+    retried: int = 0  # 재시도 끝에 성공한 항목
+    attempts: int = 0
+    resumed: bool = False
+    checkpoint_path: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+    @property
+    def completed(self) -> bool:
+        return not self.failed and self.skipped + self.succeeded == self.total
+
+    def summary_lines(self) -> List[str]:
+        lines = [
+            f"총 처리 대상: {self.total}개" + (f" (체크포인트에서 이어서 실행, 완료된 {self.skipped}개 건너뜀)" if self.resumed else ""),
+            f"성공: {self.succeeded}개 (재시도 후 성공 {self.retried}개, 총 시도 {self.attempts}회)",
+            f"실패: {len(self.failed)}개",
+        ]
+        for key, error in self.failed[:20]:
+            lines.append(f"  - {key}: {error}")
+        if len(self.failed) > 20:
+            lines.append(f"  ... 외 {len(self.failed) - 20}개")
+        if not self.completed and self.checkpoint_path:
+            lines.append(f"체크포인트: {self.checkpoint_path} (다시 실행하면 실패 / 미처리 항목부터 이어서 처리)")
+        lines.append(f"소요 시간: {self.elapsed_seconds:.1f}초")
+        return lines
+
+
+def backoff_delay(attempt: int, base_seconds: float, max_seconds: float) -> float:
+    """attempt번째 실패 후 대기 시간 (지수 백오프, 0.5~1.5배 지터)"""
+    return min(max_seconds, base_seconds * (2 ** attempt)) * random.uniform(0.5, 1.5)
+
+
+def run_batch_job(
+    job_name: str,
+    items: Iterable,
+    job: Callable,
+    key: Callable = str,
+    run_key: str = '',
+    workers: int = 1,
+    max_retries: int = 2,
+    backoff_seconds: float = 1.0,
+    max_backoff_seconds: float = 30.0,
+    rate_per_second: float = 0.0,
+    resume: bool = True,
+    on_done: Optional[Callable] = None,
+    checkpoint_dir: str = None,
+) -> BatchJobReport:
+    """
+    항목별 작업을 체크포인트와 함께 실행
+
+    Args:
+        job_name: 배치 이름 (체크포인트 파일 이름)
+        items: 처리할 항목 목록
+        job: item -> 결과 (실패 시 예외)
+        key: item -> 체크포인트 키 (예: 티커)
+        run_key: 실행 옵션을 나타내는 문자열 (달라지면 체크포인트를 이어받지 않음)
+        workers: 동시 처리 수 (1이면 호출한 스레드에서 순서대로 처리)
+        max_retries: 항목별 재시도 횟수
+        backoff_seconds / max_backoff_seconds: 재시도 대기 시간 (지수 백오프)
+        rate_per_second: 초당 최대 작업 시작 수 (0 이하면 제한 없음, 외부 API 요청 제한 대응)
+        resume: False면 체크포인트를 무시하고 처음부터 실행
+        on_done: 항목 하나가 끝날 때마다 (item, 결과, 예외) 로 호출 (호출한 스레드에서 실행)
+    """
+    started = time.perf_counter()
+    store = open_checkpoint(job_name, run_key=run_key, resume=resume, checkpoint_dir=checkpoint_dir)
+    items = list(items)
+    done_keys = store.done_keys()
+    pending = [item for item in items if key(item) not in done_keys]
+    report = BatchJobReport(
+        job_name=job_name, total=len(items), skipped=len(items) - len(pending),
+        resumed=store.resumed, checkpoint_path=store.path,
+    )
+    if report.skipped:
+        logger.info(f"[{job_name}] 체크포인트에서 이어서 실행합니다: 완료 {report.skipped}개 건너뜀, 남은 항목 {len(pending)}개")
+    report_progress(report.skipped, report.total)
+
+    bucket = TokenBucket(rate_per_second)
+    counter_lock = threading.Lock()
+
+    def run_one(item):
+        item_key = key(item)
+        for attempt in range(max_retries + 1):
+            bucket.acquire()
+            with counter_lock:
+                report.attempts += 1
+            try:
+                result = job(item)
+            except Exception as e:
+                if attempt == max_retries:
+                    store.record(item_key, STATUS_FAILED, attempt + 1, str(e))
+                    raise
+                delay = backoff_delay(attempt, backoff_seconds, max_backoff_seconds)
+                logger.warning(f"[{job_name}] {item_key} 실패 ({attempt + 1}/{max_retries + 1}회): {e} - {delay:.1f}초 후 재시도")
+                time.sleep(delay)
+                continue
+            store.record(item_key, STATUS_DONE, attempt + 1)
+            if attempt:
+                with counter_lock:
+                    report.retried += 1
+            return result
+
+    def finish_one(item, result, error):
+        if error is not None:
+            report.failed.append((key(item), str(error)))
+        else:
+            report.succeeded += 1
+        report_progress(report.skipped + report.succeeded + len(report.failed), report.total, key(item))
+        if on_done:
+            on_done(item, result, error)
+
+    if workers <= 1:
+        for item in pending:
+            try:
+                result, error = run_one(item), None
+            except Exception as e:
+                result, error = None, e
+            finish_one(item, result, error)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{job_name}-job") as executor:
+            futures = {executor.submit(run_one, item): item for item in pending}
+            for future in as_completed(futures):
+                try:
+                    result, error = future.result(), None
+                except Exception as e:
+                    result, error = None, e
+                finish_one(futures[future], result, error)
+
+    if report.completed:
+        store.finish()
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,211 @@
+"""
+ETF 일봉 차트 컬럼형 인메모리 캐시
+
+etf_id별로 날짜/시가/고가/저가/종가/거래량을 NumPy 배열로 보관하여
+차트 조회 API가 ORM 객체, Decimal, Pydantic 변환 없이 범위 슬라이스를 바로 응답하도록 한다.
+
+- 최초 조회 시 DB에서 지연 로딩 (ORM 객체 대신 컬럼 값만 조회)
+- 같은 프로세스의 일봉 차트 쓰기(bulk upsert, 단건 CRUD)는 해당 etf_id를 즉시 무효화
+- 다른 프로세스(import 스크립트 등)의 쓰기는 감지할 수 없으므로 TTL이 지나면 다시 로딩
+"""
+import threading
+import time
+from collections import OrderedDict
+from itertools import groupby
+from datetime import date, timedelta
+from typing import Iterable, Optional, Tuple
+import numpy as np
+from sqlalchemy import select, cast, Float
+from sqlalchemy.orm import Session
+from app.database import settings
+from app.models.usa_etfs_daily_chart import USAETFsDailyChart
+from app.models.domestic_etfs_daily_chart import DomesticETFsDailyChart
+
+PRICE_FIELDS = ('open', 'high', 'low', 'close')
+
+
+class ChartSeries:
+    """단일 ETF의 일봉 차트 (날짜 오름차순 정렬된 NumPy 배열)"""
+
+    __slots__ = ('etf_id', 'ids', 'dates', 'open', 'high', 'low', 'close', 'volume', 'price_scale', 'loaded_at')
+
+    def __init__(self, etf_id: int, rows: list, price_scale: Optional[int]):
+        self.etf_id = etf_id
+        self.price_scale = price_scale
+        self.loaded_at = time.monotonic()
+
+        price_dtype = np.float64 if price_scale else np.int64
+        columns = list(zip(*rows)) if rows else [()] * 7
+        self.ids = np.array(columns[0], dtype=np.int64)
+        self.dates = np.array(columns[1], dtype='datetime64[D]')
+        self.open = np.array(columns[2], dtype=price_dtype)
+        self.high = np.array(columns[3], dtype=price_dtype)
+        self.low = np.array(columns[4], dtype=price_dtype)
+        self.close = np.array(columns[5], dtype=price_dtype)
+        self.volume = np.array(columns[6], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def date_range(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> slice:
+        """start_date <= date <= end_date 범위의 인덱스 슬라이스 (이진 탐색)"""
+        lo = 0 if start_date is None else int(np.searchsorted(self.dates, np.datetime64(start_date, 'D'), side='left'))
+        hi = len(self) if end_date is None else int(np.searchsorted(self.dates, np.datetime64(end_date, 'D'), side='right'))
+        return slice(lo, max(lo, hi))
+
+    def latest_first(self, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                     skip: int = 0, limit: int = 100) -> np.ndarray:
+        """기간 내 행을 날짜 내림차순으로 skip/limit 적용한 인덱스 배열"""
+        date_range = self.date_range(start_date, end_date)
+        stop = max(date_range.start, date_range.stop - max(skip, 0))
+        start = max(date_range.start, stop - max(limit, 0))
+        return np.arange(stop - 1, start - 1, -1)
+
+    def latest_first_page(self, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                          after: Optional[date] = None, limit: int = 100) -> Tuple[np.ndarray, Optional[date]]:
+        """
+        키셋 페이지: after(이전 페이지의 마지막 날짜)보다 이전 날짜부터 날짜 내림차순으로 limit행
+
+        Returns:
+            (인덱스 배열, 다음 페이지가 있으면 이번 페이지의 마지막 날짜 아니면 None)
+        """
+        if after is not None:
+            before = after - timedelta(days=1)
+            end_date = before if end_date is None else min(end_date, before)
+        index = self.latest_first(start_date, end_date, limit=limit + 1)
+        if limit <= 0:
+            return index[:0], None
+        if len(index) <= limit:
+            return index, None
+        index = index[:limit]
+        return index, self.dates[index[-1]].astype(date)
+
+    def index_of(self, target_date: date) -> Optional[int]:
+        """정확히 target_date인 행의 인덱스 (없으면 None)"""
+        target = np.datetime64(target_date, 'D')
+        idx = int(np.searchsorted(self.dates, target, side='left'))
+        if idx < len(self) and self.dates[idx] == target:
+            return idx
+        return None
+
+    def _format_prices(self, values: np.ndarray) -> list:
+        # NUMERIC 컬럼은 기존 응답(Decimal 직렬화)과 동일하게 소수점 자리수를 고정한 문자열로 반환
+        if self.price_scale:
+            return np.char.mod(f'%.{self.price_scale}f', values).tolist()
+        return values.tolist()
+
+    def to_records(self, index) -> list:
+        """index(slice, int 배열 등)에 해당하는 행들을 JSON 응답용 dict 리스트로 변환"""
+        dates = np.datetime_as_string(self.dates[index], unit='D').tolist()
+        prices = [self._format_prices(getattr(self, field)[index]) for field in PRICE_FIELDS]
+        return [
+            {
+                'etf_id': self.etf_id,
+                'date': chart_date,
+                'open': open_price,
+                'high': high_price,
+                'low': low_price,
+                'close': close_price,
+                'volume': volume,
+                'id': chart_id,
+            }
+            for chart_id, chart_date, open_price, high_price, low_price, close_price, volume in zip(
+                self.ids[index].tolist(), dates, *prices, self.volume[index].tolist()
+            )
+        ]
+
+
+class ChartCache:
+    """etf_id -> ChartSeries 캐시 (LRU + TTL, 스레드 안전)"""
+
+    def __init__(self, model, ttl_seconds: int = None, max_entries: int = 512):
+        self.model = model
+        self.ttl_seconds = settings.chart_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.max_entries = max_entries
+        self.price_scale = getattr(model.__table__.c.open.type, 'scale', None)
+        self._series = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _select(self, etf_ids: list):
+        model = self.model
+        # NUMERIC은 DB 드라이버가 Decimal로 만들지 않도록 float로 캐스팅해서 조회
+        price_columns = [
+            cast(getattr(model, field), Float) if self.price_scale else getattr(model, field)
+            for field in PRICE_FIELDS
+        ]
+        return (
+            select(model.etf_id, model.id, model.date, *price_columns, model.volume)
+            .where(model.etf_id.in_(etf_ids))
+            .order_by(model.etf_id.asc(), model.date.asc())
+        )
+
+    def _lookup(self, etf_ids: Iterable[int]) -> tuple:
+        """(캐시에 있는 ChartSeries dict, 로딩이 필요한 etf_id 리스트, 현재 세대)"""
+        found = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            for etf_id in dict.fromkeys(etf_ids):
+                series = self._series.get(etf_id)
+                if series is not None and now - series.loaded_at < self.ttl_seconds:
+                    self._series.move_to_end(etf_id)
+                    found[etf_id] = series
+                else:
+                    missing.append(etf_id)
+            return found, missing, self._generation
+
+    def _store(self, missing: list, rows: list, generation: int) -> dict:
+        """조회 결과를 etf_id별 ChartSeries로 만들어 캐시에 저장"""
+        rows_by_etf = {etf_id: [] for etf_id in missing}
+        for etf_id, group in groupby(rows, key=lambda row: row[0]):
+            rows_by_etf[etf_id] = [row[1:] for row in group]
+        loaded = {etf_id: ChartSeries(etf_id, etf_rows, self.price_scale) for etf_id, etf_rows in rows_by_etf.items()}
+
+        with self._lock:
+            # 로딩 중에 무효화가 발생했다면 오래된 데이터일 수 있으므로 캐시에 넣지 않음
+            if generation == self._generation:
+                for etf_id, series in loaded.items():
+                    self._series[etf_id] = series
+                    self._series.move_to_end(etf_id)
+                while len(self._series) > self.max_entries:
+                    self._series.popitem(last=False)
+        return loaded
+
+    def get_many(self, db: Session, etf_ids: Iterable[int]) -> dict:
+        """여러 ETF의 캐시된 차트 반환 (캐시에 없는 ETF는 쿼리 한 번으로 함께 로딩)"""
+        found, missing, generation = self._lookup(etf_ids)
+        if missing:
+            rows = db.execute(self._select(missing)).all()
+            found.update(self._store(missing, rows, generation))
+        return found
+
+    async def aget_many(self, db, etf_ids: Iterable[int]) -> dict:
+        """get_many의 비동기 버전 (AsyncSession 사용)"""
+        found, missing, generation = self._lookup(etf_ids)
+        if missing:
+            rows = (await db.execute(self._select(missing))).all()
+            found.update(self._store(missing, rows, generation))
+        return found
+
+    def get(self, db: Session, etf_id: int) -> ChartSeries:
+        """캐시된 차트 반환 (없거나 TTL이 지났으면 DB에서 로딩)"""
+        return self.get_many(db, [etf_id])[etf_id]
+
+    async def aget(self, db, etf_id: int) -> ChartSeries:
+        """get의 비동기 버전 (AsyncSession 사용)"""
+        return (await self.aget_many(db, [etf_id]))[etf_id]
+
+    def invalidate(self, etf_ids: Optional[Iterable[int]] = None):
+        """지정한 etf_id들의 캐시 삭제 (None이면 전체 삭제)"""
+        with self._lock:
+            self._generation += 1
+            if etf_ids is None:
+                self._series.clear()
+                return
+            for etf_id in etf_ids:
+                self._series.pop(etf_id, None)
+
+
+usa_chart_cache = ChartCache(USAETFsDailyChart)
+domestic_chart_cache = ChartCache(DomesticETFsDailyChart)
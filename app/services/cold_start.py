@@ -0,0 +1,75 @@
+"""
+콜드 스타트 단계별 소요시간 기록 (서버리스 배포 디버그용)
+
+앱 모듈 import, 테이블 생성, DB 엔진 생성, 첫 DB 연결, 첫 요청 처리 시간을 기록하여
+/debug/cold-start 엔드포인트로 확인할 수 있게 한다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# 이 모듈이 처음 import된 시점 (app.main에서 가장 먼저 import함)
+_started_at = time.perf_counter()
+_phases = OrderedDict()
+_first_request = {}
+_lock = threading.Lock()
+
+
+def record(name: str, seconds: float):
+    """단계 소요시간 기록 (같은 단계는 처음 한 번만 기록)"""
+    with _lock:
+        _phases.setdefault(name, {
+            'ms': round(seconds * 1000, 2),
+            'at_ms': round((time.perf_counter() - _started_at) * 1000, 2),
+        })
+
+
+def record_since_start(name: str):
+    """모듈 import 시점부터 지금까지의 시간을 단계로 기록"""
+    record(name, time.perf_counter() - _started_at)
+
+
+@contextmanager
+def phase(name: str):
+    """with 블록 실행 시간을 단계로 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def report() -> dict:
+    """지금까지 기록된 콜드 스타트 정보"""
+    with _lock:
+        return {
+            'uptime_seconds': round(time.perf_counter() - _started_at, 3),
+            'phases': dict(_phases),
+            'first_request': dict(_first_request) or None,
+        }
+
+
+class ColdStartMiddleware:
+    """첫 HTTP 요청의 경로와 처리 시간을 기록하는 ASGI 미들웨어 (이후 요청은 그대로 통과)"""
+
+    def __init__(self, app):
+        self.app = app
+        self._recorded = False
+
+    async def __call__(self, scope, receive, send):
+        if self._recorded or scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        self._recorded = True
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            with _lock:
+                _first_request.update(
+                    path=scope.get('path'),
+                    ms=round((time.perf_counter() - started) * 1000, 2),
+                    at_ms=round((started - _started_at) * 1000, 2),
+                )
@@ -0,0 +1,246 @@
+"""
+일봉 차트 수집 파이프라인
+
+여러 티커를 제한된 수의 스레드에서 동시에 조회(토큰 버킷으로 초당 요청 수 제한)하고,
+DataFrame을 컬럼 단위 벡터 연산으로 행 dict로 변환한 뒤,
+일정 행 수마다 모아서 집합 기반 writer(bulk upsert)로 저장한다.
+
+- DB 쓰기는 파이프라인을 호출한 스레드에서만 수행 (세션을 스레드 간에 공유하지 않음)
+- 데이터 소스는 fetch(ticker, period, interval, start=None) -> DataFrame 만 구현하면 됨
+  (YFinanceSource: 실제 조회, FakeChartSource: 네트워크 없이 테스트 / 벤치마크용)
+- 증분 모드: ETF별 마지막 저장 날짜(워터마크)에서 겹침 구간만큼 앞부터 조회하고 변경 없는 행은 UPDATE하지 않음
+"""
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close')
+
+# 증분 수집 시 마지막 저장일 이전으로 다시 가져오는 일수 (데이터 제공처의 사후 수정 반영)
+INCREMENTAL_OVERLAP_DAYS = 5
+
+
+def incremental_start(latest_date: Optional[date], overlap_days: int = INCREMENTAL_OVERLAP_DAYS) -> Optional[date]:
+    """증분 수집 시작일 (저장된 데이터가 없으면 None - 전체 기간 조회)"""
+    if latest_date is None:
+        return None
+    return latest_date - timedelta(days=overlap_days)
+
+
+class TokenBucket:
+    """초당 rate개의 토큰을 채우는 토큰 버킷 (최대 capacity개까지 몰아서 사용 가능, 스레드 안전)"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 사용 (없으면 채워질 때까지 대기)"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class YFinanceSource:
+    """yfinance 일봉 데이터 소스"""
+
+    def __init__(self):
+        import yfinance  # noqa: F401  (미설치 시 파이프라인 시작 전에 ImportError)
+
+    def fetch(self, ticker: str, period: str, interval: str, start: Optional[date] = None):
+        import yfinance as yf
+        if start is not None:
+            return yf.Ticker(ticker).history(start=start, interval=interval)
+        return yf.Ticker(ticker).history(period=period, interval=interval)
+
+
+class FakeChartSource:
+    """
+    네트워크 없이 결정적인 랜덤워크 일봉을 만드는 테스트용 데이터 소스
+
+    Args:
+        days: 티커당 일봉 수
+        latency: 조회 1회당 지연 시간(초) - 실제 API 응답 시간 흉내
+        fail_tickers: 조회 시 예외를 발생시킬 티커 목록
+    """
+
+    def __init__(self, days: int = 500, latency: float = 0.0, fail_tickers: Iterable[str] = ()):
+        self.days = days
+        self.latency = latency
+        self.fail_tickers = set(fail_tickers)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, ticker: str, period: str, interval: str, start: Optional[date] = None):
+        import pandas as pd
+
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if ticker in self.fail_tickers:
+            raise ConnectionError(f"fake source failure: {ticker}")
+
+        rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+        close = 50 * np.exp(np.cumsum(rng.normal(0.0002, 0.01, self.days)))
+        index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=self.days, tz='America/New_York')
+        df = pd.DataFrame({
+            'Open': close * (1 + rng.normal(0, 0.002, self.days)),
+            'High': close * 1.01,
+            'Low': close * 0.99,
+            'Close': close,
+            'Volume': rng.integers(1_000, 1_000_000, self.days),
+            'Dividends': 0.0,
+        }, index=index)
+        if start is not None:
+            df = df[df.index.date >= start]
+        return df
+
+
+def frame_to_rows(df, etf_id: int, price_scale: int = 6) -> list:
+    """
+    yfinance 형식 DataFrame(Open/High/Low/Close/Volume, DatetimeIndex)을 일봉 차트 행 dict 리스트로 변환
+
+    컬럼 단위 벡터 연산으로 결측 행을 제외하고 가격은 DB 소수점 자리수로 반올림한다.
+    """
+    if df is None or df.empty:
+        return []
+    columns = list(PRICE_COLUMNS) + ['Volume']
+    df = df[columns]
+    df = df[df.notna().all(axis=1)]
+    if df.empty:
+        return []
+
+    # tz-aware 인덱스는 거래소 현지 날짜 기준
+    dates = df.index.date.tolist() if hasattr(df.index, 'date') else list(df.index)
+    prices = [np.round(df[column].to_numpy(dtype=np.float64), price_scale).tolist() for column in PRICE_COLUMNS]
+    volumes = df['Volume'].to_numpy(dtype=np.int64).tolist()
+    return [
+        {'etf_id': etf_id, 'date': chart_date, 'open': open_price, 'high': high_price,
+         'low': low_price, 'close': close_price, 'volume': volume}
+        for chart_date, open_price, high_price, low_price, close_price, volume in zip(dates, *prices, volumes)
+    ]
+
+
+@dataclass
+class PipelineStats:
+    """파이프라인 실행 통계"""
+    tickers: int = 0
+    succeeded: int = 0
+    empty: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)  # (티커, 오류)
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    batches: int = 0
+    fetch_seconds: float = 0.0  # 조회 + 변환 시간 합계 (워커 스레드 기준)
+    write_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+
+def run_chart_pipeline(
+    etfs: List[Tuple[int, str]],
+    source,
+    writer: Callable[[list], dict],
+    start_dates: Optional[Dict[int, date]] = None,
+    period: str = '2y',
+    interval: str = '1d',
+    workers: int = 8,
+    rate_per_second: float = 5.0,
+    batch_rows: int = 5000,
+    max_retries: int = 2,
+    price_scale: int = 6,
+    on_ticker_done: Optional[Callable[[str, int, Optional[str]], None]] = None,
+) -> PipelineStats:
+    """
+    여러 ETF의 일봉을 동시에 조회해서 배치 단위로 저장
+
+    Args:
+        etfs: (etf_id, ticker) 리스트
+        source: fetch(ticker, period, interval, start=None) -> DataFrame 을 구현한 데이터 소스
+        writer: 행 dict 리스트를 저장하고 {'created', 'updated'(, 'unchanged')}를 반환하는 함수 (예: bulk upsert)
+        start_dates: etf_id -> 조회 시작일 (증분 모드, 없는 ETF는 period 전체 조회)
+        workers: 동시 조회 스레드 수
+        rate_per_second: 초당 최대 조회 요청 수 (0 이하면 제한 없음)
+        batch_rows: 이 행 수 이상 모이면 writer 호출
+        max_retries: 조회 실패 시 재시도 횟수 (지수 백오프)
+        on_ticker_done: 티커 하나가 끝날 때마다 (티커, 행 수, 오류 메시지) 로 호출되는 콜백
+    """
+    stats = PipelineStats(tickers=len(etfs))
+    start_dates = start_dates or {}
+    bucket = TokenBucket(rate_per_second)
+    started = time.perf_counter()
+
+    def fetch_rows(etf_id: int, ticker: str) -> tuple:
+        fetch_started = time.perf_counter()
+        for attempt in range(max_retries + 1):
+            bucket.acquire()
+            try:
+                df = source.fetch(ticker, period, interval, start=start_dates.get(etf_id))
+                break
+            except Exception:
+                if attempt == max_retries:
+                    raise
+                time.sleep(0.5 * (2 ** attempt))
+        rows = frame_to_rows(df, etf_id, price_scale)
+        return rows, time.perf_counter() - fetch_started
+
+    buffer = []
+
+    def flush():
+        if not buffer:
+            return
+        write_started = time.perf_counter()
+        result = writer(list(buffer))
+        stats.write_seconds += time.perf_counter() - write_started
+        stats.created += result.get('created', 0)
+        stats.updated += result.get('updated', 0)
+        stats.unchanged += result.get('unchanged', 0)
+        stats.batches += 1
+        buffer.clear()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='chart-fetch') as executor:
+        futures = {executor.submit(fetch_rows, etf_id, ticker): ticker for etf_id, ticker in etfs}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                rows, seconds = future.result()
+            except Exception as e:
+                stats.failed.append((ticker, str(e)))
+                if on_ticker_done:
+                    on_ticker_done(ticker, 0, str(e))
+                continue
+
+            stats.fetch_seconds += seconds
+            if rows:
+                stats.succeeded += 1
+                stats.rows += len(rows)
+                buffer.extend(rows)
+                if len(buffer) >= batch_rows:
+                    flush()
+            else:
+                stats.empty += 1
+            if on_ticker_done:
+                on_ticker_done(ticker, len(rows), None)
+        flush()
+
+    stats.elapsed_seconds = time.perf_counter() - started
+    return stats
@@ -0,0 +1,259 @@
+"""
+향후 12개월 배당 현금흐름 추정
+
+ISA / IRP / 연금저축펀드 보유 종목 전체에 대해 최근 12개월 배당 이력이 같은 달에 반복된다고 보고
+다음 12개월의 종목별 / 월별 배당금(원화)을 추정하고 배당소득 목표(income_target)와 비교한다.
+
+- 보유 종목, 배당 이력은 각각 쿼리 한 번으로 조회하고 NumPy 배열 연산으로 한 번에 계산
+- 미국 ETF 배당은 기준일의 as-of USD/KRW 환율로 원화 환산
+- 계산 결과는 (보유 종목 스냅샷, 배당 데이터 버전, 기준월, 환율, 목표/설정) 단위로 메모이제이션
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Optional
+import numpy as np
+from sqlalchemy import select, func, literal, union_all
+from sqlalchemy.orm import Session
+from app.database import settings
+from app.models.domestic_etfs import DomesticETFs
+from app.models.domestic_etfs_dividend import DomesticETFsDividend
+from app.models.usa_etfs import USAETFs
+from app.models.usa_etfs_dividend import USAETFsDividend
+from app.models.income_target import IncomeTarget, IncomeType
+from app.models.early_retirement_initial_setting import EarlyRetirementInitialSetting, DividendOption
+from app.services.exchange_rate_cache import usd_krw_cache
+from app.services.portfolio_valuation import ACCOUNT_TYPES
+
+PROJECTION_MONTHS = 12
+
+# 배당옵션별 목표 배당수익률
+DIVIDEND_OPTION_YIELDS = {
+    DividendOption.MEDIUM: 0.05,
+    DividendOption.HIGH: 0.10,
+    DividendOption.ULTRA_HIGH: 0.20,
+}
+
+
+def _holdings_select():
+    """세 계좌 상세 테이블의 보유 종목 (국내/미국 ETF 매칭 포함)을 한 문장으로 조회"""
+    selects = []
+    for account_type, _, detail_model in ACCOUNT_TYPES:
+        selects.append(
+            select(
+                literal(account_type).label('account_type'),
+                detail_model.account_id,
+                detail_model.stock_code,
+                detail_model.quantity,
+                DomesticETFs.id.label('domestic_etf_id'),
+                DomesticETFs.name.label('domestic_name'),
+                USAETFs.id.label('usa_etf_id'),
+                USAETFs.name.label('usa_name'),
+            )
+            .select_from(detail_model)
+            .outerjoin(DomesticETFs, DomesticETFs.ticker == detail_model.stock_code)
+            .outerjoin(USAETFs, USAETFs.ticker == detail_model.stock_code)
+        )
+    return union_all(*selects)
+
+
+def _dividend_version_select():
+    """
+    배당 테이블 버전 (행 수, 최대 id, 배당금 합계) - 스크래퍼 등 다른 프로세스의 적재도 감지
+
+    upsert는 같은 (etf_id, 기준일) 행의 배당금을 제자리에서 고치므로 행 수 / id만으로는 정정을 놓친다.
+    """
+    return select(
+        select(func.count(DomesticETFsDividend.id)).scalar_subquery(),
+        select(func.max(DomesticETFsDividend.id)).scalar_subquery(),
+        select(func.sum(DomesticETFsDividend.dividend_amt)).scalar_subquery(),
+        select(func.count(USAETFsDividend.id)).scalar_subquery(),
+        select(func.max(USAETFsDividend.id)).scalar_subquery(),
+        select(func.sum(USAETFsDividend.dividend_amt)).scalar_subquery(),
+    )
+
+
+def _held_etf_ids(holdings: list) -> tuple:
+    """보유 종목의 (국내 ETF id 목록, 미국 ETF id 목록) - 같은 종목코드가 양쪽에 있으면 국내 우선"""
+    domestic_ids = sorted({row.domestic_etf_id for row in holdings if row.domestic_etf_id is not None})
+    usa_ids = sorted({row.usa_etf_id for row in holdings if row.domestic_etf_id is None and row.usa_etf_id is not None})
+    return domestic_ids, usa_ids
+
+
+def _trailing_dividends(db: Session, model, date_column, etf_ids: list, start: date, end: date) -> tuple:
+    """etf_ids의 start ~ end 배당 (etf_id 배열, 지급월 배열, 주당 배당금 배열)"""
+    if not etf_ids:
+        return np.array([], dtype=np.int64), np.array([], dtype='datetime64[M]'), np.array([], dtype=np.float64)
+    rows = db.execute(
+        select(model.etf_id, date_column, model.dividend_amt)
+        .where(model.etf_id.in_(etf_ids), date_column >= start, date_column <= end)
+    ).all()
+    columns = list(zip(*rows)) if rows else [(), (), ()]
+    return (
+        np.array(columns[0], dtype=np.int64),
+        np.array(columns[1], dtype='datetime64[D]').astype('datetime64[M]'),
+        np.array([float(amount) for amount in columns[2]], dtype=np.float64),
+    )
+
+
+def _per_share_matrix(etf_ids: list, dividend_etf_ids: np.ndarray, pay_months: np.ndarray,
+                      amounts: np.ndarray, first_month: np.datetime64) -> np.ndarray:
+    """ETF별 향후 12개월 주당 배당금 행렬 (len(etf_ids) x 12)"""
+    matrix = np.zeros((len(etf_ids), PROJECTION_MONTHS), dtype=np.float64)
+    if len(amounts) == 0:
+        return matrix
+    rows = np.searchsorted(np.array(etf_ids, dtype=np.int64), dividend_etf_ids)
+    # 최근 12개월 중 k번째 달의 배당은 다음 12개월 중 k번째 달에 다시 지급된다고 가정
+    columns = (pay_months - first_month).astype(np.int64)
+    np.add.at(matrix, (rows, columns), amounts)
+    return matrix
+
+
+def compute_projection(holdings: list, domestic: tuple, usa: tuple, as_of: date,
+                       usd_krw_rate: Optional[float], monthly_target: float,
+                       dividend_option: Optional[DividendOption]) -> dict:
+    """보유 종목과 배당 이력 배열로 향후 12개월 배당 추정 (응답 스키마: DividendProjection)"""
+    current_month = np.datetime64(as_of, 'M')
+    trailing_first = current_month - (PROJECTION_MONTHS - 1)
+    months = np.arange(current_month + 1, current_month + 1 + PROJECTION_MONTHS)
+
+    domestic_ids, usa_ids = _held_etf_ids(holdings)
+    domestic_matrix = _per_share_matrix(domestic_ids, *domestic, trailing_first)
+    usa_matrix = _per_share_matrix(usa_ids, *usa, trailing_first) * (usd_krw_rate or 0.0)
+
+    # 보유 종목별 주당 배당 행 선택 후 수량을 곱해 (보유 종목 수 x 12) 배당금 행렬 생성
+    domestic_rows = {etf_id: idx for idx, etf_id in enumerate(domestic_ids)}
+    usa_rows = {etf_id: idx for idx, etf_id in enumerate(usa_ids)}
+    per_share = np.zeros((len(holdings), PROJECTION_MONTHS), dtype=np.float64)
+    markets = []
+    for idx, row in enumerate(holdings):
+        if row.domestic_etf_id is not None:
+            per_share[idx] = domestic_matrix[domestic_rows[row.domestic_etf_id]]
+            markets.append('domestic')
+        elif row.usa_etf_id is not None:
+            per_share[idx] = usa_matrix[usa_rows[row.usa_etf_id]]
+            markets.append('usa')
+        else:
+            markets.append(None)
+    quantities = np.array([float(row.quantity) for row in holdings], dtype=np.float64)
+    holding_amounts = np.round(per_share * quantities[:, None])
+    monthly_totals = holding_amounts.sum(axis=0)
+    annual_total = float(monthly_totals.sum())
+
+    month_labels = np.datetime_as_string(months, unit='M').tolist()
+    annual_target = monthly_target * PROJECTION_MONTHS
+    option_yield = DIVIDEND_OPTION_YIELDS.get(dividend_option)
+
+    return {
+        'as_of': as_of,
+        'months': month_labels,
+        'usd_krw_rate': usd_krw_rate,
+        'holdings': [
+            {
+                'account_type': row.account_type,
+                'account_id': row.account_id,
+                'stock_code': row.stock_code,
+                'stock_name': row.domestic_name or row.usa_name,
+                'market': market,
+                'quantity': float(row.quantity),
+                'annual_amount': int(amounts.sum()),
+                'monthly_amounts': amounts.astype(np.int64).tolist(),
+            }
+            for row, market, amounts in zip(holdings, markets, holding_amounts)
+        ],
+        'monthly': [
+            {
+                'month': month,
+                'amount': int(amount),
+                'target_amount': int(monthly_target),
+                'shortfall': int(max(monthly_target - amount, 0)),
+            }
+            for month, amount in zip(month_labels, monthly_totals.tolist())
+        ],
+        'annual_total': int(annual_total),
+        'monthly_target': int(monthly_target),
+        'annual_target': int(annual_target),
+        'achievement_rate': round(annual_total / annual_target, 6) if annual_target else None,
+        'dividend_option': dividend_option,
+        'option_yield': option_yield,
+        # 배당옵션 수익률로 목표 배당소득을 얻기 위해 필요한 투자자산
+        'required_assets': int(annual_target / option_yield) if option_yield else None,
+    }
+
+
+class DividendProjectionService:
+    """배당 추정 결과 메모이제이션 (스레드 안전, LRU + TTL)"""
+
+    def __init__(self, ttl_seconds: int = None, max_entries: int = 32):
+        self.ttl_seconds = settings.dividend_projection_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.max_entries = max_entries
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: tuple) -> Optional[dict]:
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl_seconds:
+                return None
+            self._results.move_to_end(key)
+            return entry[1]
+
+    def _store(self, key: tuple, result: dict):
+        with self._lock:
+            self._results[key] = (time.monotonic(), result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def project(self, db: Session, as_of: Optional[date] = None) -> dict:
+        """
+        향후 12개월 배당 추정
+
+        Args:
+            db: 데이터베이스 세션
+            as_of: 기준일 (기본: 오늘). 기준월 포함 최근 12개월 배당 이력을 다음 12개월로 투영
+
+        Note:
+            income_target의 배당소득(dividend) 금액은 월 목표 금액으로 보고 합산한다.
+        """
+        as_of = as_of or date.today()
+        holdings = db.execute(_holdings_select()).all()
+        dividend_version = tuple(db.execute(_dividend_version_select()).one())
+        monthly_target = float(
+            db.execute(
+                select(func.coalesce(func.sum(IncomeTarget.amount), 0)).where(IncomeTarget.type == IncomeType.DIVIDEND)
+            ).scalar()
+        )
+        dividend_option = db.execute(
+            select(EarlyRetirementInitialSetting.dividend_option).order_by(EarlyRetirementInitialSetting.id.asc()).limit(1)
+        ).scalar()
+        rate = usd_krw_cache.get(db).asof(as_of)
+        usd_krw_rate = rate['exchange_rate'] if rate else None
+
+        key = (
+            tuple(tuple(row) for row in holdings),
+            dividend_version,
+            np.datetime64(as_of, 'M').item(),
+            usd_krw_rate,
+            monthly_target,
+            dividend_option,
+        )
+        result = self._lookup(key)
+        if result is not None:
+            return result
+
+        current_month = np.datetime64(as_of, 'M')
+        trailing_start = (current_month - (PROJECTION_MONTHS - 1)).astype('datetime64[D]').item()
+        domestic_ids, usa_ids = _held_etf_ids(holdings)
+        domestic = _trailing_dividends(
+            db, DomesticETFsDividend, DomesticETFsDividend.payment_date, domestic_ids, trailing_start, as_of
+        )
+        usa = _trailing_dividends(db, USAETFsDividend, USAETFsDividend.record_date, usa_ids, trailing_start, as_of)
+
+        result = compute_projection(holdings, domestic, usa, as_of, usd_krw_rate, monthly_target, dividend_option)
+        self._store(key, result)
+        return result
+
+
+dividend_projection_service = DividendProjectionService()
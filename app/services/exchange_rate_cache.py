@@ -0,0 +1,137 @@
+"""
+USD/KRW 환율(basic.usd_krw_exchange) 인메모리 캐시
+
+테이블 전체를 날짜 오름차순 NumPy 배열로 보관하여 as-of 환율 조회를 쿼리 없이 이진 탐색으로 처리한다.
+- 최초 조회 시 지연 로딩, 같은 프로세스의 환율 쓰기 시 무효화
+- 다른 프로세스(스크래퍼 등)의 쓰기는 TTL이 지나면 반영
+"""
+import threading
+import time
+from datetime import date
+from typing import Optional
+import numpy as np
+from sqlalchemy import select, cast, Float
+from sqlalchemy.orm import Session
+from app.database import settings
+from app.models.usd_krw_exchange import USDKRWExchange
+from app.services.asof_lookup import asof_index, asof_indices, to_datetime64
+
+
+class ExchangeRateSeries:
+    """날짜 오름차순 환율 시계열"""
+
+    __slots__ = ('ids', 'dates', 'rates', 'loaded_at')
+
+    def __init__(self, rows: list):
+        self.loaded_at = time.monotonic()
+        columns = list(zip(*rows)) if rows else [()] * 3
+        self.ids = np.array(columns[0], dtype=np.int64)
+        self.dates = np.array(columns[1], dtype='datetime64[D]')
+        self.rates = np.array(columns[2], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def record(self, idx: int) -> dict:
+        """인덱스의 환율을 JSON 응답용 dict로 변환"""
+        return {
+            'id': int(self.ids[idx]),
+            'date': str(self.dates[idx]),
+            'exchange_rate': float(self.rates[idx]),
+        }
+
+    def asof(self, target_date: date) -> Optional[dict]:
+        """target_date 또는 그 이전의 가장 가까운 환율 (없으면 None)"""
+        idx = asof_index(self.dates, target_date)
+        return None if idx is None else self.record(idx)
+
+    def _asof_rates(self, targets) -> tuple:
+        """targets 각각의 as-of (환율 배열, 환율 날짜 배열, 존재 여부 마스크)"""
+        indices = asof_indices(self.dates, targets)
+        found = indices >= 0
+        if len(self) == 0:
+            return np.full(len(indices), np.nan), np.full(len(indices), np.datetime64('NaT'), dtype='datetime64[D]'), found
+        safe_indices = np.where(found, indices, 0)
+        return self.rates[safe_indices], self.dates[safe_indices], found
+
+    def convert(self, dates: list, usd_amounts: list) -> dict:
+        """
+        날짜별 as-of 환율로 달러 금액을 원화로 일괄 환산 (벡터화)
+
+        Returns:
+            {'krw_amounts', 'exchange_rates', 'rate_dates'} (적용 가능한 환율이 없는 항목은 None)
+        """
+        rates, rate_dates, found = self._asof_rates(dates)
+        krw_amounts = np.round(np.asarray(usd_amounts, dtype=np.float64) * rates, 2)
+        found_list = found.tolist()
+        return {
+            'krw_amounts': [amount if ok else None for amount, ok in zip(krw_amounts.tolist(), found_list)],
+            'exchange_rates': [rate if ok else None for rate, ok in zip(rates.tolist(), found_list)],
+            'rate_dates': [
+                rate_date if ok else None
+                for rate_date, ok in zip(np.datetime_as_string(rate_dates, unit='D').tolist(), found_list)
+            ],
+        }
+
+    def daily_rates(self, start_date: date, end_date: date) -> list:
+        """start_date ~ end_date 모든 날짜의 as-of 환율 (주말/공휴일은 직전 영업일 환율)"""
+        days = np.arange(to_datetime64(start_date), to_datetime64(end_date) + np.timedelta64(1, 'D'))
+        rates, _, found = self._asof_rates(days)
+        return [
+            {'date': day, 'exchange_rate': rate if ok else None}
+            for day, rate, ok in zip(np.datetime_as_string(days, unit='D').tolist(), rates.tolist(), found.tolist())
+        ]
+
+
+class ExchangeRateCache:
+    """환율 시계열 캐시 (스레드 안전)"""
+
+    def __init__(self, ttl_seconds: int = None):
+        self.ttl_seconds = settings.exchange_rate_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._series: Optional[ExchangeRateSeries] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _lookup(self) -> tuple:
+        """(유효한 캐시 시계열 또는 None, 현재 세대)"""
+        with self._lock:
+            series = self._series
+            if series is not None and time.monotonic() - series.loaded_at < self.ttl_seconds:
+                return series, self._generation
+            return None, self._generation
+
+    def _select(self):
+        return (
+            select(USDKRWExchange.id, USDKRWExchange.date, cast(USDKRWExchange.exchange_rate, Float))
+            .order_by(USDKRWExchange.date.asc())
+        )
+
+    def _store(self, rows: list, generation: int) -> ExchangeRateSeries:
+        series = ExchangeRateSeries(rows)
+        with self._lock:
+            # 로딩 중에 무효화가 발생했다면 오래된 데이터일 수 있으므로 캐시에 넣지 않음
+            if generation == self._generation:
+                self._series = series
+        return series
+
+    def get(self, db: Session) -> ExchangeRateSeries:
+        """캐시된 환율 시계열 반환 (없거나 TTL이 지났으면 DB에서 로딩)"""
+        series, generation = self._lookup()
+        if series is None:
+            series = self._store(db.execute(self._select()).all(), generation)
+        return series
+
+    async def aget(self, db) -> ExchangeRateSeries:
+        """get의 비동기 버전 (AsyncSession 사용)"""
+        series, generation = self._lookup()
+        if series is None:
+            series = self._store((await db.execute(self._select())).all(), generation)
+        return series
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._series = None
+
+
+usd_krw_cache = ExchangeRateCache()
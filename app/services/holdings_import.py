@@ -0,0 +1,437 @@
+"""
+ISA / IRP / 연금저축펀드 계좌 보유 종목 엑셀 업로드 공통 처리
+
+- openpyxl 읽기 전용 모드로 행을 순서대로 읽음 (업로드 파일 전체를 메모리에 올리지 않음)
+- 컬럼별로 값을 변환한 뒤 NumPy 마스크로 전체 행을 한 번에 검증
+- 기존 보유 종목은 (account_id, stock_code) 기준 조회 1회로 찾고, bulk_upsert로 한 트랜잭션에서 생성 / 업데이트
+  (업데이트할 때 매도수수료는 기존 값 유지, 새로 생성하면 0)
+
+엑셀 컬럼: 종목코드, 수량, 매입단가, 현재가, 매수수수료(선택, 비어있으면 0)
+
+파일 가져오기(ingest_holdings)는 템플릿 외에 CSV / 증권사 잔고 내보내기 파일도 받는다.
+- 헤더 이름으로 컬럼을 찾음 (BROKER_LAYOUTS 또는 요청한 매핑, 헤더 위의 제목 행은 건너뜀)
+- 현재 보유 종목을 한 번에 읽어서 stock_code 기준 dict로 비교 (생성 / 업데이트 / 삭제 변경 내역)
+- dry_run이면 변경 내역만 반환하고, 아니면 오류가 없을 때만 한 트랜잭션으로 반영
+- 매수수수료 컬럼이 없는 레이아웃이면 매수수수료는 비교 / 저장하지 않음 (저장된 값 유지, 새로 생성하면 0)
+"""
+import codecs
+import csv
+import io
+import os
+from decimal import Decimal, InvalidOperation
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app.crud.bulk_upsert import bulk_upsert
+from app.schemas.holdings_import import HoldingChange, HoldingValues, HoldingsIngestResult
+from app.services.portfolio_valuation import portfolio_valuation_cache
+
+STOCK_CODE_LENGTH = 6
+PRICE_COLUMNS = ('quantity', 'purchase_avg_price', 'current_price')  # 필수 숫자 컬럼 (엑셀 2~4번째 열)
+KEY_COLUMNS = ('account_id', 'stock_code')
+HOLDING_FIELDS = ('stock_code',) + PRICE_COLUMNS + ('purchase_fee',)  # validate_rows가 받는 행의 컬럼 순서
+VALUE_FIELDS = PRICE_COLUMNS + ('purchase_fee',)
+
+# 필드 -> 헤더 이름 후보 (증권사 잔고 / 평가 내역 내보내기의 흔한 헤더)
+BROKER_LAYOUTS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    'template': {
+        'stock_code': ('종목코드',),
+        'quantity': ('수량',),
+        'purchase_avg_price': ('매입단가',),
+        'current_price': ('현재가',),
+        'purchase_fee': ('매수수수료',),
+    },
+    'kiwoom': {
+        'stock_code': ('종목번호', '종목코드'),
+        'quantity': ('보유수량',),
+        'purchase_avg_price': ('매입가', '평균단가'),
+        'current_price': ('현재가',),
+        'purchase_fee': ('매입수수료', '수수료'),
+    },
+    'mirae_asset': {
+        'stock_code': ('종목코드',),
+        'quantity': ('잔고수량', '보유수량'),
+        'purchase_avg_price': ('매입단가', '매입평균가'),
+        'current_price': ('현재가',),
+        'purchase_fee': ('매입수수료', '수수료'),
+    },
+    'samsung': {
+        'stock_code': ('종목코드',),
+        'quantity': ('보유수량', '잔고수량'),
+        'purchase_avg_price': ('평균매입가', '매입평균가'),
+        'current_price': ('현재가',),
+        'purchase_fee': ('수수료',),
+    },
+    'korea_investment': {
+        'stock_code': ('상품번호', '종목코드'),
+        'quantity': ('보유수량',),
+        'purchase_avg_price': ('매입평균가격', '매입평균가'),
+        'current_price': ('현재가',),
+        'purchase_fee': ('수수료',),
+    },
+}
+HEADER_SEARCH_ROWS = 20  # 헤더 행을 찾을 때 확인할 앞부분 행 수 (내보내기 파일의 제목 / 조회 조건 행)
+
+_INVALID = object()  # 숫자로 변환할 수 없는 값
+
+
+def _iter_sheet_rows(file: BinaryIO, min_row: int = 1) -> Iterator[Tuple[int, tuple]]:
+    # openpyxl은 import 비용이 커서 엑셀 업로드가 처음 호출될 때 로딩
+    import openpyxl
+
+    wb = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        yield from enumerate(wb.active.iter_rows(min_row=min_row, values_only=True), start=min_row)
+    finally:
+        wb.close()
+
+
+def iter_excel_rows(file: BinaryIO) -> Iterator[Tuple[int, tuple]]:
+    """첫 번째 시트의 (행 번호, 값) (헤더 행과 빈 행 제외)"""
+    for row_idx, row in _iter_sheet_rows(file, min_row=2):
+        if row and any(row):
+            yield row_idx, row
+
+
+def _detect_encoding(file: BinaryIO, sample_size: int = 65536) -> str:
+    """CSV 인코딩 추정 (UTF-8로 읽히지 않으면 증권사 내보내기에 흔한 CP949)"""
+    sample = file.read(sample_size)
+    file.seek(0)
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample)  # 끝에서 잘린 멀티바이트 문자는 오류로 보지 않음
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+
+def _iter_csv_rows(file: BinaryIO) -> Iterator[Tuple[int, tuple]]:
+    text = io.TextIOWrapper(file, encoding=_detect_encoding(file), newline='')
+    try:
+        yield from enumerate((tuple(row) for row in csv.reader(text)), start=1)
+    finally:
+        text.detach()  # 업로드 파일은 호출한 쪽에서 닫음
+
+
+def _to_decimal(value):
+    if value is None:
+        return None
+    try:
+        number = Decimal(str(value))
+    except (ValueError, TypeError, InvalidOperation):
+        return _INVALID
+    return number if number.is_finite() else _INVALID
+
+
+def _to_fee(value):
+    # 매수수수료는 정수(원)로 버림, 비어있으면 0
+    if value is None:
+        return Decimal(0)
+    try:
+        return Decimal(int(float(value)))
+    except (ValueError, TypeError, OverflowError):
+        return _INVALID
+
+
+def _cell(row: tuple, index: int):
+    return row[index] if len(row) > index else None
+
+
+def validate_rows(rows: List[Tuple[int, tuple]], account_id: int) -> Tuple[List[dict], List[str]]:
+    """
+    엑셀 행 -> (저장할 보유 종목 dict 리스트, 오류 메시지 리스트)
+
+    행마다 첫 번째로 걸린 검증 오류 하나만 보고한다 (종목코드 -> 숫자 형식 -> 필수 값 -> 음수 순).
+    """
+    if not rows:
+        return [], []
+    row_numbers = [row_idx for row_idx, _ in rows]
+    codes = [str(row[0]).strip() if row[0] else '' for _, row in rows]
+    numbers = {
+        column: [_to_decimal(_cell(row, index)) for _, row in rows]
+        for index, column in enumerate(PRICE_COLUMNS, start=1)
+    }
+    numbers['purchase_fee'] = [_to_fee(_cell(row, 4)) for _, row in rows]
+
+    code_lengths = np.array([len(code) for code in codes])
+    invalid = np.zeros(len(rows), dtype=bool)
+    missing = np.zeros(len(rows), dtype=bool)
+    negative = np.zeros(len(rows), dtype=bool)
+    for values in numbers.values():
+        invalid |= np.array([value is _INVALID for value in values])
+        missing |= np.array([value is None for value in values])
+        as_float = np.array([float(value) if isinstance(value, Decimal) else np.nan for value in values])
+        negative |= np.nan_to_num(as_float, nan=0.0) < 0
+
+    empty_code = code_lengths == 0
+    bad_code = ~empty_code & (code_lengths != STOCK_CODE_LENGTH)
+    invalid &= ~(empty_code | bad_code)
+    missing &= ~(empty_code | bad_code | invalid)
+    negative &= ~(empty_code | bad_code | invalid | missing)
+    valid = ~(empty_code | bad_code | invalid | missing | negative)
+
+    errors = []
+    for i in np.flatnonzero(~valid):
+        row_idx = row_numbers[i]
+        if empty_code[i]:
+            errors.append(f"{row_idx}행: 종목코드가 비어있습니다.")
+        elif bad_code[i]:
+            errors.append(f"{row_idx}행: 종목코드는 {STOCK_CODE_LENGTH}자리여야 합니다. (현재: {code_lengths[i]}자리)")
+        elif invalid[i]:
+            errors.append(f"{row_idx}행: 숫자가 아닌 값이 있습니다. (수량, 매입단가, 현재가, 매수수수료는 숫자여야 합니다.)")
+        elif missing[i]:
+            errors.append(f"{row_idx}행: 필수 필드(수량, 매입단가, 현재가)가 비어있습니다.")
+        else:
+            errors.append(f"{row_idx}행: 음수는 입력할 수 없습니다.")
+
+    holdings = [
+        {
+            'account_id': account_id,
+            'stock_code': codes[i],
+            **{column: values[i] for column, values in numbers.items()},
+        }
+        for i in np.flatnonzero(valid)
+    ]
+    return holdings, errors
+
+
+def import_holdings_excel(db: Session, detail_model, account_id: int, file: BinaryIO) -> dict:
+    """
+    보유 종목 엑셀 파일을 account_id 계좌에 반영 (오류가 있는 행은 건너뛰고 나머지는 저장)
+
+    Args:
+        detail_model: 계좌 상세 모델 (ISAAccountDetail, IRPAccountDetail, PensionFundAccountDetail)
+        file: 업로드된 엑셀 파일 (seek 가능한 파일 객체)
+
+    Returns:
+        {'success_count', 'create_count', 'update_count', 'error_count', 'errors'}
+        같은 종목코드가 여러 번 나오면 마지막 행의 값으로 저장하고 두 번째부터는 업데이트로 센다.
+    """
+    holdings, errors = validate_rows(list(iter_excel_rows(file)), account_id)
+
+    created = 0
+    if holdings:
+        try:
+            result = bulk_upsert(db, detail_model, holdings, key_columns=KEY_COLUMNS)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        portfolio_valuation_cache.invalidate()
+        created = result['created']
+
+    return {
+        "success_count": len(holdings),
+        "create_count": created,
+        "update_count": len(holdings) - created,
+        "error_count": len(errors),
+        "errors": errors,
+    }
+
+
+def _normalize_code(value) -> Optional[str]:
+    # 숫자로 저장된 종목코드(앞자리 0 누락)와 증권사 표기(A069500) 정리
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"{int(value):06d}"
+    code = str(value).strip()
+    if len(code) == STOCK_CODE_LENGTH + 1 and code[0] in 'AaQ':
+        code = code[1:]
+    return code or None
+
+
+def _normalize_number(value):
+    # CSV / 내보내기 파일의 문자열 숫자 (천 단위 구분기호, 공백)
+    if isinstance(value, str):
+        value = value.replace(',', '').strip()
+        return value or None
+    return value
+
+
+def _clean_header(value) -> str:
+    return str(value).replace(' ', '').replace('\n', '').strip() if value is not None else ''
+
+
+def resolve_columns(header: tuple, layout: Dict[str, Sequence[str]]) -> Optional[Dict[str, int]]:
+    """헤더 행 -> 필드별 컬럼 위치 (필수 필드 헤더가 하나라도 없으면 None, 매수수수료는 선택)"""
+    positions = {_clean_header(name): index for index, name in reversed(list(enumerate(header)))}
+    columns = {}
+    for field in HOLDING_FIELDS:
+        index = next((positions[_clean_header(name)] for name in layout.get(field, ()) if _clean_header(name) in positions), None)
+        if index is None:
+            if field != 'purchase_fee':
+                return None
+            continue
+        columns[field] = index
+    return columns
+
+
+def parse_mapping(mapping: Dict[str, object]) -> Dict[str, Tuple[str, ...]]:
+    """요청한 컬럼 매핑 {필드: 헤더 이름 또는 이름 목록} 검증"""
+    if not isinstance(mapping, dict):
+        raise ValueError("mapping은 JSON 객체여야 합니다.")
+    unknown = set(mapping) - set(HOLDING_FIELDS)
+    if unknown:
+        raise ValueError(f"알 수 없는 필드입니다: {', '.join(sorted(unknown))} (가능한 필드: {', '.join(HOLDING_FIELDS)})")
+    missing = [field for field in HOLDING_FIELDS[:-1] if not mapping.get(field)]
+    if missing:
+        raise ValueError(f"필수 필드의 헤더 이름이 없습니다: {', '.join(missing)}")
+    return {field: (names,) if isinstance(names, str) else tuple(names) for field, names in mapping.items() if names}
+
+
+def iter_mapped_rows(rows: Iterator[Tuple[int, tuple]], layout: str = 'auto',
+                     mapping: Optional[Dict[str, Sequence[str]]] = None
+                     ) -> Tuple[str, Dict[str, int], Iterator[Tuple[int, tuple]]]:
+    """
+    파일 행 -> (사용한 레이아웃 이름, 필드별 컬럼 위치, HOLDING_FIELDS 순서로 정리한 (행 번호, 값))
+
+    앞쪽 HEADER_SEARCH_ROWS행 안에서 레이아웃의 헤더가 모두 있는 행을 헤더로 사용한다.
+    """
+    if mapping:
+        candidates = {'custom': mapping}
+    elif layout == 'auto':
+        candidates = BROKER_LAYOUTS
+    elif layout in BROKER_LAYOUTS:
+        candidates = {layout: BROKER_LAYOUTS[layout]}
+    else:
+        raise ValueError(f"알 수 없는 레이아웃입니다: {layout} (가능한 레이아웃: auto, {', '.join(BROKER_LAYOUTS)})")
+
+    for row_idx, header in rows:
+        for name, candidate in candidates.items():
+            columns = resolve_columns(header, candidate)
+            if columns is not None:
+                return name, columns, _mapped(rows, columns)
+        if row_idx >= HEADER_SEARCH_ROWS:
+            break
+    raise ValueError(f"헤더 행을 찾을 수 없습니다. 앞쪽 {HEADER_SEARCH_ROWS}행 안에 종목코드 / 수량 / 매입단가 / 현재가 헤더가 있어야 합니다.")
+
+
+def _mapped(rows: Iterator[Tuple[int, tuple]], columns: Dict[str, int]) -> Iterator[Tuple[int, tuple]]:
+    for row_idx, row in rows:
+        if not row or not any(value not in (None, '') for value in row):
+            continue
+        values = [_cell(row, columns[field]) if field in columns else None for field in HOLDING_FIELDS]
+        yield row_idx, (_normalize_code(values[0]), *(_normalize_number(value) for value in values[1:]))
+
+
+def _values(row) -> HoldingValues:
+    return HoldingValues(**{field: row[field] for field in VALUE_FIELDS})
+
+
+def diff_holdings(db: Session, detail_model, account_id: int, holdings: List[dict],
+                  delete_missing: bool = False, value_fields: Sequence[str] = VALUE_FIELDS
+                  ) -> Tuple[List[HoldingChange], List[dict], List[int], int]:
+    """
+    파일의 보유 종목과 현재 저장된 보유 종목 비교 (계좌의 보유 종목 조회 1회 + stock_code 기준 dict 비교)
+
+    value_fields에 없는 필드(파일에 없는 매수수수료)는 비교하지 않고, 변경 내역에는 저장된 값(생성이면 0)으로 표시한다.
+
+    Returns:
+        (변경 내역, 저장할 행(생성 + 업데이트), 삭제할 id, 변경 없는 종목 수)
+        같은 종목코드가 여러 번 나오면 마지막 행의 값을 사용한다.
+    """
+    current = {
+        row.stock_code: row
+        for row in db.execute(
+            select(detail_model.id, detail_model.stock_code, *(getattr(detail_model, field) for field in VALUE_FIELDS))
+            .where(detail_model.account_id == account_id)
+        )
+    }
+    incoming = {holding['stock_code']: holding for holding in holdings}
+
+    changes, upserts, unchanged = [], [], 0
+    for stock_code, holding in incoming.items():
+        stored = current.get(stock_code)
+        if stored is None:
+            after = _values({'purchase_fee': Decimal(0), **holding})
+            changes.append(HoldingChange(action='create', stock_code=stock_code, after=after))
+            upserts.append(holding)
+            continue
+        changed_fields = [field for field in value_fields if getattr(stored, field) != holding[field]]
+        if not changed_fields:
+            unchanged += 1
+            continue
+        changes.append(HoldingChange(
+            action='update', stock_code=stock_code, before=_values(stored._mapping),
+            after=_values({**stored._mapping, **holding}),
+            changed_fields=changed_fields,
+        ))
+        upserts.append(holding)
+
+    delete_ids = []
+    if delete_missing:
+        for stock_code, stored in current.items():
+            if stock_code not in incoming:
+                changes.append(HoldingChange(action='delete', stock_code=stock_code, before=_values(stored._mapping)))
+                delete_ids.append(stored.id)
+    return changes, upserts, delete_ids, unchanged
+
+
+def ingest_holdings(db: Session, detail_model, account_id: int, file: BinaryIO, filename: str,
+                    layout: str = 'auto', mapping: Optional[Dict[str, Sequence[str]]] = None,
+                    dry_run: bool = True, delete_missing: bool = False) -> HoldingsIngestResult:
+    """
+    보유 종목 파일(CSV, XLSX)을 account_id 계좌와 비교하고, dry_run이 아니면 반영
+
+    Args:
+        detail_model: 계좌 상세 모델 (ISAAccountDetail, IRPAccountDetail, PensionFundAccountDetail)
+        file: 업로드된 파일 (seek 가능한 파일 객체)
+        filename: 파일 이름 (확장자로 형식 판단)
+        layout: BROKER_LAYOUTS의 이름 또는 auto (헤더로 자동 판단)
+        mapping: 직접 지정한 컬럼 매핑 {필드: 헤더 이름 목록} (지정하면 layout 무시)
+        dry_run: True면 변경 내역만 계산
+        delete_missing: True면 파일에 없는 보유 종목을 삭제 대상으로 (파일이 계좌 전체 잔고인 경우)
+
+    dry_run이 아니어도 검증 오류가 있으면 아무것도 저장하지 않는다 (applied=False).
+    """
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension == '.csv':
+        file_format, rows = 'csv', _iter_csv_rows(file)
+    elif extension == '.xlsx':
+        file_format, rows = 'xlsx', _iter_sheet_rows(file)
+    else:
+        raise ValueError("CSV(.csv) 또는 엑셀(.xlsx) 파일만 가져올 수 있습니다.")
+
+    layout_name, columns, mapped = iter_mapped_rows(iter(rows), layout, mapping)
+    parsed = list(mapped)
+    holdings, errors = validate_rows(parsed, account_id)
+    value_fields = VALUE_FIELDS
+    if 'purchase_fee' not in columns:
+        # 파일에 매수수수료가 없으면 0으로 덮어쓰지 않도록 비교 / 저장 대상에서 제외
+        value_fields = PRICE_COLUMNS
+        for holding in holdings:
+            del holding['purchase_fee']
+    changes, upserts, delete_ids, unchanged = diff_holdings(
+        db, detail_model, account_id, holdings, delete_missing, value_fields
+    )
+
+    applied = False
+    if not dry_run and not errors and (upserts or delete_ids):
+        try:
+            if upserts:
+                bulk_upsert(db, detail_model, upserts, key_columns=KEY_COLUMNS)
+            if delete_ids:
+                db.execute(delete(detail_model).where(detail_model.id.in_(delete_ids)))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        portfolio_valuation_cache.invalidate()
+        applied = True
+
+    counts = {action: sum(1 for change in changes if change.action == action) for action in ('create', 'update', 'delete')}
+    return HoldingsIngestResult(
+        dry_run=dry_run,
+        applied=applied,
+        file_format=file_format,
+        layout=layout_name,
+        row_count=len(parsed),
+        create_count=counts['create'],
+        update_count=counts['update'],
+        unchanged_count=unchanged,
+        delete_count=counts['delete'],
+        error_count=len(errors),
+        errors=errors,
+        changes=changes,
+    )
@@ -0,0 +1,253 @@
+"""
+가져오기 / 스크래핑 작업 큐 (API에서 접수하고 백그라운드 스레드에서 실행)
+
+- 작업은 import_job 테이블에 기록 (queued -> running -> completed / failed), 접수하면 바로 작업 ID 반환
+- app/import, app/scrapers의 스크립트 함수를 그대로 실행 (CLI와 같은 코드, 같은 체크포인트)
+- 작업 유형별 동시 실행 수(concurrency, 다른 프로세스에서 실행 중인 작업 포함) + 프로세스 전체 실행 수(import_job_workers) 제한
+- 배치의 진행 상황(batch_jobs.report_progress)을 PROGRESS_INTERVAL_SECONDS에 한 번까지 테이블에 기록
+- 실행 중인 작업은 주기적으로 생존 신호(heartbeat_at)를 갱신하고, 신호가 끊긴 작업(프로세스 종료 등)은 다시 대기열로
+  (스크립트가 체크포인트에서 이어서 실행하므로 완료된 항목은 다시 처리하지 않음)
+- 대기 중인 작업은 조건부 UPDATE로 가져가므로 API 프로세스 여러 개와 별도 워커가 같은 테이블을 써도 한 번만 실행
+
+서버리스 모드에서는 응답 후 백그라운드 스레드가 멈추므로 접수만 하고, 실행은 별도 워커(app/import/run_import_worker.py)가 맡는다.
+"""
+import dataclasses
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Dict, Optional, Type
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from app.crud import import_job as crud_import_job
+from app.database import settings, SessionLocal
+from app.models.import_job import ImportJob
+from app.schemas.import_job import (
+    DomesticETFDailyChartParams,
+    DomesticETFDividendParams,
+    USAETFDailyChartParams,
+    USAETFDividendParams,
+    USAETFDividendYahooParams,
+    USAIndicatorsParams,
+    USDKRWExchangeParams,
+)
+from app.services.batch_jobs import progress_reporter
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_INTERVAL_SECONDS = 1.0  # 진행 상황 DB 기록 최소 간격
+HEARTBEAT_SECONDS = 30  # 실행 중인 작업의 생존 신호 갱신 주기
+
+
+@dataclass(frozen=True)
+class JobTypeSpec:
+    """작업 유형: 실행할 스크립트 함수와 파라미터"""
+    module: str  # 함수가 있는 모듈 (app.import는 예약어라서 import_module로 로딩)
+    function: str  # 실행할 함수 (params 필드를 키워드 인자로 받음)
+    params: Type[BaseModel]  # 파라미터 스키마
+    description: str
+    concurrency: int = 1  # 같은 유형 동시 실행 수 (같은 유형은 체크포인트 파일을 공유하므로 기본 1)
+
+
+JOB_TYPES: Dict[str, JobTypeSpec] = {
+    'usa_etf_daily_chart': JobTypeSpec(
+        'app.import.import_usa_etf_daily_chart', 'import_usa_etf_daily_chart_pipeline', USAETFDailyChartParams,
+        "미국 ETF 일봉 차트 (yfinance, 파이프라인 모드)",
+    ),
+    'domestic_etf_daily_chart': JobTypeSpec(
+        'app.import.import_domestic_etf_daily_chart', 'import_domestic_etf_daily_chart', DomesticETFDailyChartParams,
+        "국내 ETF 일봉 차트 (FinanceDataReader)",
+    ),
+    'usd_krw_exchange': JobTypeSpec(
+        'app.scrapers.usd_krw_exchange', 'scrape_and_save_usd_krw_exchange', USDKRWExchangeParams,
+        "USD/KRW 환율 (네이버 금융)",
+    ),
+    'usa_etf_dividend': JobTypeSpec(
+        'app.scrapers.usa_etfs_dividend', 'scrape_all_usa_etf_dividends', USAETFDividendParams,
+        "미국 ETF 배당 (Seeking Alpha, 필요하면 브라우저 사용)",
+    ),
+    'usa_etf_dividend_yahoo': JobTypeSpec(
+        'app.scrapers.usa_etfs_dividend_yahoo', 'scrape_all_usa_etf_dividends_yahoo', USAETFDividendYahooParams,
+        "미국 ETF 배당 (Yahoo Finance)",
+    ),
+    'domestic_etf_dividend': JobTypeSpec(
+        'app.scrapers.domestic_etfs_dividend', 'scrape_all_high_dividend_etfs', DomesticETFDividendParams,
+        "국내 ETF 배당 (SEIBRO, 브라우저 사용)",
+    ),
+    'usa_indicators': JobTypeSpec(
+        'app.import.compute_usa_indicators', 'compute_usa_indicators', USAIndicatorsParams,
+        "미국 지표 주봉 MACD 오실레이터 / RSI / 이동평균 계산 (저장된 일봉 사용)",
+    ),
+}
+
+
+def validate_params(job_type: str, params: dict) -> dict:
+    """작업 유형의 파라미터 검증 후 기본값을 채운 dict (알 수 없는 유형 / 잘못된 값은 ValueError)"""
+    spec = JOB_TYPES.get(job_type)
+    if spec is None:
+        raise ValueError(f"알 수 없는 작업 유형입니다: {job_type} (가능한 유형: {', '.join(JOB_TYPES)})")
+    return spec.params(**params).model_dump()
+
+
+def summarize_result(result) -> Optional[dict]:
+    """스크립트 반환값(BatchJobReport, PipelineStats 등 dataclass 또는 dict)을 JSON으로 저장할 수 있는 dict로 변환"""
+    if result is None:
+        return None
+    if dataclasses.is_dataclass(result):
+        result = dataclasses.asdict(result)
+    elif not isinstance(result, dict):
+        result = {'value': result}
+    return json.loads(json.dumps(result, default=str, ensure_ascii=False))
+
+
+class ImportJobQueue:
+    """
+    DB 테이블 기반 가져오기 작업 큐 (스레드 안전)
+
+    Args:
+        max_workers: 이 프로세스에서 동시에 실행할 작업 수 (None이면 설정의 import_job_workers)
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or settings.import_job_workers
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._lock = threading.Lock()
+        self._dispatch_lock = threading.Lock()
+        self._running: Dict[int, str] = {}  # 이 프로세스에서 실행 중인 작업 ID -> 유형
+        self._executor = None
+        self._heartbeat = None
+        self._last_recovery = 0.0
+
+    def _start(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='import-job')
+            self._heartbeat = threading.Thread(target=self._heartbeat_loop, name='import-job-heartbeat', daemon=True)
+            self._heartbeat.start()
+
+    def submit(self, db: Session, job_type: str, params: dict) -> ImportJob:
+        """작업 접수 (서버리스 모드가 아니면 바로 실행 시도, 동시 실행 제한에 걸리면 대기열에 남음)"""
+        job = crud_import_job.create_import_job(db, job_type, validate_params(job_type, params))
+        if not settings.serverless_mode and self.dispatch():
+            db.refresh(job)
+        return job
+
+    def dispatch(self) -> int:
+        """대기 중인 작업 중 동시 실행 제한 안에서 실행할 수 있는 작업을 가져가서 실행 (시작한 작업 수)"""
+        with self._dispatch_lock:
+            with self._lock:
+                free = self.max_workers - len(self._running)
+            if free <= 0:
+                return 0
+            db = SessionLocal()
+            try:
+                self._recover_stale(db)
+                running = Counter(crud_import_job.count_running_import_jobs(db))
+                started = 0
+                for job in crud_import_job.get_queued_import_jobs(db):
+                    if started >= free:
+                        break
+                    spec = JOB_TYPES.get(job.job_type)
+                    if spec is None:
+                        crud_import_job.finish_import_job(db, job.id, 'failed', error=f"알 수 없는 작업 유형입니다: {job.job_type}")
+                        continue
+                    if running[job.job_type] >= spec.concurrency:
+                        continue
+                    if not crud_import_job.claim_import_job(db, job.id, self.worker_id):
+                        continue  # 다른 프로세스가 먼저 가져감
+                    running[job.job_type] += 1
+                    with self._lock:
+                        self._running[job.id] = job.job_type
+                    self._start()
+                    self._executor.submit(self._run, job.id, spec, dict(job.params or {}))
+                    started += 1
+                return started
+            finally:
+                db.close()
+
+    def _recover_stale(self, db: Session):
+        """생존 신호가 끊긴 실행 중 작업을 다시 대기열로 (HEARTBEAT_SECONDS에 한 번까지)"""
+        now = time.monotonic()
+        if now - self._last_recovery < HEARTBEAT_SECONDS:
+            return
+        self._last_recovery = now
+        requeued = crud_import_job.requeue_stale_import_jobs(db, settings.import_job_stale_seconds)
+        if requeued:
+            logger.warning(f"생존 신호가 끊긴 작업 {requeued}개를 다시 대기열에 넣었습니다.")
+
+    def _run(self, job_id: int, spec: JobTypeSpec, params: dict):
+        last_write = {'at': 0.0}
+
+        def on_progress(done: int, total: Optional[int], message: Optional[str]):
+            now = time.monotonic()
+            if now - last_write['at'] < PROGRESS_INTERVAL_SECONDS and (total is None or done < total):
+                return
+            last_write['at'] = now
+            db = SessionLocal()
+            try:
+                crud_import_job.update_import_job_progress(db, job_id, done, total, message)
+            finally:
+                db.close()
+
+        status, summary, error = 'completed', None, None
+        try:
+            function = getattr(import_module(spec.module), spec.function)
+            with progress_reporter(on_progress):
+                summary = summarize_result(function(**params))
+        except SystemExit:
+            # 스크립트가 의존성 누락 / 오류 시 sys.exit로 종료하는 경우 (자세한 내용은 스크립트 로그)
+            logger.error(f"가져오기 작업 {job_id} ({spec.function}) 비정상 종료")
+            status, error = 'failed', "작업 스크립트가 비정상 종료했습니다. 서버 로그를 확인하세요."
+        except Exception as e:
+            logger.exception(f"가져오기 작업 {job_id} ({spec.function}) 실패")
+            status, error = 'failed', str(e) or type(e).__name__
+        else:
+            failed = (summary or {}).get('failed')
+            if failed:
+                status, error = 'failed', f"{len(failed)}개 항목 실패 (다시 실행하면 체크포인트에서 실패한 항목부터 이어서 처리)"
+
+        db = SessionLocal()
+        try:
+            crud_import_job.finish_import_job(db, job_id, status, result=summary, error=error)
+        except Exception:
+            logger.exception(f"가져오기 작업 {job_id} 종료 기록 실패")
+        finally:
+            db.close()
+            with self._lock:
+                self._running.pop(job_id, None)
+        # 자리가 났으므로 대기 중인 다음 작업 실행
+        try:
+            self.dispatch()
+        except Exception:
+            logger.exception("대기 중인 가져오기 작업 실행 실패")
+
+    def _heartbeat_loop(self):
+        """실행 중인 작업의 생존 신호 갱신 + 다른 프로세스의 작업 때문에 밀려 있던 대기 작업 실행"""
+        while True:
+            time.sleep(HEARTBEAT_SECONDS)
+            with self._lock:
+                job_ids = list(self._running)
+            db = SessionLocal()
+            try:
+                crud_import_job.touch_import_jobs(db, job_ids)
+            except Exception as e:
+                logger.warning(f"가져오기 작업 생존 신호 갱신 실패: {e}")
+            finally:
+                db.close()
+            try:
+                self.dispatch()
+            except Exception as e:
+                logger.warning(f"대기 중인 가져오기 작업 실행 실패: {e}")
+
+    def running_count(self) -> int:
+        """이 프로세스에서 실행 중인 작업 수"""
+        with self._lock:
+            return len(self._running)
+
+
+import_jobs = ImportJobQueue()
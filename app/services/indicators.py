@@ -0,0 +1,247 @@
+"""
+미국 지표(basic.usa_indicators) 기술적 지표 계산
+
+- 저장된 일봉(stock.usa_etfs_daily_chart)을 주봉(월요일 시작 주의 마지막 종가)으로 변환
+- 모든 티커를 [티커 x 주] 행렬 하나로 만들어 MACD 오실레이터 / RSI / 이동평균 / 이격도를 NumPy로 한 번에 계산
+  (EMA처럼 직전 값에 의존하는 지표도 주 단위 반복 한 번으로 모든 티커를 함께 계산)
+- 계산 결과는 기본키 기준 일괄 UPDATE, 값이 바뀐 행만 기록
+- 증분 모드: 지표 계산 기준일 / 기준 종가(calculated_date, calculated_close)가 최신 일봉과 같은 티커는 건너뛰고,
+  나머지는 최근 lookback_weeks주 일봉만 읽어서 다시 계산 (최신 주봉만 바뀐 경우 읽는 양이 기간과 무관하게 일정)
+  같은 날짜의 최신 일봉 종가가 보정된 경우(일봉 수집의 최근 구간 재수집)도 다시 계산
+
+일봉이 없는 티커(usa_etfs에 없는 지수 등)의 지표 행은 건드리지 않는다 (직접 입력한 값 유지).
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.crud import usa_etfs_daily_chart, usa_indicators
+from app.models.usa_etfs import USAETFs
+from app.models.usa_indicators import USAIndicators
+
+logger = logging.getLogger(__name__)
+
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+RSI_PERIOD = 14
+MA_PERIOD = 20
+# 증분 계산 시 읽는 기간: 가장 느리게 잊는 RSI의 Wilder 평활(13/14)^312 ≈ 1e-10, EMA(26)은 (25/27)^312 ≈ 4e-11 배로
+# 초기값의 영향이 줄어 전체 기간 계산과의 차이가 1e-7 이하 (600주 랜덤워크 200개 측정, 156주는 최대 4e-3)
+# 저장 단위(소수 넷째 자리)의 반올림 경계에 걸린 값만 드물게 마지막 자리가 다를 수 있음
+DEFAULT_LOOKBACK_WEEKS = 312
+
+INDICATOR_COLUMNS = ('weekly_macd_oscillator', 'weekly_rsi', 'weekly_ma20', 'weekly_ma20_gap')
+_QUANT = Decimal('0.0001')
+
+
+def weekly_close_matrix(etf_index: np.ndarray, dates: np.ndarray, closes: np.ndarray, n_etfs: int) -> tuple:
+    """
+    일봉을 [n_etfs x 주] 주봉 종가 행렬로 변환
+
+    Args:
+        etf_index: 행마다 0 ~ n_etfs-1 티커 번호 (티커, 날짜 오름차순 정렬)
+        dates: 날짜 (datetime64[D])
+        closes: 종가
+
+    Returns:
+        (행렬, 티커별 마지막 주 열 번호) - 첫 거래 이전 주는 NaN, 중간에 거래가 없는 주는 직전 종가
+        티커별 지표 값은 각자의 마지막 주 열에서 읽는다 (다른 티커가 더 최근 주까지 있어도 영향 없음)
+    """
+    if len(dates) == 0:
+        return np.full((n_etfs, 0), np.nan), np.full(n_etfs, -1, dtype=np.int64)
+    # 월요일 시작 주 번호 (1970-01-01은 목요일)
+    weeks = (dates.astype('datetime64[D]').astype(np.int64) + 3) // 7
+    first_week = weeks.min()
+    n_weeks = int(weeks.max() - first_week) + 1
+    # (티커, 주) 그룹의 마지막 행 = 주봉 종가
+    is_last = np.r_[(etf_index[1:] != etf_index[:-1]) | (weeks[1:] != weeks[:-1]), True]
+    rows, cols = etf_index[is_last], weeks[is_last] - first_week
+
+    matrix = np.full((n_etfs, n_weeks), np.nan)
+    matrix[rows, cols] = closes[is_last]
+    last_cols = np.full(n_etfs, -1, dtype=np.int64)
+    np.maximum.at(last_cols, rows, cols)
+
+    # 앞 방향 채우기 (첫 거래 이전은 NaN 유지)
+    index = np.where(np.isnan(matrix), 0, np.arange(n_weeks))
+    np.maximum.accumulate(index, axis=1, out=index)
+    return matrix[np.arange(n_etfs)[:, None], index], last_cols
+
+
+def ema(matrix: np.ndarray, alpha: float) -> np.ndarray:
+    """행(티커)별 지수이동평균 (첫 유효 값에서 시작, pandas ewm(adjust=False)와 같음)"""
+    out = np.empty_like(matrix)
+    prev = np.full(matrix.shape[0], np.nan)
+    for t in range(matrix.shape[1]):
+        x = matrix[:, t]
+        prev = np.where(np.isnan(prev), x, prev + alpha * (x - prev))
+        out[:, t] = prev
+    return out
+
+
+def sma(matrix: np.ndarray, period: int) -> np.ndarray:
+    """행별 단순이동평균 (구간 안에 NaN이 있으면 NaN)"""
+    n, length = matrix.shape
+    out = np.full((n, length), np.nan)
+    if length < period:
+        return out
+    valid = ~np.isnan(matrix)
+    sums = np.concatenate([np.zeros((n, 1)), np.cumsum(np.where(valid, matrix, 0.0), axis=1)], axis=1)
+    counts = np.concatenate([np.zeros((n, 1)), np.cumsum(valid, axis=1)], axis=1)
+    window_sums = sums[:, period:] - sums[:, :-period]
+    window_counts = counts[:, period:] - counts[:, :-period]
+    out[:, period - 1:] = np.where(window_counts == period, window_sums / period, np.nan)
+    return out
+
+
+def macd_oscillator(matrix: np.ndarray, fast: int = MACD_FAST, slow: int = MACD_SLOW, signal: int = MACD_SIGNAL) -> np.ndarray:
+    """MACD 오실레이터 = MACD(EMA fast - EMA slow) - 시그널(MACD의 EMA signal)"""
+    macd = ema(matrix, 2 / (fast + 1)) - ema(matrix, 2 / (slow + 1))
+    return macd - ema(macd, 2 / (signal + 1))
+
+
+def rsi(matrix: np.ndarray, period: int = RSI_PERIOD) -> np.ndarray:
+    """RSI (Wilder 평활: 알파 1/period 지수이동평균)"""
+    delta = np.diff(matrix, axis=1, prepend=np.nan)
+    average_gain = ema(np.clip(delta, 0, None), 1 / period)
+    average_loss = ema(np.clip(-delta, 0, None), 1 / period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = 100 - 100 / (1 + average_gain / average_loss)
+    # 하락이 없으면 100, 변동이 없으면 50
+    value = np.where(average_loss == 0, np.where(average_gain == 0, 50.0, 100.0), value)
+    return np.where(np.isnan(average_gain), np.nan, value)
+
+
+def compute_weekly_indicators(matrix: np.ndarray, last_cols: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    주봉 종가 행렬에서 티커별 최신 지표 값 계산
+
+    Returns:
+        {컬럼 이름: 티커별 값 배열} - 주봉 수가 부족한 지표는 NaN
+        (MACD 오실레이터: slow + signal - 1주, RSI: period + 1주, 20주 이동평균: 20주 이상)
+    """
+    n = matrix.shape[0]
+    if not matrix.size:
+        return {column: np.full(n, np.nan) for column in INDICATOR_COLUMNS}
+    has_data = last_cols >= 0
+    rows = np.arange(n)
+    cols = np.where(has_data, last_cols, 0)
+    # 첫 거래 주부터 티커의 마지막 주까지 주봉 수 (앞 방향 채우기 후라서 중간에 NaN 없음)
+    weeks = np.where(has_data, cols - (~np.isnan(matrix)).argmax(axis=1) + 1, 0)
+
+    def latest(values: np.ndarray, min_weeks: int) -> np.ndarray:
+        return np.where(has_data & (weeks >= min_weeks), values[rows, cols], np.nan)
+
+    close = latest(matrix, 1)
+    moving_average = latest(sma(matrix, MA_PERIOD), MA_PERIOD)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gap = (close / moving_average - 1) * 100
+    return {
+        'weekly_macd_oscillator': latest(macd_oscillator(matrix), MACD_SLOW + MACD_SIGNAL - 1),
+        'weekly_rsi': latest(rsi(matrix), RSI_PERIOD + 1),
+        'weekly_ma20': moving_average,
+        'weekly_ma20_gap': gap,
+    }
+
+
+def _to_decimal(value: float) -> Optional[Decimal]:
+    if value is None or not np.isfinite(value):
+        return None
+    return Decimal(repr(float(value))).quantize(_QUANT)
+
+
+@dataclass
+class IndicatorUpdateStats:
+    """지표 계산 결과"""
+    indicators: int = 0  # 대상 지표 행 수
+    tickers: int = 0  # 일봉이 있는 티커 수
+    computed: int = 0  # 계산한 티커 수
+    unchanged: int = 0  # 최신 일봉이 바뀌지 않아서 건너뛴 티커 수 (증분 모드)
+    missing_chart: List[str] = field(default_factory=list)  # 일봉이 없는 티커 (기존 값 유지)
+    updated: int = 0  # 값이 바뀌어 UPDATE한 지표 행 수
+    daily_rows: int = 0  # 읽은 일봉 행 수
+    weeks: int = 0  # 주봉 행렬 열 수
+    elapsed_seconds: float = 0.0
+
+
+def update_usa_indicators(db: Session, incremental: bool = True, lookback_weeks: int = DEFAULT_LOOKBACK_WEEKS,
+                          tickers: Optional[List[str]] = None) -> IndicatorUpdateStats:
+    """
+    usa_indicators의 주봉 지표를 저장된 일봉으로 다시 계산해서 일괄 업데이트
+
+    Args:
+        incremental: True면 계산 기준일 이후 새 일봉이 있거나 최신 일봉 종가가 바뀐 티커만, 최근 lookback_weeks주 일봉으로 계산
+                     (False면 모든 티커를 전체 기간 일봉으로 계산)
+        lookback_weeks: 증분 모드에서 읽는 주 수
+        tickers: 특정 티커만 (None이면 모든 지표 행)
+    """
+    started = time.perf_counter()
+    stats = IndicatorUpdateStats()
+    query = db.query(USAIndicators)
+    if tickers:
+        query = query.filter(USAIndicators.ticker.in_(tickers))
+    indicator_rows = query.all()
+    stats.indicators = len(indicator_rows)
+    rows_by_ticker: Dict[str, list] = {}
+    for row in indicator_rows:
+        rows_by_ticker.setdefault(row.ticker, []).append(row)
+    if not rows_by_ticker:
+        return stats
+
+    etf_ids = dict(db.execute(select(USAETFs.ticker, USAETFs.id).where(USAETFs.ticker.in_(list(rows_by_ticker)))).all())
+    latest_bars = usa_etfs_daily_chart.get_latest_usa_etf_daily_bars(db, list(etf_ids.values()))
+    stats.missing_chart = sorted(ticker for ticker in rows_by_ticker if etf_ids.get(ticker) not in latest_bars)
+    stats.tickers = len(rows_by_ticker) - len(stats.missing_chart)
+
+    targets = {}  # etf_id -> 티커
+    for ticker, rows in rows_by_ticker.items():
+        etf_id = etf_ids.get(ticker)
+        if etf_id not in latest_bars:
+            continue
+        latest_date, latest_close = latest_bars[etf_id]
+        if incremental and all(
+            row.calculated_date == latest_date and row.calculated_close == latest_close for row in rows
+        ):
+            stats.unchanged += 1
+            continue
+        targets[etf_id] = ticker
+    stats.computed = len(targets)
+    if not targets:
+        stats.elapsed_seconds = time.perf_counter() - started
+        return stats
+
+    target_ids = sorted(targets)
+    start_date = None
+    if incremental:
+        start_date = min(latest_bars[etf_id][0] for etf_id in target_ids) - timedelta(weeks=lookback_weeks)
+    closes = usa_etfs_daily_chart.get_usa_etf_daily_closes(db, target_ids, start_date=start_date)
+    stats.daily_rows = len(closes)
+    columns = list(zip(*closes)) if closes else [(), (), ()]
+    ids = np.array(columns[0], dtype=np.int64)
+    matrix, last_cols = weekly_close_matrix(
+        np.searchsorted(np.array(target_ids, dtype=np.int64), ids),
+        np.array(columns[1], dtype='datetime64[D]'),
+        np.array(columns[2], dtype=np.float64),
+        len(target_ids),
+    )
+    stats.weeks = matrix.shape[1]
+    values = compute_weekly_indicators(matrix, last_cols)
+
+    updates = []
+    for index, etf_id in enumerate(target_ids):
+        new_values = {column: _to_decimal(values[column][index]) for column in INDICATOR_COLUMNS}
+        new_values['calculated_date'], new_values['calculated_close'] = latest_bars[etf_id]
+        for row in rows_by_ticker[targets[etf_id]]:
+            if any(getattr(row, column) != value for column, value in new_values.items()):
+                updates.append({'id': row.id, **new_values})
+    stats.updated = usa_indicators.bulk_update_usa_indicator_values(db, updates)
+    stats.elapsed_seconds = time.perf_counter() - started
+    logger.info(
+        f"미국 지표 계산: 티커 {stats.computed}개 계산 (변경 없음 {stats.unchanged}개, 일봉 없음 {len(stats.missing_chart)}개), "
+        f"일봉 {stats.daily_rows}행 / 주봉 {stats.weeks}주, 업데이트 {stats.updated}행, {stats.elapsed_seconds:.2f}초"
+    )
+    return stats
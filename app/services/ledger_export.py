@@ -0,0 +1,78 @@
+"""
+계좌 보유 종목 / 매도 내역 / 배당 내역 파일 내보내기 (CSV, XLSX 스트리밍)
+
+- 행은 서버 측 커서(keyset.server_side_result)로 STREAM_BATCH_SIZE행씩 읽음
+- CSV: 배치마다 바로 응답으로 전송 (엑셀에서 한글이 깨지지 않도록 UTF-8 BOM)
+- XLSX: openpyxl 쓰기 전용 모드로 시트 XML을 임시 파일에 쓰고, 완성된 파일을 CHUNK_SIZE씩 전송
+  (xlsx는 zip이라 마지막에 목차를 써야 하므로 행을 받는 중에 보낼 수는 없지만 메모리에는 배치 하나만 올라감)
+
+헤더는 조회문의 컬럼 label을 그대로 사용한다.
+"""
+import csv
+import io
+import tempfile
+from typing import Iterator
+from app.crud.keyset import STREAM_BATCH_SIZE, server_side_result
+
+CHUNK_SIZE = 64 * 1024
+EXPORT_MEDIA_TYPES = {
+    'xlsx': "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    'csv': "text/csv; charset=utf-8",
+}
+
+
+def _csv_chunks(stmt, batch_size: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    with server_side_result(stmt, batch_size) as result:
+        writer.writerow(result.keys())
+        yield ('﻿' + buffer.getvalue()).encode('utf-8')
+        for partition in result.partitions():
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(partition)
+            yield buffer.getvalue().encode('utf-8')
+
+
+def _xlsx_chunks(stmt, batch_size: int, sheet_title: str) -> Iterator[bytes]:
+    # openpyxl은 import 비용이 커서 내보내기가 처음 호출될 때 로딩
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title)
+    with server_side_result(stmt, batch_size) as result:
+        header = []
+        for name in result.keys():
+            cell = WriteOnlyCell(ws, value=name)
+            cell.font = Font(bold=True)
+            header.append(cell)
+        ws.append(header)
+        for partition in result.partitions():
+            for row in partition:
+                ws.append(list(row))
+
+    with tempfile.TemporaryFile() as output:
+        wb.save(output)
+        output.seek(0)
+        while True:
+            chunk = output.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def stream_export(stmt, file_format: str, sheet_title: str, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    컬럼 조회 stmt의 결과를 file_format(xlsx, csv) 파일로 스트리밍
+
+    Args:
+        stmt: select(Model.a.label('헤더'), ...) 조회문 (정렬 포함)
+        sheet_title: xlsx 시트 이름
+    """
+    if file_format == 'csv':
+        return _csv_chunks(stmt, batch_size)
+    if file_format == 'xlsx':
+        return _xlsx_chunks(stmt, batch_size, sheet_title)
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {file_format} (가능한 형식: {', '.join(EXPORT_MEDIA_TYPES)})")
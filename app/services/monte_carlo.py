@@ -0,0 +1,105 @@
+"""
+조기은퇴 계획 몬테카를로 시뮬레이션 엔진 (NumPy만 사용)
+
+과거 월별 (수익률, 배당수익률, 환율 변화) 표본을 같은 달 단위로 복원추출(부트스트랩)하여
+여러 경로를 한 번에 시뮬레이션한다. 프로세스 풀 워커에서 실행되므로 DB / 앱 설정에 의존하지 않는다.
+
+매월 처리 순서 (모든 경로를 배열로 동시에 계산):
+1. 표본 월 하나를 뽑아 투자자산에 그 달의 배당수익률만큼 배당을 현금으로 받고, 수익률만큼 평가액 변화
+2. 물가상승률을 반영한 생활비를 현금에서 지출 (현금이 부족하면 투자자산을 매도)
+3. 부족한 생활비가 투자자산보다 커서 총자산(투자자산 + 현금)이 0 이하가 되면 그 경로는 실패(자산 고갈)로 기록
+   (투자자산 없이 현금만 있는 계획은 현금이 남아있는 동안 실패가 아님)
+"""
+from typing import List, Optional
+import numpy as np
+
+# 경로를 이 단위로 나누어 워커에 배분 (시드가 같으면 워커 수와 관계없이 같은 결과)
+CHUNK_PATHS = 2000
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def portfolio_samples(asset_log_returns: np.ndarray, dividend_yields: np.ndarray, weights: np.ndarray,
+                      fx_log_returns: Optional[np.ndarray] = None, usd_mask: Optional[np.ndarray] = None) -> tuple:
+    """
+    자산별 월별 표본을 매월 목표 비중으로 리밸런싱하는 포트폴리오 표본으로 변환
+
+    Args:
+        asset_log_returns: (표본 월 수 x 자산 수) 현지통화 기준 월간 로그수익률
+        dividend_yields: (표본 월 수 x 자산 수) 월간 배당수익률 (배당금 / 월말 종가)
+        weights: (자산 수,) 비중 (합계 1)
+        fx_log_returns: (표본 월 수,) USD/KRW 월간 로그변화율
+        usd_mask: (자산 수,) 달러 자산 여부
+
+    Returns:
+        (원화 기준 월간 성장배수 배열, 월간 배당수익률 배열)
+    """
+    log_returns = asset_log_returns
+    if fx_log_returns is not None and usd_mask is not None:
+        log_returns = log_returns + fx_log_returns[:, None] * usd_mask[None, :]
+    growth = np.exp(log_returns) @ weights
+    dividend_yield = dividend_yields @ weights
+    return growth, dividend_yield
+
+
+def simulate_paths(seed_sequence: np.random.SeedSequence, n_paths: int, years: int,
+                   growth: np.ndarray, dividend_yield: np.ndarray,
+                   initial_invested: float, initial_cash: float,
+                   monthly_expense: float, annual_inflation: float) -> tuple:
+    """
+    n_paths개 경로 시뮬레이션
+
+    Returns:
+        (연말 총자산 배열 (n_paths x years+1), 자산 고갈 월 배열 (고갈되지 않으면 -1))
+    """
+    rng = np.random.default_rng(seed_sequence)
+    months = years * 12
+    monthly_inflation = (1 + annual_inflation) ** (1 / 12) - 1
+
+    invested = np.full(n_paths, initial_invested, dtype=np.float64)
+    cash = np.full(n_paths, initial_cash, dtype=np.float64)
+    yearly_values = np.empty((n_paths, years + 1), dtype=np.float64)
+    yearly_values[:, 0] = invested + cash
+    depleted_month = np.full(n_paths, -1, dtype=np.int64)
+
+    for month in range(months):
+        draws = rng.integers(0, len(growth), size=n_paths)
+        cash += invested * dividend_yield[draws]
+        invested *= growth[draws]
+        cash -= monthly_expense * (1 + monthly_inflation) ** month
+
+        # 현금이 부족한 경로는 투자자산을 매도해서 충당
+        shortage = np.minimum(cash, 0.0)
+        invested += shortage
+        cash -= shortage
+
+        newly_depleted = (invested + cash <= 0) & (depleted_month < 0)
+        depleted_month[newly_depleted] = month + 1
+        np.maximum(invested, 0.0, out=invested)
+
+        if (month + 1) % 12 == 0:
+            yearly_values[:, (month + 1) // 12] = invested + cash
+
+    return yearly_values, depleted_month
+
+
+def summarize(yearly_values: np.ndarray, depleted_month: np.ndarray) -> dict:
+    """경로별 결과를 연도별 백분위 밴드와 실패 확률로 요약"""
+    years = yearly_values.shape[1] - 1
+    bands = np.percentile(yearly_values, PERCENTILES, axis=0)
+    depleted = depleted_month >= 0
+    year_ends = np.arange(1, years + 1) * 12
+    failure_by_year = (depleted[:, None] & (depleted_month[:, None] <= year_ends[None, :])).mean(axis=0)
+    return {
+        'percentiles': {f'p{p}': np.round(band).tolist() for p, band in zip(PERCENTILES, bands)},
+        'failure_probability': float(depleted.mean()),
+        'failure_probability_by_year': np.round(failure_by_year, 6).tolist(),
+        'median_depletion_year': float(np.median(depleted_month[depleted]) / 12) if depleted.any() else None,
+    }
+
+
+def chunk_sizes(n_paths: int) -> List[int]:
+    """n_paths를 CHUNK_PATHS 단위 조각으로 분할"""
+    sizes = [CHUNK_PATHS] * (n_paths // CHUNK_PATHS)
+    if n_paths % CHUNK_PATHS:
+        sizes.append(n_paths % CHUNK_PATHS)
+    return sizes
@@ -0,0 +1,171 @@
+"""
+ISA / IRP / 연금저축펀드 계좌 평가 (평가금액, 매입금액, 평가손익, 비중)
+
+세 계좌 상세 테이블을 계좌별로 GROUP BY 집계한 쿼리를 UNION ALL로 묶어 한 번에 조회하고,
+계산 결과를 캐시한다.
+- 같은 프로세스의 계좌/계좌 상세 쓰기(CRUD, 엑셀 업로드)는 캐시를 즉시 무효화
+- 다른 프로세스의 쓰기는 TTL이 지나면 반영
+"""
+import threading
+import time
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import select, func, literal, union_all
+from sqlalchemy.orm import Session
+from app.database import settings
+from app.models.isa_account import ISAAccount
+from app.models.isa_account_detail import ISAAccountDetail
+from app.models.irp_account import IRPAccount
+from app.models.irp_account_detail import IRPAccountDetail
+from app.models.pension_fund_account import PensionFundAccount
+from app.models.pension_fund_account_detail import PensionFundAccountDetail
+
+# (계좌유형, 계좌 모델, 계좌 상세 모델)
+ACCOUNT_TYPES = (
+    ('isa', ISAAccount, ISAAccountDetail),
+    ('irp', IRPAccount, IRPAccountDetail),
+    ('pension_fund', PensionFundAccount, PensionFundAccountDetail),
+)
+
+SUM_FIELDS = ('market_value', 'cost_basis', 'sale_fee', 'cash_balance')
+
+
+def _account_select(account_type: str, account_model, detail_model):
+    """계좌별 보유 종목 수 / 평가금액 / 매입금액 / 매도수수료 집계 (보유 종목이 없는 계좌 포함)"""
+    zero = literal(0)
+    return (
+        select(
+            literal(account_type).label('account_type'),
+            account_model.id.label('account_id'),
+            account_model.account_number,
+            account_model.financial_institution_code,
+            account_model.cash_balance,
+            func.count(detail_model.id).label('holding_count'),
+            func.coalesce(func.sum(detail_model.quantity * detail_model.current_price), zero).label('market_value'),
+            func.coalesce(
+                func.sum(detail_model.quantity * detail_model.purchase_avg_price + detail_model.purchase_fee), zero
+            ).label('cost_basis'),
+            func.coalesce(func.sum(detail_model.sale_fee), zero).label('sale_fee'),
+        )
+        .select_from(account_model)
+        .outerjoin(detail_model, detail_model.account_id == account_model.id)
+        .group_by(
+            account_model.id,
+            account_model.account_number,
+            account_model.financial_institution_code,
+            account_model.cash_balance,
+        )
+    )
+
+
+def valuation_select():
+    """세 계좌유형의 계좌별 집계를 한 문장으로 조회"""
+    return union_all(*(_account_select(*account_type) for account_type in ACCOUNT_TYPES))
+
+
+def _summarize(holding_count: int, market_value: Decimal, cost_basis: Decimal,
+               sale_fee: Decimal, cash_balance: Decimal) -> dict:
+    unrealized_pnl = market_value - sale_fee - cost_basis
+    return {
+        'holding_count': holding_count,
+        'market_value': market_value,
+        'cost_basis': cost_basis,
+        'sale_fee': sale_fee,
+        'unrealized_pnl': unrealized_pnl,
+        'return_rate': round(float(unrealized_pnl / cost_basis), 6) if cost_basis else None,
+        'cash_balance': cash_balance,
+        'total_value': market_value + cash_balance,
+        'weight': None,
+    }
+
+
+def _add_weight(summary: dict, grand_total: Decimal):
+    summary['weight'] = round(float(summary['total_value'] / grand_total), 6) if grand_total else None
+
+
+def compute_valuation(rows: list) -> dict:
+    """집계 행들로 계좌별 / 계좌유형별 / 전체 평가 계산 (응답 스키마: PortfolioValuation)"""
+    accounts = []
+    for row in rows:
+        account = _summarize(
+            int(row.holding_count),
+            Decimal(row.market_value or 0),
+            Decimal(row.cost_basis or 0),
+            Decimal(row.sale_fee or 0),
+            Decimal(row.cash_balance or 0),
+        )
+        account.update(
+            account_type=row.account_type,
+            account_id=row.account_id,
+            account_number=row.account_number,
+            financial_institution_code=row.financial_institution_code,
+        )
+        accounts.append(account)
+    type_order = {account_type: order for order, (account_type, _, _) in enumerate(ACCOUNT_TYPES)}
+    accounts.sort(key=lambda account: (type_order[account['account_type']], account['account_id']))
+
+    def total_of(items: list) -> dict:
+        return _summarize(
+            sum(item['holding_count'] for item in items),
+            *(sum((item[field] for item in items), Decimal(0)) for field in SUM_FIELDS)
+        )
+
+    by_account_type = {
+        account_type: total_of([account for account in accounts if account['account_type'] == account_type])
+        for account_type, _, _ in ACCOUNT_TYPES
+    }
+    total = total_of(accounts)
+
+    for summary in (*accounts, *by_account_type.values(), total):
+        _add_weight(summary, total['total_value'])
+
+    return {'accounts': accounts, 'by_account_type': by_account_type, 'total': total}
+
+
+class PortfolioValuationCache:
+    """계좌 평가 결과 캐시 (스레드 안전)"""
+
+    def __init__(self, ttl_seconds: int = None):
+        self.ttl_seconds = settings.portfolio_valuation_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._valuation: Optional[dict] = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _lookup(self) -> tuple:
+        """(유효한 캐시 결과 또는 None, 현재 세대)"""
+        with self._lock:
+            if self._valuation is not None and time.monotonic() - self._loaded_at < self.ttl_seconds:
+                return self._valuation, self._generation
+            return None, self._generation
+
+    def _store(self, rows: list, generation: int) -> dict:
+        valuation = compute_valuation(rows)
+        with self._lock:
+            # 계산 중에 무효화가 발생했다면 오래된 데이터일 수 있으므로 캐시에 넣지 않음
+            if generation == self._generation:
+                self._valuation = valuation
+                self._loaded_at = time.monotonic()
+        return valuation
+
+    def get(self, db: Session) -> dict:
+        """캐시된 평가 결과 반환 (없거나 TTL이 지났으면 DB에서 집계)"""
+        valuation, generation = self._lookup()
+        if valuation is None:
+            valuation = self._store(db.execute(valuation_select()).all(), generation)
+        return valuation
+
+    async def aget(self, db) -> dict:
+        """get의 비동기 버전 (AsyncSession 사용)"""
+        valuation, generation = self._lookup()
+        if valuation is None:
+            valuation = self._store((await db.execute(valuation_select())).all(), generation)
+        return valuation
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._valuation = None
+
+
+portfolio_valuation_cache = PortfolioValuationCache()
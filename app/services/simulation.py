@@ -0,0 +1,379 @@
+"""
+조기은퇴 계획 몬테카를로 시뮬레이션 작업 관리
+
+- 저장된 일봉 차트 / 배당 / USD/KRW 환율에서 월별 부트스트랩 표본을 만들고
+- 경로를 조각으로 나누어 프로세스 풀(monte_carlo.simulate_paths)에서 병렬 실행
+- 요청은 비동기 작업으로 접수하고 결과는 (요청 + 시드, 적용된 계획, 데이터 버전) 단위로 캐시
+  (초기설정 / 생활비 / 일봉 차트 / 배당 / 환율이 바뀌면 같은 시드라도 다시 계산)
+
+서버리스 모드에서는 프로세스 풀을 만들지 않고 작업 스레드에서 바로 계산한다.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import json
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import reduce
+from typing import Optional
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from app.database import settings, SessionLocal
+from app.models.domestic_etfs_daily_chart import DomesticETFsDailyChart
+from app.models.domestic_etfs_dividend import DomesticETFsDividend
+from app.models.usa_etfs_daily_chart import USAETFsDailyChart
+from app.models.usa_etfs_dividend import USAETFsDividend
+from app.models.expense import Expense
+from app.models.usd_krw_exchange import USDKRWExchange
+from app.models.early_retirement_initial_setting import EarlyRetirementInitialSetting
+from app.schemas.simulation import SimulationRequest
+from app.services import monte_carlo
+from app.services.chart_cache import domestic_chart_cache, usa_chart_cache
+from app.services.dividend_projection import DIVIDEND_OPTION_YIELDS
+from app.services.exchange_rate_cache import usd_krw_cache
+
+MIN_SAMPLE_MONTHS = 12
+
+
+def _month_end(dates: np.ndarray, values: np.ndarray) -> tuple:
+    """일별 시계열을 월말 값으로 변환 (월 배열, 값 배열)"""
+    months = dates.astype('datetime64[M]')
+    is_last = np.r_[months[1:] != months[:-1], True] if len(months) else np.array([], dtype=bool)
+    return months[is_last], values[is_last].astype(np.float64)
+
+
+def _monthly_dividends(db: Session, model, date_column, etf_ids: list) -> dict:
+    """etf_id -> (지급월 배열, 월별 주당 배당금 배열)"""
+    if not etf_ids:
+        return {}
+    rows = db.execute(
+        select(model.etf_id, date_column, model.dividend_amt).where(model.etf_id.in_(etf_ids))
+    ).all()
+    dividends = {etf_id: ([], []) for etf_id in etf_ids}
+    for etf_id, pay_date, amount in rows:
+        dividends[etf_id][0].append(pay_date)
+        dividends[etf_id][1].append(float(amount))
+    return {
+        etf_id: (np.array(days, dtype='datetime64[D]').astype('datetime64[M]'), np.array(amounts, dtype=np.float64))
+        for etf_id, (days, amounts) in dividends.items()
+    }
+
+
+def load_samples(db: Session, request: SimulationRequest, fallback_yield: Optional[float]) -> dict:
+    """
+    요청 자산들의 월별 부트스트랩 표본 생성
+
+    모든 자산(달러 자산이 있으면 환율 포함)의 월말 값이 있는 연속된 두 달만 표본으로 사용하여
+    같은 달의 수익률 / 배당 / 환율이 함께 추출되도록 한다 (자산 간 상관관계 유지).
+    """
+    assets = request.assets
+    domestic_ids = [asset.etf_id for asset in assets if asset.market == 'domestic']
+    usa_ids = [asset.etf_id for asset in assets if asset.market == 'usa']
+    series = {('domestic', etf_id): s for etf_id, s in domestic_chart_cache.get_many(db, domestic_ids).items()}
+    series.update({('usa', etf_id): s for etf_id, s in usa_chart_cache.get_many(db, usa_ids).items()})
+
+    monthly = []
+    for asset in assets:
+        chart = series[(asset.market, asset.etf_id)]
+        if len(chart) == 0:
+            raise ValueError(f"일봉 차트 데이터가 없습니다: {asset.market} etf_id={asset.etf_id}")
+        monthly.append(_month_end(chart.dates, chart.close))
+
+    fx = None
+    if usa_ids:
+        rates = usd_krw_cache.get(db)
+        if len(rates) == 0:
+            raise ValueError("달러 자산 시뮬레이션에 필요한 USD/KRW 환율 데이터가 없습니다.")
+        fx = _month_end(rates.dates, rates.rates)
+
+    common = reduce(np.intersect1d, [months for months, _ in monthly] + ([fx[0]] if fx else []))
+    consecutive = (common[1:] - common[:-1]).astype(np.int64) == 1
+    sample_months = common[1:][consecutive]
+    if len(sample_months) < MIN_SAMPLE_MONTHS:
+        raise ValueError(
+            f"모든 자산에 공통으로 존재하는 월별 표본이 {len(sample_months)}개로 부족합니다. (최소 {MIN_SAMPLE_MONTHS}개)"
+        )
+
+    closes = np.column_stack([values[np.searchsorted(months, common)] for months, values in monthly])
+    log_returns = np.log(closes[1:] / closes[:-1])[consecutive]
+    sample_closes = closes[1:][consecutive]
+
+    dividends = _monthly_dividends(db, DomesticETFsDividend, DomesticETFsDividend.payment_date, domestic_ids)
+    usa_dividends = _monthly_dividends(db, USAETFsDividend, USAETFsDividend.record_date, usa_ids)
+    dividend_yields = np.zeros_like(sample_closes)
+    for column, asset in enumerate(assets):
+        pay_months, amounts = (dividends if asset.market == 'domestic' else usa_dividends)[asset.etf_id]
+        if len(amounts) == 0:
+            # 배당 이력이 없는 자산은 배당옵션 수익률을 매월 균등하게 적용
+            dividend_yields[:, column] = (fallback_yield or 0.0) / 12
+            continue
+        idx = np.searchsorted(sample_months, pay_months)
+        valid = (idx < len(sample_months)) & (sample_months[np.minimum(idx, len(sample_months) - 1)] == pay_months)
+        per_share = np.zeros(len(sample_months))
+        np.add.at(per_share, idx[valid], amounts[valid])
+        dividend_yields[:, column] = per_share / sample_closes[:, column]
+
+    fx_log_returns = None
+    if fx:
+        fx_values = fx[1][np.searchsorted(fx[0], common)]
+        fx_log_returns = np.log(fx_values[1:] / fx_values[:-1])[consecutive]
+
+    weights = np.array([asset.weight for asset in assets], dtype=np.float64)
+    growth, dividend_yield = monte_carlo.portfolio_samples(
+        log_returns, dividend_yields, weights / weights.sum(),
+        fx_log_returns, np.array([asset.market == 'usa' for asset in assets], dtype=np.float64),
+    )
+    return {
+        'growth': growth,
+        'dividend_yield': dividend_yield,
+        'sample_start': str(sample_months[0]),
+        'sample_end': str(sample_months[-1]),
+        'sample_months': len(sample_months),
+    }
+
+
+def load_plan(db: Session, request: SimulationRequest) -> dict:
+    """초기 투자자산 / 대기자금 / 월 생활비 / 배당옵션 (요청 값이 있으면 우선)"""
+    setting = db.execute(
+        select(EarlyRetirementInitialSetting).order_by(EarlyRetirementInitialSetting.id.asc()).limit(1)
+    ).scalar()
+    investable_assets = request.investable_assets
+    standby_fund = request.standby_fund
+    if investable_assets is None:
+        if setting is None:
+            raise ValueError("조기은퇴 초기설정이 없습니다. investable_assets를 지정하세요.")
+        investable_assets = setting.investable_assets
+    if standby_fund is None:
+        standby_fund = setting.standby_fund if setting is not None and request.investable_assets is None else 0
+
+    monthly_expense = request.monthly_expense
+    if monthly_expense is None:
+        monthly_expense = db.execute(select(func.coalesce(func.sum(Expense.amount), 0))).scalar()
+
+    if float(standby_fund) > float(investable_assets):
+        raise ValueError(
+            f"대기자금({standby_fund})이 투자가능자산({investable_assets})보다 클 수 없습니다."
+        )
+
+    return {
+        'initial_invested': float(investable_assets) - float(standby_fund),
+        'initial_cash': float(standby_fund),
+        'monthly_expense': float(monthly_expense),
+        'dividend_option': setting.dividend_option if setting is not None else None,
+    }
+
+
+def _data_version_select(request: SimulationRequest):
+    """
+    요청 자산의 일봉 차트 / 배당 / 환율 버전
+
+    증분 수집은 최근 며칠을 다시 받아 지난 행의 값을 제자리에서 고치므로 최신 날짜 / 최대 id 외에
+    행 수와 종가 / 배당금 / 환율 합계를 함께 비교한다.
+    """
+    domestic_ids = [asset.etf_id for asset in request.assets if asset.market == 'domestic']
+    usa_ids = [asset.etf_id for asset in request.assets if asset.market == 'usa']
+    columns = []
+    for chart_model, dividend_model, etf_ids in (
+        (DomesticETFsDailyChart, DomesticETFsDividend, domestic_ids),
+        (USAETFsDailyChart, USAETFsDividend, usa_ids),
+    ):
+        if etf_ids:
+            columns += [
+                select(aggregate).where(model.etf_id.in_(etf_ids)).scalar_subquery()
+                for model, aggregate in (
+                    (chart_model, func.max(chart_model.date)),
+                    (chart_model, func.count(chart_model.id)),
+                    (chart_model, func.sum(chart_model.close)),
+                    (dividend_model, func.count(dividend_model.id)),
+                    (dividend_model, func.max(dividend_model.id)),
+                    (dividend_model, func.sum(dividend_model.dividend_amt)),
+                )
+            ]
+    if usa_ids:
+        columns += [
+            select(func.max(USDKRWExchange.date)).scalar_subquery(),
+            select(func.sum(USDKRWExchange.exchange_rate)).scalar_subquery(),
+        ]
+    return select(*columns)
+
+
+def result_cache_key(db: Session, request: SimulationRequest, seed: int, plan: dict) -> str:
+    """결과 캐시 키 (요청 + 시드, 적용된 계획, 데이터 버전)"""
+    data_version = list(db.execute(_data_version_select(request)).one())
+    return json.dumps({
+        'request': request.model_copy(update={'seed': seed}).model_dump(mode='json'),
+        'plan': plan,
+        'data_version': data_version,
+    }, sort_keys=True, default=str)
+
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """시뮬레이션 프로세스 풀 (서버리스 모드이거나 워커가 1개 이하면 None)"""
+    global _process_pool
+    workers = settings.simulation_workers or min(4, os.cpu_count() or 1)
+    if settings.serverless_mode or workers <= 1:
+        return None
+    with _process_pool_lock:
+        if _process_pool is None:
+            # 스레드가 있는 서버 프로세스를 fork하지 않도록 spawn 사용
+            _process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return _process_pool
+
+
+def _reset_process_pool(pool: ProcessPoolExecutor):
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run_simulation(request: SimulationRequest, plan: dict, samples: dict, seed: int) -> dict:
+    """경로를 조각으로 나누어 실행하고 결과를 요약 (응답 스키마: SimulationResult)"""
+    sizes = monte_carlo.chunk_sizes(request.paths)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [
+        (
+            chunk_seed, size, request.years, samples['growth'], samples['dividend_yield'],
+            plan['initial_invested'], plan['initial_cash'], plan['monthly_expense'], request.inflation_rate,
+        )
+        for chunk_seed, size in zip(seeds, sizes)
+    ]
+
+    pool = _get_process_pool()
+    chunks = None
+    if pool is not None and len(args) > 1:
+        try:
+            chunks = list(pool.map(monte_carlo.simulate_paths, *zip(*args)))
+        except BrokenProcessPool:
+            # 워커가 비정상 종료된 풀은 재사용할 수 없으므로 버리고 이번 작업은 현재 스레드에서 계산
+            logging.warning("시뮬레이션 프로세스 풀이 종료되어 현재 스레드에서 계산합니다.")
+            _reset_process_pool(pool)
+    if chunks is None:
+        chunks = [monte_carlo.simulate_paths(*chunk_args) for chunk_args in args]
+
+    yearly_values = np.concatenate([values for values, _ in chunks])
+    depleted_month = np.concatenate([depleted for _, depleted in chunks])
+    return {
+        'seed': seed,
+        'paths': request.paths,
+        'years': request.years,
+        'initial_value': plan['initial_invested'] + plan['initial_cash'],
+        'monthly_expense': plan['monthly_expense'],
+        'sample_start': samples['sample_start'],
+        'sample_end': samples['sample_end'],
+        'sample_months': samples['sample_months'],
+        **monte_carlo.summarize(yearly_values, depleted_month),
+    }
+
+
+class SimulationJobs:
+    """시뮬레이션 비동기 작업 목록과 결과 캐시 (스레드 안전)"""
+
+    def __init__(self, max_jobs: int = 200, max_results: int = 50):
+        self.max_jobs = max_jobs
+        self.max_results = max_results
+        self._jobs = OrderedDict()
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        self._runner = None
+
+    def _cached_result(self, key: str) -> Optional[dict]:
+        entry = self._results.get(key)
+        if entry is None or time.monotonic() - entry[0] >= settings.simulation_cache_ttl_seconds:
+            return None
+        self._results.move_to_end(key)
+        return entry[1]
+
+    def _add_job(self, job: dict):
+        self._jobs[job['job_id']] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+
+    def submit(self, request: SimulationRequest) -> dict:
+        """작업 접수 (같은 요청 + 시드, 계획, 데이터 버전의 결과가 캐시에 있으면 완료 상태로 바로 반환)"""
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'status': 'pending',
+            'submitted_at': datetime.now(),
+            'finished_at': None,
+            'cached': False,
+            'error': None,
+            'result': None,
+        }
+        key = None
+        if request.seed is not None:
+            db = SessionLocal()
+            try:
+                key = result_cache_key(db, request, request.seed, load_plan(db, request))
+            except ValueError:
+                # 계획을 만들 수 없는 요청은 작업에서 실패 사유를 기록
+                pass
+            finally:
+                db.close()
+        with self._lock:
+            if key is not None:
+                result = self._cached_result(key)
+                if result is not None:
+                    job.update(status='completed', finished_at=job['submitted_at'], cached=True, result=result)
+                    self._add_job(job)
+                    return dict(job)
+            self._add_job(job)
+            if self._runner is None:
+                self._runner = ThreadPoolExecutor(max_workers=1, thread_name_prefix='simulation')
+        self._runner.submit(self._run, job['job_id'], request)
+        return dict(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def _run(self, job_id: str, request: SimulationRequest):
+        self._update(job_id, status='running')
+        seed = request.seed if request.seed is not None else int(np.random.SeedSequence().entropy % (2 ** 63))
+        db = SessionLocal()
+        try:
+            plan = load_plan(db, request)
+            samples = load_samples(db, request, DIVIDEND_OPTION_YIELDS.get(plan['dividend_option']))
+            key = result_cache_key(db, request, seed, plan)
+        except ValueError as e:
+            self._update(job_id, status='failed', error=str(e), finished_at=datetime.now())
+            return
+        except Exception as e:
+            logging.exception("시뮬레이션 데이터 로딩 실패")
+            self._update(job_id, status='failed', error=f"데이터 로딩 중 오류 발생: {str(e)}", finished_at=datetime.now())
+            return
+        finally:
+            db.close()
+
+        try:
+            result = run_simulation(request, plan, samples, seed)
+        except Exception as e:
+            logging.exception("시뮬레이션 실행 실패")
+            self._update(job_id, status='failed', error=f"시뮬레이션 중 오류 발생: {str(e)}", finished_at=datetime.now())
+            return
+
+        with self._lock:
+            self._results[key] = (time.monotonic(), result)
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        self._update(job_id, status='completed', result=result, finished_at=datetime.now())
+
+
+simulation_jobs = SimulationJobs()
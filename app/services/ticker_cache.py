@@ -0,0 +1,78 @@
+"""
+종목코드 -> 종목 정보(종목명, ETF 유형, 과세유형) 인메모리 캐시
+
+계좌 보유 종목 / 매도 내역 / 배당 내역의 종목명(stock_name)을 ETF 테이블 조인 없이 채우는 데 사용한다.
+- 최초 조회 시 domestic_etfs, usa_etfs 전체의 (ticker, name, etf_type, etf_tax_type)을 한 번에 로딩
+- 같은 프로세스의 국내 / 미국 ETF 쓰기는 즉시 무효화
+- 다른 프로세스(import 스크립트 등)의 쓰기는 TTL이 지나면 반영
+- 캐시에 없는 종목코드는 행을 빼지 않고 종목명만 None (기존 INNER JOIN은 행이 사라졌음)
+"""
+import threading
+import time
+from typing import Dict, Iterable, NamedTuple, Optional
+from sqlalchemy import null, select
+from sqlalchemy.orm import Session
+from app.database import settings
+from app.models.domestic_etfs import DomesticETFs
+from app.models.usa_etfs import USAETFs
+
+
+class TickerInfo(NamedTuple):
+    name: str  # 종목명
+    etf_type: Optional[str]  # ETF 유형 (공통코드)
+    etf_tax_type: Optional[str]  # 과세유형 (공통코드, 미국 ETF는 없음)
+    market: str  # domestic 또는 usa
+
+
+class TickerCache:
+    """종목코드 -> TickerInfo dict 캐시 (스레드 안전)"""
+
+    def __init__(self, ttl_seconds: int = None):
+        self.ttl_seconds = settings.ticker_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._tickers: Optional[Dict[str, TickerInfo]] = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session) -> Dict[str, TickerInfo]:
+        tickers = {}
+        # 같은 종목코드가 양쪽에 있으면 국내 ETF 우선 (계좌 상세는 국내 종목코드 기준)
+        for model, tax_type, market in (
+            (USAETFs, null(), 'usa'),
+            (DomesticETFs, DomesticETFs.etf_tax_type, 'domestic'),
+        ):
+            rows = db.execute(select(model.ticker, model.name, model.etf_type, tax_type)).all()
+            for ticker, name, etf_type, etf_tax_type in rows:
+                tickers[ticker] = TickerInfo(name, etf_type, etf_tax_type, market)
+        return tickers
+
+    def get(self, db: Session) -> Dict[str, TickerInfo]:
+        """캐시된 종목코드 -> 종목 정보 (없거나 TTL이 지났으면 DB에서 로딩)"""
+        with self._lock:
+            if self._tickers is not None and time.monotonic() - self._loaded_at < self.ttl_seconds:
+                return self._tickers
+            generation = self._generation
+        tickers = self._load(db)
+        with self._lock:
+            # 로딩 중에 무효화가 발생했다면 오래된 데이터일 수 있으므로 캐시에 넣지 않음
+            if generation == self._generation:
+                self._tickers = tickers
+                self._loaded_at = time.monotonic()
+        return tickers
+
+    def attach_names(self, db: Session, rows: Iterable) -> list:
+        """stock_code를 가진 모델 객체들에 종목명(stock_name)을 채워 리스트로 반환"""
+        rows = list(rows)
+        tickers = self.get(db) if rows else {}
+        for row in rows:
+            info = tickers.get(row.stock_code)
+            row.stock_name = info.name if info else None
+        return rows
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._tickers = None
+
+
+ticker_cache = TickerCache()
@@ -0,0 +1,116 @@
+"""
+일봉 차트 일괄 upsert 벤치마크: 기존 행 단위 루프 vs 집합 기반 bulk_upsert
+
+예: python benchmarks/bench_bulk_upsert.py                       # SQLite 메모리 DB, ETF 50개 x 500일
+예: python benchmarks/bench_bulk_upsert.py --etfs 200 --days 500
+예: python benchmarks/bench_bulk_upsert.py --url postgresql://... # 실제 DB (stock 스키마 필요, 테이블이 비어있어야 함)
+"""
+import argparse
+from datetime import date, timedelta
+from decimal import Decimal
+
+from common import make_engine, make_session_factory, StatementCounter, timed, print_table
+
+from app.models.usa_etfs import USAETFs
+from app.models.usa_etfs_daily_chart import USAETFsDailyChart
+from app.crud.bulk_upsert import bulk_upsert
+
+
+def legacy_bulk_upsert(db, charts: list):
+    """변경 전 bulk_upsert_usa_etf_daily_charts (행마다 SELECT ... first())"""
+    created_count = 0
+    updated_count = 0
+    for chart_data in charts:
+        etf_id = chart_data.get('etf_id')
+        chart_date = chart_data.get('date')
+        if not etf_id or not chart_date:
+            continue
+        existing = db.query(USAETFsDailyChart).filter(
+            USAETFsDailyChart.etf_id == etf_id,
+            USAETFsDailyChart.date == chart_date
+        ).first()
+        if existing:
+            for field, value in chart_data.items():
+                if field not in ['etf_id', 'date']:
+                    setattr(existing, field, value)
+            updated_count += 1
+        else:
+            db.add(USAETFsDailyChart(**chart_data))
+            created_count += 1
+    db.commit()
+    return {'created': created_count, 'updated': updated_count}
+
+
+def set_based_bulk_upsert(db, charts: list):
+    result = bulk_upsert(db, USAETFsDailyChart, charts, key_columns=('etf_id', 'date'))
+    db.commit()
+    return result
+
+
+def make_charts(etf_ids: list, days: int, price_shift: str = '0') -> list:
+    start = date(2024, 1, 1)
+    charts = []
+    for etf_id in etf_ids:
+        for offset in range(days):
+            price = Decimal('10') + Decimal(offset % 97) / Decimal('10') + Decimal(price_shift)
+            charts.append({
+                'etf_id': etf_id,
+                'date': start + timedelta(days=offset),
+                'open': price,
+                'high': price + Decimal('0.5'),
+                'low': price - Decimal('0.5'),
+                'close': price + Decimal('0.1'),
+                'volume': 1000 + offset,
+            })
+    return charts
+
+
+def run(name: str, upsert_func, url: str, etf_count: int, days: int) -> list:
+    engine = make_engine(url)
+    USAETFs.__table__.create(engine, checkfirst=True)
+    USAETFsDailyChart.__table__.create(engine, checkfirst=True)
+    SessionLocal = make_session_factory(engine)
+
+    db = SessionLocal()
+    try:
+        etfs = [USAETFs(ticker=f"{name[:3].upper()}{i}", name=f"bench {i}", etf_type="bench") for i in range(etf_count)]
+        db.add_all(etfs)
+        db.commit()
+        etf_ids = [etf.id for etf in etfs]
+
+        rows = []
+        for phase, shift in (("insert", "0"), ("update", "1")):
+            charts = make_charts(etf_ids, days, price_shift=shift)
+            timings = {}
+            with StatementCounter(engine) as counter, timed(timings, phase):
+                result = upsert_func(db, charts)
+            rows.append([
+                name, phase, len(charts), result['created'], result['updated'],
+                counter.count, f"{timings[phase]:.3f}", f"{len(charts) / timings[phase]:,.0f}",
+            ])
+
+        db.query(USAETFsDailyChart).filter(USAETFsDailyChart.etf_id.in_(etf_ids)).delete(synchronize_session=False)
+        db.query(USAETFs).filter(USAETFs.id.in_(etf_ids)).delete(synchronize_session=False)
+        db.commit()
+        return rows
+    finally:
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일봉 차트 일괄 upsert 벤치마크")
+    parser.add_argument("--etfs", type=int, default=50, help="ETF 수 (기본값: 50)")
+    parser.add_argument("--days", type=int, default=500, help="ETF당 일봉 수 (기본값: 500)")
+    parser.add_argument("--url", default=None, help="데이터베이스 URL (기본값: SQLite 메모리 DB)")
+    args = parser.parse_args()
+
+    rows = []
+    rows += run("per-row", legacy_bulk_upsert, args.url, args.etfs, args.days)
+    rows += run("set-based", set_based_bulk_upsert, args.url, args.etfs, args.days)
+
+    print_table(
+        f"일봉 차트 upsert 벤치마크 (ETF {args.etfs}개 x {args.days}일)",
+        ["방식", "단계", "행 수", "생성", "업데이트", "SQL 실행", "시간(초)", "행/초"],
+        rows,
+    )
@@ -0,0 +1,118 @@
+"""
+미국 ETF 일봉 수집 벤치마크: 기존 직렬 방식 vs 파이프라인 (동시 조회 + 벡터 변환 + 배치 upsert)
+
+가짜 데이터 소스(FakeChartSource)에 조회 1회당 지연 시간을 주어 네트워크 없이 측정한다.
+
+예: python benchmarks/bench_chart_pipeline.py                          # ETF 40개 x 500일, 조회 지연 0.2초
+예: python benchmarks/bench_chart_pipeline.py --etfs 100 --latency 0.5 --workers 16 --rate 20
+예: python benchmarks/bench_chart_pipeline.py --url postgresql://...    # 실제 DB (stock 스키마 필요)
+"""
+import argparse
+from decimal import Decimal
+
+from common import make_engine, make_session_factory, StatementCounter, timed, print_table
+
+import pandas as pd
+
+from app.models.usa_etfs import USAETFs
+from app.models.usa_etfs_daily_chart import USAETFsDailyChart
+from app.crud.bulk_upsert import bulk_upsert
+from app.services.daily_chart_pipeline import FakeChartSource, frame_to_rows, run_chart_pipeline
+
+
+def legacy_frame_to_rows(df, etf_id: int) -> list:
+    """변경 전 import_single_etf_chart의 변환 (iterrows + 셀마다 Decimal(str(...)))"""
+    charts = []
+    for date_idx, row in df.iterrows():
+        open_price = Decimal(str(row.get('Open', 0))) if pd.notna(row.get('Open')) else None
+        high_price = Decimal(str(row.get('High', 0))) if pd.notna(row.get('High')) else None
+        low_price = Decimal(str(row.get('Low', 0))) if pd.notna(row.get('Low')) else None
+        close_price = Decimal(str(row.get('Close', 0))) if pd.notna(row.get('Close')) else None
+        volume = int(row.get('Volume', 0)) if pd.notna(row.get('Volume')) else None
+        if None in (open_price, high_price, low_price, close_price, volume):
+            continue
+        charts.append({
+            'etf_id': etf_id, 'date': date_idx.date(), 'open': open_price, 'high': high_price,
+            'low': low_price, 'close': close_price, 'volume': volume,
+        })
+    return charts
+
+
+def write_rows(db, rows: list) -> dict:
+    result = bulk_upsert(db, USAETFsDailyChart, rows, key_columns=('etf_id', 'date'))
+    db.commit()
+    return result
+
+
+def run_serial(db, etfs: list, source, convert) -> dict:
+    """티커마다 조회 -> 변환 -> upsert + commit 을 순서대로 실행"""
+    stats = {'rows': 0, 'created': 0, 'updated': 0}
+    for etf_id, ticker in etfs:
+        rows = convert(source.fetch(ticker, '2y', '1d'), etf_id)
+        if rows:
+            result = write_rows(db, rows)
+            stats['rows'] += len(rows)
+            stats['created'] += result['created']
+            stats['updated'] += result['updated']
+    return stats
+
+
+def run(name: str, url: str, etf_count: int, days: int, latency: float, workers: int, rate: float) -> list:
+    engine = make_engine(url)
+    USAETFs.__table__.create(engine, checkfirst=True)
+    USAETFsDailyChart.__table__.create(engine, checkfirst=True)
+    SessionLocal = make_session_factory(engine)
+    source = FakeChartSource(days=days, latency=latency)
+
+    db = SessionLocal()
+    try:
+        etf_models = [USAETFs(ticker=f"{name[:3].upper()}{i}", name=f"bench {i}", etf_type="bench") for i in range(etf_count)]
+        db.add_all(etf_models)
+        db.commit()
+        etfs = [(etf.id, etf.ticker) for etf in etf_models]
+
+        timings = {}
+        with StatementCounter(engine) as counter, timed(timings, name):
+            if name == "serial-legacy":
+                stats = run_serial(db, etfs, source, legacy_frame_to_rows)
+            elif name == "serial-vectorized":
+                stats = run_serial(db, etfs, source, frame_to_rows)
+            else:
+                pipeline_stats = run_chart_pipeline(
+                    etfs, source, lambda rows: write_rows(db, rows), workers=workers, rate_per_second=rate,
+                )
+                stats = {'rows': pipeline_stats.rows, 'created': pipeline_stats.created, 'updated': pipeline_stats.updated}
+
+        etf_ids = [etf_id for etf_id, _ in etfs]
+        db.query(USAETFsDailyChart).filter(USAETFsDailyChart.etf_id.in_(etf_ids)).delete(synchronize_session=False)
+        db.query(USAETFs).filter(USAETFs.id.in_(etf_ids)).delete(synchronize_session=False)
+        db.commit()
+        return [
+            name, stats['rows'], stats['created'], stats['updated'], counter.count,
+            f"{timings[name]:.3f}", f"{stats['rows'] / timings[name]:,.0f}",
+        ]
+    finally:
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="미국 ETF 일봉 수집 파이프라인 벤치마크")
+    parser.add_argument("--etfs", type=int, default=40, help="ETF 수 (기본값: 40)")
+    parser.add_argument("--days", type=int, default=500, help="ETF당 일봉 수 (기본값: 500)")
+    parser.add_argument("--latency", type=float, default=0.2, help="조회 1회당 지연 시간(초) (기본값: 0.2)")
+    parser.add_argument("--workers", type=int, default=8, help="파이프라인 동시 조회 스레드 수 (기본값: 8)")
+    parser.add_argument("--rate", type=float, default=0, help="파이프라인 초당 최대 조회 요청 수 (기본값: 0, 제한 없음)")
+    parser.add_argument("--url", default=None, help="데이터베이스 URL (기본값: SQLite 메모리 DB)")
+    args = parser.parse_args()
+
+    rows = [
+        run(name, args.url, args.etfs, args.days, args.latency, args.workers, args.rate)
+        for name in ("serial-legacy", "serial-vectorized", "pipeline")
+    ]
+
+    print_table(
+        f"일봉 수집 벤치마크 (ETF {args.etfs}개 x {args.days}일, 조회 지연 {args.latency}초, 워커 {args.workers}개)",
+        ["방식", "행 수", "생성", "업데이트", "SQL 실행", "시간(초)", "행/초"],
+        rows,
+    )
@@ -0,0 +1,151 @@
+"""
+계좌 상세(보유 종목) 쓰기 벤치마크: 기존 쓰기 후 재조회 vs RETURNING / 일괄 처리
+
+쓰기 한 건당 실행되는 SQL 문장 수(DB 왕복 횟수)와 시간을 비교한다.
+- legacy: add / commit / refresh / INNER JOIN 재조회 (변경 전 isa_account_detail CRUD)
+- returning: account_holdings.create_holding 등 (RETURNING 한 문장, 종목명은 캐시)
+- batch: account_holdings.create_holdings 등 (요청 한 번에 전체 행)
+
+예: python benchmarks/bench_holdings_writes.py                  # SQLite 메모리 DB, 쓰기 200건
+예: python benchmarks/bench_holdings_writes.py --writes 1000
+예: python benchmarks/bench_holdings_writes.py --url postgresql://... # 실제 DB (stock 스키마 필요, 테이블이 비어있어야 함)
+"""
+import argparse
+from decimal import Decimal
+
+from common import make_engine, make_session_factory, StatementCounter, timed, print_table
+
+import app.models  # noqa: F401  (관계 설정에 필요한 모델 등록)
+from app.models.domestic_etfs import DomesticETFs
+from app.models.isa_account_detail import ISAAccountDetail
+from app.models.usa_etfs import USAETFs
+from app.crud import account_holdings
+from app.services.ticker_cache import ticker_cache
+
+HOLDING_TYPE = account_holdings.HOLDING_TYPES['isa']
+ACCOUNT_ID = 1
+
+
+def _legacy_get(db, detail_id: int):
+    result = db.query(
+        ISAAccountDetail, DomesticETFs.name.label('etf_name')
+    ).join(
+        DomesticETFs, ISAAccountDetail.stock_code == DomesticETFs.ticker
+    ).filter(ISAAccountDetail.id == detail_id).first()
+    if result:
+        detail, etf_name = result
+        detail.stock_name = etf_name
+        return detail
+    return None
+
+
+def legacy_create(db, values: dict):
+    """변경 전 create_isa_account_detail"""
+    db_detail = ISAAccountDetail(**values)
+    db.add(db_detail)
+    db.commit()
+    db.refresh(db_detail)
+    return _legacy_get(db, db_detail.id)
+
+
+def legacy_update(db, detail_id: int, values: dict):
+    """변경 전 update_isa_account_detail"""
+    db_detail = db.query(ISAAccountDetail).filter(ISAAccountDetail.id == detail_id).first()
+    for key, value in values.items():
+        setattr(db_detail, key, value)
+    db.commit()
+    db.refresh(db_detail)
+    return _legacy_get(db, detail_id)
+
+
+def legacy_delete(db, detail_id: int):
+    """변경 전 delete_isa_account_detail"""
+    db_detail = _legacy_get(db, detail_id)
+    db.delete(db_detail)
+    db.commit()
+    return db_detail
+
+
+def make_values(index: int, price_shift: int = 0) -> dict:
+    price = Decimal(10000 + index % 997 + price_shift)
+    return {
+        'account_id': ACCOUNT_ID,
+        'stock_code': f"{index % 100:06d}",
+        'quantity': Decimal(1 + index % 50),
+        'purchase_avg_price': price,
+        'current_price': price + Decimal(100),
+        'purchase_fee': Decimal(0),
+    }
+
+
+def measure(engine, rows: list, name: str, phase: str, writes: int, func):
+    timings = {}
+    with StatementCounter(engine) as counter, timed(timings, phase):
+        func()
+    rows.append([
+        name, phase, writes, counter.count, f"{counter.count / writes:.2f}",
+        f"{timings[phase]:.3f}", f"{writes / timings[phase]:,.0f}",
+    ])
+
+
+def run(url: str, writes: int) -> list:
+    engine = make_engine(url)
+    DomesticETFs.__table__.create(engine, checkfirst=True)
+    USAETFs.__table__.create(engine, checkfirst=True)  # 종목 정보 캐시 로딩에 필요
+    ISAAccountDetail.__table__.create(engine, checkfirst=True)
+    SessionLocal = make_session_factory(engine)
+    ticker_cache.invalidate()
+
+    db = SessionLocal()
+    rows = []
+    try:
+        db.add_all([DomesticETFs(ticker=f"{i:06d}", name=f"bench {i}", etf_type="bench") for i in range(100)])
+        db.commit()
+        values = [make_values(i) for i in range(writes)]
+        updated = [make_values(i, price_shift=1) for i in range(writes)]
+
+        ids = []
+        measure(engine, rows, "legacy", "create", writes,
+                lambda: ids.extend(legacy_create(db, v).id for v in values))
+        measure(engine, rows, "legacy", "update", writes,
+                lambda: [legacy_update(db, i, v) for i, v in zip(ids, updated)])
+        measure(engine, rows, "legacy", "delete", writes,
+                lambda: [legacy_delete(db, i) for i in ids])
+        db.expunge_all()
+
+        # 종목명 캐시는 첫 쓰기에서 한 번 로딩 (측정에 포함)
+        ids = []
+        measure(engine, rows, "returning", "create", writes,
+                lambda: ids.extend(account_holdings.create_holding(db, HOLDING_TYPE, v).id for v in values))
+        measure(engine, rows, "returning", "update", writes,
+                lambda: [account_holdings.update_holding(db, HOLDING_TYPE, i, v) for i, v in zip(ids, updated)])
+        measure(engine, rows, "returning", "delete", writes,
+                lambda: [account_holdings.delete_holding(db, HOLDING_TYPE, i) for i in ids])
+
+        ids = []
+        measure(engine, rows, "batch", "create", writes,
+                lambda: ids.extend(d.id for d in account_holdings.create_holdings(db, HOLDING_TYPE, values)))
+        measure(engine, rows, "batch", "update", writes,
+                lambda: account_holdings.update_holdings(db, HOLDING_TYPE, dict(zip(ids, updated))))
+        measure(engine, rows, "batch", "delete", writes,
+                lambda: account_holdings.delete_holdings(db, HOLDING_TYPE, ids))
+
+        db.query(DomesticETFs).filter(DomesticETFs.etf_type == "bench").delete(synchronize_session=False)
+        db.commit()
+        return rows
+    finally:
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="계좌 상세 쓰기 벤치마크")
+    parser.add_argument("--writes", type=int, default=200, help="생성 / 수정 / 삭제 건수 (기본값: 200)")
+    parser.add_argument("--url", default=None, help="데이터베이스 URL (기본값: SQLite 메모리 DB)")
+    args = parser.parse_args()
+
+    print_table(
+        f"계좌 상세 쓰기 벤치마크 (쓰기 {args.writes}건)",
+        ["방식", "단계", "건수", "SQL 실행", "건당 SQL", "시간(초)", "건/초"],
+        run(args.url, args.writes),
+    )
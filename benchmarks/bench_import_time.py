@@ -0,0 +1,105 @@
+"""
+앱 import 시간 벤치마크 (python -X importtime 기반)
+
+서버리스 콜드 스타트의 대부분은 app.main import 시간이므로 릴리스마다 이 값을 기록해 비교한다.
+매 실행을 새 프로세스에서 수행하며, DB 연결/테이블 생성이 없도록 SERVERLESS_MODE=true로 실행한다.
+
+예: python benchmarks/bench_import_time.py
+예: python benchmarks/bench_import_time.py --runs 10 --top 20
+예: python benchmarks/bench_import_time.py --json import_time_v1.0.0.json  # 릴리스별 결과 저장
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime
+
+from common import backend_dir, print_table
+
+
+def run_importtime(module: str) -> tuple:
+    """새 프로세스에서 module을 import하고 (모듈별 (self, cumulative) us dict, 로딩된 모듈 목록) 반환"""
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env["SERVERLESS_MODE"] = "true"
+    code = f"import sys, json; import {module}; print(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=backend_dir, env=env, capture_output=True, text=True, check=True,
+    )
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="app import 시간 벤치마크")
+    parser.add_argument("--module", default="app.main", help="측정할 모듈 (기본: app.main)")
+    parser.add_argument("--runs", type=int, default=5, help="반복 횟수 (중앙값 사용)")
+    parser.add_argument("--top", type=int, default=15, help="출력할 상위 패키지 수")
+    parser.add_argument("--json", dest="json_path", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    from app.api.v1 import DEFERRED_IMPORTS
+
+    totals = []
+    package_self = defaultdict(list)
+    loaded_modules = set()
+    for _ in range(args.runs):
+        timings, modules = run_importtime(args.module)
+        totals.append(timings[args.module][1])
+        loaded_modules.update(modules)
+
+        # 최상위 패키지별 self 시간 합계 (예: sqlalchemy.orm.* -> sqlalchemy)
+        per_package = defaultdict(int)
+        for name, (self_us, _) in timings.items():
+            per_package[name.split(".")[0]] += self_us
+        for package, self_us in per_package.items():
+            package_self[package].append(self_us)
+
+    total_ms = statistics.median(totals) / 1000
+    packages = sorted(
+        ((package, statistics.median(values) / 1000) for package, values in package_self.items()),
+        key=lambda item: item[1], reverse=True,
+    )[:args.top]
+    deferred_loaded = [name for name in DEFERRED_IMPORTS if name in loaded_modules]
+
+    print_table(
+        f"{args.module} import 시간: {total_ms:.1f}ms (중앙값, {args.runs}회)",
+        ["패키지", "self 합계(ms)", "비율"],
+        [(package, f"{ms:.1f}", f"{ms / total_ms:.0%}") for package, ms in packages],
+    )
+    if deferred_loaded:
+        print(f"경고: 지연 로딩 대상이 import 시점에 로딩됨: {', '.join(deferred_loaded)}")
+    else:
+        print(f"지연 로딩 대상 미로딩 확인: {', '.join(DEFERRED_IMPORTS)}")
+
+    if args.json_path:
+        report = {
+            "measured_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "module": args.module,
+            "runs": args.runs,
+            "total_ms": round(total_ms, 1),
+            "packages_ms": {package: round(ms, 1) for package, ms in packages},
+            "deferred_imports_loaded": deferred_loaded,
+        }
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json_path}")
+
+    if deferred_loaded:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
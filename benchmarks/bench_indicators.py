@@ -0,0 +1,79 @@
+"""
+주봉 지표 계산 벤치마크: 티커별 pandas (resample + ewm + rolling) vs 전체 티커 NumPy 행렬 한 번
+
+가짜 일봉(기하 브라운 운동)으로 DB 없이 계산 시간만 측정하고, 두 방식의 결과 차이(최대 절대 오차)를 함께 출력한다.
+
+예: python benchmarks/bench_indicators.py                        # 티커 200개 x 1250일 (5년)
+예: python benchmarks/bench_indicators.py --tickers 1000 --days 2500
+"""
+import argparse
+
+from common import timed, print_table
+
+import numpy as np
+import pandas as pd
+
+from app.services.indicators import (
+    INDICATOR_COLUMNS, MA_PERIOD, MACD_FAST, MACD_SIGNAL, MACD_SLOW, RSI_PERIOD,
+    compute_weekly_indicators, weekly_close_matrix,
+)
+
+
+def make_daily(tickers: int, days: int, seed: int = 0) -> list:
+    """티커별 (영업일 DatetimeIndex, 종가 배열) - 상장일이 티커마다 다르도록 앞부분을 잘라냄"""
+    rng = np.random.default_rng(seed)
+    calendar = pd.bdate_range(end='2025-06-27', periods=days)
+    series = []
+    for _ in range(tickers):
+        start = int(rng.integers(0, days // 3))
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, days - start)))
+        series.append((calendar[start:], close))
+    return series
+
+
+def pandas_per_ticker(series: list) -> dict:
+    """기존 방식에 해당하는 티커별 pandas 계산"""
+    values = {column: [] for column in INDICATOR_COLUMNS}
+    for dates, close in series:
+        weekly = pd.Series(close, index=dates).resample('W-SUN').last().dropna()
+        macd = weekly.ewm(span=MACD_FAST, adjust=False).mean() - weekly.ewm(span=MACD_SLOW, adjust=False).mean()
+        delta = weekly.diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / RSI_PERIOD, adjust=False).mean()
+        loss = (-delta).clip(lower=0).ewm(alpha=1 / RSI_PERIOD, adjust=False).mean()
+        moving_average = weekly.rolling(MA_PERIOD).mean()
+        values['weekly_macd_oscillator'].append((macd - macd.ewm(span=MACD_SIGNAL, adjust=False).mean()).iloc[-1])
+        values['weekly_rsi'].append((100 - 100 / (1 + gain / loss)).iloc[-1])
+        values['weekly_ma20'].append(moving_average.iloc[-1])
+        values['weekly_ma20_gap'].append((weekly.iloc[-1] / moving_average.iloc[-1] - 1) * 100)
+    return {column: np.array(column_values) for column, column_values in values.items()}
+
+
+def vectorized(series: list) -> dict:
+    """전체 티커를 행렬 하나로 계산 (DB 조회 결과와 같은 형태의 평평한 배열에서 시작)"""
+    etf_index = np.concatenate([np.full(len(dates), i) for i, (dates, _) in enumerate(series)])
+    dates = np.concatenate([dates.values.astype('datetime64[D]') for dates, _ in series])
+    closes = np.concatenate([close for _, close in series])
+    matrix, last_cols = weekly_close_matrix(etf_index, dates, closes, len(series))
+    return compute_weekly_indicators(matrix, last_cols)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="주봉 지표 계산 벤치마크")
+    parser.add_argument("--tickers", type=int, default=200, help="티커 수 (기본값: 200)")
+    parser.add_argument("--days", type=int, default=1250, help="티커당 최대 일봉 수 (기본값: 1250)")
+    args = parser.parse_args()
+
+    series = make_daily(args.tickers, args.days)
+    timings = {}
+    with timed(timings, "pandas-per-ticker"):
+        expected = pandas_per_ticker(series)
+    with timed(timings, "numpy-matrix"):
+        actual = vectorized(series)
+
+    errors = {column: float(np.nanmax(np.abs(expected[column] - actual[column]))) for column in INDICATOR_COLUMNS}
+    print_table(
+        f"주봉 지표 계산 벤치마크 (티커 {args.tickers}개 x 최대 {args.days}일)",
+        ["방식", "시간(초)", "티커/초"],
+        [[name, f"{seconds:.3f}", f"{args.tickers / seconds:,.0f}"] for name, seconds in timings.items()],
+    )
+    print("최대 절대 오차: " + ", ".join(f"{column} {error:.2e}" for column, error in errors.items()))
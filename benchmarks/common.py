@@ -0,0 +1,94 @@
+"""
+벤치마크 스크립트 공통 유틸리티
+
+- 프로젝트 루트를 Python 경로에 추가
+- DATABASE_URL이 없으면 SQLite 메모리 DB를 사용 (app.database import 시 필요)
+- stock / basic 스키마를 ATTACH한 SQLite 엔진 생성
+- 실행된 SQL 문장 수(DB 왕복 횟수) 측정
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+current_dir = os.path.dirname(os.path.abspath(__file__))  # backend-fastapi/benchmarks
+backend_dir = os.path.dirname(current_dir)  # backend-fastapi
+
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+SCHEMAS = ("stock", "basic")
+
+
+def make_engine(url: str = None):
+    """
+    벤치마크용 엔진 생성
+
+    Args:
+        url: 데이터베이스 URL (None이면 stock/basic 스키마를 ATTACH한 SQLite 메모리 DB)
+    """
+    if url:
+        return create_engine(url)
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _attach_schemas(dbapi_connection, connection_record):
+        for schema in SCHEMAS:
+            dbapi_connection.execute(f"ATTACH DATABASE ':memory:' AS {schema}")
+
+    return engine
+
+
+def make_session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+class StatementCounter:
+    """엔진에서 실행된 SQL 문장 수를 센다 (executemany는 1회로 계산)"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+@contextmanager
+def timed(results: dict, name: str):
+    """블록 실행 시간을 results[name]에 초 단위로 기록"""
+    start = time.perf_counter()
+    yield
+    results[name] = time.perf_counter() - start
+
+
+def print_table(title: str, headers: list, rows: list):
+    """결과를 고정폭 표 형태로 출력"""
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print(f"\n{'='*60}")
+    print(title)
+    print(f"{'='*60}")
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(str(v).ljust(w) for v, w in zip(row, widths)))
+    print(f"{'='*60}\n")